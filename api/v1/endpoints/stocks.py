@@ -11,10 +11,13 @@
 4. GET /api/v1/stocks/{code}/history 历史行情接口
 """
 
+import hashlib
 import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Optional
 
-from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, Request, Response, UploadFile
 
 from api.v1.schemas.stocks import (
     ExtractFromImageResponse,
@@ -321,13 +324,16 @@ def get_stock_quote(stock_code: str) -> StockQuote:
 )
 def get_stock_history(
     stock_code: str,
+    request: Request,
+    response: Response,
     period: str = Query("daily", description="K 线周期", pattern="^(daily|weekly|monthly)$"),
     days: int = Query(30, ge=1, le=365, description="获取天数")
-) -> StockHistoryResponse:
+):
     """
     获取股票历史行情
     
-    获取指定股票的历史 K 线数据
+    获取指定股票的历史 K 线数据。响应携带 ETag / Last-Modified，
+    客户端带 If-None-Match / If-Modified-Since 重新验证时数据未变化返回 304。
     
     Args:
         stock_code: 股票代码
@@ -362,15 +368,21 @@ def get_stock_history(
             for item in result.get("data", [])
         ]
         
-        return StockHistoryResponse(
+        payload = StockHistoryResponse(
             stock_code=stock_code,
             stock_name=result.get("stock_name"),
             period=period,
             data=data
         )
+
+        headers = _history_cache_headers(payload, result.get("last_modified"))
+        if _history_not_modified(request, headers):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return payload
     
     except ValueError as e:
-        # period 参数不支持的错误（如 weekly/monthly）
+        # period 参数不支持的错误
         raise HTTPException(
             status_code=422,
             detail={
@@ -387,3 +399,33 @@ def get_stock_history(
                 "message": f"获取历史行情失败: {str(e)}"
             }
         )
+
+
+def _history_cache_headers(payload: StockHistoryResponse, last_modified: Optional[datetime]) -> dict:
+    """K 线响应的验证头：ETag 取响应体摘要，Last-Modified 取数据最近写入时间"""
+    digest = hashlib.sha1(payload.model_dump_json().encode("utf-8")).hexdigest()
+    headers = {"ETag": f'W/"{digest}"', "Cache-Control": "no-cache"}
+    if isinstance(last_modified, datetime):
+        # 库中时间为本地时间（naive），按本地时区换算为 GMT
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _history_not_modified(request: Request, headers: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # 有 If-None-Match 时忽略 If-Modified-Since（RFC 9110）
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or headers["ETag"].removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return parsedate_to_datetime(last_modified) <= since
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from api.deps import get_system_config_service
 from api.v1.schemas.common import ErrorResponse
@@ -19,6 +21,7 @@ from api.v1.schemas.system_config import (
     SystemConfigSchemaResponse,
     SetupStatusResponse,
     SystemConfigValidationErrorResponse,
+    TestChannelsRequest,
     TestLLMChannelRequest,
     TestLLMChannelResponse,
     TestNotificationChannelRequest,
@@ -437,6 +440,51 @@ def test_notification_channel(
         )
 
 
+@router.post(
+    "/config/test-channels",
+    responses={
+        200: {"description": "Server-sent events, one per finished channel test"},
+    },
+    summary="Test several channels concurrently",
+    description=(
+        "Test LLM channels and notification channels in parallel and stream each result as "
+        "a server-sent event when it finishes. Channels whose settings passed a test in the "
+        "last 10 minutes are answered from cache unless `use_cache` is false."
+    ),
+)
+def test_channels(
+    request: TestChannelsRequest,
+    service: SystemConfigService = Depends(get_system_config_service),
+) -> StreamingResponse:
+    """Stream per-channel test results without writing `.env`."""
+    events = service.test_channels(
+        llm_channels=[channel.model_dump() for channel in request.llm_channels],
+        notification_channels=list(request.notification_channels),
+        items=[item.model_dump() for item in request.items],
+        mask_token=request.mask_token,
+        timeout_seconds=request.timeout_seconds,
+        use_cache=request.use_cache,
+    )
+
+    def event_stream():
+        total = 0
+        try:
+            for event in events:
+                total += 1
+                yield "data: " + json.dumps(event, ensure_ascii=False, default=str) + "\n\n"
+        except Exception as exc:
+            logger.error("Failed to test channels: %s", exc, exc_info=True)
+            yield "data: " + json.dumps({"type": "error", "message": "Failed to test channels"}) + "\n\n"
+            return
+        yield "data: " + json.dumps({"type": "done", "total": total}) + "\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/config/llm/discover-models",
     response_model=DiscoverLLMChannelModelsResponse,
@@ -267,6 +267,17 @@ class TestNotificationChannelResponse(BaseModel):
     attempts: List[NotificationTestAttempt] = Field(default_factory=list)
 
 
+class TestChannelsRequest(BaseModel):
+    """Request payload for testing several LLM / notification channels at once."""
+
+    llm_channels: List[TestLLMChannelRequest] = Field(default_factory=list)
+    notification_channels: List[NotificationTestChannel] = Field(default_factory=list)
+    items: List[SystemConfigUpdateItem] = Field(default_factory=list)
+    mask_token: str = "******"
+    timeout_seconds: float = Field(default=20.0, ge=1.0, le=120.0)
+    use_cache: bool = True
+
+
 class DiscoverLLMChannelModelsRequest(BaseModel):
     """Request payload for discovering models from one LLM channel."""
 
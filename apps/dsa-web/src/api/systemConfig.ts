@@ -1,5 +1,6 @@
 import apiClient from './index';
-import { createParsedApiError, getParsedApiError, type ParsedApiError } from './error';
+import { API_BASE_URL } from '../utils/constants';
+import { createApiError, createParsedApiError, getParsedApiError, parseApiError, type ParsedApiError } from './error';
 import { toCamelCase } from './utils';
 import type {
   DiscoverLLMChannelModelsRequest,
@@ -11,6 +12,8 @@ import type {
   SystemConfigResponse,
   SystemConfigSchemaResponse,
   SystemConfigValidationErrorResponse,
+  TestChannelsEvent,
+  TestChannelsRequest,
   TestLLMChannelRequest,
   TestLLMChannelResponse,
   TestNotificationChannelRequest,
@@ -116,6 +119,20 @@ function toSnakeNotificationTestPayload(payload: TestNotificationChannelRequest)
   };
 }
 
+function toSnakeTestChannelsPayload(payload: TestChannelsRequest): Record<string, unknown> {
+  return {
+    llm_channels: (payload.llmChannels || []).map(toSnakeTestChannelPayload),
+    notification_channels: payload.notificationChannels || [],
+    items: (payload.items || []).map((item) => ({
+      key: item.key,
+      value: item.value,
+    })),
+    mask_token: payload.maskToken ?? '******',
+    timeout_seconds: payload.timeoutSeconds ?? 20,
+    use_cache: payload.useCache ?? true,
+  };
+}
+
 function toSnakeDiscoverModelsPayload(payload: DiscoverLLMChannelModelsRequest): Record<string, unknown> {
   return {
     name: payload.name,
@@ -190,6 +207,50 @@ export const systemConfigApi = {
     return toCamelCase<TestNotificationChannelResponse>(response.data);
   },
 
+  /**
+   * 并发测试多个渠道；每个渠道测试完成即回调 onEvent，不必等待全部结束。
+   * 设置页保存时用它代替逐个调用 testLLMChannel / testNotificationChannel。
+   */
+  async testChannels(
+    payload: TestChannelsRequest,
+    onEvent: (event: TestChannelsEvent) => void,
+    options?: { signal?: AbortSignal },
+  ): Promise<void> {
+    const response = await fetch(`${API_BASE_URL || ''}/api/v1/system/config/test-channels`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(toSnakeTestChannelsPayload(payload)),
+      credentials: 'include',
+      signal: options?.signal,
+    });
+    if (!response.ok || !response.body) {
+      const responseData = await response.json().catch(() => null);
+      const details = {
+        response: { status: response.status, statusText: response.statusText, data: responseData },
+      };
+      throw createApiError(parseApiError(details), details);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      const frames = buffer.split('\n\n');
+      buffer = frames.pop() ?? '';
+      for (const frame of frames) {
+        const data = frame.startsWith('data: ') ? frame.slice(6) : '';
+        if (data) {
+          onEvent(toCamelCase<TestChannelsEvent>(JSON.parse(data)));
+        }
+      }
+      if (done) {
+        return;
+      }
+    }
+  },
+
   async discoverLLMChannelModels(
     payload: DiscoverLLMChannelModelsRequest,
   ): Promise<DiscoverLLMChannelModelsResponse> {
@@ -237,6 +237,21 @@ export interface TestNotificationChannelResponse {
   attempts: NotificationTestAttempt[];
 }
 
+export interface TestChannelsRequest {
+  llmChannels?: TestLLMChannelRequest[];
+  notificationChannels?: NotificationTestChannel[];
+  items?: SystemConfigUpdateItem[];
+  maskToken?: string;
+  timeoutSeconds?: number;
+  useCache?: boolean;
+}
+
+export type TestChannelsEvent =
+  | { type: 'llm'; name: string; cached: boolean; result: TestLLMChannelResponse }
+  | { type: 'notification'; name: NotificationTestChannel; cached: boolean; result: TestNotificationChannelResponse }
+  | { type: 'done'; total: number }
+  | { type: 'error'; message: string };
+
 export interface DiscoverLLMChannelModelsRequest {
   name: string;
   protocol: string;
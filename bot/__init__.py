@@ -10,6 +10,7 @@
 模块结构：
 - models.py: 统一的消息/响应模型
 - dispatcher.py: 命令分发器
+- worker_pool.py: 命令工作池（Stream / 延迟响应平台）
 - commands/: 命令处理器
 - platforms/: 平台适配器
 - handler.py: Webhook 处理器
@@ -33,6 +34,7 @@
 
 from bot.models import BotMessage, BotResponse, ChatType, WebhookResponse
 from bot.dispatcher import CommandDispatcher, get_dispatcher
+from bot.worker_pool import BotWorkerPool, get_bot_worker_pool
 
 __all__ = [
     'BotMessage',
@@ -41,4 +43,6 @@ __all__ = [
     'WebhookResponse',
     'CommandDispatcher',
     'get_dispatcher',
+    'BotWorkerPool',
+    'get_bot_worker_pool',
 ]
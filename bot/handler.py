@@ -7,14 +7,13 @@ Bot Webhook 处理器
 处理各平台的 Webhook 回调，分发到命令处理器。
 """
 
-import asyncio
 import json
 import logging
-import threading
 from typing import Dict, Optional, TYPE_CHECKING
 
-from bot.models import WebhookResponse
+from bot.models import BotMessage, WebhookResponse
 from bot.dispatcher import get_dispatcher
+from bot.worker_pool import submit_message
 from bot.platforms import ALL_PLATFORMS
 
 if TYPE_CHECKING:
@@ -49,6 +48,15 @@ def get_platform(platform_name: str) -> Optional['BotPlatform']:
     return _platform_instances[platform_name]
 
 
+def _submit_deferred(platform: 'BotPlatform', message: BotMessage) -> None:
+    """将延迟响应的命令交给工作池，结果通过平台 follow-up 接口发送"""
+    submit_message(
+        message,
+        lambda msg: get_dispatcher().dispatch(msg),
+        lambda response: platform.send_followup(response, message),
+    )
+
+
 def handle_webhook(
     platform_name: str,
     headers: Dict[str, str],
@@ -101,20 +109,10 @@ def handle_webhook(
         logger.info("[BotHandler] 返回验证响应")
         return immediate_response
 
-    # 延迟响应（如 Discord type 5）：立即返回 ACK，后台处理命令
+    # 延迟响应（如 Discord type 5）：立即返回 ACK，命令交给工作池处理
     if immediate_response and message:
         logger.info("[BotHandler] 返回延迟 ACK，后台处理命令")
-
-        def _deferred_dispatch() -> None:
-            try:
-                dispatcher = get_dispatcher()
-                response = dispatcher.dispatch(message)
-                if response.text:
-                    platform.send_followup(response, message)
-            except Exception as exc:
-                logger.error("[BotHandler] 延迟命令处理失败: %s", exc)
-
-        threading.Thread(target=_deferred_dispatch, daemon=True).start()
+        _submit_deferred(platform, message)
         return immediate_response
 
     # 如果没有消息需要处理，返回空响应
@@ -176,17 +174,7 @@ async def handle_webhook_async(
 
     if immediate_response and message:
         logger.info("[BotHandler] 返回延迟 ACK，后台处理命令 (async)")
-
-        async def _deferred_dispatch() -> None:
-            try:
-                dispatcher = get_dispatcher()
-                response = await dispatcher.dispatch_async(message)
-                if response.text:
-                    await asyncio.to_thread(platform.send_followup, response, message)
-            except Exception as exc:
-                logger.error("[BotHandler] 延迟命令处理失败: %s", exc)
-
-        asyncio.ensure_future(_deferred_dispatch())
+        _submit_deferred(platform, message)
         return immediate_response
 
     if not message:
@@ -19,6 +19,7 @@ pip install dingtalk-stream
 https://github.com/open-dingtalk/dingtalk-stream-sdk-python
 """
 
+import asyncio
 import logging
 import inspect
 import threading
@@ -39,6 +40,7 @@ except ImportError:
     logger.warning("[DingTalk Stream] 请运行: pip install dingtalk-stream")
 
 from bot.models import BotMessage, BotResponse, ChatType
+from bot.worker_pool import submit_message
 
 
 class DingtalkStreamHandler:
@@ -64,6 +66,13 @@ class DingtalkStreamHandler:
             return f"{cleaned[:max_len]}..."
         return cleaned
 
+    def _handle_queued_message(self, message: BotMessage) -> Optional[BotResponse]:
+        """在工作线程中执行消息回调，兼容返回协程的回调"""
+        response = self._on_message(message)
+        if inspect.isawaitable(response):
+            response = asyncio.run(response)
+        return response
+
     def _log_incoming_message(self, message: BotMessage) -> None:
         content = message.raw_content or message.content or ""
         summary = self._truncate_log_content(content)
@@ -86,7 +95,7 @@ class DingtalkStreamHandler:
                 self.logger = logger
 
             async def process(self, callback: dingtalk_stream.CallbackMessage):
-                """处理收到的消息"""
+                """处理收到的消息：入队后立即 ACK，命令在工作池中执行"""
                 try:
                     # 解析消息
                     incoming = dingtalk_stream.ChatbotMessage.from_dict(callback.data)
@@ -96,23 +105,12 @@ class DingtalkStreamHandler:
 
                     if bot_message:
                         self._parent._log_incoming_message(bot_message)
-                        # 调用消息处理回调
-                        response = self._parent._on_message(bot_message)
-                        if inspect.isawaitable(response):
-                            response = await response
-
-                        # 发送回复
-                        if response and response.text:
-                            # 构建 @用户 前缀（群聊场景下需要在文本中包含 @用户名）
-                            if response.at_user and incoming.sender_nick:
-                                if response.markdown:
-                                    self.reply_markdown(
-                                        title="股票分析助手",
-                                        text=f"@{incoming.sender_nick} " + response.text,
-                                        incoming_message=incoming
-                                    )
-                                else:
-                                    self.reply_text(response.text, incoming)
+                        # 不在 Stream 事件循环里等待命令结果，避免长命令阻塞后续消息
+                        submit_message(
+                            bot_message,
+                            self._parent._handle_queued_message,
+                            lambda response: self._send_reply(response, incoming),
+                        )
 
                     return AckMessage.STATUS_OK, 'OK'
 
@@ -121,6 +119,21 @@ class DingtalkStreamHandler:
                     self.logger.exception(e)
                     return AckMessage.STATUS_SYSTEM_EXCEPTION, str(e)
 
+            def _send_reply(self, response: BotResponse, incoming: Any) -> None:
+                """通过钉钉回复接口发送结果（在工作线程中调用）"""
+                text = response.text
+                # 群聊场景下需要在文本中包含 @用户名
+                if response.at_user and incoming.sender_nick:
+                    text = f"@{incoming.sender_nick} " + text
+                if response.markdown:
+                    self.reply_markdown(
+                        title="股票分析助手",
+                        text=text,
+                        incoming_message=incoming
+                    )
+                else:
+                    self.reply_text(text, incoming)
+
         def create_handler(self) -> '_ChatbotHandler':
             """创建 SDK 需要的处理器实例"""
             return self._ChatbotHandler(self)
@@ -235,12 +248,12 @@ class DingtalkStreamClient:
         self._running = False
 
     def _create_message_handler(self) -> Callable[[BotMessage], Any]:
-        """创建消息处理函数"""
+        """创建消息处理函数（在工作池线程中同步执行）"""
 
-        async def handle_message(message: BotMessage) -> BotResponse:
+        def handle_message(message: BotMessage) -> BotResponse:
             from bot.dispatcher import get_dispatcher
             dispatcher = get_dispatcher()
-            return await dispatcher.dispatch_async(message)
+            return dispatcher.dispatch(message)
 
         return handle_message
 
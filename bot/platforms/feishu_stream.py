@@ -24,8 +24,6 @@ https://open.feishu.cn/document/uAjLw4CM/ukTMukTMukTM/server-side-sdk/python--sd
 import json
 import logging
 import threading
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Callable
 import time
@@ -51,6 +49,7 @@ except ImportError:
     logger.warning("[Feishu Stream] 请运行: pip install lark-oapi")
 
 from bot.models import BotMessage, BotResponse, ChatType
+from bot.worker_pool import BotWorkerPool, submit_message
 from src.formatters import format_feishu_markdown, chunk_content_by_max_bytes
 from src.config import get_config
 
@@ -267,22 +266,22 @@ class FeishuStreamHandler:
     def __init__(
             self,
             on_message: Callable[[BotMessage], BotResponse],
-            reply_client: FeishuReplyClient
+            reply_client: FeishuReplyClient,
+            pool: Optional[BotWorkerPool] = None
     ):
         """
         Args:
             on_message: 消息处理回调函数，接收 BotMessage 返回 BotResponse
             reply_client: 飞书回复客户端
+            pool: 命令工作池，默认使用全局共享的有界工作池
         """
         self._on_message = on_message
         self._reply_client = reply_client
         self._logger = logger
-        # Different conversations can run in parallel, but one conversation
-        # must stay FIFO so multi-turn chat and replies do not get reordered.
-        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="feishu-msg")
-        self._pending_messages: dict[str, deque[BotMessage]] = {}
-        self._active_conversations: set[str] = set()
-        self._queue_lock = threading.Lock()
+        # Different conversations run in parallel on the shared bounded pool,
+        # but one conversation stays FIFO so multi-turn chat and replies do
+        # not get reordered.
+        self._pool = pool
         self._shutdown = False
 
     def _conversation_key(self, bot_message: BotMessage) -> str:
@@ -295,57 +294,31 @@ class FeishuStreamHandler:
         return f"{chat_id}:{user_id}"
 
     def _enqueue_message(self, bot_message: BotMessage) -> None:
-        """Queue a message and start a worker when its conversation is idle."""
+        """Queue a message on the worker pool; returns without waiting for the command."""
         if self._shutdown:
             self._logger.debug("[Feishu Stream] Handler already stopped, dropping message")
             return
 
-        conversation_key = self._conversation_key(bot_message)
-        should_start_worker = False
-
-        with self._queue_lock:
-            self._pending_messages.setdefault(conversation_key, deque()).append(bot_message)
-            if conversation_key not in self._active_conversations:
-                self._active_conversations.add(conversation_key)
-                should_start_worker = True
+        submit_message(
+            bot_message,
+            self._handle_queued_message,
+            lambda response: self._send_reply(bot_message, response),
+            pool=self._pool,
+            key=f"feishu:{self._conversation_key(bot_message)}",
+        )
 
-        if should_start_worker:
-            try:
-                self._executor.submit(self._drain_conversation, conversation_key)
-            except RuntimeError as exc:
-                with self._queue_lock:
-                    self._active_conversations.discard(conversation_key)
-                    self._pending_messages.pop(conversation_key, None)
-                self._logger.error("[Feishu Stream] 无法启动消息处理线程: %s", exc)
-
-    def _drain_conversation(self, conversation_key: str) -> None:
-        """Drain one conversation queue in FIFO order."""
-        while True:
-            with self._queue_lock:
-                queue = self._pending_messages.get(conversation_key)
-                if not queue:
-                    self._pending_messages.pop(conversation_key, None)
-                    self._active_conversations.discard(conversation_key)
-                    return
-                bot_message = queue.popleft()
-
-            self._process_message(bot_message)
-
-    def _process_message(self, bot_message: BotMessage) -> None:
-        """Execute command handling off the SDK callback thread."""
-        try:
-            response = self._on_message(bot_message)
-
-            if response and response.text:
-                self._reply_client.reply_text(
-                    message_id=bot_message.message_id,
-                    text=response.text,
-                    at_user=response.at_user,
-                    user_id=bot_message.user_id if response.at_user else None,
-                )
-        except Exception as e:
-            self._logger.error(f"[Feishu Stream] 异步处理消息失败: {e}")
-            self._logger.exception(e)
+    def _handle_queued_message(self, bot_message: BotMessage) -> Optional[BotResponse]:
+        if self._shutdown:
+            return None
+        return self._on_message(bot_message)
+
+    def _send_reply(self, bot_message: BotMessage, response: BotResponse) -> None:
+        self._reply_client.reply_text(
+            message_id=bot_message.message_id,
+            text=response.text,
+            at_user=response.at_user,
+            user_id=bot_message.user_id if response.at_user else None,
+        )
 
     @staticmethod
     def _truncate_log_content(text: str, max_len: int = 200) -> str:
@@ -513,12 +486,12 @@ class FeishuStreamHandler:
         return ' '.join(text.split())
 
     def shutdown(self, wait: bool = False) -> None:
-        """Stop accepting new messages and tear down worker threads."""
+        """Stop accepting new messages; queued ones are skipped when reached.
+
+        ``wait`` is kept for compatibility: the worker pool is shared and
+        outlives the handler.
+        """
         self._shutdown = True
-        with self._queue_lock:
-            self._pending_messages.clear()
-            self._active_conversations.clear()
-        self._executor.shutdown(wait=wait)
 
 
 class FeishuStreamClient:
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+机器人命令工作池
+===================================
+
+Stream / 延迟响应类平台（钉钉 Stream、飞书 Stream、Discord）收到消息后
+只负责入队并立即确认，命令在共享的有界线程池中执行，结果通过平台回复
+接口异步送达。
+
+调度规则：
+- 同一会话（平台 + 会话 + 用户）串行、FIFO，多轮对话不会乱序
+- 不同用户之间轮转：每个工作线程执行一个用户的一条命令后换下一个用户，
+  某个用户排队的重命令不会饿死其他用户
+- 排队总数或单用户待处理数超限时直接拒绝（降载），由调用方回复繁忙提示
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from bot.models import BotMessage, BotResponse, ChatType
+
+logger = logging.getLogger(__name__)
+
+BUSY_TEXT = "当前请求较多，请稍后再试"
+QUEUED_TEXT = "已收到，前面还有任务在处理，完成后会回复你"
+
+_DEFAULT_MAX_WORKERS = 4
+_DEFAULT_MAX_PENDING = 50
+_DEFAULT_MAX_PENDING_PER_USER = 3
+
+
+class Admission(str, Enum):
+    """提交结果"""
+    STARTED = "started"    # 已有空闲线程，立即执行
+    FOLLOWS = "follows"    # 排在本会话前序命令之后
+    QUEUED = "queued"      # 已入队，等待空闲线程
+    REJECTED = "rejected"  # 工作池饱和，已丢弃
+
+
+def conversation_key(message: BotMessage) -> str:
+    """会话排队键：私聊按会话，群聊按会话内的用户。"""
+    if message.chat_type == ChatType.PRIVATE:
+        key = message.chat_id or message.user_id or message.message_id
+    else:
+        key = f"{message.chat_id or 'unknown-chat'}:{message.user_id or 'unknown-user'}"
+    return f"{message.platform}:{key}"
+
+
+class BotWorkerPool:
+    """
+    有界、按用户公平调度的命令工作池
+
+    Args:
+        max_workers: 同时执行的命令数
+        max_pending: 所有用户排队（未开始）命令总数上限
+        max_pending_per_user: 单个会话未完成（排队 + 执行中）命令数上限
+    """
+
+    def __init__(
+        self,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        max_pending: int = _DEFAULT_MAX_PENDING,
+        max_pending_per_user: int = _DEFAULT_MAX_PENDING_PER_USER,
+        thread_name_prefix: str = "bot-worker",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+        self.max_pending_per_user = max(1, max_pending_per_user)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[Callable[[], Any]]] = {}
+        # Keys with queued jobs and no job running, in round-robin order
+        self._ready: Deque[str] = deque()
+        self._running: Set[str] = set()
+        self._pending = 0
+        self._workers = 0
+        # Workers spawned for a STARTED job that have not picked it up yet
+        self._claims = 0
+        self._shutdown = False
+        self._stats = {
+            "started": 0, "follows": 0, "queued": 0, "rejected": 0, "completed": 0, "failed": 0,
+        }
+
+    def submit(self, key: str, job: Callable[[], Any]) -> Admission:
+        """提交一个命令任务，立即返回，不等待执行。"""
+        with self._lock:
+            if self._shutdown:
+                self._stats["rejected"] += 1
+                return Admission.REJECTED
+            queue = self._queues.get(key)
+            outstanding = (len(queue) if queue else 0) + (1 if key in self._running else 0)
+            waiting = self._pending - self._claims
+            if outstanding >= self.max_pending_per_user or waiting >= self.max_pending + self._idle_workers():
+                self._stats["rejected"] += 1
+                logger.warning(
+                    "[BotWorkerPool] 拒绝 %s 的请求 (waiting=%d, user_outstanding=%d)",
+                    key, waiting, outstanding,
+                )
+                return Admission.REJECTED
+
+            if queue is None:
+                queue = self._queues[key] = deque()
+            queue.append(job)
+            self._pending += 1
+            admission = Admission.FOLLOWS
+            if key not in self._running and len(queue) == 1:
+                self._ready.append(key)
+                admission = Admission.QUEUED
+                if self._workers < self.max_workers:
+                    self._workers += 1
+                    self._claims += 1
+                    self._executor.submit(self._work)
+                    admission = Admission.STARTED
+            self._stats[admission.value] += 1
+            return admission
+
+    def _idle_workers(self) -> int:
+        return self.max_workers - self._workers
+
+    def _work(self) -> None:
+        claimed = False
+        while True:
+            with self._lock:
+                if not claimed:
+                    claimed = True
+                    self._claims -= 1
+                if not self._ready:
+                    self._workers -= 1
+                    return
+                key = self._ready.popleft()
+                job = self._queues[key].popleft()
+                self._pending -= 1
+                self._running.add(key)
+
+            try:
+                job()
+                outcome = "completed"
+            except Exception as exc:
+                outcome = "failed"
+                logger.error("[BotWorkerPool] 任务执行失败 (%s): %s", key, exc)
+                logger.exception(exc)
+
+            with self._lock:
+                self._stats[outcome] += 1
+                self._running.discard(key)
+                if self._queues.get(key):
+                    # Back of the line: other users get a turn first
+                    self._ready.append(key)
+                else:
+                    self._queues.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": self._pending,
+                "running": len(self._running),
+                "workers": self._workers,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """停止接收新任务并丢弃排队任务。"""
+        with self._lock:
+            self._shutdown = True
+            self._queues.clear()
+            self._ready.clear()
+            self._pending = 0
+            self._claims = 0
+        self._executor.shutdown(wait=wait)
+
+
+def submit_message(
+    message: BotMessage,
+    handler: Callable[[BotMessage], Optional[BotResponse]],
+    deliver: Callable[[BotResponse], Any],
+    pool: Optional[BotWorkerPool] = None,
+    key: Optional[str] = None,
+) -> Admission:
+    """在工作池中处理一条消息，并通过 ``deliver`` 异步回复结果。
+
+    需要等待空闲线程时先回复排队提示，饱和时回复繁忙提示；排在本会话
+    前序命令之后的消息不额外提示。
+    """
+    pool = pool or get_bot_worker_pool()
+
+    def _job() -> None:
+        response = handler(message)
+        if response and response.text:
+            deliver(response)
+
+    admission = pool.submit(key or conversation_key(message), _job)
+    notice = None
+    if admission == Admission.REJECTED:
+        notice = BotResponse.error_response(BUSY_TEXT)
+    elif admission == Admission.QUEUED:
+        notice = BotResponse.text_response(QUEUED_TEXT)
+    if notice is not None:
+        try:
+            deliver(notice)
+        except Exception as exc:
+            logger.warning("[BotWorkerPool] 发送排队提示失败: %s", exc)
+    return admission
+
+
+# 全局工作池实例
+_pool: Optional[BotWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_bot_worker_pool() -> BotWorkerPool:
+    """获取全局工作池（首次调用时按配置创建）。"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from src.config import get_config
+
+                config = get_config()
+                _pool = BotWorkerPool(
+                    max_workers=config.bot_max_workers,
+                    max_pending=config.bot_max_pending,
+                    max_pending_per_user=config.bot_max_pending_per_user,
+                )
+    return _pool
+
+
+def reset_bot_worker_pool() -> None:
+    """重置全局工作池（主要用于测试）"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
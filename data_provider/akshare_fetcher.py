@@ -1625,11 +1625,22 @@ class AkshareFetcher(BaseFetcher):
         获取市场涨跌统计
 
         数据源优先级：
+        0. 实时行情缓存中的东财全市场快照（与个股实时行情共用）
         1. 东财接口 (ak.stock_zh_a_spot_em)
         2. 新浪接口 (ak.stock_zh_a_spot)
         """
         import akshare as ak
 
+        # 优先复用实时行情缓存中的东财全市场快照：个股流水线预取过行情时，
+        # 大盘复盘无需再次全量下载
+        current_time = time.time()
+        cached_df = _realtime_cache['data']
+        if (cached_df is not None and not cached_df.empty and
+                current_time - _realtime_cache['timestamp'] < _realtime_cache['ttl']):
+            cache_age = int(current_time - _realtime_cache['timestamp'])
+            logger.info(f"[缓存命中] 复用A股实时行情快照计算市场统计 - 缓存年龄 {cache_age}s")
+            return self._calc_market_stats(cached_df)
+
         # 优先东财接口
         try:
             self._set_random_user_agent()
@@ -1638,6 +1649,9 @@ class AkshareFetcher(BaseFetcher):
             logger.info("[API调用] ak.stock_zh_a_spot_em() 获取市场统计...")
             df = ak.stock_zh_a_spot_em()
             if df is not None and not df.empty:
+                # 回填实时行情缓存，后续个股实时行情直接命中同一份快照
+                _realtime_cache['data'] = df
+                _realtime_cache['timestamp'] = current_time
                 return self._calc_market_stats(df)
         except Exception as e:
             logger.warning(f"[Akshare] 东财接口获取市场统计失败: {e}，尝试新浪接口")
@@ -17,7 +17,7 @@
 import logging
 import random
 import time
-from threading import BoundedSemaphore, RLock, Thread
+from threading import RLock
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Callable, Optional, List, Tuple, Dict, Any
@@ -27,6 +27,8 @@ import numpy as np
 from src.data.stock_index_loader import get_index_stock_name
 from src.data.stock_mapping import STOCK_NAME_MAP, is_meaningful_stock_name
 from .fundamental_adapter import AkshareFundamentalAdapter
+from .fundamental_store import FundamentalStore
+from .timeout_executor import TimeoutExecutor, current_cancel_token, get_timeout_executor
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -515,14 +517,15 @@ class DataFetcherManager:
         else:
             # 默认数据源将在首次使用时延迟加载
             self._init_default_fetchers()
-        self._fundamental_adapter = AkshareFundamentalAdapter()
+        # 基本面数据集落库复用：全市场表每个报告期只下载一次，跨进程 / 跨股票按代码查表
+        self._fundamental_adapter = AkshareFundamentalAdapter(store=FundamentalStore())
         self._tickflow_fetcher = None
         self._tickflow_api_key: Optional[str] = None
         self._tickflow_lock = RLock()
         self._fundamental_cache: Dict[str, Dict[str, Any]] = {}
         self._fundamental_cache_lock = RLock()
-        self._fundamental_timeout_worker_limit = 8
-        self._fundamental_timeout_slots = BoundedSemaphore(self._fundamental_timeout_worker_limit)
+        # 超时保护调用默认走进程级共享执行器（首次使用时创建）
+        self._timeout_executor: Optional[TimeoutExecutor] = None
 
     def _ensure_concurrency_guards(self) -> None:
         """Lazily initialize thread-safety primitives for test scaffolds using __new__."""
@@ -1798,47 +1801,16 @@ class DataFetcherManager:
         task_name: str,
     ) -> Tuple[Optional[Any], Optional[str], int]:
         """
-        Execute a task in a short-lived thread and enforce a timeout.
+        Execute a task on the shared timeout executor and enforce a timeout.
+
+        On timeout the task's cancel token is set; fetchers check
+        ``current_cancel_token()`` before moving on to the next source.
 
         Returns:
             (result, error, duration_ms)
         """
-        start = time.time()
-        timeout_value = max(0.0, timeout_seconds)
-        if timeout_value <= 0:
-            return None, f"{task_name} timeout", 0
-        result_holder: Dict[str, Any] = {}
-        error_holder: Dict[str, Exception] = {}
-
-        if not self._fundamental_timeout_slots.acquire(blocking=False):
-            return None, f"{task_name} timeout worker pool exhausted", int(timeout_value * 1000)
-
-        def runner() -> None:
-            try:
-                result_holder["value"] = task()
-            except Exception as exc:
-                error_holder["value"] = exc
-            finally:
-                try:
-                    self._fundamental_timeout_slots.release()
-                except ValueError:
-                    pass
-
-        worker = Thread(target=runner, daemon=True, name=f"fundamental-{task_name}")
-        try:
-            worker.start()
-        except Exception as exc:
-            try:
-                self._fundamental_timeout_slots.release()
-            except ValueError:
-                pass
-            return None, str(exc), int((time.time() - start) * 1000)
-        worker.join(timeout=timeout_value)
-        if worker.is_alive():
-            return None, f"{task_name} timeout", int(timeout_value * 1000)
-        if "value" in error_holder:
-            return None, str(error_holder["value"]), int((time.time() - start) * 1000)
-        return result_holder.get("value"), None, int((time.time() - start) * 1000)
+        executor = getattr(self, "_timeout_executor", None) or get_timeout_executor()
+        return executor.run(task, timeout_seconds, task_name)
 
     def _run_with_retry(
         self,
@@ -2571,9 +2543,14 @@ class DataFetcherManager:
             last_error = ""
 
             # 直接遍历管理器已经按 priority 排好序的数据源列表
+            cancel_token = current_cancel_token()
             for fetcher in self._fetchers:
                 if not hasattr(fetcher, 'get_sector_rankings'):
                     continue
+                if cancel_token is not None and cancel_token.cancelled:
+                    # 所属超时任务已放弃等待，不再尝试后续数据源
+                    last_error = last_error or "sector rankings cancelled"
+                    break
 
                 start = time.time()
                 try:
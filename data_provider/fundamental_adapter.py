@@ -15,6 +15,9 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from data_provider.fundamental_store import FundamentalStore
+from data_provider.timeout_executor import current_cancel_token
+
 logger = logging.getLogger(__name__)
 
 _DIVIDEND_KEYWORD_MAP: Dict[str, List[str]] = {
@@ -261,27 +264,55 @@ def _extract_latest_row(df: pd.DataFrame, stock_code: str) -> Optional[pd.Series
     return df.iloc[0]
 
 
+def _as_frame(df: Any) -> Any:
+    if isinstance(df, pd.Series):
+        return df.to_frame().T
+    return df
+
+
 class AkshareFundamentalAdapter:
     """AkShare adapter for fundamentals, capital flow and dragon-tiger signals."""
 
+    def __init__(self, store: Optional[FundamentalStore] = None):
+        # Fundamental bundle datasets go through the persistent store when set
+        self._store = store
+
     def _call_df_candidates(
         self,
         candidates: List[Tuple[str, Dict[str, Any]]],
+        stock_code: Optional[str] = None,
     ) -> Tuple[Optional[pd.DataFrame], Optional[str], List[str]]:
+        """
+        Return the first non-empty candidate result.
+
+        With ``stock_code`` and a store, results come from / go to the
+        persistent store and market-wide tables are narrowed to the stock's rows.
+        """
         errors: List[str] = []
+        store = self._store if stock_code else None
         try:
             import akshare as ak
         except Exception as exc:
-            return None, None, [f"import_akshare:{type(exc).__name__}"]
+            if store is None:
+                return None, None, [f"import_akshare:{type(exc).__name__}"]
+            ak = None
+            errors.append(f"import_akshare:{type(exc).__name__}")
 
+        cancel_token = current_cancel_token()
         for func_name, kwargs in candidates:
-            fn = getattr(ak, func_name, None)
-            if fn is None:
+            if cancel_token is not None and cancel_token.cancelled:
+                # The timeout-guarded caller gave up; stop probing endpoints
+                errors.append("cancelled")
+                break
+            fn = getattr(ak, func_name, None) if ak is not None else None
+            if fn is None and store is None:
                 continue
             try:
-                df = fn(**kwargs)
-                if isinstance(df, pd.Series):
-                    df = df.to_frame().T
+                if store is not None:
+                    loader = (lambda fn=fn, kwargs=kwargs: _as_frame(fn(**kwargs))) if fn else None
+                    df = store.get_or_fetch(func_name, kwargs, stock_code, loader)
+                else:
+                    df = _as_frame(fn(**kwargs))
                 if isinstance(df, pd.DataFrame) and not df.empty:
                     return df, func_name, errors
             except Exception as exc:
@@ -307,7 +338,7 @@ class AkshareFundamentalAdapter:
             ("stock_financial_abstract", {"symbol": stock_code}),
             ("stock_financial_analysis_indicator", {"symbol": stock_code}),
             ("stock_financial_analysis_indicator", {}),
-        ])
+        ], stock_code)
         result["errors"].extend(fin_errors)
         if fin_df is not None:
             row = _extract_latest_row(fin_df, stock_code)
@@ -345,7 +376,7 @@ class AkshareFundamentalAdapter:
             ("stock_yjyg_em", {}),
             ("stock_yjbb_em", {"symbol": stock_code}),
             ("stock_yjbb_em", {}),
-        ])
+        ], stock_code)
         result["errors"].extend(forecast_errors)
         if forecast_df is not None:
             row = _extract_latest_row(forecast_df, stock_code)
@@ -359,7 +390,7 @@ class AkshareFundamentalAdapter:
         quick_df, quick_source, quick_errors = self._call_df_candidates([
             ("stock_yjkb_em", {"symbol": stock_code}),
             ("stock_yjkb_em", {}),
-        ])
+        ], stock_code)
         result["errors"].extend(quick_errors)
         if quick_df is not None:
             row = _extract_latest_row(quick_df, stock_code)
@@ -374,7 +405,7 @@ class AkshareFundamentalAdapter:
             ("stock_fhps_detail_em", {"symbol": stock_code}),
             ("stock_history_dividend_detail", {"symbol": stock_code, "indicator": "分红", "date": ""}),
             ("stock_dividend_cninfo", {"symbol": stock_code}),
-        ])
+        ], stock_code)
         result["errors"].extend(dividend_errors)
         if dividend_df is not None:
             dividend_payload = _build_dividend_payload(dividend_df, stock_code, max_events=5)
@@ -386,7 +417,7 @@ class AkshareFundamentalAdapter:
         inst_df, inst_source, inst_errors = self._call_df_candidates([
             ("stock_institute_hold", {}),
             ("stock_institute_recommend", {}),
-        ])
+        ], stock_code)
         result["errors"].extend(inst_errors)
         if inst_df is not None:
             row = _extract_latest_row(inst_df, stock_code)
@@ -400,7 +431,7 @@ class AkshareFundamentalAdapter:
             ("stock_gdfx_top_10_em", {}),
             ("stock_zh_a_gdhs_detail_em", {"symbol": stock_code}),
             ("stock_zh_a_gdhs_detail_em", {}),
-        ])
+        ], stock_code)
         result["errors"].extend(top10_errors)
         if top10_df is not None:
             row = _extract_latest_row(top10_df, stock_code)
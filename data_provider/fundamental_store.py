@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent fundamental dataset store (fail-open).
+
+AkShare fundamental endpoints come in two shapes: per-stock calls
+(``symbol=...``) and market-wide tables whose full result used to be thrown
+away after one row was picked out. This store keeps both in the local
+database keyed by dataset and report period:
+
+- market-wide tables are downloaded once per period, split by stock code and
+  stored row-per-code, so a whole watchlist costs one download plus lookups
+- per-stock results are stored under their code; empty ones are not stored
+
+Entries expire after ``FUNDAMENTAL_STORE_TTL_HOURS`` so disclosures that land
+later in the same period are picked up. Concurrent callers asking for the same
+market-wide table wait for one download instead of starting their own.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARKET_WIDE_MARKER = "*"
+
+# kwargs naming the stock in per-stock AkShare calls
+_STOCK_KWARGS = ("symbol", "stock")
+_CODE_COLUMN_KEYWORDS = ("代码", "股票代码", "证券代码", "ts_code", "symbol")
+
+_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def report_period(today: Optional[date] = None) -> str:
+    """Latest quarter end on or before ``today``, e.g. ``2026-09-30``."""
+    today = today or date.today()
+    quarter_ends = [(3, 31), (6, 30), (9, 30), (12, 31)]
+    for month, day in reversed(quarter_ends):
+        if (today.month, today.day) >= (month, day):
+            return date(today.year, month, day).isoformat()
+    return date(today.year - 1, 12, 31).isoformat()
+
+
+def _code_column(df: pd.DataFrame) -> Optional[Any]:
+    return next(
+        (col for col in df.columns if any(k in str(col) for k in _CODE_COLUMN_KEYWORDS)),
+        None,
+    )
+
+
+def _dataset_key(func_name: str, kwargs: Dict[str, Any], stock_code: str) -> Tuple[str, bool]:
+    """Return (dataset id, is_market_wide) for one AkShare call."""
+    market_wide = not any(kwargs.get(name) == stock_code for name in _STOCK_KWARGS)
+    extra = sorted(
+        (name, str(value)) for name, value in kwargs.items()
+        if market_wide or name not in _STOCK_KWARGS
+    )
+    if not extra:
+        return func_name, market_wide
+    return func_name + "|" + ",".join(f"{name}={value}" for name, value in extra), market_wide
+
+
+def _lock_for(dataset: str, period: str, scope: str) -> threading.Lock:
+    key = (dataset, period, scope)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _to_records(df: pd.DataFrame) -> list:
+    if df.empty:
+        return []
+    return json.loads(df.to_json(orient="records", date_format="iso", force_ascii=False))
+
+
+class FundamentalStore:
+    """
+    Dataset/period keyed fundamental cache backed by ``DatabaseManager``.
+
+    Args:
+        ttl_seconds: entry lifetime; ``None`` reads ``FUNDAMENTAL_STORE_TTL_HOURS``
+            on each call, ``0`` disables the store
+        db: database manager; defaults to ``get_db()`` on first use
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, db: Any = None):
+        self._ttl_seconds = ttl_seconds
+        self._db = db
+
+    def _ttl(self) -> int:
+        if self._ttl_seconds is not None:
+            return max(0, int(self._ttl_seconds))
+        try:
+            from src.config import get_config
+
+            hours = getattr(get_config(), "fundamental_store_ttl_hours", 0)
+        except Exception:
+            return 0
+        if not isinstance(hours, int) or isinstance(hours, bool):
+            return 0
+        return max(0, hours) * 3600
+
+    def _get_db(self) -> Any:
+        if self._db is None:
+            from src.storage import get_db
+
+            self._db = get_db()
+        return self._db
+
+    def get_or_fetch(
+        self,
+        func_name: str,
+        kwargs: Dict[str, Any],
+        stock_code: str,
+        loader: Optional[Callable[[], Optional[pd.DataFrame]]],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return ``stock_code``'s rows of one AkShare dataset.
+
+        Served from the store when fresh; otherwise ``loader`` downloads the
+        dataset (the whole table for market-wide calls), which is stored and
+        then filtered. Returns None when nothing is stored and there is no
+        loader or it returned nothing. Loader exceptions propagate.
+        """
+        from data_provider.fundamental_adapter import _normalize_code
+
+        ttl = self._ttl()
+        if ttl <= 0:
+            return loader() if loader is not None else None
+
+        code = _normalize_code(stock_code)
+        dataset, market_wide = _dataset_key(func_name, kwargs, stock_code)
+        period = report_period()
+        with _lock_for(dataset, period, MARKET_WIDE_MARKER if market_wide else code):
+            cached = self._lookup(dataset, period, code, market_wide, ttl)
+            if cached is not None or loader is None:
+                return cached
+            df = loader()
+            if not isinstance(df, pd.DataFrame):
+                return None
+            return self._save(dataset, period, code, market_wide, df)
+
+    def _lookup(
+        self, dataset: str, period: str, code: str, market_wide: bool, ttl: int
+    ) -> Optional[pd.DataFrame]:
+        keys = [code, MARKET_WIDE_MARKER] if market_wide else [code]
+        try:
+            stored = self._get_db().get_fundamental_dataset(dataset, period, keys)
+        except Exception as exc:
+            logger.debug("[FundamentalStore] 读取 %s 失败（fail-open）: %s", dataset, exc)
+            return None
+
+        now = datetime.now()
+        head = stored.get(MARKET_WIDE_MARKER if market_wide else code)
+        if head is None or (now - head[1]).total_seconds() > ttl:
+            return None
+        columns = head[0] if market_wide else None
+        records = stored.get(code, ([], None))[0]
+        return pd.DataFrame.from_records(records, columns=columns)
+
+    def _save(
+        self, dataset: str, period: str, code: str, market_wide: bool, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        columns = [str(col) for col in df.columns]
+        records = _to_records(df)
+        if not market_wide:
+            if not records:
+                # An empty answer is often a transient upstream gap; storing
+                # it would hide the endpoint's data until the TTL runs out
+                return df
+            payloads: Dict[str, Any] = {code: records}
+            rows = records
+        else:
+            code_col = _code_column(df)
+            if code_col is None:
+                # Cannot be indexed by code; hand back as-is without storing
+                return df
+            from data_provider.fundamental_adapter import _normalize_code
+
+            payloads = {}
+            for row_code, record in zip(df[code_col].astype(str).map(_normalize_code), records):
+                payloads.setdefault(row_code, []).append(record)
+            rows = payloads.get(code, [])
+            payloads[MARKET_WIDE_MARKER] = columns
+
+        try:
+            self._get_db().save_fundamental_dataset(dataset, period, payloads, replace=market_wide)
+            if market_wide:
+                logger.info(
+                    "[FundamentalStore] 已缓存全市场数据集 %s（%s，%d 只股票）",
+                    dataset, period, len(payloads) - 1,
+                )
+        except Exception as exc:
+            logger.warning("[FundamentalStore] 写入 %s 失败（fail-open）: %s", dataset, exc)
+        return pd.DataFrame.from_records(rows, columns=columns)
@@ -359,6 +359,23 @@ class CircuitBreaker:
 
             return True
     
+    def peek_state(self, source: str) -> str:
+        """
+        只读查询数据源状态，不触发状态迁移、不占用半开探测名额
+
+        冷却已到期的 OPEN 视为 HALF_OPEN（下一次 is_available 会放行）。
+        """
+        with self._lock:
+            state = self._states.get(source)
+            if state is None:
+                return self.CLOSED
+            if (
+                state['state'] == self.OPEN
+                and time.time() - state['last_failure_time'] >= self.cooldown_seconds
+            ):
+                return self.HALF_OPEN
+            return state['state']
+
     def record_inconclusive(self, source: str) -> None:
         """记录不确定的探测结果（如返回 None）。
 
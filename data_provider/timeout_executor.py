@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+超时保护任务执行器
+===================================
+
+基本面各块（估值、财务包、资金流、龙虎榜、板块）的超时保护调用共用一个
+进程级、固定大小的线程池，取代原先“每个任务新建一个线程 + 信号量限流”：
+
+- 线程复用，不再为每次调用创建 / 销毁线程
+- 在途任务（排队 + 执行中）超过上限时直接拒绝，不再无限堆积
+- 超时后向任务发出协作式取消信号；尚未开始的任务直接撤销，已在执行的
+  任务由数据源在下一个检查点（如切换候选接口前）自行退出
+- 超时仍在运行的任务计为“遗弃”，连同队列深度等指标可通过 stats() 查看
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_WORKERS = 8
+_DEFAULT_MAX_QUEUE = 16
+
+
+class TaskCancelled(Exception):
+    """任务已因超时被取消。"""
+
+
+class CancelToken:
+    """协作式取消信号，由执行器在任务超时时触发。"""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._finished = False
+        self._abandoned = False
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TaskCancelled("task cancelled after timeout")
+
+
+_local = threading.local()
+
+
+def current_cancel_token() -> Optional[CancelToken]:
+    """当前线程正在执行的任务的取消信号；不在执行器内时返回 None。"""
+    return getattr(_local, "token", None)
+
+
+class TimeoutExecutor:
+    """
+    固定大小、带超时与协作取消的任务执行器
+
+    Args:
+        max_workers: 工作线程数
+        max_queue: 等待空闲线程的任务数上限，超出时拒绝新任务
+    """
+
+    def __init__(
+        self,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        max_queue: int = _DEFAULT_MAX_QUEUE,
+        thread_name_prefix: str = "fundamental",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._abandoned = 0
+        self._stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "abandoned_total": 0,
+            "peak_queued": 0,
+        }
+
+    def run(
+        self,
+        task: Callable[[], Any],
+        timeout_seconds: float,
+        task_name: str,
+    ) -> Tuple[Optional[Any], Optional[str], int]:
+        """
+        在工作池中执行任务并等待至多 ``timeout_seconds``（含排队时间）。
+
+        Returns:
+            (result, error, duration_ms)
+        """
+        start = time.time()
+        timeout_value = max(0.0, timeout_seconds)
+        if timeout_value <= 0:
+            return None, f"{task_name} timeout", 0
+
+        token = CancelToken()
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                return None, f"{task_name} timeout worker pool exhausted", int(timeout_value * 1000)
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["peak_queued"] = max(self._stats["peak_queued"], self._queued)
+
+        try:
+            future = self._executor.submit(self._invoke, task, token)
+        except Exception as exc:
+            with self._lock:
+                self._queued -= 1
+            return None, str(exc), int((time.time() - start) * 1000)
+
+        try:
+            result = future.result(timeout=timeout_value)
+        except (FuturesTimeoutError, CancelledError):
+            token.cancel()
+            self._on_timeout(future, token, task_name)
+            return None, f"{task_name} timeout", int(timeout_value * 1000)
+        except Exception as exc:
+            return None, str(exc), int((time.time() - start) * 1000)
+        return result, None, int((time.time() - start) * 1000)
+
+    def _on_timeout(self, future: Any, token: CancelToken, task_name: str) -> None:
+        with self._lock:
+            self._stats["timed_out"] += 1
+            if future.cancel():
+                # Never started: dropped from the queue
+                self._queued -= 1
+                self._stats["cancelled"] += 1
+                return
+            if token._finished:
+                return
+            token._abandoned = True
+            self._abandoned += 1
+            self._stats["abandoned_total"] += 1
+            abandoned = self._abandoned
+        logger.debug("[超时执行器] %s 超时，任务仍在运行（当前遗弃 %d 个）", task_name, abandoned)
+
+    def _invoke(self, task: Callable[[], Any], token: CancelToken) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        _local.token = token
+        failed = False
+        try:
+            token.raise_if_cancelled()
+            return task()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _local.token = None
+            with self._lock:
+                self._running -= 1
+                token._finished = True
+                if token._abandoned:
+                    self._abandoned -= 1
+                self._stats["failed" if failed else "completed"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "queued": self._queued,
+                "running": self._running,
+                "abandoned": self._abandoned,
+                "workers": self.max_workers,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """停止接收新任务，并撤销尚未开始的任务。"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[TimeoutExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_timeout_executor() -> TimeoutExecutor:
+    """获取全局执行器（首次调用时按配置创建）。"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from src.config import get_config
+
+                workers = getattr(get_config(), "fundamental_timeout_workers", _DEFAULT_MAX_WORKERS)
+                _executor = TimeoutExecutor(max_workers=workers, max_queue=max(1, workers) * 2)
+    return _executor
+
+
+def reset_timeout_executor() -> None:
+    """重置全局执行器（主要用于测试）"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
@@ -44,10 +44,12 @@ if os.getenv("GITHUB_ACTIONS") != "true" and os.getenv("USE_PROXY", "false").low
     os.environ["https_proxy"] = proxy_url
 
 import argparse
+import contextvars
 import logging
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
 from data_provider.base import canonical_stock_code
@@ -234,6 +236,7 @@ def parse_arguments() -> argparse.Namespace:
   python main.py --single-notify    # 启用单股推送模式（每分析完一只立即推送）
   python main.py --schedule         # 启用定时任务模式
   python main.py --market-review    # 仅运行大盘复盘
+  python main.py --screen           # 按策略 screen 规则预筛本地已缓存日线的股票，仅分析命中股票
         '''
     )
 
@@ -348,6 +351,14 @@ def parse_arguments() -> argparse.Namespace:
         help='FastAPI 服务监听地址（默认 0.0.0.0）'
     )
 
+    parser.add_argument(
+        '--screen',
+        nargs='?',
+        const='all',
+        default=None,
+        help='先用策略 screen 规则对本地数据库已缓存日线的股票做预筛，仅分析命中的股票（可指定逗号分隔的策略名，默认全部）'
+    )
+
     parser.add_argument(
         '--no-context-snapshot',
         action='store_true',
@@ -426,6 +437,77 @@ def _compute_trading_day_filter(
     return (filtered_codes, effective_region, should_skip_all)
 
 
+def _filter_codes_for_market(stock_codes: List[str], market: str) -> List[str]:
+    """Codes traded on ``market``; unrecognized codes go with the A-share run."""
+    from src.core.trading_calendar import get_market_for_stock
+
+    return [code for code in stock_codes if (get_market_for_stock(code) or 'cn') == market]
+
+
+def _restrict_review_region(
+    config: Config, effective_region: Optional[str], market: str
+) -> str:
+    """Narrow the market review region to ``market`` for a per-market run ('' = no review)."""
+    region = effective_region
+    if region is None:
+        region = getattr(config, 'market_review_region', 'cn') or 'cn'
+    regions = {'cn', 'hk', 'us'} if region == 'both' else set(region.split(','))
+    return market if market in regions else ''
+
+
+def _apply_skill_prescreen(
+    config: Config,
+    selection: str,
+    stock_codes: Optional[List[str]],
+    market: Optional[str] = None,
+) -> List[str]:
+    """
+    Screen cached daily bars with the skills' ``screen:`` rules.
+
+    The universe is ``stock_codes`` when given (--stocks), otherwise every
+    stock that already has bars in the local ``stock_daily`` table -- codes
+    never fetched are not screened. The screen runs before this run's data
+    refresh, so it warns when the newest cached bar lags the latest completed
+    session. Returns the codes matched by any skill.
+    """
+    from src.agent.factory import get_skill_manager
+    from src.agent.skills.screener import screen_skills
+    from src.core.trading_calendar import get_effective_trading_date, get_market_for_stock
+
+    skills = get_skill_manager(config).list_skills()
+    if selection and selection != 'all':
+        wanted = {name.strip() for name in selection.split(',') if name.strip()}
+        skills = [skill for skill in skills if skill.name in wanted]
+
+    result, screens = screen_skills(skills, codes=stock_codes)
+    if not screens:
+        logger.warning("预筛选：所选策略均未定义 screen 规则，跳过个股分析")
+        return []
+    for code in result.codes:
+        logger.info("预筛选命中 %s: %s", code, ", ".join(result.skills_for(code)))
+    logger.info(
+        "预筛选完成：%d 只股票中命中 %d 只（数据截至 %s）",
+        result.universe_size, len(result.codes), result.as_of,
+    )
+
+    if market:
+        markets = {market}
+    elif stock_codes:
+        markets = {get_market_for_stock(code) or 'cn' for code in stock_codes}
+    else:
+        markets = {'cn'}
+    expected = max(get_effective_trading_date(m) for m in markets)
+    if result.as_of is None:
+        logger.warning("预筛选：本地数据库没有可用日线缓存，请先运行一次不带 --screen 的分析拉取数据")
+    elif result.as_of < expected:
+        logger.warning(
+            "预筛选使用的日线截至 %s，落后于最近交易日 %s：本次分析尚未刷新数据，"
+            "结果基于旧行情，请先刷新日线缓存后再筛选",
+            result.as_of, expected,
+        )
+    return result.codes
+
+
 def _run_market_review_with_shared_lock(
     config: Config,
     run_market_review_func: Callable[..., Optional[str]],
@@ -450,12 +532,18 @@ def _run_market_review_with_shared_lock(
 def run_full_analysis(
     config: Config,
     args: argparse.Namespace,
-    stock_codes: Optional[List[str]] = None
+    stock_codes: Optional[List[str]] = None,
+    market: Optional[str] = None,
+    fetcher_manager: Optional[Any] = None,
 ):
     """
     执行完整的分析流程（个股 + 大盘复盘）
 
     这是定时任务调用的主函数
+
+    Args:
+        market: 按市场调度时只分析该市场（'cn' / 'hk' / 'us'）的股票与大盘复盘
+        fetcher_manager: 复用的数据源管理器（定时预热后沿用其缓存）
     """
     # Import pipeline modules outside the broad try/except so that import-time
     # failures propagate to the caller instead of being silently swallowed.
@@ -467,8 +555,14 @@ def run_full_analysis(
         if stock_codes is None:
             config.refresh_stock_list()
 
+        # 策略预筛选：只把规则命中的股票交给 AI 分析
+        if getattr(args, 'screen', None):
+            stock_codes = _apply_skill_prescreen(config, args.screen, stock_codes, market=market)
+
         # Issue #373: Trading day filter (per-stock, per-market)
         effective_codes = stock_codes if stock_codes is not None else config.stock_list
+        if market:
+            effective_codes = _filter_codes_for_market(effective_codes, market)
         filtered_codes, effective_region, should_skip = _compute_trading_day_filter(
             config, args, effective_codes
         )
@@ -477,6 +571,12 @@ def run_full_analysis(
                 "今日所有相关市场均为非交易日，跳过执行。可使用 --force-run 强制执行。"
             )
             return
+        if market:
+            effective_region = _restrict_review_region(config, effective_region, market)
+            review_wanted = config.market_review_enabled and not getattr(args, 'no_market_review', False)
+            if not filtered_codes and not (review_wanted and effective_region):
+                logger.info("[%s] 无自选股且未配置该市场大盘复盘，跳过本次执行", market)
+                return
         if set(filtered_codes) != set(effective_codes):
             skipped = set(effective_codes) - set(filtered_codes)
             logger.info("今日休市股票已跳过: %s", skipped)
@@ -494,6 +594,24 @@ def run_full_analysis(
             and not config.single_stock_notify
         )
 
+        run_review = bool(
+            config.market_review_enabled
+            and not args.no_market_review
+            and effective_region != ''
+        )
+        concurrent_review = run_review and getattr(config, 'market_review_concurrent', False)
+
+        # 并行复盘占用一个并发名额，使个股与复盘的 LLM 调用总数不超过 MAX_WORKERS；
+        # 只有 1 个名额时无法并行，回退为先个股后复盘
+        pipeline_workers = args.workers
+        if concurrent_review:
+            total_workers = args.workers or getattr(config, 'max_workers', 1) or 1
+            if total_workers < 2:
+                logger.info("MAX_WORKERS < 2，大盘复盘改为在个股分析之后顺序执行")
+                concurrent_review = False
+            else:
+                pipeline_workers = total_workers - 1
+
         # 创建调度器
         save_context_snapshot = None
         if getattr(args, 'no_context_snapshot', False):
@@ -501,39 +619,24 @@ def run_full_analysis(
         query_id = uuid.uuid4().hex
         pipeline = StockAnalysisPipeline(
             config=config,
-            max_workers=args.workers,
+            max_workers=pipeline_workers,
             query_id=query_id,
             query_source="cli",
-            save_context_snapshot=save_context_snapshot
-        )
-
-        # 1. 运行个股分析
-        results = pipeline.run(
-            stock_codes=stock_codes,
-            dry_run=args.dry_run,
-            send_notification=not args.no_notify,
-            merge_notification=merge_notification
+            save_context_snapshot=save_context_snapshot,
+            fetcher_manager=fetcher_manager,
         )
 
-        # Issue #128: 分析间隔 - 在个股分析和大盘分析之间添加延迟
-        analysis_delay = getattr(config, 'analysis_delay', 0)
-        if (
-            analysis_delay > 0
-            and config.market_review_enabled
-            and not args.no_market_review
-            and effective_region != ''
-        ):
-            logger.info(f"等待 {analysis_delay} 秒后执行大盘复盘（避免API限流）...")
-            time.sleep(analysis_delay)
+        def _run_stock_batch():
+            return pipeline.run(
+                stock_codes=stock_codes,
+                dry_run=args.dry_run,
+                send_notification=not args.no_notify,
+                merge_notification=merge_notification
+            )
 
-        # 2. 运行大盘复盘（如果启用且不是仅个股模式）
-        market_report = ""
-        if (
-            config.market_review_enabled
-            and not args.no_market_review
-            and effective_region != ''
-        ):
-            review_result = _run_market_review_with_shared_lock(
+        def _run_review():
+            # 复用个股流水线的数据源管理器 / LLM / 搜索服务，共享限流与熔断状态
+            return _run_market_review_with_shared_lock(
                 config,
                 run_market_review,
                 notifier=pipeline.notifier,
@@ -542,10 +645,38 @@ def run_full_analysis(
                 send_notification=not args.no_notify,
                 merge_notification=merge_notification,
                 override_region=effective_region,
+                data_manager=pipeline.fetcher_manager,
             )
-            # 如果有结果，赋值给 market_report 用于后续飞书文档生成
-            if review_result:
-                market_report = review_result
+
+        market_report = ""
+        review_result = None
+        if concurrent_review:
+            # 1+2. 个股分析与大盘复盘并行执行，合并推送前统一等待两者完成
+            logger.info("大盘复盘与个股分析并行执行（MARKET_REVIEW_CONCURRENT=true）")
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="market_review") as review_executor:
+                review_future = review_executor.submit(contextvars.copy_context().run, _run_review)
+                results = _run_stock_batch()
+                try:
+                    review_result = review_future.result()
+                except Exception as e:
+                    logger.error(f"并行大盘复盘执行失败: {e}")
+        else:
+            # 1. 运行个股分析
+            results = _run_stock_batch()
+
+            # Issue #128: 分析间隔 - 在个股分析和大盘分析之间添加延迟
+            analysis_delay = getattr(config, 'analysis_delay', 0)
+            if analysis_delay > 0 and run_review:
+                logger.info(f"等待 {analysis_delay} 秒后执行大盘复盘（避免API限流）...")
+                time.sleep(analysis_delay)
+
+            # 2. 运行大盘复盘（如果启用且不是仅个股模式）
+            if run_review:
+                review_result = _run_review()
+
+        # 如果有结果，赋值给 market_report 用于后续飞书文档生成
+        if review_result:
+            market_report = review_result
 
         # Issue #190: 合并推送（个股+大盘复盘）
         if merge_notification and (results or market_report) and not args.no_notify:
@@ -931,9 +1062,54 @@ def main() -> int:
             scheduled_stock_codes = _resolve_scheduled_stock_codes(stock_codes)
             schedule_time_provider = _build_schedule_time_provider(config.schedule_time)
 
+            # 预热与正式执行共用同一个数据源管理器，基本面缓存才能被正式执行命中
+            warmup_minutes = getattr(config, 'schedule_warmup_minutes', 0)
+            shared_fetcher_manager = None
+            if isinstance(warmup_minutes, int) and warmup_minutes > 0:
+                from data_provider import DataFetcherManager
+
+                shared_fetcher_manager = DataFetcherManager()
+            else:
+                warmup_minutes = 0
+
+            def _run_scheduled_analysis(market: Optional[str] = None):
+                runtime_config = _reload_runtime_config()
+                run_full_analysis(
+                    runtime_config,
+                    args,
+                    scheduled_stock_codes,
+                    market=market,
+                    fetcher_manager=shared_fetcher_manager,
+                )
+
             def scheduled_task():
+                _run_scheduled_analysis()
+
+            def warmup_task(market: Optional[str] = None):
+                from src.core.cache_warmup import warm_up_caches
+
                 runtime_config = _reload_runtime_config()
-                run_full_analysis(runtime_config, args, scheduled_stock_codes)
+                # 与正式执行保持同一股票集合
+                if scheduled_stock_codes is not None:
+                    codes = list(scheduled_stock_codes)
+                else:
+                    codes = list(runtime_config.stock_list)
+                if market:
+                    codes = _filter_codes_for_market(codes, market)
+                codes, _, _ = _compute_trading_day_filter(runtime_config, args, codes)
+                warm_up_caches(runtime_config, codes, shared_fetcher_manager)
+
+            market_tasks = []
+            if getattr(config, 'schedule_by_market', False) is True:
+                delay_minutes = getattr(config, 'schedule_market_delay_minutes', 30)
+                logger.info("按市场收盘调度: 各市场收盘后 %s 分钟执行（忽略 SCHEDULE_TIME）", delay_minutes)
+                for market in ("cn", "hk", "us"):
+                    market_tasks.append({
+                        "market": market,
+                        "task": lambda market=market: _run_scheduled_analysis(market),
+                        "delay_minutes": delay_minutes,
+                        "name": f"market_{market}",
+                    })
 
             background_tasks = []
             if getattr(config, 'agent_event_monitor_enabled', False):
@@ -963,6 +1139,9 @@ def main() -> int:
                 run_immediately=should_run_immediately,
                 background_tasks=background_tasks,
                 schedule_time_provider=schedule_time_provider,
+                market_tasks=market_tasks,
+                warmup_task=warmup_task if warmup_minutes else None,
+                warmup_minutes=warmup_minutes,
             )
             return 0
 
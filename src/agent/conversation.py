@@ -11,10 +11,121 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from src.config import get_config
 from src.storage import get_db
+from src.utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_HEADER = "[此前对话摘要]"
+_SUMMARY_ACK = "好的，我已了解此前的对话内容。"
+# Older messages read per compaction pass; anything before that is left out of the summary
+_MAX_ROLL_MESSAGES = 200
+_SUMMARY_USER_CHARS = 120
+_SUMMARY_ASSISTANT_CHARS = 240
+
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
+
+
+def _clip_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) + 1 <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + "…"
+
+
+class ConversationHistoryManager:
+    """Builds the token-budgeted history sent to the LLM for one chat session.
+
+    The last ``keep_turns`` turns are read verbatim from the tail of
+    ``conversation_messages``. Messages older than that are condensed into a
+    running summary persisted in ``conversation_summaries``, so each turn only
+    reads the messages that fell out of the verbatim window since the last
+    pass. A quarter of ``token_budget`` is reserved for the summary; the rest
+    goes to recent messages, dropping the oldest first.
+    """
+
+    def __init__(self, keep_turns: int = 6, token_budget: int = 6000, db=None):
+        self.keep_turns = max(1, keep_turns)
+        self.token_budget = max(1, token_budget)
+        self._db = db
+
+    @property
+    def db(self):
+        return self._db if self._db is not None else get_db()
+
+    def build(self, session_id: str) -> List[Dict[str, str]]:
+        window = self.keep_turns * 2
+        tail = self.db.get_conversation_tail(session_id, window)
+        if not tail:
+            return []
+
+        stored = self.db.get_conversation_summary(session_id) or {}
+        summary = stored.get("summary", "")
+        covered_id = stored.get("last_message_id", 0)
+
+        summary_budget = self.token_budget // 4
+        # Messages already folded into the summary are never repeated verbatim
+        candidates = [msg for msg in tail if msg["id"] > covered_id]
+        recent = self._fit_recent(candidates, self.token_budget - summary_budget)
+
+        # Only look further back when something may have left the verbatim window
+        if recent and (len(tail) == window or len(recent) < len(candidates)):
+            older = self.db.get_conversation_messages_between(
+                session_id, after_id=covered_id, before_id=recent[0]["id"], limit=_MAX_ROLL_MESSAGES,
+            )
+            if older:
+                summary = self._roll_summary(summary, older, summary_budget)
+                try:
+                    self.db.save_conversation_summary(session_id, summary, older[-1]["id"])
+                except Exception as exc:
+                    logger.warning("Failed to persist conversation summary for %s: %s", session_id, exc)
+
+        messages: List[Dict[str, str]] = []
+        if summary:
+            messages.append({"role": "user", "content": f"{_SUMMARY_HEADER}\n{summary}"})
+            messages.append({"role": "assistant", "content": _SUMMARY_ACK})
+        messages.extend({"role": msg["role"], "content": msg["content"]} for msg in recent)
+        return messages
+
+    @staticmethod
+    def _fit_recent(tail: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+        """Keep the newest messages that fit in budget; clip the last one if it alone is too long."""
+        kept: List[Dict[str, Any]] = []
+        used = 0
+        for msg in reversed(tail):
+            cost = estimate_tokens(msg["content"])
+            if used + cost > budget:
+                if not kept:
+                    kept.append({**msg, "content": _clip_to_tokens(msg["content"], budget)})
+                break
+            kept.append(msg)
+            used += cost
+        kept.reverse()
+        return kept
+
+    @staticmethod
+    def _roll_summary(summary: str, older: List[Dict[str, Any]], budget: int) -> str:
+        lines = summary.splitlines() if summary else []
+        for msg in older:
+            if msg["role"] == "user":
+                lines.append(f"- 用户: {_clip(msg['content'], _SUMMARY_USER_CHARS)}")
+            elif msg["role"] == "assistant":
+                lines.append(f"  助手: {_clip(msg['content'], _SUMMARY_ASSISTANT_CHARS)}")
+        # Drop the oldest lines once the summary outgrows its share of the budget
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > budget:
+            lines.pop(0)
+        return _clip_to_tokens("\n".join(lines), budget)
+
 @dataclass
 class ConversationSession:
     """A single multi-turn conversation session."""
@@ -34,9 +145,13 @@ class ConversationSession:
         self.last_active = datetime.now()
 
     def get_history(self) -> List[Dict[str, Any]]:
-        """Get message history."""
-        messages = get_db().get_conversation_history(self.session_id)
-        return messages
+        """Get token-budgeted message history: running summary plus recent turns."""
+        config = get_config()
+        manager = ConversationHistoryManager(
+            keep_turns=config.agent_chat_history_turns,
+            token_budget=config.agent_chat_history_token_budget,
+        )
+        return manager.build(self.session_id)
 
 class ConversationManager:
     """Manages multiple conversation sessions with TTL."""
@@ -21,7 +21,9 @@ from typing import Any, Callable, Dict, List, Optional
 
 from src.agent.llm_adapter import LLMToolAdapter
 from src.agent.runner import run_agent_loop, parse_dashboard_json
+from src.agent.tool_cache import ToolResultCache
 from src.agent.tools.registry import ToolRegistry
+from src.llm_scheduler import llm_priority
 from src.report_language import normalize_report_language
 from src.market_context import get_market_role, get_market_guidelines
 
@@ -511,8 +513,20 @@ class AgentExecutor:
             {"role": "user", "content": self._build_user_message(task, context)},
         ]
 
-        return self._run_loop(messages, tool_decls, parse_dashboard=True)
+        tool_cache = ToolResultCache.from_context(context)
+        result = self._run_loop(messages, tool_decls, parse_dashboard=True, tool_result_cache=tool_cache)
+        cache_stats = tool_cache.stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            logger.info(
+                "[AgentExecutor] tool cache: hits=%d misses=%d seeded=%d hit_rate=%.0f%%",
+                cache_stats["hits"],
+                cache_stats["misses"],
+                cache_stats["seeded"],
+                cache_stats["hit_rate"] * 100,
+            )
+        return result
 
+    @llm_priority("interactive")
     def chat(self, message: str, session_id: str, progress_callback: Optional[Callable] = None, context: Optional[Dict[str, Any]] = None) -> AgentResult:
         """Execute the agent loop for a free-form chat message.
 
@@ -604,7 +618,14 @@ class AgentExecutor:
 
         return result
 
-    def _run_loop(self, messages: List[Dict[str, Any]], tool_decls: List[Dict[str, Any]], parse_dashboard: bool, progress_callback: Optional[Callable] = None) -> AgentResult:
+    def _run_loop(
+        self,
+        messages: List[Dict[str, Any]],
+        tool_decls: List[Dict[str, Any]],
+        parse_dashboard: bool,
+        progress_callback: Optional[Callable] = None,
+        tool_result_cache: Optional[ToolResultCache] = None,
+    ) -> AgentResult:
         """Delegate to the shared runner and adapt the result.
 
         This preserves the exact same observable behaviour as the original
@@ -618,6 +639,7 @@ class AgentExecutor:
             max_steps=self.max_steps,
             progress_callback=progress_callback,
             max_wall_clock_seconds=self.timeout_seconds,
+            tool_result_cache=tool_result_cache,
         )
 
         model_str = loop_result.model
@@ -25,9 +25,16 @@ from src.config import (
     get_effective_agent_primary_model,
     normalize_litellm_temperature,
 )
+from src.utils.tokens import estimate_tokens
+from src.llm_routing import get_llm_router
+from src.llm_scheduler import LLMQueueTimeout, get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Completion allowance assumed for TPM admission when max_tokens is not set;
+# the scheduler replaces it with real usage once the response arrives
+_DEFAULT_COMPLETION_TOKENS = 2048
+
 
 def _resolve_litellm_exception(name: str) -> type[BaseException]:
     """Return a catchable LiteLLM exception class even in stubbed test environments."""
@@ -320,6 +327,12 @@ class LLMToolAdapter:
             )
             logger.error(error_msg)
             return LLMResponse(content=error_msg, provider="error")
+        router = get_llm_router(config)
+        if router is not None:
+            router.set_probe(self._probe_model)
+            models_to_try = router.order(models_to_try)
+        scheduler = get_llm_scheduler(config)
+        estimated_tokens = self._estimate_request_tokens(messages, tools, max_tokens)
         started_at = time.time()
         providers = [self._get_model_provider(model) for model in models_to_try]
 
@@ -334,8 +347,19 @@ class LLMToolAdapter:
                         f"LLM completion timed out before trying fallback model {model}"
                     )
                     break
+            if router is not None:
+                router.begin_attempt(model)
+            ticket = None
+            used_tokens: Optional[int] = None
+            call_started = time.monotonic()
             try:
-                return self._call_litellm_model(
+                if scheduler is not None:
+                    ticket = scheduler.acquire(model, estimated_tokens, timeout=remaining_timeout or None)
+                    call_started = time.monotonic()
+                    if timeout is not None and timeout > 0:
+                        # Time spent queued comes out of this call's budget
+                        remaining_timeout = max(0.0, float(timeout) - (time.time() - started_at))
+                response = self._call_litellm_model(
                     messages,
                     tools or [],
                     model,
@@ -343,7 +367,22 @@ class LLMToolAdapter:
                     max_tokens=max_tokens,
                     timeout=remaining_timeout,
                 )
+                usage = getattr(response, "usage", None)
+                if isinstance(usage, dict):
+                    used_tokens = usage.get("total_tokens") or None
+                if router is not None:
+                    router.record_success(model, time.monotonic() - call_started)
+                return response
             except Exception as e:
+                if isinstance(e, LLMQueueTimeout):
+                    logger.warning("Agent LLM request for %s not admitted: %s", model, e)
+                    last_error = e
+                    continue
+                if router is not None and not isinstance(
+                    e, _resolve_litellm_exception("ContextWindowExceededError")
+                ):
+                    # Context overflow is a property of the request, not channel health
+                    router.record_failure(model, e, time.monotonic() - call_started)
                 if isinstance(e, _resolve_litellm_exception("RateLimitError")):
                     logger.warning("Agent LLM rate-limited on %s: %s", model, e)
                     last_error = e
@@ -371,12 +410,44 @@ class LLMToolAdapter:
                 logger.warning("Agent LLM call failed with %s: %s", model, e)
                 last_error = e
                 continue
+            finally:
+                if scheduler is not None:
+                    scheduler.release(ticket, used_tokens)
 
         suffix = " (rate-limit encountered during fallback)" if hit_rate_limit else ""
         error_msg = f"All LLM models failed{suffix}. Last error: {last_error}"
         logger.error(error_msg)
         return LLMResponse(content=error_msg, provider="error")
 
+    @staticmethod
+    def _estimate_request_tokens(
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[dict]],
+        max_tokens: Optional[int],
+    ) -> int:
+        """Prompt + completion token estimate used for TPM admission."""
+        prompt_tokens = 0
+        for message in messages:
+            content = message.get("content")
+            if not isinstance(content, str):
+                content = json.dumps(content, ensure_ascii=False, default=str) if content else ""
+            prompt_tokens += estimate_tokens(content)
+            if message.get("tool_calls"):
+                prompt_tokens += estimate_tokens(json.dumps(message["tool_calls"], ensure_ascii=False, default=str))
+        if tools:
+            prompt_tokens += estimate_tokens(json.dumps(tools, ensure_ascii=False))
+        return prompt_tokens + (max_tokens or _DEFAULT_COMPLETION_TOKENS)
+
+    def _probe_model(self, model: str) -> None:
+        """Minimal completion used by the router to check a parked model."""
+        self._call_litellm_model(
+            [{"role": "user", "content": "ping"}],
+            [],
+            model,
+            max_tokens=1,
+            timeout=15.0,
+        )
+
     @staticmethod
     def _get_model_provider(model: str) -> str:
         """Return LiteLLM provider namespace for model fallback grouping."""
@@ -41,8 +41,10 @@ from src.agent.protocols import (
     normalize_decision_signal,
 )
 from src.agent.runner import parse_dashboard_json
+from src.agent.tool_cache import ToolResultCache
 from src.agent.tools.registry import ToolRegistry
 from src.config import AGENT_MAX_STEPS_DEFAULT
+from src.llm_scheduler import llm_priority
 from src.report_language import normalize_report_language
 
 if TYPE_CHECKING:
@@ -295,6 +297,7 @@ class AgentOrchestrator:
             error=orch_result.error,
         )
 
+    @llm_priority("interactive")
     def chat(
         self,
         message: str,
@@ -360,7 +363,40 @@ class AgentOrchestrator:
         parse_dashboard: bool = True,
         progress_callback: Optional[Callable] = None,
     ) -> OrchestratorResult:
-        """Run the agent pipeline according to ``self.mode``."""
+        """Run the agent pipeline according to ``self.mode``.
+
+        Every stage shares ``ctx.tool_cache`` so data seeded by the caller or
+        fetched by an earlier agent is not requested again by later ones.
+        """
+        if ctx.tool_cache is None:
+            ctx.tool_cache = ToolResultCache()
+
+        orch_result = self._run_agent_chain(
+            ctx,
+            parse_dashboard=parse_dashboard,
+            progress_callback=progress_callback,
+        )
+
+        cache_stats = ctx.tool_cache.stats()
+        if orch_result.stats is not None:
+            orch_result.stats.tool_cache = cache_stats
+        if cache_stats["hits"] or cache_stats["misses"]:
+            logger.info(
+                "[Orchestrator] shared tool cache: hits=%d misses=%d seeded=%d hit_rate=%.0f%%",
+                cache_stats["hits"],
+                cache_stats["misses"],
+                cache_stats["seeded"],
+                cache_stats["hit_rate"] * 100,
+            )
+        return orch_result
+
+    def _run_agent_chain(
+        self,
+        ctx: AgentContext,
+        parse_dashboard: bool = True,
+        progress_callback: Optional[Callable] = None,
+    ) -> OrchestratorResult:
+        """Run the stage agents in order and assemble the final result."""
         stats = AgentRunStats()
         all_tool_calls: List[Dict[str, Any]] = []
         models_used: List[str] = []
@@ -696,6 +732,7 @@ class AgentOrchestrator:
     def _build_context(self, task: str, context: Optional[Dict[str, Any]] = None) -> AgentContext:
         """Seed an ``AgentContext`` from the user request."""
         ctx = AgentContext(query=task)
+        ctx.tool_cache = ToolResultCache.from_context(context)
 
         if context:
             ctx.stock_code = context.get("stock_code", "")
@@ -88,6 +88,9 @@ class AgentContext:
     meta: Dict[str, Any] = field(default_factory=dict)
     # e.g. {"skills_requested": [...], "user_platform": "feishu"}
 
+    # --- per-run tool result cache shared by all agents (ToolResultCache) ---
+    tool_cache: Optional[Any] = field(default=None, repr=False)
+
     # --- timing ---
     created_at: float = field(default_factory=time.time)
 
@@ -202,6 +205,8 @@ class AgentRunStats:
     total_duration_s: float = 0.0
     models_used: List[str] = field(default_factory=list)
     stage_results: List[StageResult] = field(default_factory=list)
+    tool_cache: Dict[str, Any] = field(default_factory=dict)
+    # e.g. {"hits": 4, "misses": 3, "seeded": 3, "entries": 6, "hit_rate": 0.5714}
 
     def record_stage(self, result: StageResult) -> None:
         """Record a stage result and update counters.
@@ -233,4 +238,5 @@ class AgentRunStats:
             "total_tool_calls": self.total_tool_calls,
             "total_duration_s": round(self.total_duration_s, 2),
             "models_used": self.models_used,
+            "tool_cache": self.tool_cache,
         }
@@ -20,13 +20,19 @@ import logging
 import re
 import time
 import contextvars
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, wait as wait_futures
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from src.agent.llm_adapter import LLMToolAdapter
+from src.agent.tool_encoding import encode_tool_result, tool_encoding_report
+from src.agent.tool_pool import ToolSession, get_tool_pool
 from src.agent.tools.registry import ToolRegistry
 from src.storage import persist_llm_usage as _persist_usage
+from src.utils.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from src.agent.tool_cache import ToolResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +106,42 @@ def serialize_tool_result(result: Any) -> str:
     return str(result)
 
 
+def resolve_tool_result_max_chars() -> Optional[int]:
+    """Return the configured tool-result size cap, or None when compact encoding is off."""
+    try:
+        from src.config import get_config
+
+        config = get_config()
+        if not getattr(config, "agent_compact_tool_results", True):
+            return None
+        return int(getattr(config, "agent_tool_result_max_chars", 0) or 0)
+    except Exception:
+        return 0
+
+
+def resolve_tool_timeout_seconds() -> Optional[float]:
+    """Return the configured per-tool-call timeout, or None when unset."""
+    try:
+        from src.config import get_config
+
+        value = getattr(get_config(), "agent_tool_timeout_seconds", 0)
+    except Exception:
+        return None
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+        return None
+    return float(value)
+
+
+def _encode_result(tool_name: str, result: Any, max_chars: Optional[int]) -> Tuple[str, Optional[int]]:
+    """Return the text sent to the LLM and, with compact encoding on, the raw JSON length."""
+    raw = serialize_tool_result(result)
+    if max_chars is None:
+        return raw, None
+    if isinstance(result, str):
+        return raw, len(raw)
+    return encode_tool_result(tool_name, result, max_chars=max_chars), len(raw)
+
+
 def _normalize_tool_stock_code(value: Any) -> Any:
     """Canonicalize stock code arguments so equivalent HK variants share one cache key."""
     if not isinstance(value, str):
@@ -368,6 +410,7 @@ def run_agent_loop(
     thinking_labels: Optional[Dict[str, str]] = None,
     max_wall_clock_seconds: Optional[float] = None,
     tool_call_timeout_seconds: Optional[float] = None,
+    tool_result_cache: Optional["ToolResultCache"] = None,
 ) -> RunLoopResult:
     """Execute the ReAct LLM ↔ tool loop.
 
@@ -384,7 +427,12 @@ def run_agent_loop(
         progress_callback: Optional callback receiving progress dicts.
         thinking_labels: Override map of tool_name → friendly label.
         max_wall_clock_seconds: Optional overall timeout budget for the loop.
-        tool_call_timeout_seconds: Optional timeout for one parallel tool batch.
+        tool_call_timeout_seconds: Optional timeout for one parallel tool batch;
+                  ``AGENT_TOOL_TIMEOUT_SECONDS`` additionally caps each call,
+                  counted from when that call starts running.
+        tool_result_cache: Optional per-analysis cache shared with other
+                  agents of the same run; successful results of cacheable
+                  tools are served from / written to it.
 
     Returns:
         A :class:`RunLoopResult` with the final content, stats, and the
@@ -392,6 +440,10 @@ def run_agent_loop(
     """
     labels = thinking_labels or _THINKING_TOOL_LABELS
     tool_decls = tool_registry.to_openai_tools()
+    tool_result_max_chars = resolve_tool_result_max_chars()
+    per_tool_timeout = resolve_tool_timeout_seconds()
+    # Tool calls of this loop share the process-wide pool under one session limit
+    tool_session = get_tool_pool().session()
 
     start_time = time.time()
     tool_calls_log: List[Dict[str, Any]] = []
@@ -531,6 +583,10 @@ def run_agent_loop(
                 tool_calls_log,
                 non_retriable_tool_results,
                 tool_wait_timeout_seconds=effective_tool_timeout,
+                tool_result_cache=tool_result_cache,
+                tool_result_max_chars=tool_result_max_chars,
+                tool_session=tool_session,
+                per_call_timeout_seconds=per_tool_timeout,
             )
 
             # Append tool results preserving original call order
@@ -568,6 +624,15 @@ def run_agent_loop(
                 time.time() - start_time,
                 total_tokens,
             )
+            encoding = tool_encoding_report(tool_calls_log)
+            if encoding["tool_results"]:
+                logger.info(
+                    "Agent tool results: %d chars raw -> %d chars encoded (~%d tokens, %.0f%% smaller)",
+                    encoding["raw_chars"],
+                    encoding["encoded_chars"],
+                    encoding["encoded_tokens"],
+                    encoding["saved_ratio"] * 100,
+                )
             if progress_callback:
                 progress_callback({"type": "generating", "step": step + 1, "message": "正在生成最终分析..."})
 
@@ -605,6 +670,75 @@ def run_agent_loop(
 # Internal tool execution
 # ============================================================
 
+def _record_encoding(
+    log_entry: Dict[str, Any],
+    call_id: str,
+    result_str: str,
+    encoding_sizes: Dict[str, int],
+) -> None:
+    raw_length = encoding_sizes.get(call_id)
+    if raw_length is not None:
+        log_entry["raw_length"] = raw_length
+        log_entry["result_tokens"] = estimate_tokens(result_str)
+
+
+# How often queued calls are checked for having started when only a
+# per-call timeout applies
+_TOOL_START_POLL_SECONDS = 0.05
+
+
+def _iter_tool_outcomes(
+    tool_session: ToolSession,
+    futures: Sequence[Future],
+    batch_timeout: Optional[float],
+    per_call_timeout: Optional[float],
+) -> Iterator[Tuple[Future, Optional[float]]]:
+    """Yield ``(future, None)`` as calls finish and ``(future, limit)`` on timeout.
+
+    Timed-out calls are abandoned on ``tool_session``; ``limit`` is the
+    timeout that fired.
+    """
+    batch_deadline = (
+        time.monotonic() + batch_timeout if batch_timeout and batch_timeout > 0 else None
+    )
+    per_call = per_call_timeout if per_call_timeout and per_call_timeout > 0 else None
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        if batch_deadline is not None and now >= batch_deadline:
+            tool_session.abandon(pending)
+            for future in futures:
+                if future in pending:
+                    yield future, batch_timeout
+            return
+
+        wait_seconds = None if batch_deadline is None else batch_deadline - now
+        expired = []
+        if per_call is not None:
+            for future in pending:
+                if future.done():
+                    continue
+                started = tool_session.started_at(future)
+                if started is None:
+                    wait_seconds = min(wait_seconds or _TOOL_START_POLL_SECONDS, _TOOL_START_POLL_SECONDS)
+                elif now - started >= per_call:
+                    expired.append(future)
+                else:
+                    remaining = started + per_call - now
+                    wait_seconds = remaining if wait_seconds is None else min(wait_seconds, remaining)
+        if expired:
+            tool_session.abandon(expired)
+            for future in expired:
+                pending.discard(future)
+                yield future, per_call
+            continue
+
+        done, _ = wait_futures(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            yield future, None
+
+
 def _execute_tools(
     tool_calls,
     tool_registry: ToolRegistry,
@@ -613,11 +747,26 @@ def _execute_tools(
     tool_calls_log: List[Dict[str, Any]],
     non_retriable_tool_results: Optional[Dict[str, str]] = None,
     tool_wait_timeout_seconds: Optional[float] = None,
+    tool_result_cache: Optional["ToolResultCache"] = None,
+    tool_result_max_chars: Optional[int] = 0,
+    tool_session: Optional[ToolSession] = None,
+    per_call_timeout_seconds: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """Execute one or more tool calls, returning ordered result dicts.
 
-    Single tools run inline; multiple tools run in parallel threads.
+    Single tools without a timeout run inline; otherwise calls run on the
+    shared tool pool through ``tool_session`` (a fresh session by default).
+    ``tool_wait_timeout_seconds`` bounds the whole batch, while
+    ``per_call_timeout_seconds`` bounds each call from the moment it starts
+    running, so calls queued behind the session limit keep their full budget.
+    Results are looked up in the non-retriable error cache first, then in
+    the optional shared ``tool_result_cache``; log entries carry a
+    ``cache_source`` of ``"non_retriable"`` or ``"shared"`` on a hit.
+    Fresh results are encoded with :func:`encode_tool_result` (``None``
+    keeps the plain JSON dump) and their log entries record ``raw_length``
+    and ``result_tokens`` for the encoding report.
     """
+    encoding_sizes: Dict[str, int] = {}
 
     def _exec_single(tc_item):
         t0 = time.time()
@@ -630,59 +779,74 @@ def _execute_tools(
                 tc_item.name,
                 tc_item.arguments,
             )
-            return tc_item, non_retriable_tool_results[cache_key], False, dur, True
+            return tc_item, non_retriable_tool_results[cache_key], False, dur, "non_retriable"
+
+        if tool_result_cache is not None:
+            shared_hit = tool_result_cache.get(tc_item.name, tc_item.arguments)
+            if shared_hit is not None:
+                dur = round(time.time() - t0, 2)
+                logger.debug("Tool '%s' served from shared result cache", tc_item.name)
+                return tc_item, shared_hit, True, dur, "shared"
 
         try:
             res = tool_registry.execute(tc_item.name, **tc_item.arguments)
-            res_str = serialize_tool_result(res)
+            res_str, raw_length = _encode_result(tc_item.name, res, tool_result_max_chars)
+            if raw_length is not None:
+                encoding_sizes[tc_item.id] = raw_length
             ok = True
             if cache_key and non_retriable_tool_results is not None and _is_non_retriable_tool_result(res):
                 non_retriable_tool_results[cache_key] = res_str
+            elif tool_result_cache is not None:
+                tool_result_cache.put(tc_item.name, tc_item.arguments, res, serialized=res_str)
         except Exception as e:
             res_str = json.dumps({"error": str(e)})
             ok = False
             logger.warning("Tool '%s' failed: %s", tc_item.name, e)
         dur = round(time.time() - t0, 2)
-        return tc_item, res_str, ok, dur, False
+        return tc_item, res_str, ok, dur, None
 
     results: List[Dict[str, Any]] = []
+    if tool_session is None:
+        tool_session = get_tool_pool().session()
+    use_timeouts = bool(
+        (tool_wait_timeout_seconds and tool_wait_timeout_seconds > 0)
+        or (per_call_timeout_seconds and per_call_timeout_seconds > 0)
+    )
 
     if len(tool_calls) == 1:
         tc = tool_calls[0]
         if progress_callback:
             progress_callback({"type": "tool_start", "step": step, "tool": tc.name})
-        timeout_triggered = False
-        if tool_wait_timeout_seconds and tool_wait_timeout_seconds > 0:
-            pool = ThreadPoolExecutor(max_workers=1)
-            ctx = contextvars.copy_context()
-            try:
-                future = pool.submit(ctx.run, _exec_single, tc)
-                try:
-                    _, result_str, success, dur, cached = future.result(timeout=tool_wait_timeout_seconds)
-                except FuturesTimeoutError:
-                    timeout_triggered = True
-                    future.cancel()
-                    timeout_label = f"{tool_wait_timeout_seconds:.2f}s"
-                    logger.warning("Tool '%s' timed out after %s at step %d", tc.name, timeout_label, step)
-                    result_str = json.dumps({
-                        "error": f"Tool execution timed out after {timeout_label}",
-                        "timeout": True,
-                    })
-                    success = False
-                    dur = round(tool_wait_timeout_seconds, 2)
-                    cached = False
-            finally:
-                pool.shutdown(wait=not timeout_triggered, cancel_futures=timeout_triggered)
+        if use_timeouts:
+            future = tool_session.submit(contextvars.copy_context().run, _exec_single, tc)
+            _, timeout_limit = next(_iter_tool_outcomes(
+                tool_session, [future], tool_wait_timeout_seconds, per_call_timeout_seconds
+            ))
+            if timeout_limit is None:
+                _, result_str, success, dur, cache_source = future.result()
+            else:
+                timeout_label = f"{timeout_limit:.2f}s"
+                logger.warning("Tool '%s' timed out after %s at step %d", tc.name, timeout_label, step)
+                result_str = json.dumps({
+                    "error": f"Tool execution timed out after {timeout_label}",
+                    "timeout": True,
+                })
+                success = False
+                dur = round(timeout_limit, 2)
+                cache_source = None
         else:
-            _, result_str, success, dur, cached = _exec_single(tc)
+            _, result_str, success, dur, cache_source = _exec_single(tc)
         if progress_callback:
             progress_callback({"type": "tool_done", "step": step, "tool": tc.name, "success": success, "duration": dur})
         log_entry = {
             "step": step, "tool": tc.name, "arguments": tc.arguments,
             "success": success, "duration": dur, "result_length": len(result_str),
-            "cached": cached,
+            "cached": cache_source is not None,
         }
-        if tool_wait_timeout_seconds and tool_wait_timeout_seconds > 0 and not success:
+        if cache_source:
+            log_entry["cache_source"] = cache_source
+        _record_encoding(log_entry, tc.id, result_str, encoding_sizes)
+        if use_timeouts and not success:
             try:
                 if json.loads(result_str).get("timeout") is True:
                     log_entry["timeout"] = True
@@ -695,60 +859,51 @@ def _execute_tools(
             if progress_callback:
                 progress_callback({"type": "tool_start", "step": step, "tool": tc.name})
 
-        pool = ThreadPoolExecutor(max_workers=min(len(tool_calls), 5))
-        timeout_triggered = False
-        try:
-            futures = {pool.submit(contextvars.copy_context().run, _exec_single, tc): tc for tc in tool_calls}
-            pending = set(futures)
-            for future in as_completed(
-                futures,
-                timeout=tool_wait_timeout_seconds if tool_wait_timeout_seconds and tool_wait_timeout_seconds > 0 else None,
-            ):
-                pending.discard(future)
-                tc_item, result_str, success, dur, cached = future.result()
+        futures = {tool_session.submit(contextvars.copy_context().run, _exec_single, tc): tc for tc in tool_calls}
+        for future, timeout_limit in _iter_tool_outcomes(
+            tool_session, list(futures), tool_wait_timeout_seconds, per_call_timeout_seconds
+        ):
+            if timeout_limit is None:
+                tc_item, result_str, success, dur, cache_source = future.result()
                 if progress_callback:
                     progress_callback({"type": "tool_done", "step": step, "tool": tc_item.name, "success": success, "duration": dur})
-                tool_calls_log.append({
+                log_entry = {
                     "step": step, "tool": tc_item.name, "arguments": tc_item.arguments,
                     "success": success, "duration": dur, "result_length": len(result_str),
-                    "cached": cached,
-                })
+                    "cached": cache_source is not None,
+                }
+                if cache_source:
+                    log_entry["cache_source"] = cache_source
+                _record_encoding(log_entry, tc_item.id, result_str, encoding_sizes)
+                tool_calls_log.append(log_entry)
                 results.append({"tc": tc_item, "result_str": result_str})
-        except FuturesTimeoutError:
-            timeout_triggered = True
-            timeout_label = (
-                f"{tool_wait_timeout_seconds:.2f}s"
-                if tool_wait_timeout_seconds is not None
-                else "the configured limit"
-            )
-            logger.warning("Tool batch timed out after %s at step %d", timeout_label, step)
-            for future, tc_item in futures.items():
-                if future in pending:
-                    future.cancel()
-                    result_str = json.dumps({
-                        "error": f"Tool execution timed out after {timeout_label}",
-                        "timeout": True,
-                    })
-                    if progress_callback:
-                        progress_callback({
-                            "type": "tool_done",
-                            "step": step,
-                            "tool": tc_item.name,
-                            "success": False,
-                            "duration": round(tool_wait_timeout_seconds or 0.0, 2),
-                        })
-                    tool_calls_log.append({
-                        "step": step,
-                        "tool": tc_item.name,
-                        "arguments": tc_item.arguments,
-                        "success": False,
-                        "duration": round(tool_wait_timeout_seconds or 0.0, 2),
-                        "result_length": len(result_str),
-                        "cached": False,
-                        "timeout": True,
-                    })
-                    results.append({"tc": tc_item, "result_str": result_str})
-        finally:
-            pool.shutdown(wait=not timeout_triggered, cancel_futures=timeout_triggered)
+                continue
+
+            tc_item = futures[future]
+            timeout_label = f"{timeout_limit:.2f}s"
+            logger.warning("Tool '%s' timed out after %s at step %d", tc_item.name, timeout_label, step)
+            result_str = json.dumps({
+                "error": f"Tool execution timed out after {timeout_label}",
+                "timeout": True,
+            })
+            if progress_callback:
+                progress_callback({
+                    "type": "tool_done",
+                    "step": step,
+                    "tool": tc_item.name,
+                    "success": False,
+                    "duration": round(timeout_limit, 2),
+                })
+            tool_calls_log.append({
+                "step": step,
+                "tool": tc_item.name,
+                "arguments": tc_item.arguments,
+                "success": False,
+                "duration": round(timeout_limit, 2),
+                "result_length": len(result_str),
+                "cached": False,
+                "timeout": True,
+            })
+            results.append({"tc": tc_item, "result_str": result_str})
 
     return results
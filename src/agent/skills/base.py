@@ -54,6 +54,8 @@ class Skill:
         execution_context: Inline/fork execution hint from frontmatter.
         subagent_type: Optional subagent type hint from frontmatter.
         preferred_model: Optional model hint from frontmatter.
+        screen: Optional machine-checkable pre-screen rules (``screen:`` section),
+            evaluated over daily bars by ``src.agent.skills.screener``.
     """
     name: str
     display_name: str
@@ -77,6 +79,7 @@ class Skill:
     execution_context: str = "inline"
     subagent_type: str = ""
     preferred_model: str = ""
+    screen: Dict[str, object] = field(default_factory=dict)
 
 
 _FRONTMATTER_RE = re.compile(r"^---\s*\r?\n(.*?)\r?\n---\s*\r?\n?(.*)$", re.DOTALL)
@@ -115,6 +118,15 @@ def _coerce_int(value: object, default: int = 100) -> int:
         return default
 
 
+def _coerce_screen(value: object, source: str) -> Dict[str, object]:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        logger.warning(f"Ignoring invalid screen section in {source}: expected a mapping")
+        return {}
+    return dict(value)
+
+
 def _parse_skill_frontmatter(raw_text: str) -> tuple[Dict[str, object], str]:
     import yaml
 
@@ -199,6 +211,7 @@ def load_skill_from_yaml(filepath: Union[str, Path]) -> Skill:
         execution_context=str(data.get("context", "inline")).strip() or "inline",
         subagent_type=str(data.get("agent", "")).strip(),
         preferred_model=str(data.get("model", "")).strip(),
+        screen=_coerce_screen(data.get("screen"), filepath.name),
     )
 
 
@@ -268,6 +281,7 @@ def load_skill_from_markdown(filepath: Union[str, Path]) -> Skill:
         execution_context=str(metadata.get("context", "inline")).strip() or "inline",
         subagent_type=str(metadata.get("agent", "")).strip(),
         preferred_model=str(metadata.get("model", "")).strip(),
+        screen=_coerce_screen(metadata.get("screen"), str(filepath)),
     )
 
 
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministic pre-screening of skills over cached daily bars.
+
+Most built-in skills encode numeric rules (volume ratio > 2, MA crossovers,
+bias < 5%) that the LLM checks one stock at a time. A skill can also carry
+a machine-checkable ``screen:`` section::
+
+    screen:
+      all:
+        - volume_ratio > 2
+        - close > high_20
+        - bias_ma5 < 5
+      any:
+        - ma5 crosses_above ma10 within 3
+        - close > open
+
+``screen_skills`` evaluates every screen over the daily bars of the whole
+universe in one vectorized pass (one ``groupby`` per feature, no per-stock
+loop) and returns the codes where a rule set fired, so only those stocks
+are forwarded to the Agent / LLM analysis.
+
+Rule syntax: ``<feature> <op> <feature | number> [* <number>] [within N]``
+with ``op`` one of ``> >= < <= crosses_above crosses_below``. ``within N``
+accepts a match on any of the last N bars. Unknown features are rejected
+when the screen is compiled. Stocks without enough history (NaN features)
+never match.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCREEN_FEATURES = (
+    "open", "high", "low", "close", "volume", "amount", "pct_chg",
+    "ma5", "ma10", "ma20", "ma60",
+    "vol_ma5", "volume_ratio",
+    "bias_ma5", "bias_ma10", "bias_ma20",
+    "high_20", "low_20", "drop_from_high_20",
+    "ret_5", "ret_20", "ma20_slope", "close_position",
+)
+
+# Bars needed before the longest window (ma60) is defined
+_DEFAULT_LOOKBACK_BARS = 80
+
+_RULE_RE = re.compile(
+    r"^\s*(?P<lhs>[a-z_][a-z0-9_]*)\s*"
+    r"(?P<op>>=|<=|>|<|crosses_above|crosses_below)\s*"
+    r"(?P<rhs>[a-z_][a-z0-9_]*|-?\d+(?:\.\d+)?)"
+    r"(?:\s*\*\s*(?P<factor>-?\d+(?:\.\d+)?))?"
+    r"(?:\s+within\s+(?P<within>\d+))?\s*$"
+)
+
+
+@dataclass(frozen=True)
+class ScreenRule:
+    """One compiled comparison from a ``screen:`` section."""
+
+    lhs: str
+    op: str
+    rhs: str
+    rhs_is_feature: bool
+    factor: float = 1.0
+    within: int = 1
+    text: str = ""
+
+
+@dataclass
+class CompiledScreen:
+    skill: str
+    all_rules: List[ScreenRule] = field(default_factory=list)
+    any_rules: List[ScreenRule] = field(default_factory=list)
+
+
+@dataclass
+class ScreenResult:
+    """Outcome of one screening pass."""
+
+    as_of: Optional[date]
+    universe_size: int
+    hits: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def codes(self) -> List[str]:
+        """Codes matched by at least one skill, sorted."""
+        return sorted({code for codes in self.hits.values() for code in codes})
+
+    def skills_for(self, code: str) -> List[str]:
+        return [skill for skill, codes in self.hits.items() if code in codes]
+
+
+def parse_screen_rule(text: str) -> ScreenRule:
+    """Compile one rule string; raises ``ValueError`` on bad syntax or features."""
+    match = _RULE_RE.match(str(text).strip().lower())
+    if not match:
+        raise ValueError(f"invalid screen rule: {text!r}")
+    lhs, op, rhs = match.group("lhs"), match.group("op"), match.group("rhs")
+    rhs_is_feature = not re.match(r"^-?\d", rhs)
+    for name in (lhs, rhs) if rhs_is_feature else (lhs,):
+        if name not in SCREEN_FEATURES:
+            raise ValueError(f"unknown screen feature {name!r} in rule {text!r}")
+    if op.startswith("crosses") and not rhs_is_feature:
+        raise ValueError(f"{op} needs a feature on both sides: {text!r}")
+    within = int(match.group("within") or 1)
+    return ScreenRule(
+        lhs=lhs,
+        op=op,
+        rhs=rhs,
+        rhs_is_feature=rhs_is_feature,
+        factor=float(match.group("factor") or 1.0),
+        within=max(1, within),
+        text=str(text).strip(),
+    )
+
+
+def compile_screen(skill_name: str, spec: Dict[str, object]) -> Optional[CompiledScreen]:
+    """Compile a skill's ``screen:`` mapping; returns None when it has no rules."""
+    if not spec:
+        return None
+    compiled = CompiledScreen(skill=skill_name)
+    for key, target in (("all", compiled.all_rules), ("any", compiled.any_rules)):
+        rules = spec.get(key) or []
+        if isinstance(rules, str):
+            rules = [rules]
+        for rule in rules:
+            target.append(parse_screen_rule(rule))
+    if not compiled.all_rules and not compiled.any_rules:
+        return None
+    return compiled
+
+
+def compute_screen_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """Add every ``SCREEN_FEATURES`` column to a long (code, date) bar panel.
+
+    ``bars`` needs ``code``, ``date``, ``open``, ``high``, ``low``, ``close``
+    and ``volume``; a copy sorted by code and date is returned.
+    Volume ratio and the 20-day high/low use the bars *before* the current
+    one, matching how the skills describe them (today vs. recent average).
+    """
+    df = bars.sort_values(["code", "date"], kind="mergesort").reset_index(drop=True)
+    for column in ("open", "high", "low", "close", "volume", "amount", "pct_chg"):
+        if column not in df.columns:
+            df[column] = np.nan
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+
+    grouped = df.groupby("code", sort=False)
+    close = df["close"]
+
+    def rolling(column: str, window: int, how: str, shift: int = 0) -> pd.Series:
+        series = grouped[column].shift(shift) if shift else df[column]
+        roll = series.groupby(df["code"], sort=False).rolling(window, min_periods=window)
+        return getattr(roll, how)().reset_index(level=0, drop=True)
+
+    for window in (5, 10, 20, 60):
+        df[f"ma{window}"] = rolling("close", window, "mean")
+    df["vol_ma5"] = rolling("volume", 5, "mean", shift=1)
+    df["volume_ratio"] = df["volume"] / df["vol_ma5"].replace(0, np.nan)
+    for window in (5, 10, 20):
+        ma = df[f"ma{window}"]
+        df[f"bias_ma{window}"] = (close - ma) / ma.replace(0, np.nan) * 100
+    df["high_20"] = rolling("high", 20, "max", shift=1)
+    df["low_20"] = rolling("low", 20, "min", shift=1)
+    df["drop_from_high_20"] = (df["high_20"] - close) / df["high_20"].replace(0, np.nan) * 100
+    df["ret_5"] = grouped["close"].pct_change(5, fill_method=None) * 100
+    df["ret_20"] = grouped["close"].pct_change(20, fill_method=None) * 100
+    df["ma20_slope"] = df.groupby("code", sort=False)["ma20"].pct_change(5, fill_method=None) * 100
+    day_range = (df["high"] - df["low"]).replace(0, np.nan)
+    df["close_position"] = (close - df["low"]) / day_range
+    return df
+
+
+def _rule_mask(df: pd.DataFrame, rule: ScreenRule) -> pd.Series:
+    lhs = df[rule.lhs]
+    rhs = df[rule.rhs] * rule.factor if rule.rhs_is_feature else pd.Series(
+        float(rule.rhs) * rule.factor, index=df.index
+    )
+    if rule.op == ">":
+        mask = lhs > rhs
+    elif rule.op == ">=":
+        mask = lhs >= rhs
+    elif rule.op == "<":
+        mask = lhs < rhs
+    elif rule.op == "<=":
+        mask = lhs <= rhs
+    else:
+        codes = df["code"]
+        prev_lhs = lhs.groupby(codes, sort=False).shift(1)
+        prev_rhs = rhs.groupby(codes, sort=False).shift(1)
+        if rule.op == "crosses_above":
+            mask = (prev_lhs <= prev_rhs) & (lhs > rhs)
+        else:
+            mask = (prev_lhs >= prev_rhs) & (lhs < rhs)
+    # NaN comparisons are already False; make that explicit for the rolling any
+    mask = mask.fillna(False).astype(bool)
+    if rule.within > 1:
+        mask = (
+            mask.astype(np.int8)
+            .groupby(df["code"], sort=False)
+            .rolling(rule.within, min_periods=1)
+            .max()
+            .reset_index(level=0, drop=True)
+            .astype(bool)
+        )
+    return mask
+
+
+def _screen_mask(df: pd.DataFrame, screen: CompiledScreen) -> pd.Series:
+    mask = pd.Series(True, index=df.index)
+    for rule in screen.all_rules:
+        mask &= _rule_mask(df, rule)
+    if screen.any_rules:
+        any_mask = pd.Series(False, index=df.index)
+        for rule in screen.any_rules:
+            any_mask |= _rule_mask(df, rule)
+        mask &= any_mask
+    return mask
+
+
+def screen_bars(
+    bars: pd.DataFrame,
+    screens: Sequence[CompiledScreen],
+    max_stale_days: int = 5,
+) -> ScreenResult:
+    """Evaluate ``screens`` on the latest bar of every code in ``bars``.
+
+    Codes whose latest bar is more than ``max_stale_days`` calendar days
+    older than the newest bar in the panel (suspended / not refreshed) are
+    excluded from the hits.
+    """
+    if bars is None or bars.empty or not screens:
+        universe = 0 if bars is None or bars.empty else int(bars["code"].nunique())
+        return ScreenResult(as_of=None, universe_size=universe)
+
+    df = compute_screen_features(bars)
+    dates = pd.to_datetime(df["date"])
+    as_of_ts = dates.max()
+    is_latest = df["code"].ne(df["code"].shift(-1))
+    fresh = is_latest & (dates >= as_of_ts - pd.Timedelta(days=max_stale_days))
+
+    result = ScreenResult(as_of=as_of_ts.date(), universe_size=int(is_latest.sum()))
+    for screen in screens:
+        matched = df.loc[fresh & _screen_mask(df, screen), "code"]
+        result.hits[screen.skill] = sorted(str(code) for code in matched)
+    return result
+
+
+def compile_skill_screens(skills: Iterable[object]) -> List[CompiledScreen]:
+    """Compile the ``screen`` sections of ``skills``; invalid ones are skipped with a warning."""
+    screens: List[CompiledScreen] = []
+    for skill in skills:
+        spec = getattr(skill, "screen", None)
+        if not spec:
+            continue
+        try:
+            screen = compile_screen(skill.name, spec)
+        except ValueError as exc:
+            logger.warning(f"Skipping screen of skill {skill.name}: {exc}")
+            continue
+        if screen is not None:
+            screens.append(screen)
+    return screens
+
+
+def _lookback_start(as_of: date, lookback_bars: int) -> date:
+    # ~250 trading days per 365 calendar days, plus holiday slack
+    return as_of - timedelta(days=int(lookback_bars * 1.5) + 10)
+
+
+def screen_skills(
+    skills: Iterable[object],
+    codes: Optional[List[str]] = None,
+    db=None,
+    as_of: Optional[date] = None,
+    lookback_bars: int = _DEFAULT_LOOKBACK_BARS,
+    max_stale_days: int = 5,
+) -> Tuple[ScreenResult, List[CompiledScreen]]:
+    """Screen cached daily bars for every skill that defines ``screen:`` rules.
+
+    Args:
+        skills: Skills to evaluate (those without ``screen`` are ignored).
+        codes: Restrict the universe; None screens every stock in the database.
+        db: ``DatabaseManager``; defaults to the shared instance.
+        as_of: Last bar date to consider; defaults to today.
+        lookback_bars: Bars of history loaded per stock.
+        max_stale_days: See :func:`screen_bars`.
+
+    Returns:
+        ``(result, compiled_screens)``.
+    """
+    screens = compile_skill_screens(skills)
+    if not screens:
+        return ScreenResult(as_of=None, universe_size=0), screens
+
+    if db is None:
+        from src.storage import get_db
+
+        db = get_db()
+    as_of = as_of or date.today()
+    bars = db.get_daily_panel(_lookback_start(as_of, lookback_bars), end_date=as_of, codes=codes)
+    result = screen_bars(bars, screens, max_stale_days=max_stale_days)
+    logger.info(
+        "[Screener] %d stocks screened as of %s: %s",
+        result.universe_size,
+        result.as_of,
+        ", ".join(f"{name}={len(hit)}" for name, hit in result.hits.items()) or "no screens",
+    )
+    return result, screens
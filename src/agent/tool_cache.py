@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+ToolResultCache — per-analysis memo of tool results shared across agents.
+
+A single dashboard analysis fans out into several agents (technical, intel,
+risk, skill specialists, decision) that each run their own ReAct loop and
+frequently ask for the same data: the realtime quote, chip distribution,
+daily history and trend analysis of the stock under review.  The pipeline
+has usually fetched most of that already before handing off to the agents.
+
+``ToolResultCache`` is created once per orchestrator/executor run, seeded
+with whatever the pipeline already holds, and passed down to every
+``run_agent_loop`` call so that repeated tool calls are served from memory.
+Keys come from :func:`src.agent.runner._build_tool_cache_key`, so HK/A-share
+code variants resolve to the same entry.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.agent.runner import _build_tool_cache_key, resolve_tool_result_max_chars, serialize_tool_result
+from src.agent.tool_encoding import encode_tool_result
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results are deterministic for the lifetime of one analysis run.
+# Search/news tools are excluded on purpose: different agents phrase queries
+# differently and the intel agent relies on fresh results.
+SHARED_CACHEABLE_TOOLS = frozenset({
+    "get_realtime_quote",
+    "get_daily_history",
+    "get_chip_distribution",
+    "analyze_trend",
+    "get_stock_info",
+    "get_analysis_context",
+    "calculate_ma",
+    "get_volume_analysis",
+    "analyze_pattern",
+})
+
+# (tool_name, arguments, result) triples used to pre-seed a cache
+ToolSeed = Tuple[str, Dict[str, Any], Any]
+
+
+class ToolResultCache:
+    """Thread-safe memo of successful tool results for one analysis run.
+
+    Only tools listed in ``SHARED_CACHEABLE_TOOLS`` are memoized, and only
+    successful results are stored — error payloads are left to the runner's
+    non-retriable cache so transient failures can still be retried.
+    """
+
+    def __init__(self, cacheable_tools: Optional[Iterable[str]] = None):
+        self._cacheable = frozenset(cacheable_tools) if cacheable_tools is not None else SHARED_CACHEABLE_TOOLS
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.seeded = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return tool_name in self._cacheable
+
+    def get(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Return the cached serialized result, counting a hit or a miss."""
+        if not self.is_cacheable(tool_name):
+            return None
+        key = _build_tool_cache_key(tool_name, arguments)
+        if key is None:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cached
+
+    def put(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        result: Any,
+        serialized: Optional[str] = None,
+    ) -> bool:
+        """Store a successful tool result; return True when it was cached.
+
+        ``serialized`` lets the runner store the exact string it sent to the
+        LLM; otherwise the result is encoded here.
+        """
+        if not self.is_cacheable(tool_name) or result is None:
+            return False
+        if isinstance(result, dict) and result.get("error"):
+            return False
+        key = _build_tool_cache_key(tool_name, arguments)
+        if key is None:
+            return False
+        if serialized is not None:
+            result_str = serialized
+        elif isinstance(result, str):
+            result_str = result
+        else:
+            max_chars = resolve_tool_result_max_chars()
+            result_str = (
+                serialize_tool_result(result)
+                if max_chars is None
+                else encode_tool_result(tool_name, result, max_chars=max_chars)
+            )
+        with self._lock:
+            self._entries[key] = result_str
+        return True
+
+    def seed(self, entries: Optional[Iterable[ToolSeed]]) -> int:
+        """Pre-populate the cache without touching hit/miss counters."""
+        count = 0
+        for item in entries or ():
+            try:
+                tool_name, arguments, result = item
+            except (TypeError, ValueError):
+                continue
+            if self.put(tool_name, arguments, result):
+                count += 1
+        self.seeded += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate for logging and run stats."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "seeded": self.seeded,
+                "entries": len(self._entries),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @classmethod
+    def from_context(cls, context: Optional[Dict[str, Any]]) -> "ToolResultCache":
+        """Build a cache seeded from ``context["tool_result_seed"]`` when present."""
+        cache = cls()
+        if context:
+            seeded = cache.seed(context.get("tool_result_seed"))
+            if seeded:
+                logger.debug("[ToolResultCache] seeded %d tool result(s) from pipeline data", seeded)
+        return cache
+
+
+def build_pipeline_tool_seed(
+    stock_code: str,
+    *,
+    realtime_quote: Any = None,
+    chip_data: Any = None,
+    trend_result: Any = None,
+) -> List[ToolSeed]:
+    """Translate data already fetched by the pipeline into tool-shaped seed entries.
+
+    The payloads are produced by the same converters the tools use, so a
+    seeded hit is indistinguishable from a live tool call.
+    """
+    if not stock_code:
+        return []
+
+    seeds: List[ToolSeed] = []
+    arguments = {"stock_code": stock_code}
+    try:
+        if realtime_quote is not None:
+            from src.agent.tools.data_tools import realtime_quote_to_payload
+            seeds.append(("get_realtime_quote", arguments, realtime_quote_to_payload(realtime_quote)))
+        if chip_data is not None:
+            from src.agent.tools.data_tools import chip_distribution_to_payload
+            seeds.append(("get_chip_distribution", arguments, chip_distribution_to_payload(chip_data)))
+        if trend_result is not None:
+            from src.agent.tools.analysis_tools import trend_result_to_payload
+            seeds.append(("analyze_trend", arguments, trend_result_to_payload(trend_result)))
+    except Exception as exc:
+        # Seeding is an optimisation only; agents can still fetch live data.
+        logger.debug("[ToolResultCache] failed to build pipeline seed for %s: %s", stock_code, exc)
+    return seeds
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Compact encoding of tool results before they enter the agent message list.
+
+Every tool message stays in ``messages`` for the rest of the ReAct loop and is
+re-sent on each later LLM step, so its size is paid once per remaining step.
+``encode_tool_result`` shrinks a result without changing its meaning:
+
+- ``None`` fields are dropped and floats are rounded
+- lists of uniform dicts (K-line bars, rankings) become a column/row table,
+  with columns that hold one value across all rows hoisted into ``const``
+- per-tool schemas drop fields the model never needs (e.g. ``data_source``
+  on every bar of ``get_daily_history``)
+- results over ``max_chars`` keep their newest table rows plus a min/max
+  summary of the omitted ones, or are clipped with a note as a last resort
+
+The output is still a JSON document, so tools and prompts that read
+``json.loads(content)["price"]`` style fields keep working.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.tokens import estimate_tokens
+
+# Minimum rows before a list of dicts is turned into a column/row table
+_TABLE_MIN_ROWS = 3
+
+# Fields dropped from each bar of get_daily_history; the response header
+# already carries the code and source
+_DAILY_HISTORY_DROP_FIELDS = frozenset({"code", "data_source", "created_at", "updated_at", "id"})
+
+
+def _round_float(value: float) -> Any:
+    if math.isnan(value) or math.isinf(value):
+        return None
+    if value == int(value) and abs(value) < 1e15:
+        return int(value)
+    magnitude = abs(value)
+    if magnitude >= 100:
+        return round(value, 2)
+    if magnitude >= 1:
+        return round(value, 3)
+    return round(value, 4)
+
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, float):
+        return _round_float(value)
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            item = _compact_value(item)
+            if item is None:
+                continue
+            compacted[key] = item
+        return compacted
+    if isinstance(value, (list, tuple)):
+        items = [_compact_value(item) for item in value]
+        return _tabulate(items) if _is_uniform_records(items) else items
+    if hasattr(value, "item") and callable(value.item):
+        # numpy scalars
+        try:
+            return _compact_value(value.item())
+        except (TypeError, ValueError):
+            return str(value)
+    return value
+
+
+def _is_uniform_records(items: List[Any]) -> bool:
+    if len(items) < _TABLE_MIN_ROWS or not all(isinstance(item, dict) for item in items):
+        return False
+    first_keys = set(items[0])
+    return bool(first_keys) and all(
+        len(set(item) ^ first_keys) <= max(1, len(first_keys) // 4) for item in items
+    )
+
+
+def _tabulate(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    columns: List[str] = []
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+
+    const: Dict[str, Any] = {}
+    varying: List[str] = []
+    for column in columns:
+        values = [record.get(column) for record in records]
+        first = values[0]
+        if all(v == first for v in values) and not isinstance(first, (dict, list)):
+            if first is not None:
+                const[column] = first
+        else:
+            varying.append(column)
+
+    table: Dict[str, Any] = {
+        "columns": varying,
+        "rows": [[record.get(column) for column in varying] for record in records],
+    }
+    if const:
+        table["const"] = const
+    return table
+
+
+def _encode_daily_history(result: Dict[str, Any]) -> Dict[str, Any]:
+    data = result.get("data")
+    if not isinstance(data, list):
+        return result
+    bars = [
+        {k: v for k, v in bar.items() if k not in _DAILY_HISTORY_DROP_FIELDS}
+        if isinstance(bar, dict) else bar
+        for bar in data
+    ]
+    encoded = {
+        k: v for k, v in result.items()
+        # these duplicate actual_records / requested_days
+        if k not in {"total_records", "effective_days"}
+    }
+    encoded["data"] = bars
+    return encoded
+
+
+# tool name -> pre-compaction reshaping of that tool's result dict
+_TOOL_SCHEMAS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "get_daily_history": _encode_daily_history,
+}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _summarize_rows(columns: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"count": len(rows)}
+    for index, column in enumerate(columns):
+        values = [row[index] for row in rows if index < len(row) and row[index] is not None]
+        if not values:
+            continue
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            summary[column] = {"min": min(values), "max": max(values)}
+        elif index == 0:
+            summary[column] = {"first": values[0], "last": values[-1]}
+    return summary
+
+
+def _find_largest_table(value: Any, path: tuple = ()) -> Optional[tuple]:
+    """Return (path, table) for the table with the most rows inside value."""
+    best = None
+    if isinstance(value, dict):
+        if isinstance(value.get("columns"), list) and isinstance(value.get("rows"), list):
+            best = (path, value)
+        for key, item in value.items():
+            found = _find_largest_table(item, path + (key,))
+            if found and (best is None or len(found[1]["rows"]) > len(best[1]["rows"])):
+                best = found
+    return best
+
+
+def _fit_to_size(encoded: Any, max_chars: int) -> str:
+    text = _dumps(encoded)
+    if len(text) <= max_chars:
+        return text
+
+    found = _find_largest_table(encoded)
+    if found is not None:
+        _, table = found
+        rows = table["rows"]
+        # Keep the newest rows (tables of bars are in chronological order)
+        keep = len(rows)
+        while keep > 1:
+            keep = max(1, keep // 2 if len(text) > 2 * max_chars else keep - max(1, keep // 10))
+            table["rows"] = rows[-keep:]
+            table["omitted"] = _summarize_rows(table["columns"], rows[:-keep])
+            text = _dumps(encoded)
+            if len(text) <= max_chars:
+                return text
+
+    def _wrap(partial: str) -> str:
+        return _dumps({"truncated": True, "original_chars": len(text), "partial": partial})
+
+    # Escaping (quotes, backslashes, control chars) can grow the clip once it
+    # is re-encoded, so shrink it until the wrapped note fits
+    keep = max(0, max_chars - len(_wrap("")))
+    wrapped = _wrap(text[:keep])
+    while keep > 0 and len(wrapped) > max_chars:
+        keep = max(0, keep - max(1, len(wrapped) - max_chars))
+        wrapped = _wrap(text[:keep])
+    return wrapped
+
+
+def encode_tool_result(tool_name: str, result: Any, max_chars: int = 0) -> str:
+    """Serialize a tool result compactly for the LLM.
+
+    Strings pass through unchanged; ``max_chars <= 0`` disables the size cap.
+    """
+    if result is None:
+        return json.dumps({"result": None})
+    if isinstance(result, str):
+        return result
+    if not isinstance(result, (dict, list, tuple)):
+        if hasattr(result, "__dict__"):
+            result = {k: v for k, v in result.__dict__.items() if not k.startswith("_")}
+        else:
+            return str(result)
+
+    schema = _TOOL_SCHEMAS.get(tool_name)
+    if schema is not None and isinstance(result, dict) and not result.get("error"):
+        result = schema(result)
+
+    try:
+        encoded = _compact_value(result)
+        if max_chars and max_chars > 0:
+            return _fit_to_size(encoded, max_chars)
+        return _dumps(encoded)
+    except (TypeError, ValueError):
+        return str(result)
+
+
+def tool_encoding_report(tool_calls_log: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate raw vs encoded result sizes recorded in a tool-call log."""
+    entries = [e for e in tool_calls_log if "raw_length" in e]
+    raw_chars = sum(e["raw_length"] for e in entries)
+    encoded_chars = sum(e.get("result_length", 0) for e in entries)
+    return {
+        "tool_results": len(entries),
+        "raw_chars": raw_chars,
+        "encoded_chars": encoded_chars,
+        "encoded_tokens": sum(e.get("result_tokens", 0) for e in entries),
+        "saved_ratio": round(1 - encoded_chars / raw_chars, 4) if raw_chars else 0.0,
+    }
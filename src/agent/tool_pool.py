@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+ToolExecutionPool — process-wide, bounded thread pool for agent tool calls.
+
+Every ReAct step used to spin up its own ``ThreadPoolExecutor`` for parallel
+tool calls and tear it down afterwards, so concurrent chats and multi-agent
+runs paid thread start-up on every step and had no global cap on tool
+threads.  All ``run_agent_loop`` calls now share one pool:
+
+- ``AGENT_TOOL_POOL_WORKERS`` caps tool threads across all sessions; extra
+  calls wait in the pool's queue instead of adding threads
+- each loop opens a :class:`ToolSession` that runs at most
+  ``AGENT_TOOL_SESSION_CONCURRENCY`` of its calls at once and queues the
+  rest, so one agent fanning out many tools cannot occupy the whole pool
+- timed-out calls are cancelled when they have not started yet; running
+  ones are counted and left to finish on their worker, but give their
+  session slot back at once so a hung tool cannot stall later steps
+- :meth:`ToolSession.started_at` tells callers when a call actually began
+  running, so per-call timeouts exclude time spent queued
+
+``stats()`` exposes queue depth, running calls and saturation counters.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_WORKERS = 16
+_DEFAULT_MAX_PER_SESSION = 5
+
+_WorkItem = Tuple[Callable[..., Any], Tuple[Any, ...], Future]
+
+
+class ToolSession:
+    """Per-loop handle that limits how many of its tool calls run at once."""
+
+    def __init__(self, pool: "ToolExecutionPool", max_concurrency: int):
+        self._pool = pool
+        self.max_concurrency = max(1, max_concurrency)
+        self._active = 0
+        self._waiting: Deque[_WorkItem] = deque()
+        # monotonic start time of each running call
+        self._started: Dict[Future, float] = {}
+        # calls given up on whose slot was already released
+        self._abandoned: Set[Future] = set()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Schedule ``fn(*args)`` and return its future."""
+        future: Future = Future()
+        item = (fn, args, future)
+        pool = self._pool
+        with pool._lock:
+            pool._stats["submitted"] += 1
+            if self._active >= self.max_concurrency:
+                self._waiting.append(item)
+                pool._waiting += 1
+                return future
+            self._active += 1
+        pool._start(self, item)
+        return future
+
+    def started_at(self, future: Future) -> Optional[float]:
+        """``time.monotonic()`` at which ``future``'s call started running, or None."""
+        with self._pool._lock:
+            return self._started.get(future)
+
+    def abandon(self, futures: Iterable[Future]) -> None:
+        """Give up on unfinished calls after a timeout.
+
+        Calls that have not started are cancelled. Running ones keep their
+        worker until they return and are counted only as ``timed_out``; their
+        session slot is released now so the session's next calls can start.
+        """
+        pool = self._pool
+        to_start: List[_WorkItem] = []
+        with pool._lock:
+            waiting = {item[2] for item in self._waiting}
+            holding_slot = []
+            for future in futures:
+                if future.done() or future in self._abandoned:
+                    continue
+                if future.cancel():
+                    pool._stats["cancelled"] += 1
+                else:
+                    pool._stats["timed_out"] += 1
+                if future not in waiting:
+                    holding_slot.append(future)
+            kept = deque(item for item in self._waiting if not item[2].cancelled())
+            pool._waiting -= len(self._waiting) - len(kept)
+            self._waiting = kept
+            for future in holding_slot:
+                self._abandoned.add(future)
+                self._started.pop(future, None)
+                next_item = self._next_locked()
+                if next_item is not None:
+                    to_start.append(next_item)
+        for item in to_start:
+            pool._start(self, item)
+
+    def _finish_locked(self, future: Future) -> Optional[_WorkItem]:
+        """Release ``future``'s slot and return the session's next call, if any."""
+        self._started.pop(future, None)
+        if future in self._abandoned:
+            # abandon() already handed the slot on
+            self._abandoned.discard(future)
+            return None
+        return self._next_locked()
+
+    def _next_locked(self) -> Optional[_WorkItem]:
+        while self._waiting:
+            item = self._waiting.popleft()
+            self._pool._waiting -= 1
+            if not item[2].cancelled():
+                return item
+        self._active -= 1
+        return None
+
+
+class ToolExecutionPool:
+    """Shared, bounded executor for agent tool calls.
+
+    Args:
+        max_workers: Tool threads shared by all sessions.
+        max_per_session: Default per-session concurrency limit.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        max_per_session: int = _DEFAULT_MAX_PER_SESSION,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_per_session = max(1, max_per_session)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent-tool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._waiting = 0
+        self._stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "timed_out": 0,
+            "saturated": 0,
+            "peak_queued": 0,
+        }
+
+    def session(self, max_concurrency: Optional[int] = None) -> ToolSession:
+        """Open a session; ``max_concurrency`` defaults to the pool's per-session limit."""
+        return ToolSession(self, max_concurrency or self.max_per_session)
+
+    def _start(self, session: ToolSession, item: _WorkItem) -> None:
+        with self._lock:
+            self._queued += 1
+            if self._running + self._queued > self.max_workers:
+                # All workers busy: the call waits in the shared queue
+                self._stats["saturated"] += 1
+                self._stats["peak_queued"] = max(
+                    self._stats["peak_queued"], self._running + self._queued - self.max_workers
+                )
+        try:
+            self._executor.submit(self._run, session, item)
+        except RuntimeError as exc:
+            # Pool shut down: fail this call and move on to the session's next one
+            with self._lock:
+                self._queued -= 1
+            if item[2].set_running_or_notify_cancel():
+                item[2].set_exception(exc)
+            with self._lock:
+                next_item = session._finish_locked(item[2])
+            if next_item is not None:
+                self._start(session, next_item)
+
+    def _run(self, session: ToolSession, item: _WorkItem) -> None:
+        fn, args, future = item
+        with self._lock:
+            self._queued -= 1
+        try:
+            if future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._running += 1
+                    session._started[future] = time.monotonic()
+                try:
+                    result = fn(*args)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                    outcome = "failed"
+                else:
+                    future.set_result(result)
+                    outcome = "completed"
+                with self._lock:
+                    self._running -= 1
+                    if future not in session._abandoned:
+                        self._stats[outcome] += 1
+        finally:
+            with self._lock:
+                next_item = session._finish_locked(future)
+            if next_item is not None:
+                self._start(session, next_item)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool gauges (``running``, ``queued``, ``session_waiting``) and counters."""
+        with self._lock:
+            return {
+                **self._stats,
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "session_waiting": self._waiting,
+                "utilization": round(min(self._running, self.max_workers) / self.max_workers, 2),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting new calls; calls already queued still run."""
+        self._executor.shutdown(wait=wait)
+
+
+_pool: Optional[ToolExecutionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ToolExecutionPool:
+    """Return the process-wide pool, created from config on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from src.config import get_config
+
+                config = get_config()
+                _pool = ToolExecutionPool(
+                    max_workers=getattr(config, "agent_tool_pool_workers", _DEFAULT_MAX_WORKERS),
+                    max_per_session=getattr(
+                        config, "agent_tool_session_concurrency", _DEFAULT_MAX_PER_SESSION
+                    ),
+                )
+    return _pool
+
+
+def reset_tool_pool() -> None:
+    """Drop the process-wide pool (mainly for tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
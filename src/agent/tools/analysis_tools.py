@@ -7,7 +7,7 @@ Tools:
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 from src.agent.tools.registry import ToolParameter, ToolDefinition
 
@@ -22,27 +22,8 @@ def _fetch_trend_data(stock_code: str):
     return df
 
 
-def _handle_analyze_trend(stock_code: str) -> dict:
-    """Run technical trend analysis on a stock."""
-    from src.stock_analyzer import StockTrendAnalyzer
-
-    if not (stock_code and str(stock_code).strip()):
-        return {"error": "stock_code is required"}
-
-    df = _fetch_trend_data(stock_code)
-    if df is None or df.empty:
-        return {"error": f"No historical data available for trend analysis on {stock_code}"}
-
-    if len(df) < 20:
-        return {"error": f"Insufficient data for trend analysis on {stock_code} (need >= 20 days)"}
-
-    analyzer = StockTrendAnalyzer()
-    try:
-        result = analyzer.analyze(df, stock_code)
-    except Exception:
-        logger.warning("analyze_trend(%s): Trend analysis failed", stock_code, exc_info=True)
-        return {"error": f"Trend analysis failed for {stock_code}"}
-
+def trend_result_to_payload(result: Any) -> dict:
+    """Convert a ``TrendAnalysisResult`` into the ``analyze_trend`` tool payload."""
     return {
         "code": result.code,
         "trend_status": result.trend_status.value,
@@ -80,6 +61,30 @@ def _handle_analyze_trend(stock_code: str) -> dict:
     }
 
 
+def _handle_analyze_trend(stock_code: str) -> dict:
+    """Run technical trend analysis on a stock."""
+    from src.stock_analyzer import StockTrendAnalyzer
+
+    if not (stock_code and str(stock_code).strip()):
+        return {"error": "stock_code is required"}
+
+    df = _fetch_trend_data(stock_code)
+    if df is None or df.empty:
+        return {"error": f"No historical data available for trend analysis on {stock_code}"}
+
+    if len(df) < 20:
+        return {"error": f"Insufficient data for trend analysis on {stock_code} (need >= 20 days)"}
+
+    analyzer = StockTrendAnalyzer()
+    try:
+        result = analyzer.analyze(df, stock_code)
+    except Exception:
+        logger.warning("analyze_trend(%s): Trend analysis failed", stock_code, exc_info=True)
+        return {"error": f"Trend analysis failed for {stock_code}"}
+
+    return trend_result_to_payload(result)
+
+
 analyze_trend_tool = ToolDefinition(
     name="analyze_trend",
     description="Run comprehensive technical trend analysis on a stock. "
@@ -232,17 +232,8 @@ def _compact_portfolio_risk(risk: dict, top_n: int = 10) -> dict:
 # get_realtime_quote
 # ============================================================
 
-def _handle_get_realtime_quote(stock_code: str) -> dict:
-    """Get real-time stock quote."""
-    manager = _get_fetcher_manager()
-    quote = manager.get_realtime_quote(stock_code)
-    if quote is None:
-        return {
-            "error": f"No realtime quote available for {stock_code}",
-            "retriable": False,
-            "note": "All data sources unavailable (network or circuit-breaker). Skip this tool and proceed with historical data only.",
-        }
-
+def realtime_quote_to_payload(quote: Any) -> dict:
+    """Convert a realtime quote object into the ``get_realtime_quote`` tool payload."""
     return {
         "code": quote.code,
         "name": quote.name,
@@ -267,6 +258,20 @@ def _handle_get_realtime_quote(stock_code: str) -> dict:
     }
 
 
+def _handle_get_realtime_quote(stock_code: str) -> dict:
+    """Get real-time stock quote."""
+    manager = _get_fetcher_manager()
+    quote = manager.get_realtime_quote(stock_code)
+    if quote is None:
+        return {
+            "error": f"No realtime quote available for {stock_code}",
+            "retriable": False,
+            "note": "All data sources unavailable (network or circuit-breaker). Skip this tool and proceed with historical data only.",
+        }
+
+    return realtime_quote_to_payload(quote)
+
+
 get_realtime_quote_tool = ToolDefinition(
     name="get_realtime_quote",
     description="Get real-time stock quote including price, change%, volume ratio, "
@@ -368,14 +373,8 @@ get_daily_history_tool = ToolDefinition(
 # get_chip_distribution
 # ============================================================
 
-def _handle_get_chip_distribution(stock_code: str) -> dict:
-    """Get chip distribution data."""
-    manager = _get_fetcher_manager()
-    chip = manager.get_chip_distribution(stock_code)
-
-    if chip is None:
-        return {"error": f"No chip distribution data available for {stock_code}"}
-
+def chip_distribution_to_payload(chip: Any) -> dict:
+    """Convert a ``ChipDistribution`` into the ``get_chip_distribution`` tool payload."""
     return {
         "code": chip.code,
         "date": chip.date,
@@ -391,6 +390,17 @@ def _handle_get_chip_distribution(stock_code: str) -> dict:
     }
 
 
+def _handle_get_chip_distribution(stock_code: str) -> dict:
+    """Get chip distribution data."""
+    manager = _get_fetcher_manager()
+    chip = manager.get_chip_distribution(stock_code)
+
+    if chip is None:
+        return {"error": f"No chip distribution data available for {stock_code}"}
+
+    return chip_distribution_to_payload(chip)
+
+
 get_chip_distribution_tool = ToolDefinition(
     name="get_chip_distribution",
     description="Get chip distribution analysis for a stock. Returns profit ratio, "
@@ -22,6 +22,7 @@ import litellm
 from json_repair import repair_json
 from litellm import Router
 
+from src.utils.tokens import estimate_tokens
 from src.agent.llm_adapter import get_thinking_extra_body
 from src.agent.skills.defaults import CORE_TRADING_SKILL_POLICY_ZH
 from src.config import (
@@ -33,6 +34,8 @@ from src.config import (
     normalize_litellm_temperature,
     resolve_news_window_days,
 )
+from src.llm_routing import get_llm_router
+from src.llm_scheduler import LLMQueueTimeout, get_llm_scheduler
 from src.storage import persist_llm_usage
 from src.data.stock_mapping import STOCK_NAME_MAP
 from src.report_language import (
@@ -1896,6 +1899,27 @@ class GeminiAnalyzer:
         effective_kwargs.update(extra_litellm_params(model, config))
         return litellm.completion(**effective_kwargs)
 
+    def _probe_litellm_model(
+        self,
+        model: str,
+        config: Config,
+        use_channel_router: bool,
+        router_model_names: set[str],
+    ) -> None:
+        """Minimal completion used by the LLM router to check a parked model."""
+        self._dispatch_litellm_completion(
+            model,
+            {
+                "model": model,
+                "messages": [{"role": "user", "content": "ping"}],
+                "max_tokens": 1,
+                "timeout": 15.0,
+            },
+            config=config,
+            use_channel_router=use_channel_router,
+            router_model_names=router_model_names,
+        )
+
     def _normalize_usage(self, usage_obj: Any) -> Dict[str, Any]:
         """Normalize usage objects from LiteLLM responses/chunks."""
         if not usage_obj:
@@ -2045,8 +2069,29 @@ class GeminiAnalyzer:
         last_usage: Dict[str, Any] = {}
         effective_system_prompt = system_prompt or self.TEXT_SYSTEM_PROMPT
         router_model_names = set(get_configured_llm_models(config.llm_model_list))
+        health_router = get_llm_router(config)
+        if health_router is not None:
+            health_router.set_probe(
+                lambda probe_model: self._probe_litellm_model(
+                    probe_model, config, use_channel_router, router_model_names,
+                )
+            )
+            models_to_try = health_router.order(models_to_try)
+        scheduler = get_llm_scheduler(config)
+        estimated_tokens = (
+            estimate_tokens(effective_system_prompt) + estimate_tokens(prompt) + int(max_tokens)
+        )
         for model in models_to_try:
+            if health_router is not None:
+                health_router.begin_attempt(model)
+            call_started = time.monotonic()
+            responded = False
+            ticket = None
+            used_tokens: Optional[int] = None
             try:
+                if scheduler is not None:
+                    ticket = scheduler.acquire(model, estimated_tokens)
+                    call_started = time.monotonic()
                 model_short = model.split("/")[-1] if "/" in model else model
                 extra = get_thinking_extra_body(model_short)
                 call_kwargs: Dict[str, Any] = {
@@ -2105,6 +2150,10 @@ class GeminiAnalyzer:
                         )
 
                 if _stream_text is not None:
+                    responded = True
+                    used_tokens = _stream_usage.get("total_tokens") or None
+                    if health_router is not None:
+                        health_router.record_success(model, time.monotonic() - call_started)
                     last_response_text = _stream_text
                     last_model = model
                     last_usage = _stream_usage
@@ -2123,6 +2172,10 @@ class GeminiAnalyzer:
                 if response and response.choices and response.choices[0].message.content:
                     content = response.choices[0].message.content
                     usage = self._normalize_usage(getattr(response, "usage", None))
+                    responded = True
+                    used_tokens = usage.get("total_tokens") or None
+                    if health_router is not None:
+                        health_router.record_success(model, time.monotonic() - call_started)
                     last_response_text = content
                     last_model = model
                     last_usage = usage
@@ -2133,8 +2186,15 @@ class GeminiAnalyzer:
 
             except Exception as e:
                 logger.warning(f"[LiteLLM] {model} failed: {e}")
+                # Validator rejections mean the channel answered; only transport /
+                # provider errors count against its health
+                if health_router is not None and not responded and not isinstance(e, LLMQueueTimeout):
+                    health_router.record_failure(model, e, time.monotonic() - call_started)
                 last_error = e
                 continue
+            finally:
+                if scheduler is not None:
+                    scheduler.release(ticket, used_tokens)
 
         raise _AllModelsFailedError(
             f"All LLM models failed (tried {len(models_to_try)} model(s)). Last error: {last_error}",
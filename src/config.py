@@ -652,6 +652,15 @@ class Config:
     llm_channels: List[Dict[str, Any]] = field(default_factory=list)
     # Pre-built LiteLLM Router model_list (populated from channels, YAML, or legacy keys)
     llm_model_list: List[Dict[str, Any]] = field(default_factory=list)
+    # Adaptive fallback ordering by per-model latency / error rate / 429s (src/llm_routing.py)
+    llm_adaptive_routing: bool = False
+    llm_breaker_failure_threshold: int = 3  # Consecutive failures before a model is parked
+    llm_breaker_cooldown_seconds: float = 120.0  # Parked time before a half-open retry
+    llm_health_probe_interval: float = 0.0  # Background probe of parked models; 0 disables
+    # Process-wide LLM admission budgets (src/llm_scheduler.py), e.g. "gemini:rpm=15,tpm=1000000;openai:concurrency=4"
+    llm_provider_limits: str = ""
+    llm_default_concurrency: int = 0  # One shared concurrency cap for all models without a provider entry; 0 = unlimited
+    llm_scheduler_max_wait: float = 300.0  # Max seconds a request queues for a slot before failing over
 
     # Multi-key support: each list is parsed from *_API_KEYS (comma-separated) with single-key fallback
     gemini_api_keys: List[str] = field(default_factory=list)
@@ -729,6 +738,13 @@ class Config:
     agent_event_monitor_enabled: bool = False  # Enable periodic event-driven alert checks in schedule mode
     agent_event_monitor_interval_minutes: int = 5  # Polling interval for event monitor background checks
     agent_event_alert_rules_json: str = ""  # JSON array of serialized EventMonitor rules
+    agent_chat_history_turns: int = 6  # Recent chat turns sent verbatim; older turns are rolled into a summary
+    agent_chat_history_token_budget: int = 6000  # Approximate token cap for history (summary + recent turns) per request
+    agent_compact_tool_results: bool = True  # Encode tool results compactly (tables, rounding, no nulls) before feeding the LLM
+    agent_tool_result_max_chars: int = 8000  # Per tool result size cap after encoding; 0 disables the cap
+    agent_tool_pool_workers: int = 16  # Tool threads shared by all concurrent agent sessions
+    agent_tool_session_concurrency: int = 5  # Max tool calls one agent loop runs at once on the shared pool
+    agent_tool_timeout_seconds: int = 0  # Per tool call timeout in seconds; 0 leaves only the loop budget
 
     # === 通知配置（可同时配置多个，全部推送）===
     
@@ -802,6 +818,11 @@ class Config:
     notification_min_severity: str = ""
     notification_daily_digest_enabled: bool = False
 
+    # 多渠道并发推送：线程池上限（1 为逐个发送）、单渠道超时（秒，0 不限时）与失败重试次数
+    notification_max_workers: int = 4
+    notification_channel_timeout_seconds: int = 60
+    notification_channel_retries: int = 0
+
     # 单股推送模式：每分析完一只股票立即推送，而不是汇总后推送
     single_stock_notify: bool = False
 
@@ -842,6 +863,8 @@ class Config:
     markdown_to_image_channels: List[str] = field(default_factory=list)  # 逗号分隔：telegram,wechat,custom,email
     markdown_to_image_max_chars: int = 15000  # 超过此长度不转换，避免超大图片
     md2img_engine: str = "wkhtmltoimage"  # wkhtmltoimage | markdown-to-file (Issue #455, better emoji support)
+    md2img_max_workers: int = 2  # 同时运行的转图子进程上限
+    md2img_cache_size: int = 32  # 按内容哈希缓存的 PNG 数量，0 关闭缓存
 
     # 实时行情预取（Issue #455）：设为 false 可禁用，避免 efinance/akshare_em 全市场拉取
     prefetch_realtime_quotes: bool = True
@@ -852,6 +875,11 @@ class Config:
     sqlite_busy_timeout_ms: int = 5000
     sqlite_write_retry_max: int = 3
     sqlite_write_retry_base_delay: float = 0.1
+    # 写后缓冲：LLM 用量、对话消息、新闻情报、基本面快照合并成批量事务写入
+    db_write_behind_enabled: bool = False
+    db_write_behind_batch_size: int = 200
+    db_write_behind_flush_interval: float = 1.0
+    db_write_behind_max_pending: int = 2000
 
     # 是否保存分析上下文快照（用于历史回溯）
     save_context_snapshot: bool = True
@@ -877,10 +905,19 @@ class Config:
     schedule_enabled: bool = False            # 是否启用定时任务
     schedule_time: str = "18:00"              # 每日推送时间（HH:MM 格式）
     schedule_run_immediately: bool = True     # 启动时是否立即执行一次
+    # 按市场收盘分别调度：A股/港股/美股各自在收盘后 SCHEDULE_MARKET_DELAY_MINUTES 分钟执行，替代 SCHEDULE_TIME
+    schedule_by_market: bool = False
+    schedule_market_delay_minutes: int = 30
+    # 定时执行前 N 分钟预热实时行情 / 日线缺口 / 基本面缓存，0 表示关闭
+    schedule_warmup_minutes: int = 0
     run_immediately: bool = True              # 启动时是否立即执行一次（非定时模式）
     market_review_enabled: bool = True        # 是否启用大盘复盘
     # 大盘复盘市场区域：cn(A股)、us(美股)、both(两者)，us 适合仅关注美股的用户
     market_review_region: str = "cn"
+    # 大盘复盘与个股分析并行执行：共享数据源限流/熔断与 LLM 并发预算，合并推送前统一等待
+    market_review_concurrent: bool = False
+    # 大盘概览各数据块（指数/涨跌统计/板块/新闻）并行获取时的单项超时（秒），<=0 表示不限时
+    market_review_part_timeout_seconds: float = 20.0
     # 交易日检查：默认启用，非交易日跳过执行；设为 false 或 --force-run 可强制执行（Issue #373）
     trading_day_check_enabled: bool = True
 
@@ -918,6 +955,10 @@ class Config:
     fundamental_cache_ttl_seconds: int = 120
     # 基本面缓存最大条目数（避免长时间运行内存增长）
     fundamental_cache_max_entries: int = 256
+    # 基本面数据集持久化缓存有效期（小时），跨进程复用 AkShare 全市场表，0 表示关闭
+    fundamental_store_ttl_hours: int = 24
+    # 基本面超时保护调用共享线程池大小（排队上限为其 2 倍，超出时直接降级）
+    fundamental_timeout_workers: int = 8
 
     # === Portfolio PR2: import/risk/fx settings ===
     portfolio_risk_concentration_alert_pct: float = 35.0
@@ -954,6 +995,9 @@ class Config:
     bot_rate_limit_requests: int = 10     # 频率限制：窗口内最大请求数
     bot_rate_limit_window: int = 60       # 频率限制：窗口时间（秒）
     bot_admin_users: List[str] = field(default_factory=list)  # 管理员用户 ID 列表
+    bot_max_workers: int = 4              # 命令工作池并发数（Stream / 延迟响应平台）
+    bot_max_pending: int = 50             # 工作池排队上限，超出直接回复繁忙
+    bot_max_pending_per_user: int = 3     # 单个会话未完成命令上限
     
     # 飞书机器人（事件订阅）- 已有 feishu_app_id, feishu_app_secret
     feishu_verification_token: Optional[str] = None  # 事件订阅验证 Token
@@ -1393,6 +1437,38 @@ class Config:
             llm_models_source=llm_models_source,
             llm_channels=llm_channels,
             llm_model_list=llm_model_list,
+            llm_adaptive_routing=os.getenv('LLM_ADAPTIVE_ROUTING', 'false').lower() == 'true',
+            llm_breaker_failure_threshold=parse_env_int(
+                os.getenv('LLM_BREAKER_FAILURE_THRESHOLD'),
+                3,
+                field_name='LLM_BREAKER_FAILURE_THRESHOLD',
+                minimum=1,
+            ),
+            llm_breaker_cooldown_seconds=parse_env_float(
+                os.getenv('LLM_BREAKER_COOLDOWN_SECONDS'),
+                120.0,
+                field_name='LLM_BREAKER_COOLDOWN_SECONDS',
+                minimum=1.0,
+            ),
+            llm_health_probe_interval=parse_env_float(
+                os.getenv('LLM_HEALTH_PROBE_INTERVAL'),
+                0.0,
+                field_name='LLM_HEALTH_PROBE_INTERVAL',
+                minimum=0.0,
+            ),
+            llm_provider_limits=os.getenv('LLM_PROVIDER_LIMITS', '').strip(),
+            llm_default_concurrency=parse_env_int(
+                os.getenv('LLM_DEFAULT_CONCURRENCY'),
+                0,
+                field_name='LLM_DEFAULT_CONCURRENCY',
+                minimum=0,
+            ),
+            llm_scheduler_max_wait=parse_env_float(
+                os.getenv('LLM_SCHEDULER_MAX_WAIT'),
+                300.0,
+                field_name='LLM_SCHEDULER_MAX_WAIT',
+                minimum=1.0,
+            ),
             gemini_api_keys=gemini_api_keys,
             anthropic_api_keys=anthropic_api_keys,
             openai_api_keys=openai_api_keys,
@@ -1491,6 +1567,43 @@ class Config:
                 minimum=1,
             ),
             agent_event_alert_rules_json=os.getenv('AGENT_EVENT_ALERT_RULES_JSON', ''),
+            agent_chat_history_turns=parse_env_int(
+                os.getenv('AGENT_CHAT_HISTORY_TURNS'),
+                6,
+                field_name='AGENT_CHAT_HISTORY_TURNS',
+                minimum=1,
+            ),
+            agent_chat_history_token_budget=parse_env_int(
+                os.getenv('AGENT_CHAT_HISTORY_TOKEN_BUDGET'),
+                6000,
+                field_name='AGENT_CHAT_HISTORY_TOKEN_BUDGET',
+                minimum=500,
+            ),
+            agent_compact_tool_results=os.getenv('AGENT_COMPACT_TOOL_RESULTS', 'true').lower() == 'true',
+            agent_tool_result_max_chars=parse_env_int(
+                os.getenv('AGENT_TOOL_RESULT_MAX_CHARS'),
+                8000,
+                field_name='AGENT_TOOL_RESULT_MAX_CHARS',
+                minimum=0,
+            ),
+            agent_tool_pool_workers=parse_env_int(
+                os.getenv('AGENT_TOOL_POOL_WORKERS'),
+                16,
+                field_name='AGENT_TOOL_POOL_WORKERS',
+                minimum=1,
+            ),
+            agent_tool_session_concurrency=parse_env_int(
+                os.getenv('AGENT_TOOL_SESSION_CONCURRENCY'),
+                5,
+                field_name='AGENT_TOOL_SESSION_CONCURRENCY',
+                minimum=1,
+            ),
+            agent_tool_timeout_seconds=parse_env_int(
+                os.getenv('AGENT_TOOL_TIMEOUT_SECONDS'),
+                0,
+                field_name='AGENT_TOOL_TIMEOUT_SECONDS',
+                minimum=0,
+            ),
             wechat_webhook_url=os.getenv('WECHAT_WEBHOOK_URL'),
             feishu_webhook_url=os.getenv('FEISHU_WEBHOOK_URL'),
             feishu_webhook_secret=os.getenv('FEISHU_WEBHOOK_SECRET'),
@@ -1556,6 +1669,24 @@ class Config:
                 os.getenv('NOTIFICATION_DAILY_DIGEST_ENABLED'),
                 default=False,
             ),
+            notification_max_workers=parse_env_int(
+                os.getenv('NOTIFICATION_MAX_WORKERS'),
+                4,
+                field_name='NOTIFICATION_MAX_WORKERS',
+                minimum=1,
+            ),
+            notification_channel_timeout_seconds=parse_env_int(
+                os.getenv('NOTIFICATION_CHANNEL_TIMEOUT_SECONDS'),
+                60,
+                field_name='NOTIFICATION_CHANNEL_TIMEOUT_SECONDS',
+                minimum=0,
+            ),
+            notification_channel_retries=parse_env_int(
+                os.getenv('NOTIFICATION_CHANNEL_RETRIES'),
+                0,
+                field_name='NOTIFICATION_CHANNEL_RETRIES',
+                minimum=0,
+            ),
             single_stock_notify=os.getenv('SINGLE_STOCK_NOTIFY', 'false').lower() == 'true',
             report_type=cls._parse_report_type(os.getenv('REPORT_TYPE', 'simple')),
             report_language=cls._parse_report_language(report_language_raw),
@@ -1583,6 +1714,12 @@ class Config:
                 minimum=1,
             ),
             md2img_engine=cls._parse_md2img_engine(os.getenv('MD2IMG_ENGINE', 'wkhtmltoimage')),
+            md2img_max_workers=parse_env_int(
+                os.getenv('MD2IMG_MAX_WORKERS'), 2, field_name='MD2IMG_MAX_WORKERS', minimum=1
+            ),
+            md2img_cache_size=parse_env_int(
+                os.getenv('MD2IMG_CACHE_SIZE'), 32, field_name='MD2IMG_CACHE_SIZE', minimum=0
+            ),
             prefetch_realtime_quotes=os.getenv('PREFETCH_REALTIME_QUOTES', 'true').lower() == 'true',
             database_path=os.getenv('DATABASE_PATH', './data/stock_analysis.db'),
             sqlite_wal_enabled=os.getenv('SQLITE_WAL_ENABLED', 'true').lower() == 'true',
@@ -1604,6 +1741,25 @@ class Config:
                 field_name='SQLITE_WRITE_RETRY_BASE_DELAY',
                 minimum=0.0,
             ),
+            db_write_behind_enabled=os.getenv('DB_WRITE_BEHIND_ENABLED', 'false').lower() == 'true',
+            db_write_behind_batch_size=parse_env_int(
+                os.getenv('DB_WRITE_BEHIND_BATCH_SIZE'),
+                200,
+                field_name='DB_WRITE_BEHIND_BATCH_SIZE',
+                minimum=1,
+            ),
+            db_write_behind_flush_interval=parse_env_float(
+                os.getenv('DB_WRITE_BEHIND_FLUSH_INTERVAL'),
+                1.0,
+                field_name='DB_WRITE_BEHIND_FLUSH_INTERVAL',
+                minimum=0.01,
+            ),
+            db_write_behind_max_pending=parse_env_int(
+                os.getenv('DB_WRITE_BEHIND_MAX_PENDING'),
+                2000,
+                field_name='DB_WRITE_BEHIND_MAX_PENDING',
+                minimum=1,
+            ),
             save_context_snapshot=os.getenv('SAVE_CONTEXT_SNAPSHOT', 'true').lower() == 'true',
             backtest_enabled=os.getenv('BACKTEST_ENABLED', 'true').lower() == 'true',
             backtest_eval_window_days=parse_env_int(os.getenv('BACKTEST_EVAL_WINDOW_DAYS'), 10, field_name='BACKTEST_EVAL_WINDOW_DAYS', minimum=1),
@@ -1629,11 +1785,31 @@ class Config:
             ).lower() == 'true',
             schedule_time=(schedule_time_value or '18:00').strip() or '18:00',
             schedule_run_immediately=schedule_run_immediately,
+            schedule_by_market=os.getenv('SCHEDULE_BY_MARKET', 'false').lower() == 'true',
+            schedule_market_delay_minutes=parse_env_int(
+                os.getenv('SCHEDULE_MARKET_DELAY_MINUTES'),
+                30,
+                field_name='SCHEDULE_MARKET_DELAY_MINUTES',
+                minimum=0,
+            ),
+            schedule_warmup_minutes=parse_env_int(
+                os.getenv('SCHEDULE_WARMUP_MINUTES'),
+                0,
+                field_name='SCHEDULE_WARMUP_MINUTES',
+                minimum=0,
+            ),
             run_immediately=legacy_run_immediately,
             market_review_enabled=os.getenv('MARKET_REVIEW_ENABLED', 'true').lower() == 'true',
             market_review_region=cls._parse_market_review_region(
                 os.getenv('MARKET_REVIEW_REGION', 'cn')
             ),
+            market_review_concurrent=os.getenv('MARKET_REVIEW_CONCURRENT', 'false').lower() == 'true',
+            market_review_part_timeout_seconds=parse_env_float(
+                os.getenv('MARKET_REVIEW_PART_TIMEOUT_SECONDS'),
+                20.0,
+                field_name='MARKET_REVIEW_PART_TIMEOUT_SECONDS',
+                minimum=0.0,
+            ),
             trading_day_check_enabled=os.getenv('TRADING_DAY_CHECK_ENABLED', 'true').lower() != 'false',
             webui_enabled=os.getenv('WEBUI_ENABLED', 'false').lower() == 'true',
             webui_host=os.getenv('WEBUI_HOST', '127.0.0.1'),
@@ -1644,6 +1820,9 @@ class Config:
             bot_rate_limit_requests=parse_env_int(os.getenv('BOT_RATE_LIMIT_REQUESTS'), 10, field_name='BOT_RATE_LIMIT_REQUESTS', minimum=1),
             bot_rate_limit_window=parse_env_int(os.getenv('BOT_RATE_LIMIT_WINDOW'), 60, field_name='BOT_RATE_LIMIT_WINDOW', minimum=1),
             bot_admin_users=[u.strip() for u in os.getenv('BOT_ADMIN_USERS', '').split(',') if u.strip()],
+            bot_max_workers=parse_env_int(os.getenv('BOT_MAX_WORKERS'), 4, field_name='BOT_MAX_WORKERS', minimum=1),
+            bot_max_pending=parse_env_int(os.getenv('BOT_MAX_PENDING'), 50, field_name='BOT_MAX_PENDING', minimum=0),
+            bot_max_pending_per_user=parse_env_int(os.getenv('BOT_MAX_PENDING_PER_USER'), 3, field_name='BOT_MAX_PENDING_PER_USER', minimum=1),
             # 飞书机器人
             feishu_verification_token=os.getenv('FEISHU_VERIFICATION_TOKEN'),
             feishu_encrypt_key=os.getenv('FEISHU_ENCRYPT_KEY'),
@@ -1703,6 +1882,18 @@ class Config:
                 field_name='FUNDAMENTAL_CACHE_MAX_ENTRIES',
                 minimum=1,
             ),
+            fundamental_store_ttl_hours=parse_env_int(
+                os.getenv('FUNDAMENTAL_STORE_TTL_HOURS'),
+                24,
+                field_name='FUNDAMENTAL_STORE_TTL_HOURS',
+                minimum=0,
+            ),
+            fundamental_timeout_workers=parse_env_int(
+                os.getenv('FUNDAMENTAL_TIMEOUT_WORKERS'),
+                8,
+                field_name='FUNDAMENTAL_TIMEOUT_WORKERS',
+                minimum=1,
+            ),
             portfolio_risk_concentration_alert_pct=parse_env_float(
                 os.getenv('PORTFOLIO_RISK_CONCENTRATION_ALERT_PCT'),
                 35.0,
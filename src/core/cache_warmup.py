@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Pre-run cache warm-up for scheduled analysis.
+
+Runs shortly before a scheduled run so the run itself mostly spends its time
+in the LLM instead of data sources:
+
+- realtime snapshot: one bulk pull fills the quote cache
+- daily bars: missing bars up to the latest reusable session are saved to the
+  database, so the pipeline's resume check skips the network
+- fundamentals: filled into the ``DataFetcherManager`` cache; only useful when
+  the same manager instance is handed to the pipeline and
+  ``FUNDAMENTAL_CACHE_TTL_SECONDS`` covers the warm-up lead
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from src.core.trading_calendar import get_effective_trading_date, get_market_for_stock
+from src.storage import get_db
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_caches(
+    config: Any,
+    stock_codes: List[str],
+    fetcher_manager: Any,
+    current_time: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Prefetch realtime quotes, daily-bar gaps and fundamentals for ``stock_codes``.
+
+    Every step is fail-open: errors are logged and counted, never raised.
+
+    Returns:
+        Counters: ``stocks``, ``realtime``, ``bars``, ``fundamentals``, ``errors``
+    """
+    stats = {"stocks": len(stock_codes), "realtime": 0, "bars": 0, "fundamentals": 0, "errors": 0}
+    if not stock_codes:
+        return stats
+
+    reference_time = current_time or datetime.now(timezone.utc)
+
+    try:
+        fetcher_manager.prefetch_stock_names(stock_codes, use_bulk=False)
+        stats["realtime"] = fetcher_manager.prefetch_realtime_quotes(stock_codes)
+    except Exception as exc:
+        stats["errors"] += 1
+        logger.warning("[预热] 实时行情预取失败: %s", exc)
+
+    db = get_db()
+    for code in stock_codes:
+        try:
+            target_date = get_effective_trading_date(
+                get_market_for_stock(code), current_time=reference_time
+            )
+            if db.has_today_data(code, target_date):
+                continue
+            df, source_name = fetcher_manager.get_daily_data(code, days=30)
+            if df is None or df.empty:
+                continue
+            db.save_daily_data(df, code, source_name)
+            stats["bars"] += 1
+        except Exception as exc:
+            stats["errors"] += 1
+            logger.warning("[预热] %s 日线补齐失败: %s", code, exc)
+
+    if getattr(config, "enable_fundamental_pipeline", False) and int(
+        getattr(config, "fundamental_cache_ttl_seconds", 0) or 0
+    ) > 0:
+        # Same budget as the pipeline: the cache key includes it
+        budget = getattr(config, "fundamental_stage_timeout_seconds", 1.5)
+        for code in stock_codes:
+            try:
+                fetcher_manager.get_fundamental_context(code, budget_seconds=budget)
+                stats["fundamentals"] += 1
+            except Exception as exc:
+                stats["errors"] += 1
+                logger.warning("[预热] %s 基本面预取失败: %s", code, exc)
+
+    logger.info(
+        "[预热] 完成: %d 只股票，实时行情 %d，补齐日线 %d，基本面 %d，失败 %d",
+        stats["stocks"], stats["realtime"], stats["bars"], stats["fundamentals"], stats["errors"],
+    )
+    return stats
@@ -223,6 +223,125 @@ _FIELD_DEFINITIONS: Dict[str, Dict[str, Any]] = {
         "validation": {"min": 0.0, "max": 2.0},
         "display_order": 5,
     },
+    "LLM_ADAPTIVE_ROUTING": {
+        "title": "Adaptive LLM Routing",
+        "description": (
+            "Reorder primary/fallback models per call by rolling latency, error rate and "
+            "rate-limit responses; models with repeated failures are parked behind a "
+            "circuit breaker and tried last."
+        ),
+        "category": "ai_model",
+        "data_type": "boolean",
+        "ui_control": "switch",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "false",
+        "options": [],
+        "validation": {},
+        "display_order": 63,
+    },
+    "LLM_BREAKER_FAILURE_THRESHOLD": {
+        "title": "LLM Breaker Threshold",
+        "description": (
+            "Consecutive failures before adaptive routing parks a model."
+        ),
+        "category": "ai_model",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "3",
+        "options": [],
+        "validation": {"min": 1, "max": 20},
+        "display_order": 64,
+    },
+    "LLM_BREAKER_COOLDOWN_SECONDS": {
+        "title": "LLM Breaker Cooldown",
+        "description": (
+            "Seconds a parked model waits before it is retried (half-open)."
+        ),
+        "category": "ai_model",
+        "data_type": "number",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "120",
+        "options": [],
+        "validation": {"min": 1, "max": 3600},
+        "display_order": 65,
+    },
+    "LLM_HEALTH_PROBE_INTERVAL": {
+        "title": "LLM Health Probe Interval",
+        "description": (
+            "Seconds between background one-token probes of parked models, so recovery "
+            "checks do not run on user requests. 0 disables probing."
+        ),
+        "category": "ai_model",
+        "data_type": "number",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "0",
+        "options": [],
+        "validation": {"min": 0, "max": 3600},
+        "display_order": 66,
+    },
+    "LLM_PROVIDER_LIMITS": {
+        "title": "LLM Provider Limits",
+        "description": (
+            "Per-provider or per-model request budgets shared by analysis, Agent and bots, "
+            "e.g. gemini:rpm=15,tpm=1000000,concurrency=2;openai/gpt-5.5:rpm=60. "
+            "Requests over budget queue (chat before scheduled batch runs) instead of hitting 429."
+        ),
+        "category": "ai_model",
+        "data_type": "string",
+        "ui_control": "text",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": None,
+        "options": [],
+        "validation": {},
+        "display_order": 67,
+    },
+    "LLM_DEFAULT_CONCURRENCY": {
+        "title": "LLM Default Concurrency",
+        "description": (
+            "Concurrent LLM requests shared by all models and providers without their own "
+            "LLM_PROVIDER_LIMITS entry (one combined cap, not per provider). 0 means unlimited."
+        ),
+        "category": "ai_model",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "0",
+        "options": [],
+        "validation": {"min": 0, "max": 64},
+        "display_order": 68,
+    },
+    "LLM_SCHEDULER_MAX_WAIT": {
+        "title": "LLM Queue Max Wait",
+        "description": (
+            "Maximum seconds an LLM request waits for a budget slot before trying the next "
+            "fallback model."
+        ),
+        "category": "ai_model",
+        "data_type": "number",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "300",
+        "options": [],
+        "validation": {"min": 1, "max": 3600},
+        "display_order": 69,
+    },
     "AIHUBMIX_KEY": {
         "title": "AIHubmix Key",
         "description": "AIHubmix one-stop API key – access all mainstream models with a single key, no VPN required. Auto-sets base URL to aihubmix.com/v1. Get key: https://aihubmix.com/?aff=CfMq",
@@ -1655,6 +1774,48 @@ _FIELD_DEFINITIONS: Dict[str, Dict[str, Any]] = {
         "validation": {},
         "display_order": 70,
     },
+    "NOTIFICATION_MAX_WORKERS": {
+        "title": "Notification Max Workers",
+        "description": "Maximum number of static channels pushed concurrently. 1 sends channels one by one; chunks of one channel are always sent in order.",
+        "category": "notification",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "4",
+        "options": [],
+        "validation": {"min": 1, "max": 16},
+        "display_order": 71,
+    },
+    "NOTIFICATION_CHANNEL_TIMEOUT_SECONDS": {
+        "title": "Notification Channel Timeout Seconds",
+        "description": "Per-channel send timeout, measured from when the channel starts sending. A channel that exceeds it is reported as failed without blocking the others. 0 disables the limit.",
+        "category": "notification",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "60",
+        "options": [],
+        "validation": {"min": 0},
+        "display_order": 72,
+    },
+    "NOTIFICATION_CHANNEL_RETRIES": {
+        "title": "Notification Channel Retries",
+        "description": "Extra attempts for a channel whose send failed, within its timeout. Chunked channels resend only the chunks that were not delivered. 0 disables retries.",
+        "category": "notification",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "0",
+        "options": [],
+        "validation": {"min": 0, "max": 5},
+        "display_order": 73,
+    },
     "SCHEDULE_TIME": {
         "title": "Schedule Time",
         "description": "Daily schedule time in HH:MM format.",
@@ -1783,6 +1944,51 @@ _FIELD_DEFINITIONS: Dict[str, Dict[str, Any]] = {
         "validation": {},
         "display_order": 11,
     },
+    "SCHEDULE_BY_MARKET": {
+        "title": "Schedule By Market Close",
+        "description": "Run one scheduled analysis per market (cn/hk/us) after each exchange's close, "
+                       "using the trading calendar, instead of once at SCHEDULE_TIME. Requires a restart.",
+        "category": "system",
+        "data_type": "boolean",
+        "ui_control": "switch",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "false",
+        "options": [],
+        "validation": {},
+        "display_order": 13,
+    },
+    "SCHEDULE_MARKET_DELAY_MINUTES": {
+        "title": "Minutes After Market Close",
+        "description": "With SCHEDULE_BY_MARKET, how long after the close each market's run starts, "
+                       "so data sources have settled the day's bar.",
+        "category": "system",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "30",
+        "options": [],
+        "validation": {"min": 0},
+        "display_order": 14,
+    },
+    "SCHEDULE_WARMUP_MINUTES": {
+        "title": "Schedule Warm-up Lead",
+        "description": "Prefetch realtime quotes, missing daily bars and fundamentals this many minutes "
+                       "before each scheduled run. 0 disables the warm-up.",
+        "category": "system",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "0",
+        "options": [],
+        "validation": {"min": 0},
+        "display_order": 15,
+    },
     "TRADING_DAY_CHECK_ENABLED": {
         "title": "Trading Day Check",
         "description": "Skip analysis on non-trading days. Set to false or use --force-run to override.",
@@ -1825,6 +2031,36 @@ _FIELD_DEFINITIONS: Dict[str, Dict[str, Any]] = {
         "validation": {"enum": ["cn", "hk", "us", "both"]},
         "display_order": 47,
     },
+    "MARKET_REVIEW_CONCURRENT": {
+        "title": "Concurrent Market Review",
+        "description": "Run the market review alongside the stock batch instead of after it. "
+                       "The review shares data-source limiters and takes one slot of MAX_WORKERS.",
+        "category": "system",
+        "data_type": "boolean",
+        "ui_control": "switch",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "false",
+        "options": [],
+        "validation": {},
+        "display_order": 48,
+    },
+    "MARKET_REVIEW_PART_TIMEOUT_SECONDS": {
+        "title": "Market Review Part Timeout",
+        "description": "Per-part timeout in seconds when the market review fetches indices, "
+                       "market stats, sector rankings and news in parallel. 0 disables the limit.",
+        "category": "system",
+        "data_type": "number",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "20",
+        "options": [],
+        "validation": {"min": 0},
+        "display_order": 49,
+    },
     "MAX_WORKERS": {
         "title": "Max Workers",
         "description": "Maximum concurrent analysis threads. Keep low to avoid API rate limits.",
@@ -2189,6 +2425,123 @@ _FIELD_DEFINITIONS: Dict[str, Dict[str, Any]] = {
         "validation": {},
         "display_order": 71,
     },
+    "AGENT_CHAT_HISTORY_TURNS": {
+        "title": "Chat History Turns",
+        "description": (
+            "Number of recent Agent chat turns sent to the LLM verbatim. "
+            "Older turns are rolled into a persisted running summary."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "6",
+        "options": [],
+        "validation": {"min": 1, "max": 50},
+        "display_order": 72,
+    },
+    "AGENT_CHAT_HISTORY_TOKEN_BUDGET": {
+        "title": "Chat History Token Budget",
+        "description": (
+            "Approximate token cap for conversation history (summary plus recent turns) "
+            "attached to each Agent chat request."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "6000",
+        "options": [],
+        "validation": {"min": 500, "max": 200000},
+        "display_order": 73,
+    },
+    "AGENT_COMPACT_TOOL_RESULTS": {
+        "title": "Compact Tool Results",
+        "description": (
+            "Encode Agent tool results compactly before they enter the prompt: "
+            "K-line bars as column/row tables, rounded numbers, null fields dropped."
+        ),
+        "category": "agent",
+        "data_type": "boolean",
+        "ui_control": "switch",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "true",
+        "options": [],
+        "validation": {},
+        "display_order": 74,
+    },
+    "AGENT_TOOL_RESULT_MAX_CHARS": {
+        "title": "Tool Result Size Cap",
+        "description": (
+            "Maximum characters per encoded tool result. Larger results keep their newest "
+            "table rows plus a min/max summary of the rest. 0 disables the cap."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "8000",
+        "options": [],
+        "validation": {"min": 0, "max": 200000},
+        "display_order": 75,
+    },
+    "AGENT_TOOL_POOL_WORKERS": {
+        "title": "Tool Pool Workers",
+        "description": (
+            "Tool threads shared by all concurrent Agent sessions. Extra tool calls wait in the shared queue."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "16",
+        "options": [],
+        "validation": {"min": 1, "max": 128},
+        "display_order": 76,
+    },
+    "AGENT_TOOL_SESSION_CONCURRENCY": {
+        "title": "Tool Calls per Session",
+        "description": (
+            "Maximum tool calls one Agent loop runs at once on the shared pool; the rest wait their turn."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "5",
+        "options": [],
+        "validation": {"min": 1, "max": 32},
+        "display_order": 77,
+    },
+    "AGENT_TOOL_TIMEOUT_SECONDS": {
+        "title": "Tool Call Timeout",
+        "description": (
+            "Timeout in seconds for each Agent tool call, counted from when the call starts running "
+            "(time queued behind other calls is excluded). 0 leaves only the overall Agent timeout budget."
+        ),
+        "category": "agent",
+        "data_type": "integer",
+        "ui_control": "number",
+        "is_sensitive": False,
+        "is_required": False,
+        "is_editable": True,
+        "default_value": "0",
+        "options": [],
+        "validation": {"min": 0, "max": 3600},
+        "display_order": 78,
+    },
 }
 
 
@@ -20,6 +20,7 @@ from src.market_analyzer import MarketAnalyzer
 from src.report_language import normalize_report_language
 from src.search_service import SearchService
 from src.analyzer import GeminiAnalyzer
+from data_provider.base import DataFetcherManager
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,7 @@ def run_market_review(
     send_notification: bool = True,
     merge_notification: bool = False,
     override_region: Optional[str] = None,
+    data_manager: Optional[DataFetcherManager] = None,
 ) -> Optional[str]:
     """
     执行大盘复盘分析
@@ -64,6 +66,7 @@ def run_market_review(
         send_notification: 是否发送通知
         merge_notification: 是否合并推送（跳过本次推送，由 main 层合并个股+大盘后统一发送，Issue #190）
         override_region: 覆盖 config 的 market_review_region（Issue #373 交易日过滤后有效子集）
+        data_manager: 复用的数据源管理器（可选，与个股流水线共享限流/熔断）
 
     Returns:
         复盘报告文本
@@ -99,7 +102,10 @@ def run_market_review(
                     continue
                 logger.info("生成 %s 大盘复盘报告...", label)
                 mkt_analyzer = MarketAnalyzer(
-                    search_service=search_service, analyzer=analyzer, region=mkt
+                    search_service=search_service,
+                    analyzer=analyzer,
+                    region=mkt,
+                    data_manager=data_manager,
                 )
                 mkt_report = mkt_analyzer.run_daily_review()
                 if mkt_report:
@@ -113,6 +119,7 @@ def run_market_review(
                 search_service=search_service,
                 analyzer=analyzer,
                 region=region,
+                data_manager=data_manager,
             )
             review_report = market_analyzer.run_daily_review()
         
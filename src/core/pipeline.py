@@ -44,6 +44,7 @@ from src.report_language import (
     localize_trend_prediction,
     normalize_report_language,
 )
+from src.llm_scheduler import llm_priority
 from src.search_service import SearchService
 from src.services.social_sentiment_service import SocialSentimentService
 from src.enums import ReportType
@@ -84,6 +85,7 @@ class StockAnalysisPipeline:
         query_source: Optional[str] = None,
         save_context_snapshot: Optional[bool] = None,
         progress_callback: Optional[Callable[[int, str], None]] = None,
+        fetcher_manager: Optional[DataFetcherManager] = None,
     ):
         """
         初始化调度器
@@ -91,6 +93,7 @@ class StockAnalysisPipeline:
         Args:
             config: 配置对象（可选，默认使用全局配置）
             max_workers: 最大并发线程数（可选，默认从配置读取）
+            fetcher_manager: 复用的数据源管理器（可选，如定时预热过缓存的实例）
         """
         self.config = config or get_config()
         self.max_workers = max_workers or self.config.max_workers
@@ -104,7 +107,7 @@ class StockAnalysisPipeline:
         
         # 初始化各模块
         self.db = get_db()
-        self.fetcher_manager = DataFetcherManager()
+        self.fetcher_manager = fetcher_manager or DataFetcherManager()
         # 不再单独创建 akshare_fetcher，统一使用 fetcher_manager 获取增强数据
         self.trend_analyzer = StockTrendAnalyzer()  # 技术分析器
         self.analyzer = GeminiAnalyzer(config=self.config)
@@ -805,6 +808,16 @@ class StockAnalysisPipeline:
             if trend_result:
                 initial_context["trend_result"] = self._safe_to_dict(trend_result)
 
+            # Seed the per-run tool cache so agents calling get_realtime_quote /
+            # get_chip_distribution / analyze_trend reuse the data fetched above.
+            from src.agent.tool_cache import build_pipeline_tool_seed
+            initial_context["tool_result_seed"] = build_pipeline_tool_seed(
+                code,
+                realtime_quote=realtime_quote,
+                chip_data=chip_data,
+                trend_result=trend_result,
+            )
+
             # Agent path: inject social sentiment as news_context so both
             # executor (_build_user_message) and orchestrator (ctx.set_data)
             # can consume it through the existing news_context channel
@@ -895,6 +908,8 @@ class StockAnalysisPipeline:
             if result and result.success:
                 try:
                     initial_context["stock_name"] = resolved_stock_name
+                    # The tool seed duplicates quote / chip / trend already in the snapshot
+                    initial_context.pop("tool_result_seed", None)
                     self.db.save_analysis_history(
                         result=result,
                         query_id=query_id,
@@ -1756,14 +1771,32 @@ class StockAnalysisPipeline:
             )
         
         results: List[AnalysisResult] = []
-        
+
+        # 单股推送 + 转图：分析线程完成后即生成报告并提交后台渲染，
+        # 收集侧推送时复用报告内容与渲染结果
+        prepared_reports: Dict[str, str] = {}
+        prerender_images = (
+            single_stock_notify and send_notification and not dry_run
+            and self._single_stock_needs_image()
+        )
+
+        # Scheduled batch runs queue behind interactive chat for LLM budget
+        @llm_priority("batch")
+        def _analyze_stock(code: str, **kwargs) -> Optional[AnalysisResult]:
+            result = self.process_single_stock(code, **kwargs)
+            if prerender_images and result and result.success:
+                report_content = self._prepare_single_stock_report(result, report_type)
+                if report_content is not None:
+                    prepared_reports[code] = report_content
+            return result
+
         # 使用线程池并发处理
         # 注意：max_workers 设置较低（默认3）以避免触发反爬
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # 提交任务
             future_to_code = {
                 executor.submit(
-                    self.process_single_stock,
+                    _analyze_stock,
                     code,
                     skip_analysis=dry_run,
                     single_stock_notify=False,
@@ -1786,6 +1819,7 @@ class StockAnalysisPipeline:
                                 result,
                                 report_type=report_type,
                                 fallback_code=code,
+                                report_content=prepared_reports.pop(code, None),
                             )
                     elif result and not result.success:
                         logger.warning(
@@ -1848,13 +1882,66 @@ class StockAnalysisPipeline:
         
         return results
 
+    def _build_single_stock_report(
+        self,
+        result: AnalysisResult,
+        report_type: ReportType = ReportType.SIMPLE,
+        stock_code: str = "unknown",
+    ) -> str:
+        """按报告类型生成单股推送内容。"""
+        if report_type == ReportType.FULL:
+            logger.info(f"[{stock_code}] 使用完整报告格式")
+            return self.notifier.generate_dashboard_report([result])
+        if report_type == ReportType.BRIEF:
+            logger.info(f"[{stock_code}] 使用简洁报告格式")
+            return self.notifier.generate_brief_report([result])
+        logger.info(f"[{stock_code}] 使用精简报告格式")
+        return self.notifier.generate_single_stock_report(result)
+
+    def _single_stock_needs_image(self) -> bool:
+        """单股推送的 report 路由中是否有渠道需要 Markdown 转图片。"""
+        if not self.notifier.markdown_to_image_channels or not self.notifier.is_available():
+            return False
+        channels = self.notifier.get_channels_for_route(
+            "report", channels=self.notifier.get_available_channels()
+        )
+        return any(self.notifier.needs_markdown_image(ch) for ch in channels)
+
+    def _prepare_single_stock_report(
+        self,
+        result: AnalysisResult,
+        report_type: ReportType = ReportType.SIMPLE,
+    ) -> Optional[str]:
+        """
+        在分析线程中提前生成单股报告并提交后台转图
+
+        推送仍在结果收集侧串行进行；届时 markdown_to_image 直接命中渲染缓存
+        或等待同一渲染任务，转图不再阻塞收集线程。
+        """
+        stock_code = getattr(result, "code", None) or "unknown"
+        try:
+            report_content = self._build_single_stock_report(result, report_type, stock_code)
+            from src.md2img import prerender_markdown_image
+
+            prerender_markdown_image(
+                report_content, max_chars=self.notifier.markdown_to_image_max_chars
+            )
+            return report_content
+        except Exception as e:
+            logger.warning(f"[{stock_code}] 单股报告预渲染失败，推送时将重新生成: {e}")
+            return None
+
     def _send_single_stock_notification(
         self,
         result: AnalysisResult,
         report_type: ReportType = ReportType.SIMPLE,
         fallback_code: Optional[str] = None,
+        report_content: Optional[str] = None,
     ) -> None:
-        """发送单股通知，供直接单股入口和批量串行推送共用。"""
+        """发送单股通知，供直接单股入口和批量串行推送共用。
+
+        report_content 为 _prepare_single_stock_report 预先生成的内容（可选）。
+        """
         if not self.notifier.is_available():
             return
 
@@ -1869,15 +1956,8 @@ class StockAnalysisPipeline:
 
         with notify_lock:
             try:
-                if report_type == ReportType.FULL:
-                    report_content = self.notifier.generate_dashboard_report([result])
-                    logger.info(f"[{stock_code}] 使用完整报告格式")
-                elif report_type == ReportType.BRIEF:
-                    report_content = self.notifier.generate_brief_report([result])
-                    logger.info(f"[{stock_code}] 使用简洁报告格式")
-                else:
-                    report_content = self.notifier.generate_single_stock_report(result)
-                    logger.info(f"[{stock_code}] 使用精简报告格式")
+                if report_content is None:
+                    report_content = self._build_single_stock_report(result, report_type, stock_code)
 
                 if self.notifier.send(
                     report_content,
@@ -1956,11 +2036,7 @@ class StockAnalysisPipeline:
                 # Issue #455: Markdown 转图片（与 notification.send 逻辑一致）
                 from src.md2img import markdown_to_image
 
-                channels_needing_image = {
-                    ch for ch in channels
-                    if ch.value in self.notifier._markdown_to_image_channels
-                    and ch not in {NotificationChannel.NTFY, NotificationChannel.GOTIFY}
-                }
+                channels_needing_image = {ch for ch in channels if self.notifier.needs_markdown_image(ch)}
                 non_wechat_channels_needing_image = {
                     ch for ch in channels_needing_image if ch != NotificationChannel.WECHAT
                 }
@@ -8,13 +8,20 @@
 1. 按市场（A股/港股/美股）判断当日是否为交易日
 2. 按市场时区取“今日”日期，避免服务器 UTC 导致日期错误
 3. 支持 per-stock 过滤：只分析当日开市市场的股票
+4. 提供各市场下一次收盘时间，供调度器按市场收盘触发分析
 
 依赖：exchange-calendars（可选，不可用时 fail-open）
+
+性能：每个市场按自然年预计算一张交易时段表（上一年至当年的交易日序数与
+收盘时间），之后的交易日判断与回溯均为集合查找 / 二分查找，不再每次调用
+都走 exchange-calendars 的 pandas 查询；跨年时自动按新年份构建。
 """
 
 import logging
-from datetime import date, datetime
-from typing import Optional, Set
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
@@ -40,6 +47,115 @@ MARKET_TIMEZONE = {
     "us": "America/New_York",
 }
 
+# Market -> regular close (market-local), used when exchange-calendars is unavailable
+MARKET_DEFAULT_CLOSE = {"cn": time(15, 0), "hk": time(16, 0), "us": time(16, 0)}
+
+
+# 每个 (市场, 年份) 一张时段表；保留最近几个年份，覆盖跨年与少量历史查询
+_SESSION_TABLE_MAX_ENTRIES = 8
+
+
+class _SessionTable:
+    """
+    单个市场的预计算交易时段表
+
+    覆盖 ``year - 1`` 年初至 ``year`` 年末（受日历自身范围限制），
+    ``ordinals`` 为升序的交易日序数，``closes`` 为对应的收盘时间（带时区）。
+    """
+
+    __slots__ = ("first", "last", "ordinals", "session_set", "closes")
+
+    def __init__(self, first: date, last: date, sessions: List[date], closes: List[datetime]):
+        self.first = first
+        self.last = last
+        self.ordinals = [d.toordinal() for d in sessions]
+        self.session_set = frozenset(self.ordinals)
+        self.closes = closes
+
+    def covers(self, check_date: date) -> bool:
+        return self.first <= check_date <= self.last
+
+    def is_session(self, check_date: date) -> bool:
+        if not self.covers(check_date):
+            raise ValueError(f"{check_date} outside session table {self.first}..{self.last}")
+        return check_date.toordinal() in self.session_set
+
+    def session_index_on_or_before(self, check_date: date) -> int:
+        """Index of the latest session <= check_date."""
+        if not self.covers(check_date):
+            raise ValueError(f"{check_date} outside session table {self.first}..{self.last}")
+        index = bisect_right(self.ordinals, check_date.toordinal()) - 1
+        if index < 0:
+            raise ValueError(f"no session on or before {check_date}")
+        return index
+
+    def session_date(self, index: int) -> date:
+        if index < 0:
+            raise ValueError("no previous session")
+        return date.fromordinal(self.ordinals[index])
+
+
+_session_tables: Dict[Tuple[str, int], _SessionTable] = {}
+_session_tables_lock = threading.Lock()
+
+
+def _to_date(value) -> date:
+    if hasattr(value, "date") and callable(value.date):
+        return value.date()
+    return value
+
+
+def _build_session_table(exchange: str, year: int) -> _SessionTable:
+    cal = xcals.get_calendar(exchange)
+    first = date(year - 1, 1, 1)
+    last = date(year, 12, 31)
+    first_session = getattr(cal, "first_session", None)
+    last_session = getattr(cal, "last_session", None)
+    if first_session is not None:
+        first = max(first, _to_date(first_session))
+    if last_session is not None:
+        last = min(last, _to_date(last_session))
+    if first > last:
+        raise ValueError(f"{exchange} calendar does not cover {year}")
+
+    sessions = cal.sessions_in_range(first.isoformat(), last.isoformat())
+    closes_series = getattr(cal, "closes", None)
+    if closes_series is not None:
+        raw_closes = list(closes_series.loc[sessions])
+    else:
+        raw_closes = [cal.session_close(session) for session in sessions]
+    closes = [
+        close.to_pydatetime() if hasattr(close, "to_pydatetime") else close
+        for close in raw_closes
+    ]
+    return _SessionTable(first, last, [_to_date(s) for s in sessions], closes)
+
+
+def _get_session_table(market: str, year: int) -> _SessionTable:
+    """Return the cached session table for ``market`` and ``year``, building it once."""
+    key = (market, year)
+    table = _session_tables.get(key)
+    if table is not None:
+        return table
+    with _session_tables_lock:
+        table = _session_tables.get(key)
+        if table is None:
+            table = _build_session_table(MARKET_EXCHANGE[market], year)
+            if len(_session_tables) >= _SESSION_TABLE_MAX_ENTRIES:
+                _session_tables.pop(next(iter(_session_tables)))
+            _session_tables[key] = table
+            logger.debug(
+                "trading_calendar: built %s session table for %s (%d sessions)",
+                market, year, len(table.ordinals),
+            )
+        return table
+
+
+def clear_session_cache() -> None:
+    """Drop precomputed session tables (tests, calendar updates)."""
+    with _session_tables_lock:
+        _session_tables.clear()
+
 
 def get_market_for_stock(code: str) -> Optional[str]:
     """
@@ -79,13 +195,10 @@ def is_market_open(market: str, check_date: date) -> bool:
     """
     if not _XCALS_AVAILABLE:
         return True
-    ex = MARKET_EXCHANGE.get(market)
-    if not ex:
+    if market not in MARKET_EXCHANGE:
         return True
     try:
-        cal = xcals.get_calendar(ex)
-        session = datetime(check_date.year, check_date.month, check_date.day)
-        return cal.is_session(session)
+        return _get_session_table(market, check_date.year).is_session(check_date)
     except Exception as e:
         logger.warning("trading_calendar.is_market_open fail-open: %s", e)
         return True
@@ -134,36 +247,68 @@ def get_effective_trading_date(
     if not _XCALS_AVAILABLE:
         return fallback_date
 
-    ex = MARKET_EXCHANGE.get(market or "")
     tz_name = MARKET_TIMEZONE.get(market or "")
-    if not ex or not tz_name:
+    if market not in MARKET_EXCHANGE or not tz_name:
         return fallback_date
 
     try:
-        cal = xcals.get_calendar(ex)
         local_date = market_now.date()
+        table = _get_session_table(market, local_date.year)
+        index = table.session_index_on_or_before(local_date)
 
-        if not cal.is_session(local_date):
-            return cal.date_to_session(local_date, direction="previous").date()
+        if table.ordinals[index] != local_date.toordinal():
+            return table.session_date(index)
 
-        session = cal.date_to_session(local_date, direction="previous")
-        session_close = cal.session_close(session)
-        if hasattr(session_close, "tz_convert"):
-            close_local = session_close.tz_convert(tz_name).to_pydatetime()
-        elif session_close.tzinfo is not None:
-            close_local = session_close.astimezone(ZoneInfo(tz_name))
-        else:
-            close_local = session_close.replace(tzinfo=ZoneInfo(tz_name))
+        close = table.closes[index]
+        if close.tzinfo is None:
+            close = close.replace(tzinfo=ZoneInfo(tz_name))
+        if market_now >= close:
+            return local_date
 
-        if market_now >= close_local:
-            return session.date()
-
-        return cal.previous_session(session).date()
+        return table.session_date(index - 1)
     except Exception as e:
         logger.warning("trading_calendar.get_effective_trading_date fail-open: %s", e)
         return fallback_date
 
 
+def get_next_market_close(
+    market: str, after: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Return the first session close strictly after ``after`` (default: now).
+
+    The result is timezone-aware in the market's timezone. Half days use the
+    calendar's early close. Without exchange-calendars (or on lookup failure)
+    falls back to the regular weekday close in ``MARKET_DEFAULT_CLOSE``.
+    Returns None for unknown markets.
+    """
+    if market not in MARKET_EXCHANGE:
+        return None
+    tz = ZoneInfo(MARKET_TIMEZONE[market])
+    market_now = get_market_now(market, current_time=after)
+
+    if _XCALS_AVAILABLE:
+        try:
+            for year in (market_now.year, market_now.year + 1):
+                table = _get_session_table(market, year)
+                start = bisect_left(table.ordinals, market_now.date().toordinal())
+                for close in table.closes[start:start + 2]:
+                    if close.tzinfo is None:
+                        close = close.replace(tzinfo=tz)
+                    if close > market_now:
+                        return close.astimezone(tz)
+        except Exception as e:
+            logger.warning("trading_calendar.get_next_market_close fallback: %s", e)
+
+    candidate = market_now.date()
+    while True:
+        if candidate.weekday() < 5:
+            close = datetime.combine(candidate, MARKET_DEFAULT_CLOSE[market], tzinfo=tz)
+            if close > market_now:
+                return close
+        candidate += timedelta(days=1)
+
+
 def get_open_markets_today() -> Set[str]:
     """
     Get markets that are open today (by each market's local timezone).
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Latency-aware ordering of LLM fallback candidates.
+
+``GeminiAnalyzer._call_litellm`` and ``LLMToolAdapter.call_completion`` walk
+the configured model list (primary first, then fallbacks). Without feedback a
+degraded primary costs every request its full timeout before failover. The
+router keeps per-model health and reorders each call's candidate list:
+
+- healthy models keep their configured order and go first
+- degraded models (recently rate-limited, error rate >= 50%, or much slower
+  than the fastest healthy model) follow, still in configured order
+- models whose per-model ``CircuitBreaker`` is open are parked at the end and
+  only tried when everything else failed
+
+Parked models come back through the breaker's half-open state: either the next
+request after the cooldown tries them in their configured slot, or, when
+``LLM_HEALTH_PROBE_INTERVAL`` is set, a daemon thread sends them a one-token
+probe in the background so user requests never pay for the recovery check
+(recovering models then sort after healthy and degraded ones). Ordering only
+reads breaker state; the half-open slot is claimed by :meth:`begin_attempt`
+when a model is actually called, or by the probe.
+
+Routing is process-wide (analysis pipeline, Agent, bots share one instance)
+and disabled unless ``LLM_ADAPTIVE_ROUTING=true``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# EWMA smoothing factors for latency and error rate
+_LATENCY_ALPHA = 0.3
+_ERROR_ALPHA = 0.2
+
+# Samples needed before latency / error rate are allowed to demote a model
+_MIN_SAMPLES = 3
+
+# A model is "slow" when its smoothed latency exceeds this multiple of the
+# fastest healthy model and _SLOW_FLOOR_SECONDS
+_SLOW_FACTOR = 3.0
+_SLOW_FLOOR_SECONDS = 5.0
+
+# How long a 429 keeps a model demoted when the error carries no Retry-After
+_RATE_LIMIT_COOLDOWN_SECONDS = 30.0
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True for provider rate-limit responses (HTTP 429)."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(exc).__name__
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class ModelHealth:
+    """Rolling health of one model/channel."""
+
+    samples: int = 0
+    latency: float = 0.0
+    error_rate: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    rate_limits: int = 0
+    rate_limited_until: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "latency": round(self.latency, 3),
+            "error_rate": round(self.error_rate, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "rate_limits": self.rate_limits,
+            "rate_limited": self.rate_limited_until > time.time(),
+            "last_error": self.last_error,
+        }
+
+
+class LLMChannelRouter:
+    """Track per-model latency/errors and order fallback candidates by health."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 120.0,
+        probe_interval: float = 0.0,
+    ):
+        from data_provider.realtime_types import CircuitBreaker
+
+        self._breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            cooldown_seconds=cooldown_seconds,
+            half_open_max_calls=1,
+        )
+        self.probe_interval = probe_interval
+        self._health: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+        self._probe_fn: Optional[Callable[[str], Any]] = None
+        self._probe_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def configure(self, failure_threshold: int, cooldown_seconds: float, probe_interval: float) -> None:
+        """Apply updated thresholds (config reloads) without dropping collected health."""
+        self._breaker.failure_threshold = failure_threshold
+        self._breaker.cooldown_seconds = cooldown_seconds
+        self.probe_interval = probe_interval
+
+    def _get_health_locked(self, model: str) -> ModelHealth:
+        health = self._health.get(model)
+        if health is None:
+            health = self._health[model] = ModelHealth()
+        return health
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record_success(self, model: str, latency: float) -> None:
+        with self._lock:
+            health = self._get_health_locked(model)
+            if health.samples == 0:
+                health.latency = latency
+            else:
+                health.latency += _LATENCY_ALPHA * (latency - health.latency)
+            health.error_rate *= 1 - _ERROR_ALPHA
+            health.samples += 1
+            health.successes += 1
+            health.rate_limited_until = 0.0
+        self._breaker.record_success(model)
+
+    def record_failure(self, model: str, error: BaseException, latency: Optional[float] = None) -> None:
+        rate_limited = is_rate_limit_error(error)
+        with self._lock:
+            health = self._get_health_locked(model)
+            health.error_rate += _ERROR_ALPHA * (1.0 - health.error_rate)
+            if latency is not None and not rate_limited:
+                # A timeout or slow failure is as much a latency signal as a slow success
+                if health.samples == 0:
+                    health.latency = latency
+                else:
+                    health.latency += _LATENCY_ALPHA * (latency - health.latency)
+            health.samples += 1
+            health.failures += 1
+            health.last_error = str(error)[:200]
+            if rate_limited:
+                health.rate_limits += 1
+                cooldown = _retry_after_seconds(error) or _RATE_LIMIT_COOLDOWN_SECONDS
+                health.rate_limited_until = time.time() + cooldown
+        self._breaker.record_failure(model, str(error)[:200])
+        if self._probe_fn is not None and self.probe_interval > 0:
+            self._ensure_probe_thread()
+
+    # ------------------------------------------------------------------
+    # Ordering
+    # ------------------------------------------------------------------
+
+    def _is_degraded_locked(self, model: str, fastest: Optional[float], now: float) -> bool:
+        health = self._health.get(model)
+        if health is None:
+            return False
+        if health.rate_limited_until > now:
+            return True
+        if health.samples < _MIN_SAMPLES:
+            return False
+        if health.error_rate >= 0.5:
+            return True
+        return (
+            fastest is not None
+            and health.latency > _SLOW_FLOOR_SECONDS
+            and health.latency > fastest * _SLOW_FACTOR
+        )
+
+    def order(self, models: Sequence[str]) -> List[str]:
+        """Return ``models`` reordered healthy -> degraded -> parked.
+
+        Configured order is kept within each group, and no model is dropped:
+        parked models stay as a last resort.
+        """
+        models = list(dict.fromkeys(models))
+        states = {m: self._breaker.peek_state(m) for m in models}
+        parked = [m for m in models if states[m] == self._breaker.OPEN]
+        recovering: List[str] = []
+        if self._probe_fn is not None and self.probe_interval > 0:
+            # The background probe owns the recovery check
+            recovering = [m for m in models if states[m] == self._breaker.HALF_OPEN]
+        available = [m for m in models if m not in parked and m not in recovering]
+        now = time.time()
+        with self._lock:
+            sampled = [
+                self._health[m].latency for m in available
+                if m in self._health and self._health[m].samples >= _MIN_SAMPLES
+                and self._health[m].error_rate < 0.5
+            ]
+            fastest = min(sampled) if sampled else None
+            degraded = [m for m in available if self._is_degraded_locked(m, fastest, now)]
+        healthy = [m for m in available if m not in degraded]
+        ordered = healthy + degraded + recovering + parked
+        if ordered != models:
+            logger.info(
+                "[LLMRouting] reordered candidates %s -> %s (degraded=%s, recovering=%s, parked=%s)",
+                models, ordered, degraded, recovering, parked,
+            )
+        return ordered
+
+    def begin_attempt(self, model: str) -> None:
+        """Note that ``model`` is about to be called.
+
+        A model whose cooldown elapsed moves to half-open and takes its single
+        probe slot, so the background probe does not test it concurrently.
+        """
+        self._breaker.is_available(model)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model health and breaker state, for diagnostics."""
+        states = self._breaker.get_status()
+        with self._lock:
+            return {
+                model: {**health.to_dict(), "breaker": states.get(model, "closed")}
+                for model, health in self._health.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Background probing
+    # ------------------------------------------------------------------
+
+    def set_probe(self, probe_fn: Callable[[str], Any]) -> None:
+        """Register the callable used to probe a parked model.
+
+        ``probe_fn(model)`` should send a minimal completion and raise on
+        failure. The latest registration replaces earlier ones, so the probe
+        follows the most recently used analyzer / adapter.
+        """
+        self._probe_fn = probe_fn
+
+    def _ensure_probe_thread(self) -> None:
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._stop.clear()
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop, name="llm-health-probe", daemon=True,
+            )
+            self._probe_thread.start()
+
+    def probe_parked(self) -> Dict[str, bool]:
+        """Probe every parked model whose cooldown elapsed; return model -> recovered."""
+        probe_fn = self._probe_fn
+        if probe_fn is None:
+            return {}
+        results: Dict[str, bool] = {}
+        parked = [m for m, state in self._breaker.get_status().items() if state != "closed"]
+        for model in parked:
+            # is_available moves OPEN -> HALF_OPEN once the cooldown elapsed and
+            # claims the single half-open slot for this probe
+            if not self._breaker.is_available(model):
+                continue
+            started = time.monotonic()
+            try:
+                probe_fn(model)
+            except Exception as exc:
+                self.record_failure(model, exc)
+                results[model] = False
+                logger.info("[LLMRouting] probe of %s failed: %s", model, exc)
+            else:
+                self.record_success(model, time.monotonic() - started)
+                results[model] = True
+                logger.info("[LLMRouting] probe of %s succeeded, channel restored", model)
+        return results
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(max(1.0, self.probe_interval)):
+            if self.probe_interval <= 0:
+                return
+            try:
+                self.probe_parked()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.warning("[LLMRouting] probe loop error: %s", exc)
+            if not any(state != "closed" for state in self._breaker.get_status().values()):
+                return
+
+    def close(self) -> None:
+        self._stop.set()
+        thread = self._probe_thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=2)
+
+
+_router: Optional[LLMChannelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_llm_router(config: Any) -> Optional[LLMChannelRouter]:
+    """Return the process-wide router, or None when adaptive routing is off."""
+    global _router
+    if getattr(config, "llm_adaptive_routing", False) is not True:
+        return None
+    failure_threshold = int(getattr(config, "llm_breaker_failure_threshold", 3))
+    cooldown_seconds = float(getattr(config, "llm_breaker_cooldown_seconds", 120.0))
+    probe_interval = float(getattr(config, "llm_health_probe_interval", 0.0))
+    with _router_lock:
+        if _router is None:
+            _router = LLMChannelRouter(failure_threshold, cooldown_seconds, probe_interval)
+        else:
+            _router.configure(failure_threshold, cooldown_seconds, probe_interval)
+        return _router
+
+
+def reset_llm_router() -> None:
+    """Drop the process-wide router (tests, config resets)."""
+    global _router
+    with _router_lock:
+        if _router is not None:
+            _router.close()
+        _router = None
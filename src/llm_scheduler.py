@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Process-wide admission control for LLM requests.
+
+Pipeline workers, task-queue analyses, Agent steps, bot chat and the market
+review all call providers independently. Without coordination a burst of
+parallel stock analyses exceeds a provider's RPM/TPM quota, the provider
+answers with 429s, and retries plus fallbacks add more load and latency.
+
+``LLMScheduler`` admits each request against budgets keyed by full model
+name, provider prefix or ``*`` (first match wins):
+
+- ``concurrency``: requests in flight at once
+- ``rpm``: requests started in the last 60 seconds
+- ``tpm``: estimated tokens (prompt + max output) started in the last 60
+  seconds, corrected to the real usage once the response arrives
+
+Requests that do not fit wait in a per-budget queue instead of failing.
+The queue is strict priority, FIFO within a class; the class comes from the
+``llm_priority`` context (``interactive`` chat > ``normal`` > ``batch``
+scheduled pipeline runs).
+
+Budgets come from ``LLM_PROVIDER_LIMITS``; ``LLM_DEFAULT_CONCURRENCY`` adds
+one concurrency cap shared by all models without their own entry (the
+``"*"`` budget). With neither
+configured no scheduler is created and calls are not throttled.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+
+_PRIORITY_NAMES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "normal": PRIORITY_NORMAL,
+    "batch": PRIORITY_BATCH,
+}
+
+_WINDOW_SECONDS = 60.0
+
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "llm_priority", default=PRIORITY_NORMAL
+)
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run LLM calls in this context (and copied contexts) at ``priority``.
+
+    Usable as a context manager or as a method decorator.
+    """
+    token = _current_priority.set(_PRIORITY_NAMES[priority])
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_llm_priority() -> int:
+    return _current_priority.get()
+
+
+class LLMQueueTimeout(TimeoutError):
+    """Raised when a request waited longer than allowed for an LLM slot."""
+
+
+@dataclass
+class ProviderBudget:
+    """Limits for one budget key; 0 means unlimited."""
+
+    rpm: int = 0
+    tpm: int = 0
+    concurrency: int = 0
+
+
+def parse_provider_limits(value: str) -> Dict[str, ProviderBudget]:
+    """Parse ``gemini:rpm=15,tpm=1000000,concurrency=2;openai/gpt-5.5:rpm=60``."""
+    budgets: Dict[str, ProviderBudget] = {}
+    for part in (value or "").split(";"):
+        part = part.strip()
+        if not part or ":" not in part:
+            continue
+        key, _, spec = part.rpartition(":")
+        key = key.strip()
+        budget = ProviderBudget()
+        for item in spec.split(","):
+            name, _, raw = item.partition("=")
+            name = name.strip().lower()
+            if name not in ("rpm", "tpm", "concurrency"):
+                continue
+            try:
+                setattr(budget, name, max(0, int(raw.strip())))
+            except ValueError:
+                logger.warning("[LLMScheduler] ignoring invalid limit %r for %s", item, key)
+        if key:
+            budgets[key] = budget
+    return budgets
+
+
+@dataclass
+class _Ticket:
+    key: str
+    priority: int
+    tokens: int
+    # [start timestamp, tokens] entry in the budget's TPM window
+    window_entry: Optional[List[float]] = None
+
+
+@dataclass
+class _BudgetState:
+    budget: ProviderBudget
+    in_flight: int = 0
+    requests: Deque[float] = field(default_factory=deque)
+    tokens: Deque[List[float]] = field(default_factory=deque)
+    token_total: float = 0.0
+    waiting: List[Any] = field(default_factory=list)
+    admitted: int = 0
+    queued: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+
+    def prune(self, now: float) -> None:
+        cutoff = now - _WINDOW_SECONDS
+        while self.requests and self.requests[0] <= cutoff:
+            self.requests.popleft()
+        while self.tokens and self.tokens[0][0] <= cutoff:
+            self.token_total -= self.tokens.popleft()[1]
+
+    def fits(self, tokens: int) -> bool:
+        budget = self.budget
+        if budget.concurrency and self.in_flight >= budget.concurrency:
+            return False
+        if budget.rpm and len(self.requests) >= budget.rpm:
+            return False
+        # An oversized request still goes through once the window is empty
+        if budget.tpm and self.tokens and self.token_total + tokens > budget.tpm:
+            return False
+        return True
+
+    def next_expiry(self, now: float) -> Optional[float]:
+        """Seconds until the oldest RPM/TPM window entry expires."""
+        starts = []
+        if self.requests:
+            starts.append(self.requests[0])
+        if self.tokens:
+            starts.append(self.tokens[0][0])
+        if not starts:
+            return None
+        return max(0.0, min(starts) + _WINDOW_SECONDS - now)
+
+
+class LLMScheduler:
+    """Admit LLM requests against per-provider RPM/TPM/concurrency budgets."""
+
+    def __init__(self, budgets: Dict[str, ProviderBudget], max_wait: float = 300.0):
+        self._budgets = dict(budgets)
+        self.max_wait = max_wait
+        self._states: Dict[str, _BudgetState] = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+
+    def _budget_key(self, model: str) -> Optional[str]:
+        if model in self._budgets:
+            return model
+        provider = model.split("/", 1)[0] if "/" in model else "openai"
+        if provider in self._budgets:
+            return provider
+        if "*" in self._budgets:
+            return "*"
+        return None
+
+    def acquire(
+        self,
+        model: str,
+        tokens: int,
+        *,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[_Ticket]:
+        """Block until ``model``'s budget admits the request.
+
+        Returns None when no budget applies. Raises :class:`LLMQueueTimeout`
+        after ``timeout`` (default ``max_wait``) seconds in the queue.
+        """
+        key = self._budget_key(model)
+        if key is None:
+            return None
+        priority = current_llm_priority() if priority is None else priority
+        wait_limit = self.max_wait if timeout is None else min(timeout, self.max_wait)
+        ticket = _Ticket(key=key, priority=priority, tokens=max(0, int(tokens)))
+        entry = (priority, next(self._seq), ticket)
+        started = time.monotonic()
+
+        with self._cond:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _BudgetState(self._budgets[key])
+            heapq.heappush(state.waiting, entry)
+            queued = False
+            try:
+                while True:
+                    now = time.time()
+                    state.prune(now)
+                    if state.waiting[0] is entry and state.fits(ticket.tokens):
+                        break
+                    if not queued:
+                        queued = True
+                        state.queued += 1
+                        logger.debug(
+                            "[LLMScheduler] %s queued on %s (priority=%s, waiting=%d, in_flight=%d)",
+                            model, key, priority, len(state.waiting), state.in_flight,
+                        )
+                    remaining = wait_limit - (time.monotonic() - started)
+                    if remaining <= 0:
+                        state.timeouts += 1
+                        raise LLMQueueTimeout(
+                            f"LLM request for {model} waited {wait_limit:.0f}s for a {key} slot"
+                        )
+                    expiry = state.next_expiry(now)
+                    self._cond.wait(min(remaining, expiry if expiry is not None else remaining))
+            finally:
+                if entry in state.waiting:
+                    state.waiting.remove(entry)
+                    heapq.heapify(state.waiting)
+                    # The next head may fit now that this entry is gone
+                    self._cond.notify_all()
+
+            now = time.time()
+            state.in_flight += 1
+            state.requests.append(now)
+            ticket.window_entry = [now, float(ticket.tokens)]
+            state.tokens.append(ticket.window_entry)
+            state.token_total += ticket.tokens
+            state.admitted += 1
+            state.wait_seconds += time.monotonic() - started
+        return ticket
+
+    def release(self, ticket: Optional[_Ticket], actual_tokens: Optional[int] = None) -> None:
+        """Finish a request; ``actual_tokens`` replaces the estimate in the TPM window."""
+        if ticket is None:
+            return
+        with self._cond:
+            state = self._states[ticket.key]
+            state.in_flight = max(0, state.in_flight - 1)
+            entry = ticket.window_entry
+            if actual_tokens is not None and entry is not None and any(e is entry for e in state.tokens):
+                state.token_total += actual_tokens - entry[1]
+                entry[1] = float(actual_tokens)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, model: str, tokens: int, *, timeout: Optional[float] = None) -> Iterator[Optional[_Ticket]]:
+        ticket = self.acquire(model, tokens, timeout=timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._cond:
+            now = time.time()
+            result = {}
+            for key, state in self._states.items():
+                state.prune(now)
+                result[key] = {
+                    "in_flight": state.in_flight,
+                    "waiting": len(state.waiting),
+                    "requests_last_minute": len(state.requests),
+                    "tokens_last_minute": int(state.token_total),
+                    "admitted": state.admitted,
+                    "queued": state.queued,
+                    "timeouts": state.timeouts,
+                    "avg_wait": round(state.wait_seconds / state.admitted, 3) if state.admitted else 0.0,
+                }
+            return result
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_signature: Optional[tuple] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler(config: Any) -> Optional[LLMScheduler]:
+    """Return the process-wide scheduler, or None when no LLM budget is configured."""
+    global _scheduler, _scheduler_signature
+    limits = getattr(config, "llm_provider_limits", "")
+    max_concurrency = getattr(config, "llm_default_concurrency", 0)
+    max_wait = getattr(config, "llm_scheduler_max_wait", 300.0)
+    if not isinstance(limits, str):
+        limits = ""
+    if not isinstance(max_concurrency, int) or isinstance(max_concurrency, bool):
+        max_concurrency = 0
+    if not isinstance(max_wait, (int, float)) or isinstance(max_wait, bool):
+        max_wait = 300.0
+    if not limits.strip() and max_concurrency <= 0:
+        return None
+
+    signature = (limits, max_concurrency, float(max_wait))
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler_signature != signature:
+            budgets = parse_provider_limits(limits)
+            if max_concurrency > 0:
+                budgets.setdefault("*", ProviderBudget()).concurrency = max_concurrency
+            # Budget changes apply to new requests; in-flight tickets finish
+            # against the scheduler that admitted them
+            _scheduler = LLMScheduler(budgets, max_wait=float(max_wait))
+            _scheduler_signature = signature
+        return _scheduler
+
+
+def reset_llm_scheduler() -> None:
+    """Drop the process-wide scheduler (tests, config resets)."""
+    global _scheduler, _scheduler_signature
+    with _scheduler_lock:
+        _scheduler = None
+        _scheduler_signature = None
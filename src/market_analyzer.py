@@ -10,11 +10,14 @@
 3. 使用大模型生成每日大盘复盘报告
 """
 
+import contextvars
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 import pandas as pd
 
@@ -27,6 +30,16 @@ from data_provider.base import DataFetcherManager
 
 logger = logging.getLogger(__name__)
 
+# 单次并行检索市场新闻的最大线程数
+_NEWS_SEARCH_MAX_WORKERS = 4
+
+# 各概览数据块写回 MarketOverview 的字段
+_MARKET_STATS_FIELDS = (
+    'up_count', 'down_count', 'flat_count',
+    'limit_up_count', 'limit_down_count', 'total_amount',
+)
+_SECTOR_RANKING_FIELDS = ('top_sectors', 'bottom_sectors')
+
 
 _ENGLISH_SECTION_PATTERNS = {
     "market_summary": r"###\s*(?:1\.\s*)?Market Summary",
@@ -110,6 +123,7 @@ class MarketAnalyzer:
         search_service: Optional[SearchService] = None,
         analyzer=None,
         region: str = "cn",
+        data_manager: Optional[DataFetcherManager] = None,
     ):
         """
         初始化大盘分析器
@@ -118,11 +132,12 @@ class MarketAnalyzer:
             search_service: 搜索服务实例
             analyzer: AI分析器实例（用于调用LLM）
             region: 市场区域 cn=A股 us=美股
+            data_manager: 复用的数据源管理器（可选，共享限流/熔断与行情缓存）
         """
         self.config = get_config()
         self.search_service = search_service
         self.analyzer = analyzer
-        self.data_manager = DataFetcherManager()
+        self.data_manager = data_manager if data_manager is not None else DataFetcherManager()
         self.region = region if region in ("cn", "us", "hk") else "cn"
         self.profile: MarketProfile = get_profile(self.region)
         self.strategy = get_market_strategy_blueprint(self.region)
@@ -280,30 +295,108 @@ Focus on index trend, liquidity, and sector rotation to shape the next-session t
     def get_market_overview(self) -> MarketOverview:
         """
         获取市场概览数据
-        
+
+        指数、涨跌统计、板块排行互不依赖，并行获取；每一块受
+        MARKET_REVIEW_PART_TIMEOUT_SECONDS 限时，超时的数据块保持默认值，
+        不阻塞整体复盘。
+
         Returns:
             MarketOverview: 市场概览数据对象
         """
         today = datetime.now().strftime('%Y-%m-%d')
         overview = MarketOverview(date=today)
-        
-        # 1. 获取主要指数行情（按 region 切换 A 股/美股）
-        overview.indices = self._get_main_indices()
 
-        # 2. 获取涨跌统计（A 股有，美股无等效数据）
+        # 涨跌统计与板块排行各自写入独立的临时对象，完成后由当前线程合并，
+        # 避免超时仍在运行的数据块在返回后改写 overview
+        def _collect(fill: Callable[[MarketOverview], None]) -> Callable[[], MarketOverview]:
+            def _run() -> MarketOverview:
+                partial = MarketOverview(date=today)
+                fill(partial)
+                return partial
+            return _run
+
+        # 1. 主要指数行情（按 region 切换 A 股/美股）
+        parts: Dict[str, Callable[[], Any]] = {"indices": self._get_main_indices}
+        # 2. 涨跌统计（A 股有，美股无等效数据）
         if self.profile.has_market_stats:
-            self._get_market_statistics(overview)
-
-        # 3. 获取板块涨跌榜（A 股有，美股暂无）
+            parts["stats"] = _collect(self._get_market_statistics)
+        # 3. 板块涨跌榜（A 股有，美股暂无）
         if self.profile.has_sector_rankings:
-            self._get_sector_rankings(overview)
-        
+            parts["sectors"] = _collect(self._get_sector_rankings)
+
+        results = self._run_parts_concurrently(parts, "market_overview")
+
+        if results.get("indices"):
+            overview.indices = results["indices"]
+        for key, fields in (("stats", _MARKET_STATS_FIELDS), ("sectors", _SECTOR_RANKING_FIELDS)):
+            partial = results.get(key)
+            if partial is not None:
+                for name in fields:
+                    setattr(overview, name, getattr(partial, name))
+
         # 4. 获取北向资金（可选）
         # self._get_north_flow(overview)
-        
+
         return overview
 
-    
+    def _get_part_timeout(self) -> Optional[float]:
+        """单个数据块的超时秒数；未配置或 <=0 时返回 None（不限时）。"""
+        try:
+            timeout = float(getattr(self.config, "market_review_part_timeout_seconds", 0) or 0)
+        except (TypeError, ValueError):
+            return None
+        return timeout if timeout > 0 else None
+
+    def _run_parts_concurrently(
+        self,
+        parts: Dict[str, Callable[[], Any]],
+        label: str,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        并行执行互不依赖的数据获取任务
+
+        所有任务共享同一个截止时间（启动时刻 + 单项超时），超时或异常的任务
+        不出现在返回结果中。线程池以非阻塞方式关闭，超时任务在后台自然结束，
+        不会拖慢复盘。
+
+        Args:
+            parts: 任务名 -> 无参可调用对象
+            label: 日志与线程名前缀
+            max_workers: 最大并发数，默认等于任务数
+
+        Returns:
+            任务名 -> 返回值（仅包含按时成功完成的任务）
+        """
+        if not parts:
+            return {}
+
+        timeout = self._get_part_timeout()
+        results: Dict[str, Any] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers or len(parts), len(parts))),
+            thread_name_prefix=label,
+        )
+        try:
+            # 每个任务复制一份上下文，保留调用方的日志/请求上下文变量
+            futures = {
+                name: executor.submit(contextvars.copy_context().run, fn)
+                for name, fn in parts.items()
+            }
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            for name, future in futures.items():
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    results[name] = future.result(timeout=remaining)
+                except FuturesTimeoutError:
+                    future.cancel()
+                    logger.warning(f"[大盘] {label}/{name} 超过 {timeout:.0f}s 未返回，跳过该数据块")
+                except Exception as e:
+                    logger.error(f"[大盘] {label}/{name} 执行失败: {e}")
+        finally:
+            executor.shutdown(wait=False)
+        return results
+
     def _get_main_indices(self) -> List[MarketIndex]:
         """获取主要指数实时行情"""
         indices = []
@@ -424,13 +517,22 @@ Focus on index trend, liquidity, and sector rotation to shape the next-session t
             # 根据 region 设置搜索上下文名称，避免美股搜索被解读为 A 股语境
             market_names = {"cn": "大盘", "us": "US market", "hk": "HK market"}
             market_name = market_names.get(self.region, "大盘")
-            for query in search_queries:
-                response = self.search_service.search_stock_news(
+
+            def _search(query: str) -> Callable[[], Any]:
+                return lambda: self.search_service.search_stock_news(
                     stock_code="market",
                     stock_name=market_name,
                     max_results=3,
                     focus_keywords=query.split()
                 )
+
+            # 各搜索词并行检索，结果按搜索词原顺序拼接
+            parts = {f"{i}:{query}": _search(query) for i, query in enumerate(search_queries)}
+            responses = self._run_parts_concurrently(
+                parts, "market_news", max_workers=_NEWS_SEARCH_MAX_WORKERS
+            )
+            for key, query in zip(parts, search_queries):
+                response = responses.get(key)
                 if response and response.results:
                     all_news.extend(response.results)
                     logger.info(f"[大盘] 搜索 '{query}' 获取 {len(response.results)} 条结果")
@@ -1190,11 +1292,11 @@ Market conditions can change quickly. The data above is for reference only and d
         """
         logger.info("========== 开始大盘复盘分析 ==========")
         
-        # 1. 获取市场概览
-        overview = self.get_market_overview()
-        
-        # 2. 搜索市场新闻
-        news = self.search_market_news()
+        # 1-2. 市场概览与新闻搜索互不依赖，并行执行
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="market_news") as executor:
+            news_future = executor.submit(contextvars.copy_context().run, self.search_market_news)
+            overview = self.get_market_overview()
+            news = news_future.result()
         
         # 3. 生成复盘报告
         report = self.generate_market_review(overview, news)
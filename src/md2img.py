@@ -7,18 +7,26 @@ Markdown 转图片工具模块
 将 Markdown 转为 PNG 图片（用于不支持 Markdown 的通知渠道）。
 支持 wkhtmltoimage (imgkit) 与 markdown-to-file (m2f)，后者对 emoji 支持更好 (Issue #455)。
 
+渲染经由模块级 MarkdownImageRenderer：有界并发（MD2IMG_MAX_WORKERS）限制同时运行的
+转图子进程数，按内容哈希缓存 PNG（MD2IMG_CACHE_SIZE），相同内容并发请求只渲染一次；
+prerender_markdown_image 可在发送前提交后台渲染，发送时直接命中缓存或等待同一任务。
+
 Security note: imgkit passes HTML to wkhtmltoimage via stdin, not argv, so
 command injection from content is not applicable. Output is rasterized to PNG
 (no script execution). Input is from system-generated reports, not raw user
 input. Risk is considered low for the current use case.
 """
 
+import hashlib
 import logging
 import os
 import shutil
 import subprocess
 import tempfile
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 
 from src.formatters import markdown_to_html_document
 
@@ -103,6 +111,169 @@ def _markdown_to_image_wkhtml(markdown_text: str) -> Optional[bytes]:
         return None
 
 
+def _resolve_engine() -> str:
+    try:
+        from src.config import get_config
+
+        return getattr(get_config(), "md2img_engine", "wkhtmltoimage")
+    except Exception:
+        return "wkhtmltoimage"
+
+
+def _render_with_engine(engine: str, markdown_text: str) -> Optional[bytes]:
+    if engine == "markdown-to-file":
+        return _markdown_to_image_m2f(markdown_text)
+    return _markdown_to_image_wkhtml(markdown_text)
+
+
+class MarkdownImageRenderer:
+    """
+    Bounded Markdown-to-PNG render service.
+
+    - At most ``max_workers`` converter subprocesses run at once, whichever
+      thread asks for the image.
+    - Successful PNGs are kept in an LRU cache keyed by engine + content hash.
+    - Concurrent requests for the same content share one in-flight render.
+
+    Failed renders are not cached so a later call can retry once the
+    converter is installed or recovers.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 32):
+        self._max_workers = max(1, int(max_workers))
+        self._cache_size = max(0, int(cache_size))
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _cache_key(engine: str, markdown_text: str) -> str:
+        digest = hashlib.sha256(markdown_text.encode("utf-8")).hexdigest()
+        return f"{engine}:{digest}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="md2img"
+            )
+        return self._executor
+
+    def _render_and_store(self, key: str, engine: str, markdown_text: str) -> Optional[bytes]:
+        image = None
+        try:
+            image = _render_with_engine(engine, markdown_text)
+            return image
+        finally:
+            # Publish to the cache before dropping the in-flight entry so a
+            # concurrent caller never misses both.
+            with self._lock:
+                if image and self._cache_size > 0:
+                    self._cache[key] = image
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+                self._inflight.pop(key, None)
+
+    def _submit(self, markdown_text: str, engine: str) -> Tuple[Optional[bytes], Optional[Future]]:
+        """Return (cached_bytes, None) on a cache hit, else (None, future)."""
+        key = self._cache_key(engine, markdown_text)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached, None
+            future = self._inflight.get(key)
+            if future is None:
+                self.misses += 1
+                future = self._get_executor().submit(
+                    self._render_and_store, key, engine, markdown_text
+                )
+                self._inflight[key] = future
+        return None, future
+
+    def submit(self, markdown_text: str, engine: Optional[str] = None) -> Future:
+        """Schedule a render and return a future resolving to PNG bytes or None."""
+        cached, future = self._submit(markdown_text, engine or _resolve_engine())
+        if future is not None:
+            return future
+        done: Future = Future()
+        done.set_result(cached)
+        return done
+
+    def render(self, markdown_text: str, engine: Optional[str] = None) -> Optional[bytes]:
+        """Render synchronously through the pool (cache hit returns immediately)."""
+        cached, future = self._submit(markdown_text, engine or _resolve_engine())
+        if future is None:
+            return cached
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning("markdown_to_image render failed: %s", e)
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._cache),
+                "inflight": len(self._inflight),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+_renderer: Optional[MarkdownImageRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_markdown_image_renderer() -> MarkdownImageRenderer:
+    """Return the process-wide renderer, sized from MD2IMG_MAX_WORKERS / MD2IMG_CACHE_SIZE."""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                try:
+                    from src.config import get_config
+
+                    config = get_config()
+                    max_workers = getattr(config, "md2img_max_workers", 2)
+                    cache_size = getattr(config, "md2img_cache_size", 32)
+                except Exception:
+                    max_workers, cache_size = 2, 32
+                _renderer = MarkdownImageRenderer(max_workers=max_workers, cache_size=cache_size)
+    return _renderer
+
+
+def _exceeds_max_chars(markdown_text: str, max_chars: int) -> bool:
+    if len(markdown_text) > max_chars:
+        logger.warning(
+            "Markdown content (%d chars) exceeds max_chars (%d), skipping image conversion",
+            len(markdown_text),
+            max_chars,
+        )
+        return True
+    return False
+
+
+def prerender_markdown_image(markdown_text: str, max_chars: int = 15000) -> None:
+    """
+    Start rendering in the background so a later markdown_to_image() call for
+    the same content is served from the cache (or joins the in-flight render).
+    """
+    if _exceeds_max_chars(markdown_text, max_chars):
+        return
+    get_markdown_image_renderer().submit(markdown_text)
+
+
 def markdown_to_image(markdown_text: str, max_chars: int = 15000) -> Optional[bytes]:
     """
     Convert Markdown to PNG image bytes.
@@ -121,21 +292,7 @@ def markdown_to_image(markdown_text: str, max_chars: int = 15000) -> Optional[by
     Returns:
         PNG bytes, or None if conversion fails or dependencies unavailable.
     """
-    if len(markdown_text) > max_chars:
-        logger.warning(
-            "Markdown content (%d chars) exceeds max_chars (%d), skipping image conversion",
-            len(markdown_text),
-            max_chars,
-        )
+    if _exceeds_max_chars(markdown_text, max_chars):
         return None
 
-    try:
-        from src.config import get_config
-
-        engine = getattr(get_config(), "md2img_engine", "wkhtmltoimage")
-    except Exception:
-        engine = "wkhtmltoimage"
-
-    if engine == "markdown-to-file":
-        return _markdown_to_image_m2f(markdown_text)
-    return _markdown_to_image_wkhtml(markdown_text)
+    return get_markdown_image_renderer().render(markdown_text)
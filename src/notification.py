@@ -16,9 +16,13 @@ A股自选股智能分析系统 - 通知层
 """
 from __future__ import annotations
 
+import contextvars
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
 
 from src.config import Config, get_config
@@ -62,6 +66,7 @@ from src.notification_sender import (
     resolve_gotify_message_endpoint,
     resolve_ntfy_endpoint,
 )
+from src.notification_sender.chunk_delivery import chunk_retry_scope
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +121,27 @@ class ChannelDetector:
         return names.get(channel, "未知渠道")
 
 
+@dataclass
+class ChannelSendResult:
+    """单个通知渠道的发送结果"""
+    channel: NotificationChannel
+    success: bool = False
+    attempts: int = 0            # 实际尝试次数（含重试）
+    elapsed: float = 0.0         # 耗时（秒）
+    timed_out: bool = False      # 是否超过 NOTIFICATION_CHANNEL_TIMEOUT_SECONDS
+    error: Optional[str] = None  # 最后一次失败原因
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "channel": self.channel.value,
+            "success": self.success,
+            "attempts": self.attempts,
+            "elapsed": round(self.elapsed, 3),
+            "timed_out": self.timed_out,
+            "error": self.error,
+        }
+
+
 class NotificationService(
     AstrbotSender,
     CustomWebhookSender,
@@ -170,6 +196,11 @@ class NotificationService(
 
         # 仅分析结果摘要（Issue #262）：true 时只推送汇总，不含个股详情
         self._report_summary_only = getattr(config, 'report_summary_only', False)
+
+        # 多渠道并发推送：线程池上限、单渠道超时与重试预算
+        self._max_workers = max(1, int(getattr(config, 'notification_max_workers', 4) or 1))
+        self._channel_timeout = float(getattr(config, 'notification_channel_timeout_seconds', 0) or 0)
+        self._channel_retries = max(0, int(getattr(config, 'notification_channel_retries', 0) or 0))
         self._history_compare_cache: Dict[Tuple[int, Tuple[Tuple[str, str], ...]], Dict[str, List[Dict[str, Any]]]] = {}
 
         # 初始化各渠道
@@ -372,6 +403,23 @@ class NotificationService(
         """获取所有已配置的渠道"""
         return self._available_channels
 
+    @property
+    def markdown_to_image_channels(self) -> FrozenSet[str]:
+        """需要 Markdown 转图片的渠道名集合（MARKDOWN_TO_IMAGE_CHANNELS）"""
+        return frozenset(self._markdown_to_image_channels)
+
+    @property
+    def markdown_to_image_max_chars(self) -> int:
+        """Markdown 转图片的最大字符数，超出时回退为文本"""
+        return self._markdown_to_image_max_chars
+
+    def needs_markdown_image(self, channel: NotificationChannel) -> bool:
+        """该渠道发送前是否需要把 Markdown 转为图片（ntfy / Gotify 不支持图片）"""
+        return (
+            channel.value in self._markdown_to_image_channels
+            and channel not in {NotificationChannel.NTFY, NotificationChannel.GOTIFY}
+        )
+
     def get_channels_for_route(
         self,
         route_type: Optional[str],
@@ -1689,7 +1737,40 @@ class NotificationService(
         """
         统一发送接口 - 向所有已配置的渠道发送
 
-        遍历所有已配置的渠道，逐一发送消息
+        参数与 send_with_results() 相同。
+
+        Returns:
+            是否至少有一个渠道发送成功
+        """
+        success, _ = self.send_with_results(
+            content,
+            email_stock_codes=email_stock_codes,
+            email_send_to_all=email_send_to_all,
+            route_type=route_type,
+            severity=severity,
+            dedup_key=dedup_key,
+            cooldown_key=cooldown_key,
+        )
+        return success
+
+    def send_with_results(
+        self,
+        content: str,
+        email_stock_codes: Optional[List[str]] = None,
+        email_send_to_all: bool = False,
+        route_type: Optional[str] = None,
+        severity: Optional[str] = None,
+        dedup_key: Optional[str] = None,
+        cooldown_key: Optional[str] = None,
+    ) -> Tuple[bool, List[ChannelSendResult]]:
+        """
+        向所有已配置的渠道发送，并返回本次调用的逐渠道结果
+
+        各渠道在有界线程池中并发发送（NOTIFICATION_MAX_WORKERS），同一渠道的
+        分批消息仍在同一线程内按顺序发送；单渠道受
+        NOTIFICATION_CHANNEL_TIMEOUT_SECONDS 限时、按 NOTIFICATION_CHANNEL_RETRIES
+        重试，重试只重发未送达的批次。结果随返回值给出而不保存在实例上，
+        并发调用 send() 的各流水线线程互不影响。
 
         Fallback rules (Markdown-to-image, Issue #289):
         - When image_bytes is None (conversion failed / imgkit not installed /
@@ -1707,24 +1788,24 @@ class NotificationService(
             cooldown_key: 可选冷却 key；未设置时使用路由/级别默认 key
 
         Returns:
-            是否至少有一个渠道发送成功
+            (是否至少有一个渠道发送成功, 逐渠道结果)
         """
         context_success = self.send_to_context(content)
 
         if not self._available_channels:
             if context_success:
                 logger.info("已通过消息上下文渠道完成推送（无其他通知渠道）")
-                return True
+                return True, []
             logger.warning("通知服务不可用，跳过推送")
-            return False
+            return False, []
 
         target_channels = self.get_channels_for_route(route_type)
         if not target_channels:
             if context_success:
                 logger.info("已通过消息上下文渠道完成推送（路由后无其他通知渠道）")
-                return True
+                return True, []
             logger.warning("通知路由 %s 未命中任何已配置渠道，跳过静态通知渠道", route_type)
-            return False
+            return False, []
 
         noise_decision = self.evaluate_noise_control(
             content,
@@ -1735,16 +1816,12 @@ class NotificationService(
         )
         if not noise_decision.should_send:
             logger.info(noise_decision.message)
-            return context_success
+            return context_success, []
 
         # Markdown to image (Issue #289): convert once if any channel needs it.
         # Per-channel decision via _should_use_image_for_channel (see send() docstring for fallback rules).
         image_bytes = None
-        channels_needing_image = {
-            ch for ch in target_channels
-            if ch.value in self._markdown_to_image_channels
-            and ch not in {NotificationChannel.NTFY, NotificationChannel.GOTIFY}
-        }
+        channels_needing_image = {ch for ch in target_channels if self.needs_markdown_image(ch)}
         if channels_needing_image:
             from src.md2img import markdown_to_image
             image_bytes = markdown_to_image(
@@ -1771,85 +1848,210 @@ class NotificationService(
         channel_names = ', '.join(ChannelDetector.get_channel_name(ch) for ch in target_channels)
         logger.info(f"正在向 {len(target_channels)} 个渠道发送通知：{channel_names}")
 
-        success_count = 0
-        fail_count = 0
-
-        for channel in target_channels:
-            channel_name = ChannelDetector.get_channel_name(channel)
-            use_image = self._should_use_image_for_channel(channel, image_bytes)
-            try:
-                if channel == NotificationChannel.WECHAT:
-                    if use_image:
-                        result = self._send_wechat_image(image_bytes)
-                    else:
-                        result = self.send_to_wechat(content)
-                elif channel == NotificationChannel.FEISHU:
-                    result = self.send_to_feishu(content)
-                elif channel == NotificationChannel.TELEGRAM:
-                    if use_image:
-                        result = self._send_telegram_photo(image_bytes)
-                    else:
-                        result = self.send_to_telegram(content)
-                elif channel == NotificationChannel.EMAIL:
-                    receivers = None
-                    if email_send_to_all and self._stock_email_groups:
-                        receivers = self.get_all_email_receivers()
-                    elif email_stock_codes and self._stock_email_groups:
-                        receivers = self.get_receivers_for_stocks(email_stock_codes)
-                    if use_image:
-                        result = self._send_email_with_inline_image(
-                            image_bytes, receivers=receivers
-                        )
-                    else:
-                        result = self.send_to_email(content, receivers=receivers)
-                elif channel == NotificationChannel.PUSHOVER:
-                    result = self.send_to_pushover(content)
-                elif channel == NotificationChannel.NTFY:
-                    result = self.send_to_ntfy(content)
-                elif channel == NotificationChannel.GOTIFY:
-                    result = self.send_to_gotify(content)
-                elif channel == NotificationChannel.PUSHPLUS:
-                    result = self.send_to_pushplus(content)
-                elif channel == NotificationChannel.SERVERCHAN3:
-                    result = self.send_to_serverchan3(content)
-                elif channel == NotificationChannel.CUSTOM:
-                    if use_image:
-                        result = self._send_custom_webhook_image(
-                            image_bytes, fallback_content=content
-                        )
-                    else:
-                        result = self.send_to_custom(content)
-                elif channel == NotificationChannel.DISCORD:
-                    result = self.send_to_discord(content)
-                elif channel == NotificationChannel.SLACK:
-                    if use_image:
-                        result = self._send_slack_image(
-                            image_bytes, fallback_content=content
-                        )
-                    else:
-                        result = self.send_to_slack(content)
-                elif channel == NotificationChannel.ASTRBOT:
-                    result = self.send_to_astrbot(content)
-                else:
-                    logger.warning(f"不支持的通知渠道: {channel}")
-                    result = False
-
-                if result:
-                    success_count += 1
-                else:
-                    fail_count += 1
-
-            except Exception as e:
-                logger.error(f"{channel_name} 发送失败: {e}")
-                fail_count += 1
+        results = self._dispatch_to_channels(
+            target_channels,
+            content,
+            image_bytes=image_bytes,
+            email_stock_codes=email_stock_codes,
+            email_send_to_all=email_send_to_all,
+        )
+        success_count = sum(1 for r in results if r.success)
+        fail_count = len(results) - success_count
 
-        logger.info(f"通知发送完成：成功 {success_count} 个，失败 {fail_count} 个")
+        failed_names = [ChannelDetector.get_channel_name(r.channel) for r in results if not r.success]
+        logger.info(
+            f"通知发送完成：成功 {success_count} 个，失败 {fail_count} 个"
+            + (f"（失败渠道：{', '.join(failed_names)}）" if failed_names else "")
+        )
         if success_count > 0:
             self.record_noise_control(noise_decision)
         else:
             self.release_noise_control(noise_decision)
-        return success_count > 0 or context_success
+        return success_count > 0 or context_success, results
    
+    def _dispatch_to_channels(
+        self,
+        channels: List[NotificationChannel],
+        content: str,
+        image_bytes: Optional[bytes] = None,
+        email_stock_codes: Optional[List[str]] = None,
+        email_send_to_all: bool = False,
+    ) -> List[ChannelSendResult]:
+        """
+        在有界线程池中并发向各渠道发送，返回与 channels 顺序一致的逐渠道结果
+
+        超时从渠道真正开始发送时计时（排队时间不计入）；超时渠道标记为失败，
+        其线程在后台自然结束，不阻塞调用方。
+        """
+        if not channels:
+            return []
+
+        timeout = self._channel_timeout if self._channel_timeout > 0 else None
+        started: Dict[NotificationChannel, float] = {}
+        results: Dict[NotificationChannel, ChannelSendResult] = {}
+
+        def _task(channel: NotificationChannel) -> ChannelSendResult:
+            started[channel] = time.monotonic()
+            return self._send_to_channel_with_retries(
+                channel,
+                content,
+                image_bytes=image_bytes,
+                email_stock_codes=email_stock_codes,
+                email_send_to_all=email_send_to_all,
+                started_at=started[channel],
+                timeout=timeout,
+            )
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(channels)),
+            thread_name_prefix="notify",
+        )
+        try:
+            pending = {
+                executor.submit(contextvars.copy_context().run, _task, channel): channel
+                for channel in channels
+            }
+            while pending:
+                wait_for = None
+                if timeout is not None:
+                    deadlines = [started[ch] + timeout for ch in pending.values() if ch in started]
+                    # 尚无渠道开始发送时短暂轮询，等待其记录开始时间
+                    wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else 0.05
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    channel = pending.pop(future)
+                    results[channel] = future.result()
+                if timeout is None:
+                    continue
+                now = time.monotonic()
+                for future, channel in list(pending.items()):
+                    if channel in started and now - started[channel] >= timeout:
+                        pending.pop(future)
+                        future.cancel()
+                        logger.error(
+                            f"{ChannelDetector.get_channel_name(channel)} 发送超时（>{timeout:.0f}s），已跳过"
+                        )
+                        results[channel] = ChannelSendResult(
+                            channel=channel,
+                            elapsed=now - started[channel],
+                            timed_out=True,
+                            error="timeout",
+                        )
+        finally:
+            executor.shutdown(wait=False)
+
+        return [results[channel] for channel in channels]
+
+    def _send_to_channel_with_retries(
+        self,
+        channel: NotificationChannel,
+        content: str,
+        image_bytes: Optional[bytes] = None,
+        email_stock_codes: Optional[List[str]] = None,
+        email_send_to_all: bool = False,
+        started_at: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> ChannelSendResult:
+        """
+        向单个渠道发送，失败时在超时预算内最多重试 NOTIFICATION_CHANNEL_RETRIES 次
+
+        分批发送的渠道在 chunk_retry_scope() 内重试，已送达的批次不会重发。
+        """
+        channel_name = ChannelDetector.get_channel_name(channel)
+        started_at = started_at if started_at is not None else time.monotonic()
+        result = ChannelSendResult(channel=channel)
+        max_attempts = 1 + self._channel_retries
+
+        with chunk_retry_scope():
+            for attempt in range(1, max_attempts + 1):
+                result.attempts = attempt
+                try:
+                    if self._send_to_channel(
+                        channel,
+                        content,
+                        image_bytes=image_bytes,
+                        email_stock_codes=email_stock_codes,
+                        email_send_to_all=email_send_to_all,
+                    ):
+                        result.success = True
+                        result.error = None
+                        break
+                    result.error = "send returned False"
+                except Exception as e:
+                    logger.error(f"{channel_name} 发送失败: {e}")
+                    result.error = str(e)
+
+                if attempt >= max_attempts:
+                    break
+                delay = min(2 ** (attempt - 1), 5)
+                if timeout is not None and time.monotonic() - started_at + delay >= timeout:
+                    break
+                logger.warning(f"{channel_name} 发送失败，{delay}s 后重试 ({attempt}/{self._channel_retries})")
+                time.sleep(delay)
+
+        result.elapsed = time.monotonic() - started_at
+        return result
+
+    def _send_to_channel(
+        self,
+        channel: NotificationChannel,
+        content: str,
+        image_bytes: Optional[bytes] = None,
+        email_stock_codes: Optional[List[str]] = None,
+        email_send_to_all: bool = False,
+    ) -> bool:
+        """按渠道类型调用对应发送方法（图片/文本由 _should_use_image_for_channel 决定）"""
+        use_image = self._should_use_image_for_channel(channel, image_bytes)
+        if channel == NotificationChannel.WECHAT:
+            if use_image:
+                return self._send_wechat_image(image_bytes)
+            return self.send_to_wechat(content)
+        if channel == NotificationChannel.FEISHU:
+            return self.send_to_feishu(content)
+        if channel == NotificationChannel.TELEGRAM:
+            if use_image:
+                return self._send_telegram_photo(image_bytes)
+            return self.send_to_telegram(content)
+        if channel == NotificationChannel.EMAIL:
+            receivers = None
+            if email_send_to_all and self._stock_email_groups:
+                receivers = self.get_all_email_receivers()
+            elif email_stock_codes and self._stock_email_groups:
+                receivers = self.get_receivers_for_stocks(email_stock_codes)
+            if use_image:
+                return self._send_email_with_inline_image(
+                    image_bytes, receivers=receivers
+                )
+            return self.send_to_email(content, receivers=receivers)
+        if channel == NotificationChannel.PUSHOVER:
+            return self.send_to_pushover(content)
+        if channel == NotificationChannel.NTFY:
+            return self.send_to_ntfy(content)
+        if channel == NotificationChannel.GOTIFY:
+            return self.send_to_gotify(content)
+        if channel == NotificationChannel.PUSHPLUS:
+            return self.send_to_pushplus(content)
+        if channel == NotificationChannel.SERVERCHAN3:
+            return self.send_to_serverchan3(content)
+        if channel == NotificationChannel.CUSTOM:
+            if use_image:
+                return self._send_custom_webhook_image(
+                    image_bytes, fallback_content=content
+                )
+            return self.send_to_custom(content)
+        if channel == NotificationChannel.DISCORD:
+            return self.send_to_discord(content)
+        if channel == NotificationChannel.SLACK:
+            if use_image:
+                return self._send_slack_image(
+                    image_bytes, fallback_content=content
+                )
+            return self.send_to_slack(content)
+        if channel == NotificationChannel.ASTRBOT:
+            return self.send_to_astrbot(content)
+        logger.warning(f"不支持的通知渠道: {channel}")
+        return False
+
     def save_report_to_file(
         self, 
         content: str, 
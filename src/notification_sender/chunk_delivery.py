@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+分批消息断点续发
+===================================
+
+NotificationService 重试失败渠道时会重新调用整条消息的发送方法。在
+chunk_retry_scope() 范围内，各分批发送器经 send_chunk() 记录已送达的批次，
+重试时跳过这些批次，只重发失败的批次，避免接收方收到重复消息。
+范围外调用 send_chunk() 与直接发送相同。
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+@contextmanager
+def chunk_retry_scope() -> Iterator[None]:
+    """同一渠道的首次发送与各次重试共用一份已送达批次记录。"""
+    previous = getattr(_local, "delivered", None)
+    _local.delivered = set()
+    try:
+        yield
+    finally:
+        _local.delivered = previous
+
+
+def send_chunk(target: str, index: int, chunk: str, send: Callable[[], bool]) -> bool:
+    """
+    发送一批消息；本范围内此前已送达的同一批次直接视为成功
+
+    Args:
+        target: 发送目标标识（同一渠道多个地址时用于区分）
+        index: 批次序号
+        chunk: 批次内容
+        send: 实际发送函数
+    """
+    delivered = getattr(_local, "delivered", None)
+    key = (target, index, chunk)
+    if delivered is not None and key in delivered:
+        logger.debug("%s 第 %d 批已送达，重试时跳过", target, index + 1)
+        return True
+    ok = send()
+    if ok and delivered is not None:
+        delivered.add(key)
+    return ok
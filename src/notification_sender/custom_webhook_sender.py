@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import chunk_content_by_max_bytes, slice_at_max_bytes
 
 
@@ -376,7 +377,7 @@ class CustomWebhookSender:
                 hard_budget = max(200, budget - (body_bytes - max_bytes) - 200)
                 payload["markdown"]["text"], _ = slice_at_max_bytes(payload["markdown"]["text"], hard_budget)
 
-            if self._post_custom_webhook(url, payload, timeout=30):
+            if send_chunk(url, idx, chunk, lambda payload=payload: self._post_custom_webhook(url, payload, timeout=30)):
                 ok += 1
             else:
                 logger.error(f"钉钉分批发送失败: 第 {idx+1}/{total} 批")
@@ -11,6 +11,7 @@ from typing import Optional
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import chunk_content_by_max_words
 
 
@@ -60,11 +61,17 @@ class DiscordSender:
 
         # 优先使用 Webhook（配置简单，权限低）
         if self._discord_config['webhook_url']:
-            return all(self._send_discord_webhook(chunk, timeout_seconds=timeout_seconds) for chunk in chunks)
+            return all(
+                send_chunk("discord", i, chunk, lambda chunk=chunk: self._send_discord_webhook(chunk, timeout_seconds=timeout_seconds))
+                for i, chunk in enumerate(chunks)
+            )
 
         # 其次使用 Bot API（权限高，需要 channel_id）
         if self._discord_config['bot_token'] and self._discord_config['channel_id']:
-            return all(self._send_discord_bot(chunk, timeout_seconds=timeout_seconds) for chunk in chunks)
+            return all(
+                send_chunk("discord", i, chunk, lambda chunk=chunk: self._send_discord_bot(chunk, timeout_seconds=timeout_seconds))
+                for i, chunk in enumerate(chunks)
+            )
 
         logger.warning("Discord 配置不完整，跳过推送")
         return False
@@ -15,6 +15,7 @@ from typing import Any, Dict, Optional
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import (
     MIN_MAX_BYTES,
     PAGE_MARKER_SAFE_BYTES,
@@ -173,7 +174,7 @@ class FeishuSender:
         
         for i, chunk in enumerate(chunks):
             try:
-                if self._send_feishu_message(chunk):
+                if send_chunk("feishu", i, chunk, lambda chunk=chunk: self._send_feishu_message(chunk)):
                     success_count += 1
                     logger.info(f"飞书第 {i+1}/{total_chunks} 批发送成功")
                 else:
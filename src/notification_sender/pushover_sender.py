@@ -11,6 +11,7 @@ from datetime import datetime
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import markdown_to_plain_text
 
 
@@ -216,14 +217,14 @@ class PushoverSender:
             # 添加分页标记到标题
             chunk_title = f"{title} ({i+1}/{total_chunks})" if total_chunks > 1 else title
             
-            if self._send_pushover_message(
+            if send_chunk("pushover", i, chunk, lambda chunk=chunk, chunk_title=chunk_title: self._send_pushover_message(
                 api_url,
                 user_key,
                 api_token,
                 chunk,
                 chunk_title,
                 timeout_seconds=timeout_seconds,
-            ):
+            )):
                 success_count += 1
                 logger.info(f"Pushover 第 {i+1}/{total_chunks} 批发送成功")
             else:
@@ -12,6 +12,7 @@ from datetime import datetime
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import chunk_content_by_max_bytes
 
 
@@ -136,7 +137,7 @@ class PushplusSender:
 
         for i, chunk in enumerate(chunks):
             chunk_title = f"{title} ({i+1}/{total_chunks})" if total_chunks > 1 else title
-            if self._send_pushplus_message(api_url, chunk, chunk_title):
+            if send_chunk("pushplus", i, chunk, lambda chunk=chunk, chunk_title=chunk_title: self._send_pushplus_message(api_url, chunk, chunk_title)):
                 success_count += 1
                 logger.info(f"PushPlus 第 {i+1}/{total_chunks} 批发送成功")
             else:
@@ -13,6 +13,7 @@ from typing import Optional
 import requests
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 from src.formatters import chunk_content_by_max_bytes
 
 logger = logging.getLogger(__name__)
@@ -68,11 +69,17 @@ class SlackSender:
 
         # 优先使用 Bot API（与 _send_slack_image 保持一致）
         if self._use_bot:
-            return all(self._send_slack_bot(chunk, timeout_seconds=timeout_seconds) for chunk in chunks)
+            return all(
+                send_chunk("slack", i, chunk, lambda chunk=chunk: self._send_slack_bot(chunk, timeout_seconds=timeout_seconds))
+                for i, chunk in enumerate(chunks)
+            )
 
         # 其次使用 Webhook
         if self._slack_webhook_url:
-            return all(self._send_slack_webhook(chunk, timeout_seconds=timeout_seconds) for chunk in chunks)
+            return all(
+                send_chunk("slack", i, chunk, lambda chunk=chunk: self._send_slack_webhook(chunk, timeout_seconds=timeout_seconds))
+                for i, chunk in enumerate(chunks)
+            )
 
         logger.warning("Slack 配置不完整，跳过推送")
         return False
@@ -13,6 +13,7 @@ import time
 import re
 
 from src.config import Config
+from src.notification_sender.chunk_delivery import send_chunk
 
 
 logger = logging.getLogger(__name__)
@@ -244,7 +245,7 @@ class TelegramSender:
                 if current_chunk:
                     chunk_content = "\n---\n".join(current_chunk)
                     logger.info(f"发送 Telegram 消息块 {chunk_index}...")
-                    if not self._send_telegram_message(api_url, chat_id, chunk_content, message_thread_id, timeout_seconds=timeout_seconds):
+                    if not send_chunk("telegram", chunk_index, chunk_content, lambda chunk_content=chunk_content: self._send_telegram_message(api_url, chat_id, chunk_content, message_thread_id, timeout_seconds=timeout_seconds)):
                         all_success = False
                     chunk_index += 1
                 
@@ -259,7 +260,7 @@ class TelegramSender:
         if current_chunk:
             chunk_content = "\n---\n".join(current_chunk)
             logger.info(f"发送 Telegram 消息块 {chunk_index}...")
-            if not self._send_telegram_message(api_url, chat_id, chunk_content, message_thread_id, timeout_seconds=timeout_seconds):
+            if not send_chunk("telegram", chunk_index, chunk_content, lambda chunk_content=chunk_content: self._send_telegram_message(api_url, chat_id, chunk_content, message_thread_id, timeout_seconds=timeout_seconds)):
                 all_success = False
                 
         return all_success
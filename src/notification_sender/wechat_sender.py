@@ -15,6 +15,7 @@ from typing import Optional
 
 from src.config import Config
 from src.formatters import chunk_content_by_max_bytes
+from src.notification_sender.chunk_delivery import send_chunk
 
 
 logger = logging.getLogger(__name__)
@@ -165,7 +166,7 @@ class WechatSender:
         total_chunks = len(chunks)
         success_count = 0
         for i, chunk in enumerate(chunks):
-            if self._send_wechat_message(chunk):
+            if send_chunk("wechat", i, chunk, lambda chunk=chunk: self._send_wechat_message(chunk)):
                 success_count += 1
             else:
                 logger.error(f"企业微信第 {i+1}/{total_chunks} 批发送失败")
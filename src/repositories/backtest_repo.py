@@ -12,6 +12,7 @@ from datetime import date, datetime, timedelta
 from typing import List, Optional, Tuple
 
 from sqlalchemy import and_, delete, desc, func, select
+from sqlalchemy.orm import defer
 
 from src.storage import BacktestResult, BacktestSummary, DatabaseManager, AnalysisHistory
 
@@ -42,7 +43,12 @@ class BacktestRepository:
             if code:
                 conditions.append(AnalysisHistory.code == code)
 
-            query = select(AnalysisHistory).where(and_(*conditions))
+            # 回测只需要 context_snapshot，跳过报告全文与新闻等大字段
+            query = (
+                select(AnalysisHistory)
+                .options(defer(AnalysisHistory.raw_result), defer(AnalysisHistory.news_content))
+                .where(and_(*conditions))
+            )
 
             if not force:
                 existing_ids = select(BacktestResult.analysis_history_id).where(
@@ -7,7 +7,9 @@
 职责：
 1. 支持每日定时执行股票分析
 2. 支持定时执行大盘复盘
-3. 优雅处理信号，确保可靠退出
+3. 支持按市场（A股/港股/美股）收盘后分别触发分析
+4. 支持在执行前预热行情 / 日线 / 基本面缓存
+5. 优雅处理信号，确保可靠退出
 
 依赖：
 - schedule: 轻量级定时任务库
@@ -18,7 +20,7 @@ import re
 import signal
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -59,6 +61,8 @@ class Scheduler:
 
     基于 schedule 库实现，支持：
     - 每日定时执行
+    - 按市场收盘时间执行（交易日历驱动）
+    - 执行前缓存预热
     - 启动时立即执行
     - 优雅退出
     """
@@ -87,6 +91,11 @@ class Scheduler:
         self._task_callback: Optional[Callable] = None
         self._daily_job: Optional[Any] = None
         self._background_tasks: List[Dict[str, Any]] = []
+        self._market_tasks: List[Dict[str, Any]] = []
+        self._warmup_task: Optional[Callable[[Optional[str]], Any]] = None
+        self._warmup_lead = timedelta(0)
+        self._warmup_job: Optional[Any] = None
+        self._warmup_entries: Dict[Optional[str], Dict[str, Any]] = {}
         self._running = False
 
     def set_daily_task(self, task: Callable, run_immediately: bool = True):
@@ -113,18 +122,21 @@ class Scheduler:
             return False
         return True
 
-    def _cancel_daily_job(self) -> None:
-        """Remove the currently registered daily job if one exists."""
-        if self._daily_job is None:
+    def _cancel_job(self, job: Optional[Any]) -> None:
+        """Remove a registered schedule job if one exists."""
+        if job is None:
             return
 
         if hasattr(self.schedule, "cancel_job"):
-            self.schedule.cancel_job(self._daily_job)
+            self.schedule.cancel_job(job)
         else:  # pragma: no cover - compatibility fallback
             jobs = getattr(self.schedule, "jobs", None)
-            if isinstance(jobs, list) and self._daily_job in jobs:
-                jobs.remove(self._daily_job)
+            if isinstance(jobs, list) and job in jobs:
+                jobs.remove(job)
 
+    def _cancel_daily_job(self) -> None:
+        """Remove the currently registered daily job if one exists."""
+        self._cancel_job(self._daily_job)
         self._daily_job = None
 
     def _configure_daily_task(self, schedule_time: str) -> bool:
@@ -142,6 +154,7 @@ class Scheduler:
         self._cancel_daily_job()
         self._daily_job = self.schedule.every().day.at(candidate).do(self._safe_run_task)
         self.schedule_time = candidate
+        self._configure_warmup_job()
 
         if previous_time == candidate:
             logger.info("已设置每日定时任务，执行时间: %s", self.schedule_time)
@@ -170,22 +183,146 @@ class Scheduler:
         if self._configure_daily_task(latest_schedule_time):
             logger.info("更新后的下次执行时间: %s", self._get_next_run_time())
 
-    def _safe_run_task(self):
-        """安全执行任务（带异常捕获）"""
-        if self._task_callback is None:
+    def _safe_run_task(self, task: Optional[Callable] = None, label: str = "定时任务"):
+        """安全执行任务（带异常捕获），默认执行每日任务"""
+        task = task or self._task_callback
+        if task is None:
             return
 
         try:
             logger.info("=" * 50)
-            logger.info(f"定时任务开始执行 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"{label}开始执行 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             logger.info("=" * 50)
 
-            self._task_callback()
+            task()
 
-            logger.info(f"定时任务执行完成 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"{label}执行完成 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
         except Exception as e:
-            logger.exception(f"定时任务执行失败: {e}")
+            logger.exception(f"{label}执行失败: {e}")
+
+    def set_warmup_task(self, task: Callable[[Optional[str]], Any], lead_minutes: int) -> None:
+        """
+        设置缓存预热任务
+
+        预热在每次定时执行前 ``lead_minutes`` 分钟于后台线程中运行，参数为
+        市场（'cn' / 'hk' / 'us'；每日任务为 None）。``lead_minutes`` <= 0 时关闭。
+        """
+        self._warmup_task = task if lead_minutes > 0 else None
+        self._warmup_lead = timedelta(minutes=max(0, int(lead_minutes)))
+        self._warmup_entries = {}
+        if self._daily_job is not None:
+            self._configure_warmup_job()
+
+    def _configure_warmup_job(self) -> None:
+        """(Re)register the daily warm-up job ahead of the daily job."""
+        self._cancel_job(self._warmup_job)
+        self._warmup_job = None
+        if self._warmup_task is None or self._daily_job is None:
+            return
+
+        run_at = datetime.strptime(self.schedule_time, "%H:%M")
+        warmup_time = (run_at - self._warmup_lead).strftime("%H:%M")
+        self._warmup_job = self.schedule.every().day.at(warmup_time).do(self._start_warmup)
+        logger.info("已设置缓存预热任务，执行时间: %s", warmup_time)
+
+    def _start_warmup(self, market: Optional[str] = None) -> bool:
+        """Start the warm-up for one market (None = daily task) in a daemon thread."""
+        if self._warmup_task is None:
+            return False
+
+        entry = self._warmup_entries.get(market)
+        if entry is None:
+            warmup_task = self._warmup_task
+            entry = {
+                "task": lambda: warmup_task(market),
+                "interval_seconds": 0,
+                "last_run": 0.0,
+                "name": f"warmup-{market or 'daily'}",
+                "thread": None,
+                "running": False,
+            }
+            self._warmup_entries[market] = entry
+        started = self._start_background_task(entry)
+        if not started:
+            logger.info("上一轮缓存预热仍在执行，跳过本轮: %s", entry["name"])
+        return started
+
+    def add_market_task(
+        self,
+        market: str,
+        task: Callable,
+        delay_minutes: int = 0,
+        name: Optional[str] = None,
+        catch_up: bool = True,
+    ) -> bool:
+        """Register a job that runs *delay_minutes* after every session close of *market*.
+
+        Close times come from the trading calendar (holidays and half days
+        included). With *catch_up*, a close that passed less than
+        *delay_minutes* ago still triggers its run; pass False when the
+        caller already runs the task at start-up.
+        """
+        entry = {
+            "market": market,
+            "task": task,
+            "delay": timedelta(minutes=max(0, int(delay_minutes))),
+            "name": name or f"market-{market}",
+            "close": None,
+            "next_run": None,
+            "warmed": False,
+        }
+        after = datetime.now(timezone.utc)
+        if catch_up:
+            after -= entry["delay"]
+        if not self._schedule_market_task(entry, after=after):
+            logger.warning("无法解析市场 %s 的收盘时间，跳过按市场定时任务", market)
+            return False
+
+        self._market_tasks.append(entry)
+        logger.info(
+            "已注册按市场定时任务: %s（收盘后 %d 分钟，下次执行: %s）",
+            entry["name"],
+            int(entry["delay"].total_seconds() // 60),
+            entry["next_run"].strftime("%Y-%m-%d %H:%M %Z"),
+        )
+        return True
+
+    def _schedule_market_task(self, entry: Dict[str, Any], after: datetime) -> bool:
+        """Point *entry* at the first session close after *after*."""
+        from src.core.trading_calendar import get_next_market_close
+
+        close = get_next_market_close(entry["market"], after=after)
+        if close is None:
+            return False
+        entry["close"] = close
+        entry["next_run"] = close + entry["delay"]
+        entry["warmed"] = False
+        return True
+
+    def _run_market_tasks(self) -> None:
+        """Run market jobs that are due and start warm-ups for upcoming ones."""
+        if not self._market_tasks:
+            return
+
+        now = datetime.now(timezone.utc)
+        for entry in self._market_tasks:
+            if (
+                self._warmup_task is not None
+                and not entry["warmed"]
+                and entry["next_run"] - self._warmup_lead <= now < entry["next_run"]
+            ):
+                entry["warmed"] = True
+                self._start_warmup(entry["market"])
+
+            if now < entry["next_run"]:
+                continue
+
+            self._safe_run_task(entry["task"], label=f"定时任务[{entry['market']}]")
+            # Closes missed while the process was busy or asleep are skipped
+            after = max(entry["close"], datetime.now(timezone.utc) - entry["delay"])
+            if not self._schedule_market_task(entry, after=after):  # pragma: no cover - defensive
+                logger.warning("无法计算 %s 的下次执行时间", entry["name"])
 
     def add_background_task(
         self,
@@ -283,6 +420,7 @@ class Scheduler:
         while self._running and not self.shutdown_handler.should_shutdown:
             self._refresh_daily_schedule_if_needed()
             self.schedule.run_pending()
+            self._run_market_tasks()
             self._run_background_tasks()
             time.sleep(30)  # 每30秒检查一次
 
@@ -294,10 +432,12 @@ class Scheduler:
 
     def _get_next_run_time(self) -> str:
         """获取下次执行时间"""
-        jobs = self.schedule.get_jobs()
-        if jobs:
-            next_run = min(job.next_run for job in jobs)
-            return next_run.strftime('%Y-%m-%d %H:%M:%S')
+        runs = [job.next_run for job in self.schedule.get_jobs() if job is not self._warmup_job]
+        runs.extend(
+            entry["next_run"].astimezone().replace(tzinfo=None) for entry in self._market_tasks
+        )
+        if runs:
+            return min(runs).strftime('%Y-%m-%d %H:%M:%S')
         return "未设置"
 
     def stop(self):
@@ -311,6 +451,9 @@ def run_with_schedule(
     run_immediately: bool = True,
     background_tasks: Optional[List[Dict[str, Any]]] = None,
     schedule_time_provider: Optional[Callable[[], str]] = None,
+    market_tasks: Optional[List[Dict[str, Any]]] = None,
+    warmup_task: Optional[Callable[[Optional[str]], Any]] = None,
+    warmup_minutes: int = 0,
 ):
     """
     便捷函数：使用定时调度运行任务
@@ -324,6 +467,12 @@ def run_with_schedule(
             和 `run_immediately`。`interval_seconds` 单位为秒。
         schedule_time_provider: 可选的时间提供器；调度器每轮检查前会读取，
             当返回值变化时自动重建 daily job。
+        market_tasks: 可选的按市场任务定义列表。每项需包含 `market`
+            ('cn' / 'hk' / 'us') 与 `task`，可选 `delay_minutes`（收盘后
+            延迟分钟数）和 `name`。提供时替代每日定时任务，`task` 仅用于
+            启动时的立即执行；立即执行时不再补跑延迟窗口内刚收盘的市场。
+        warmup_task: 可选的缓存预热函数，参数为市场（每日任务为 None）。
+        warmup_minutes: 预热提前量（分钟），0 表示关闭预热。
     """
     scheduler = Scheduler(
         schedule_time=schedule_time,
@@ -336,7 +485,26 @@ def run_with_schedule(
             run_immediately=entry.get("run_immediately", False),
             name=entry.get("name"),
         )
-    scheduler.set_daily_task(task, run_immediately=run_immediately)
+    if warmup_task is not None and warmup_minutes > 0:
+        scheduler.set_warmup_task(warmup_task, lead_minutes=warmup_minutes)
+
+    registered = [
+        entry for entry in market_tasks or []
+        if scheduler.add_market_task(
+            market=entry["market"],
+            task=entry["task"],
+            delay_minutes=entry.get("delay_minutes", 0),
+            name=entry.get("name"),
+            # The start-up run already covers a close that is still inside its delay
+            catch_up=not run_immediately,
+        )
+    ]
+    if registered:
+        if run_immediately:
+            logger.info("立即执行一次任务...")
+            scheduler._safe_run_task(task)
+    else:
+        scheduler.set_daily_task(task, run_immediately=run_immediately)
     scheduler.run()
 
 
@@ -16,15 +16,16 @@ from src.storage import DatabaseManager
 logger = logging.getLogger(__name__)
 
 
-def _record_to_signal(record: Any) -> Optional[Dict[str, Any]]:
-    """Convert AnalysisHistory record to signal dict. Skip on parse error."""
+def _row_to_signal(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert a signal row to the report dict. Skip on parse error."""
     try:
+        created_at = row.get("created_at")
         return {
-            "created_at": record.created_at.isoformat() if record.created_at else None,
-            "query_id": record.query_id,
-            "sentiment_score": record.sentiment_score,
-            "operation_advice": record.operation_advice,
-            "trend_prediction": record.trend_prediction,
+            "created_at": created_at.isoformat() if created_at else None,
+            "query_id": row.get("query_id"),
+            "sentiment_score": row.get("sentiment_score"),
+            "operation_advice": row.get("operation_advice"),
+            "trend_prediction": row.get("trend_prediction"),
         }
     except Exception as e:
         logger.debug("Skip record for history comparison: %s", e)
@@ -47,19 +48,8 @@ def get_signal_changes(
     Returns:
         List of signal dicts (created_at, sentiment_score, operation_advice, trend_prediction)
     """
-    db = DatabaseManager.get_instance()
-    records = db.get_analysis_history(
-        code=code,
-        days=90,
-        limit=limit,
-        exclude_query_id=exclude_query_id,
-    )
-    out = []
-    for r in records:
-        sig = _record_to_signal(r)
-        if sig:
-            out.append(sig)
-    return out
+    exclude = {code: exclude_query_id} if exclude_query_id else None
+    return get_signal_changes_batch([code], limit=limit, exclude_query_ids=exclude)[code]
 
 
 def get_signal_changes_batch(
@@ -70,6 +60,9 @@ def get_signal_changes_batch(
     """
     Get recent signal changes for multiple stocks.
 
+    All codes are served by one windowed query that reads only the signal
+    columns, so the cost does not grow with the number of stocks queried.
+
     Args:
         codes: Stock codes
         limit: Max records per stock
@@ -78,19 +71,17 @@ def get_signal_changes_batch(
     Returns:
         Dict mapping code -> list of signal dicts
     """
-    exclude_query_ids = exclude_query_ids or {}
     db = DatabaseManager.get_instance()
+    rows_by_code = db.get_signal_history_batch(
+        codes,
+        days=90,
+        limit=limit,
+        exclude_query_ids=exclude_query_ids,
+    )
     result: Dict[str, List[Dict[str, Any]]] = {c: [] for c in codes}
-    for code in codes:
-        exclude = exclude_query_ids.get(code)
-        records = db.get_analysis_history(
-            code=code,
-            days=90,
-            limit=limit,
-            exclude_query_id=exclude,
-        )
-        for r in records:
-            sig = _record_to_signal(r)
+    for code, rows in rows_by_code.items():
+        for row in rows:
+            sig = _row_to_signal(row)
             if sig:
                 result[code].append(sig)
     return result
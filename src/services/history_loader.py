@@ -3,6 +3,8 @@
 Provides:
 - ContextVar-based frozen target_date propagation across threads
 - ``load_history_df``: read from DB first, DataFetcherManager fallback
+- ``load_history_bars``: DB-first loader for chart views that fetches only the
+  missing tail and persists it
 
 Fixes #1066 – eliminates 45+ redundant HTTP requests per stock in Agent mode.
 """
@@ -10,9 +12,10 @@ from __future__ import annotations
 
 import contextvars
 import logging
+import time
 from datetime import date, datetime, timedelta
 from threading import Lock
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import pandas as pd
 
@@ -41,13 +44,14 @@ def reset_frozen_target_date(token: contextvars.Token) -> None:
 
 
 # ---------------------------------------------------------------------------
-# Internal DataFetcherManager singleton (fallback only)
+# Shared DataFetcherManager singleton (fallback only)
 # ---------------------------------------------------------------------------
 _fetcher_singleton = None
 _fetcher_lock = Lock()
 
 
-def _get_fetcher_manager():
+def get_fetcher_manager():
+    """Return the process-wide DataFetcherManager used for upstream fallbacks."""
     global _fetcher_singleton
     if _fetcher_singleton is None:
         with _fetcher_lock:
@@ -164,7 +168,7 @@ def load_history_df(
 
     # --- 2. Network fallback via singleton DataFetcherManager -------------
     try:
-        manager = _get_fetcher_manager()
+        manager = get_fetcher_manager()
         df, source = manager.get_daily_data(stock_code, days=days)
         if df is not None and not df.empty:
             return df, source
@@ -172,3 +176,121 @@ def load_history_df(
         logger.warning("load_history_df(%s): DataFetcherManager failed: %s", stock_code, e)
 
     return None, "none"
+
+
+# ---------------------------------------------------------------------------
+# Chart history: stored bars + incremental tail refresh
+# ---------------------------------------------------------------------------
+# Minimum seconds between two upstream refreshes of the same stock, so that a
+# suspended stock (whose tail never arrives) does not cost a fetch per chart load
+_TAIL_REFRESH_INTERVAL_SECONDS = 600.0
+_tail_refresh_attempts: Dict[str, float] = {}
+_tail_refresh_lock = Lock()
+
+
+class HistoryBars(NamedTuple):
+    df: Optional[pd.DataFrame]
+    source: str
+    last_modified: Optional[datetime]
+
+
+def _claim_tail_refresh(code: str) -> bool:
+    now = time.monotonic()
+    with _tail_refresh_lock:
+        last = _tail_refresh_attempts.get(code)
+        if last is not None and now - last < _TAIL_REFRESH_INTERVAL_SECONDS:
+            return False
+        _tail_refresh_attempts[code] = now
+        return True
+
+
+def reset_tail_refresh_throttle() -> None:
+    """Forget recent tail refreshes (tests)."""
+    with _tail_refresh_lock:
+        _tail_refresh_attempts.clear()
+
+
+def _expected_latest_session(code: str) -> date:
+    from src.core.trading_calendar import get_effective_trading_date, get_market_for_stock
+
+    try:
+        return get_effective_trading_date(get_market_for_stock(code))
+    except Exception as e:
+        logger.debug("load_history_bars(%s): trading calendar failed: %s", code, e)
+        return date.today()
+
+
+def _bars_frame(bars: list, days: int) -> Tuple[pd.DataFrame, Optional[datetime]]:
+    bars = sorted(bars, key=_bar_date)[-days:]
+    df = pd.DataFrame([b.to_dict() for b in bars])
+    stamps = [getattr(b, "updated_at", None) or getattr(b, "created_at", None) for b in bars]
+    stamps = [s for s in stamps if isinstance(s, datetime)]
+    return df, max(stamps) if stamps else None
+
+
+def load_history_bars(stock_code: str, days: int = 30) -> HistoryBars:
+    """Load the latest ``days`` daily bars for chart views, DB first.
+
+    - Stored bars that reach the market's latest completed session are
+      served without any upstream call.
+    - Otherwise only the missing tail (or, when the store holds fewer than
+      ``days`` bars, the full window) is fetched, persisted, and merged.
+    - Upstream refreshes per stock are throttled; on failure the stored bars
+      are served as they are.
+    """
+    from src.storage import get_db
+
+    _, normalized_code = _history_code_candidates(stock_code)
+    end = _expected_latest_session(normalized_code)
+    start = end - timedelta(days=int(days * 1.8) + 10)
+
+    db = None
+    bars: list = []
+    try:
+        db = get_db()
+        _code, bars = _select_best_bars(db, stock_code, start, end)
+    except Exception as e:
+        logger.debug("load_history_bars(%s): DB read failed: %s", stock_code, e)
+
+    latest = max((_bar_date(bar) for bar in bars), default=date.min)
+    if bars and latest >= end and len(bars) >= days:
+        df, last_modified = _bars_frame(bars, days)
+        return HistoryBars(df, "db_cache", last_modified)
+
+    if not _claim_tail_refresh(normalized_code):
+        if bars:
+            df, last_modified = _bars_frame(bars, days)
+            return HistoryBars(df, "db_cache", last_modified)
+        return HistoryBars(None, "none", None)
+
+    # Only the tail is missing: ask for the sessions after the newest stored bar
+    fetch_kwargs: Dict[str, Any] = {"days": days}
+    if bars and len(bars) >= days:
+        fetch_kwargs = {
+            "start_date": (latest + timedelta(days=1)).isoformat(),
+            "end_date": end.isoformat(),
+            "days": max(1, (end - latest).days),
+        }
+    try:
+        fetched, source = get_fetcher_manager().get_daily_data(stock_code, **fetch_kwargs)
+    except Exception as e:
+        logger.warning("load_history_bars(%s): upstream refresh failed: %s", stock_code, e)
+        fetched, source = None, "none"
+
+    if fetched is None or fetched.empty:
+        if bars:
+            df, last_modified = _bars_frame(bars, days)
+            return HistoryBars(df, "db_cache", last_modified)
+        return HistoryBars(None, "none", None)
+
+    if db is not None:
+        try:
+            db.save_daily_data(fetched, normalized_code, source)
+            _code, bars = _select_best_bars(db, stock_code, start, end)
+            if bars:
+                df, last_modified = _bars_frame(bars, days)
+                return HistoryBars(df, f"db_cache+{source}" if fetch_kwargs.get("start_date") else source, last_modified)
+        except Exception as e:
+            logger.warning("load_history_bars(%s): persisting refreshed bars failed: %s", stock_code, e)
+
+    return HistoryBars(fetched.tail(days).reset_index(drop=True), source, datetime.now())
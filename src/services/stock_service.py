@@ -13,6 +13,9 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
+import numpy as np
+import pandas as pd
+
 from src.repositories.stock_repo import StockRepository
 
 logger = logging.getLogger(__name__)
@@ -93,73 +96,54 @@ class StockService:
     ) -> Dict[str, Any]:
         """
         获取股票历史行情
-        
+
+        优先读取本地 stock_daily，仅在缺少最新交易日时向数据源补齐尾部并落库；
+        weekly/monthly 由日线在服务端聚合。
+
         Args:
             stock_code: 股票代码
             period: K 线周期 (daily/weekly/monthly)
-            days: 获取天数
-            
+            days: 获取天数（日线交易日数，周/月线由这些日线聚合）
+
         Returns:
-            历史行情数据字典
-            
+            历史行情数据字典，``last_modified`` 为数据最近一次写入时间
+
         Raises:
-            ValueError: 当 period 不是 daily 时抛出（weekly/monthly 暂未实现）
+            ValueError: 当 period 不是 daily/weekly/monthly 时抛出
         """
-        # 验证 period 参数，只支持 daily
-        if period != "daily":
+        if period not in _RESAMPLE_RULES:
             raise ValueError(
-                f"暂不支持 '{period}' 周期，目前仅支持 'daily'。"
-                "weekly/monthly 聚合功能将在后续版本实现。"
+                f"暂不支持 '{period}' 周期，目前仅支持 daily/weekly/monthly。"
             )
-        
+
         try:
-            # 调用数据获取器获取历史数据
-            from data_provider.base import DataFetcherManager
-            
-            manager = DataFetcherManager()
-            df, source = manager.get_daily_data(stock_code, days=days)
-            
+            from src.services.history_loader import get_fetcher_manager, load_history_bars
+
+            df, source, last_modified = load_history_bars(stock_code, days=days)
+
             if df is None or df.empty:
                 logger.warning(f"获取 {stock_code} 历史数据失败")
                 return {"stock_code": stock_code, "period": period, "data": []}
-            
-            # 获取股票名称
-            stock_name = manager.get_stock_name(stock_code)
-            
-            # 转换为响应格式
-            data = []
-            for _, row in df.iterrows():
-                date_val = row.get("date")
-                if hasattr(date_val, "strftime"):
-                    date_str = date_val.strftime("%Y-%m-%d")
-                else:
-                    date_str = str(date_val)
-                
-                data.append({
-                    "date": date_str,
-                    "open": float(row.get("open", 0)),
-                    "high": float(row.get("high", 0)),
-                    "low": float(row.get("low", 0)),
-                    "close": float(row.get("close", 0)),
-                    "volume": float(row.get("volume", 0)) if row.get("volume") else None,
-                    "amount": float(row.get("amount", 0)) if row.get("amount") else None,
-                    "change_percent": float(row.get("pct_chg", 0)) if row.get("pct_chg") else None,
-                })
-            
+
+            # 名称只查缓存/本地映射，不为画图额外请求实时行情
+            stock_name = get_fetcher_manager().get_stock_name(stock_code, allow_realtime=False)
+
             return {
                 "stock_code": stock_code,
                 "stock_name": stock_name,
                 "period": period,
-                "data": data,
+                "data": _kline_records(df, period),
+                "source": source,
+                "last_modified": last_modified,
             }
-            
+
         except ImportError:
             logger.warning("DataFetcherManager 未找到，返回空数据")
             return {"stock_code": stock_code, "period": period, "data": []}
         except Exception as e:
             logger.error(f"获取历史数据失败: {e}", exc_info=True)
             return {"stock_code": stock_code, "period": period, "data": []}
-    
+
     def _get_placeholder_quote(self, stock_code: str) -> Dict[str, Any]:
         """
         获取占位行情数据（用于测试）
@@ -184,3 +168,61 @@ class StockService:
             "amount": None,
             "update_time": datetime.now().isoformat(),
         }
+
+
+# K 线周期 -> pandas Period 频率（周线按周五收盘归组）
+_RESAMPLE_RULES = {"daily": None, "weekly": "W-FRI", "monthly": "M"}
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
+
+
+def _kline_records(df: pd.DataFrame, period: str) -> List[Dict[str, Any]]:
+    """将日线 DataFrame 转为 K 线记录，必要时聚合为周线/月线。
+
+    聚合 K 线的日期为该周期最后一个交易日，涨跌幅相对上一周期收盘价；
+    首个周期用首根日线的涨跌幅反推上一收盘价。
+    """
+    bars = df.copy()
+    bars["date"] = pd.to_datetime(bars["date"])
+    bars = bars.sort_values("date").reset_index(drop=True)
+    for column in ("open", "high", "low", "close", "volume", "amount", "pct_chg"):
+        if column not in bars.columns:
+            bars[column] = np.nan
+        bars[column] = pd.to_numeric(bars[column], errors="coerce")
+
+    freq = _RESAMPLE_RULES[period]
+    if freq is not None:
+        first_close, first_pct = bars["close"].iloc[0], bars["pct_chg"].iloc[0]
+        grouped = bars.groupby(bars["date"].dt.to_period(freq), sort=True)
+        bars = grouped.agg(
+            date=("date", "last"),
+            open=("open", "first"),
+            high=("high", "max"),
+            low=("low", "min"),
+            close=("close", "last"),
+            volume=("volume", lambda s: s.sum(min_count=1)),
+            amount=("amount", lambda s: s.sum(min_count=1)),
+        ).reset_index(drop=True)
+        prev_close = bars["close"].shift(1)
+        if pd.notna(first_pct) and first_pct != -100:
+            prev_close.iloc[0] = first_close / (1 + first_pct / 100)
+        bars["pct_chg"] = ((bars["close"] / prev_close - 1) * 100).round(2)
+
+    records = []
+    for row in bars.itertuples(index=False):
+        volume, amount, pct_chg = row.volume, row.amount, row.pct_chg
+        records.append({
+            "date": row.date.strftime("%Y-%m-%d"),
+            "open": float(row.open),
+            "high": float(row.high),
+            "low": float(row.low),
+            "close": float(row.close),
+            "volume": _optional_float(volume) if volume else None,
+            "amount": _optional_float(amount) if amount else None,
+            "change_percent": _optional_float(pct_chg) if pct_chg else None,
+        })
+    return records
@@ -3,15 +3,19 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import io
 import logging
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import requests
@@ -191,8 +195,15 @@ class SystemConfigService:
         "astrbot": ("ASTRBOT_URL",),
     }
 
+    # Successful channel probes are reused for this long by test_channels()
+    _CHANNEL_PROBE_CACHE_TTL_SECONDS = 600.0
+    _CHANNEL_PROBE_MAX_WORKERS = 4
+
     def __init__(self, manager: Optional[ConfigManager] = None):
         self._manager = manager or ConfigManager()
+        # probe fingerprint -> (stored_at, result payload)
+        self._channel_probe_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._channel_probe_cache_lock = threading.Lock()
 
     def get_schema(self) -> Dict[str, Any]:
         """Return grouped schema metadata for UI rendering."""
@@ -396,6 +407,144 @@ class SystemConfigService:
                 ],
             )
 
+    def test_channels(
+        self,
+        *,
+        llm_channels: Sequence[Dict[str, Any]] = (),
+        notification_channels: Sequence[str] = (),
+        items: Sequence[Dict[str, str]] = (),
+        mask_token: str = "******",
+        timeout_seconds: float = 20.0,
+        use_cache: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Test several LLM and notification channels concurrently.
+
+        Yields one event per channel as soon as its probe finishes, in
+        completion order: ``{"type": "llm"|"notification", "name", "cached",
+        "result"}``. Each probe keeps its own timeout; probes still running
+        when the overall deadline passes are reported as timed out. Successful
+        results are cached by a fingerprint of the tested settings, so channels
+        unchanged since their last passing probe are not re-tested on save.
+        """
+        jobs: List[Tuple[str, str, str, Callable[[], Dict[str, Any]]]] = []
+        for channel in llm_channels:
+            channel_kwargs = {
+                "name": str(channel.get("name") or "channel"),
+                "protocol": str(channel.get("protocol") or "openai"),
+                "base_url": str(channel.get("base_url") or ""),
+                "api_key": str(channel.get("api_key") or ""),
+                "models": list(channel.get("models") or []),
+                "enabled": bool(channel.get("enabled", True)),
+                "timeout_seconds": float(channel.get("timeout_seconds") or timeout_seconds),
+                "capability_checks": list(channel.get("capability_checks") or []),
+            }
+            fingerprint = self._channel_probe_fingerprint("llm", channel_kwargs)
+            jobs.append((
+                "llm",
+                channel_kwargs["name"],
+                fingerprint,
+                functools.partial(self.test_llm_channel, **channel_kwargs),
+            ))
+
+        if notification_channels:
+            effective_map = self._build_notification_test_effective_map(items=items, mask_token=mask_token)
+            for channel in dict.fromkeys(str(c).strip().lower() for c in notification_channels):
+                prefix = f"{channel.upper()}_"
+                channel_settings = {
+                    key: value for key, value in sorted(effective_map.items())
+                    if key.startswith(prefix) or key == "WEBHOOK_VERIFY_SSL"
+                }
+                fingerprint = self._channel_probe_fingerprint("notification", {channel: channel_settings})
+                jobs.append((
+                    "notification",
+                    channel,
+                    fingerprint,
+                    functools.partial(
+                        self.test_notification_channel,
+                        channel=channel,
+                        items=items,
+                        mask_token=mask_token,
+                        timeout_seconds=timeout_seconds,
+                    ),
+                ))
+
+        pending = []
+        for job in jobs:
+            kind, name, fingerprint, _ = job
+            cached = self._get_cached_channel_probe(fingerprint) if use_cache else None
+            if cached is not None:
+                yield {"type": kind, "name": name, "cached": True, "result": cached}
+            else:
+                pending.append(job)
+        if not pending:
+            return
+
+        # Worst case per probe: base call plus every capability check, each with its own timeout
+        deadline_seconds = max(5.0, float(timeout_seconds)) * (len(self._LLM_CAPABILITY_ORDER) + 1) + 5.0
+        pool = ThreadPoolExecutor(
+            max_workers=min(self._CHANNEL_PROBE_MAX_WORKERS, len(pending)),
+            thread_name_prefix="config-probe",
+        )
+        futures = {pool.submit(job[3]): job for job in pending}
+
+        def _finished_event(future) -> Dict[str, Any]:
+            kind, name, fingerprint, _ = futures[future]
+            try:
+                result = future.result()
+            except ValueError as exc:
+                result = {"success": False, "message": str(exc), "error_code": "invalid_config"}
+            if result.get("success"):
+                self._store_channel_probe(fingerprint, result)
+            return {"type": kind, "name": name, "cached": False, "result": result}
+
+        reported = set()
+        try:
+            for future in as_completed(futures, timeout=deadline_seconds):
+                reported.add(future)
+                yield _finished_event(future)
+        except FuturesTimeoutError:
+            # Probes that finished after the deadline but before this loop
+            # still get their real result
+            for future, (kind, name, _, _) in futures.items():
+                if future in reported:
+                    continue
+                if future.done():
+                    yield _finished_event(future)
+                    continue
+                yield {
+                    "type": kind,
+                    "name": name,
+                    "cached": False,
+                    "result": {
+                        "success": False,
+                        "message": f"Channel test did not finish within {deadline_seconds:.0f}s",
+                        "error_code": "timeout",
+                        "retryable": True,
+                    },
+                }
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _channel_probe_fingerprint(kind: str, settings: Dict[str, Any]) -> str:
+        raw = json.dumps([kind, settings], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get_cached_channel_probe(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._channel_probe_cache_lock:
+            entry = self._channel_probe_cache.get(fingerprint)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self._CHANNEL_PROBE_CACHE_TTL_SECONDS:
+                del self._channel_probe_cache[fingerprint]
+                return None
+            return result
+
+    def _store_channel_probe(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        with self._channel_probe_cache_lock:
+            self._channel_probe_cache[fingerprint] = (time.monotonic(), result)
+
     def get_setup_status(self) -> Dict[str, Any]:
         """Return read-only first-run setup status without mutating runtime state."""
         effective_map = self._build_setup_effective_config_map()
@@ -18,7 +18,7 @@
 
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from enum import Enum
 
 import pandas as pd
@@ -230,6 +230,11 @@ class StockTrendAnalyzer:
         df = self._calculate_macd(df)
         df = self._calculate_rsi(df)
 
+        self._analyze_indicators(df, result)
+        return result
+
+    def _analyze_indicators(self, df: pd.DataFrame, result: TrendAnalysisResult) -> None:
+        """基于已计算指标的 DataFrame 填充分析结果（单股与批量路径共用）"""
         # 获取最新数据
         latest = df.iloc[-1]
         result.current_price = float(latest['close'])
@@ -259,7 +264,124 @@ class StockTrendAnalyzer:
         # 7. 生成买入信号
         self._generate_signal(result)
 
-        return result
+    # 批量路径只需保留每只股票最近的这些行：覆盖 _analyze_* 用到的
+    # iloc[-1]/[-2]/[-5]、近 20 日高点以及 len(df) 门槛（20/24/26）
+    _BATCH_TAIL_ROWS = 26
+
+    def analyze_many(
+        self,
+        panel: pd.DataFrame,
+        codes: Optional[Sequence[str]] = None,
+    ) -> Dict[str, TrendAnalysisResult]:
+        """
+        批量分析多只股票（截面模式）
+
+        对长表（code, date, OHLCV）一次性计算全部股票的均线、MACD、RSI：
+        各股票按“距最新一根 K 线的位置”右对齐成二维矩阵，滚动/指数均线在
+        矩阵上按列一次完成，不再逐只股票复制 DataFrame。结果与逐只调用
+        ``analyze`` 一致。
+
+        Args:
+            panel: 包含 code/date/open/high/low/close/volume 列的长表
+            codes: 需要返回结果的股票（默认 panel 中全部股票）；
+                   panel 中缺失的股票按数据不足处理
+
+        Returns:
+            {code: TrendAnalysisResult}
+        """
+        results: Dict[str, TrendAnalysisResult] = {}
+        if panel is not None and not panel.empty:
+            for code, tail in self._calculate_panel_indicators(panel):
+                result = TrendAnalysisResult(code=code)
+                if tail.attrs['bars'] < 20:
+                    result.risk_factors.append("数据不足，无法完成分析")
+                else:
+                    self._analyze_indicators(tail, result)
+                results[code] = result
+
+        if codes is None:
+            return results
+        selected: Dict[str, TrendAnalysisResult] = {}
+        for code in codes:
+            result = results.get(code)
+            if result is None:
+                result = TrendAnalysisResult(code=code)
+                result.risk_factors.append("数据不足，无法完成分析")
+            selected[code] = result
+        return selected
+
+    def _calculate_panel_indicators(self, panel: pd.DataFrame):
+        """
+        在右对齐的二维矩阵上计算全部股票的指标
+
+        Yields:
+            (code, tail_df)：tail_df 为该股票最近 ``_BATCH_TAIL_ROWS`` 行（含指标列），
+            ``tail_df.attrs['bars']`` 为该股票的总 K 线数
+        """
+        df = panel.sort_values(['code', 'date'], kind='mergesort').reset_index(drop=True)
+        df['code'] = df['code'].astype(str)
+        # 行号：最新一根 K 线对齐到最后一行，较短的历史在顶部留空
+        from_end = df.groupby('code', sort=False).cumcount(ascending=False).to_numpy()
+        n_rows = int(from_end.max()) + 1
+        df['_row'] = n_rows - 1 - from_end
+        df['_present'] = 1.0
+
+        def wide(column: str) -> pd.DataFrame:
+            return df.pivot(index='_row', columns='code', values=column).astype(float)
+
+        close = wide('close')
+        present = wide('_present').notna()
+        bar_counts = present.sum()
+
+        # 均线（与 _calculate_mas 相同：不足 60 根时 MA60 取 MA20）
+        ma = {window: close.rolling(window=window).mean() for window in (5, 10, 20, 60)}
+        has_ma60 = np.broadcast_to((bar_counts >= 60).to_numpy(), close.shape)
+        ma[60] = ma[60].where(has_ma60, ma[20])
+
+        # MACD（与 _calculate_macd 相同；顶部空值不参与 EMA 初始化）
+        ema_fast = close.ewm(span=self.MACD_FAST, adjust=False).mean()
+        ema_slow = close.ewm(span=self.MACD_SLOW, adjust=False).mean()
+        dif = ema_fast - ema_slow
+        dea = dif.ewm(span=self.MACD_SIGNAL, adjust=False).mean()
+
+        # RSI（与 _calculate_rsi 相同；留空行保持 NaN，避免提前凑满窗口）
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).where(present)
+        loss = (-delta.where(delta < 0, 0)).where(present)
+        rsi = {}
+        for period in (self.RSI_SHORT, self.RSI_MID, self.RSI_LONG):
+            rs = gain.rolling(window=period).mean() / loss.rolling(window=period).mean()
+            rsi[period] = (100 - (100 / (1 + rs))).fillna(50)
+
+        indicators = {
+            'MA5': ma[5], 'MA10': ma[10], 'MA20': ma[20], 'MA60': ma[60],
+            'MACD_DIF': dif, 'MACD_DEA': dea, 'MACD_BAR': (dif - dea) * 2,
+        }
+        for period, values in rsi.items():
+            indicators[f'RSI_{period}'] = values
+
+        # 只把最近若干行还原成长表，供逐只股票的信号判断使用
+        first_tail_row = max(0, n_rows - self._BATCH_TAIL_ROWS)
+        tail = df[df['_row'] >= first_tail_row]
+        row_idx = tail['_row'].to_numpy()
+        col_idx = close.columns.get_indexer(tail['code'])
+        # 仅保留数值列，逐行取值时走单一 float 块，避免 object 列拖慢 iloc
+        columns = {
+            name: pd.to_numeric(tail[name], errors='coerce').to_numpy(dtype=float)
+            for name in ('close', 'high', 'volume')
+        }
+        for name, values in indicators.items():
+            columns[name] = values.to_numpy()[row_idx, col_idx]
+
+        tail_codes = tail['code'].to_numpy()
+        boundaries = np.flatnonzero(tail_codes[1:] != tail_codes[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(tail_codes)]))
+        for start, end in zip(starts, ends):
+            code = tail_codes[start]
+            group = pd.DataFrame({name: values[start:end] for name, values in columns.items()})
+            group.attrs['bars'] = int(bar_counts[code])
+            yield code, group
     
     def _calculate_mas(self, df: pd.DataFrame) -> pd.DataFrame:
         """计算均线"""
@@ -12,12 +12,15 @@ A股自选股智能分析系统 - 存储层
 """
 
 import atexit
+import base64
 from contextlib import contextmanager
 import hashlib
 import json
 import logging
 import re
+import threading
 import time
+import zlib
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any, TYPE_CHECKING, Tuple, Callable, TypeVar
 
@@ -38,6 +41,7 @@ from sqlalchemy import (
     select,
     and_,
     or_,
+    case,
     delete,
     desc,
     event,
@@ -46,9 +50,11 @@ from sqlalchemy import (
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import (
     declarative_base,
+    defer,
     sessionmaker,
     Session,
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 from src.config import get_config
@@ -63,6 +69,43 @@ if TYPE_CHECKING:
     from src.search_service import SearchResponse
 
 
+# 压缩文本列：超过阈值的内容以 "zlib:" + base64(zlib) 形式落库
+_COMPRESSED_TEXT_PREFIX = 'zlib:'
+_COMPRESSED_TEXT_MIN_CHARS = 1024
+
+
+class CompressedText(TypeDecorator):
+    """
+    透明压缩的 Text 列
+
+    写入时对超过阈值的字符串做 zlib 压缩并 base64 编码，读取时自动解压；
+    未带前缀的旧数据原样返回，因此无需迁移即可与历史记录共存。
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or len(value) < _COMPRESSED_TEXT_MIN_CHARS:
+            return value
+        packed = _COMPRESSED_TEXT_PREFIX + base64.b64encode(
+            zlib.compress(value.encode('utf-8'), 6)
+        ).decode('ascii')
+        # 压缩收益不足时保留明文，便于直接查看数据库
+        return packed if len(packed) < len(value) else value
+
+    def process_result_value(self, value, dialect):
+        if value is None or not value.startswith(_COMPRESSED_TEXT_PREFIX):
+            return value
+        try:
+            return zlib.decompress(
+                base64.b64decode(value[len(_COMPRESSED_TEXT_PREFIX):])
+            ).decode('utf-8')
+        except (ValueError, zlib.error):
+            # 恰好以前缀开头的明文
+            return value
+
+
 # === 数据模型定义 ===
 
 class StockDaily(Base):
@@ -209,6 +252,32 @@ class FundamentalSnapshot(Base):
         return f"<FundamentalSnapshot(query_id={self.query_id}, code={self.code})>"
 
 
+class FundamentalDataset(Base):
+    """
+    基本面数据集持久化缓存（跨进程复用）
+
+    按 (数据集, 报告期, 股票代码) 存储 AkShare 接口返回的原始行（JSON）。
+    全市场表下载一次后按代码拆分落库，并写入 code='*' 的标记行（列名），
+    之后整个自选股列表只需按代码查表。
+    """
+    __tablename__ = 'fundamental_dataset'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    dataset = Column(String(128), nullable=False)
+    period = Column(String(16), nullable=False)
+    code = Column(String(16), nullable=False)
+    payload = Column(CompressedText, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('dataset', 'period', 'code', name='uix_fundamental_dataset'),
+        Index('ix_fundamental_dataset_dataset_code', 'dataset', 'code'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<FundamentalDataset(dataset={self.dataset}, period={self.period}, code={self.code})>"
+
+
 class AnalysisHistory(Base):
     """
     分析结果历史记录模型
@@ -233,10 +302,10 @@ class AnalysisHistory(Base):
     trend_prediction = Column(String(50))
     analysis_summary = Column(Text)
 
-    # 详细数据
-    raw_result = Column(Text)
-    news_content = Column(Text)
-    context_snapshot = Column(Text)
+    # 详细数据（体积大，压缩存储；列表查询不加载）
+    raw_result = Column(CompressedText)
+    news_content = Column(CompressedText)
+    context_snapshot = Column(CompressedText)
 
     # 狙击点位（用于回测）
     ideal_buy = Column(Float)
@@ -273,6 +342,14 @@ class AnalysisHistory(Base):
         }
 
 
+# 列表类查询用：跳过 AnalysisHistory 的大字段，访问前需重新查询详情
+_ANALYSIS_PAYLOAD_DEFER = (
+    defer(AnalysisHistory.raw_result),
+    defer(AnalysisHistory.news_content),
+    defer(AnalysisHistory.context_snapshot),
+)
+
+
 class BacktestResult(Base):
     """单条分析记录的回测结果。"""
 
@@ -608,6 +685,40 @@ class ConversationMessage(Base):
     created_at = Column(DateTime, default=datetime.now, index=True)
 
 
+class ChatSession(Base):
+    """
+    Agent 会话索引表
+
+    每个会话一行，由 save_conversation_message / delete_conversation_session 同步维护，
+    会话列表直接按 last_active 读取，无需聚合 conversation_messages。
+    """
+    __tablename__ = 'chat_sessions'
+
+    session_id = Column(String(100), primary_key=True)
+    # 第一条 user 消息的前 60 个字符；尚无 user 消息时为空
+    title = Column(String(100))
+    message_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    last_active = Column(DateTime, nullable=False, index=True)
+
+
+_CHAT_SESSION_TITLE_CHARS = 60
+
+
+class ConversationSummary(Base):
+    """
+    Agent 会话滚动摘要
+
+    记录已被压缩进摘要的最后一条消息 id，之后的消息仍按原文保留在 conversation_messages。
+    """
+    __tablename__ = 'conversation_summaries'
+
+    session_id = Column(String(100), primary_key=True)
+    summary = Column(Text, nullable=False, default='')
+    last_message_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
 class LLMUsage(Base):
     """One row per litellm.completion() call — token-usage audit log."""
 
@@ -624,6 +735,179 @@ class LLMUsage(Base):
     called_at = Column(DateTime, default=datetime.now, index=True)
 
 
+class LLMUsageHourly(Base):
+    """Hourly llm_usage rollup keyed by call_type / model / stock_code.
+
+    stock_code is stored as '' for calls without a stock so the unique key
+    also holds on backends that treat NULLs as distinct.
+    """
+
+    __tablename__ = 'llm_usage_hourly'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    call_type = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False)
+    stock_code = Column(String(16), nullable=False, default='')
+    calls = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'bucket_start', 'call_type', 'model', 'stock_code',
+            name='uix_llm_usage_hourly_bucket',
+        ),
+    )
+
+
+class LLMUsageDaily(Base):
+    """Daily llm_usage rollup; same shape as LLMUsageHourly."""
+
+    __tablename__ = 'llm_usage_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    call_type = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False)
+    stock_code = Column(String(16), nullable=False, default='')
+    calls = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'bucket_start', 'call_type', 'model', 'stock_code',
+            name='uix_llm_usage_daily_bucket',
+        ),
+    )
+
+
+_LLM_USAGE_ROLLUPS = (
+    (LLMUsageHourly, lambda dt: dt.replace(minute=0, second=0, microsecond=0)),
+    (LLMUsageDaily, lambda dt: dt.replace(hour=0, minute=0, second=0, microsecond=0)),
+)
+_LLM_USAGE_SUM_COLUMNS = ('calls', 'prompt_tokens', 'completion_tokens', 'total_tokens')
+
+
+class WriteBehindQueue:
+    """
+    写后缓冲队列 - 把非关键的热路径插入合并成少量事务
+
+    - 调用方只负责入队，后台线程按条数（max_batch）或时间（flush_interval）触发刷盘
+    - 每次刷盘在一个写事务里执行整批操作，单条失败通过 SAVEPOINT 隔离，不影响同批其他写入
+    - 积压达到 max_pending 时由调用方线程同步刷盘（背压），内存占用有上限
+    - close() 会停止后台线程并写完剩余操作，进程退出时经 atexit 调用
+    """
+
+    def __init__(
+        self,
+        run_transaction: Callable[[str, Callable[[Session], Any]], Any],
+        max_batch: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 2000,
+    ):
+        self._run_transaction = run_transaction
+        self._max_batch = max(1, max_batch)
+        self._flush_interval = max(0.01, flush_interval)
+        self._max_pending = max(self._max_batch, max_pending)
+        self._pending: List[Tuple[str, Callable[[Session], Any]]] = []
+        self._cond = threading.Condition()
+        # 串行化刷盘：读方调用 flush() 时会等待后台线程正在提交的批次落库
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._stats = {"submitted": 0, "written": 0, "failed": 0, "commits": 0}
+        self._thread = threading.Thread(
+            target=self._run,
+            name="db-write-behind",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, operation_name: str, write_operation: Callable[[Session], Any]) -> None:
+        """入队一个写操作；队列已关闭时直接同步执行。"""
+        with self._cond:
+            if not self._closed:
+                self._pending.append((operation_name, write_operation))
+                self._stats["submitted"] += 1
+                pending = len(self._pending)
+                if pending >= self._max_batch:
+                    self._cond.notify()
+            else:
+                pending = None
+        if pending is None:
+            self._run_transaction(operation_name, write_operation)
+        elif pending >= self._max_pending:
+            self.flush()
+
+    def flush(self) -> int:
+        """把当前积压的操作写入数据库，返回成功写入的操作数。"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            return self._write_batch(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """停止后台线程并写完剩余操作。"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self._max_batch:
+                    self._cond.wait(self._flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.warning("写后缓冲刷盘失败: %s", exc)
+            if closed:
+                return
+
+    def _write_batch(self, batch: List[Tuple[str, Callable[[Session], Any]]]) -> int:
+        def _write(session: Session) -> Tuple[int, int]:
+            written = failed = 0
+            for operation_name, write_operation in batch:
+                try:
+                    with session.begin_nested():
+                        write_operation(session)
+                    written += 1
+                except Exception as exc:
+                    failed += 1
+                    logger.warning("写后缓冲操作失败（已跳过）: %s: %s", operation_name, exc)
+            return written, failed
+
+        try:
+            written, failed = self._run_transaction(f"write_behind[{len(batch)}]", _write)
+        except Exception as exc:
+            logger.error("写后缓冲批量提交失败，丢弃 %d 条写入: %s", len(batch), exc)
+            with self._cond:
+                self._stats["failed"] += len(batch)
+            return 0
+
+        with self._cond:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+            self._stats["commits"] += 1
+        logger.debug("写后缓冲刷盘完成: %d 条写入, %d 条失败", written, failed)
+        return written
+
+
 class DatabaseManager:
     """
     数据库管理器 - 单例模式
@@ -697,6 +981,18 @@ class DatabaseManager:
 
         # 注册退出钩子，确保程序退出时关闭数据库连接
         atexit.register(DatabaseManager._cleanup_engine, self._engine)
+
+        # 写后缓冲：内存 SQLite 的连接按线程隔离，后台线程写不到同一个库，始终同步写入
+        self._write_behind: Optional[WriteBehindQueue] = None
+        if config.db_write_behind_enabled and (self._sqlite_file_db or not self._is_sqlite_engine):
+            self._write_behind = WriteBehindQueue(
+                self._run_write_transaction,
+                max_batch=config.db_write_behind_batch_size,
+                flush_interval=config.db_write_behind_flush_interval,
+                max_pending=config.db_write_behind_max_pending,
+            )
+            # atexit 按注册逆序执行，先写完缓冲再释放引擎
+            atexit.register(self._write_behind.close)
     
     @classmethod
     def get_instance(cls) -> 'DatabaseManager':
@@ -709,6 +1005,7 @@ class DatabaseManager:
     def reset_instance(cls) -> None:
         """重置单例（用于测试）"""
         if cls._instance is not None:
+            cls._instance.close_write_behind()
             if hasattr(cls._instance, '_engine') and cls._instance._engine is not None:
                 cls._instance._engine.dispose()
             cls._instance._initialized = False
@@ -731,6 +1028,30 @@ class DatabaseManager:
         except Exception as e:
             logger.warning(f"清理数据库引擎时出错: {e}")
 
+    def flush_pending_writes(self) -> int:
+        """把写后缓冲中的积压写入数据库；未启用缓冲时为空操作。"""
+        queue = getattr(self, '_write_behind', None)
+        return queue.flush() if queue is not None else 0
+
+    def close_write_behind(self) -> None:
+        """停止写后缓冲线程并写完剩余操作，之后的写入恢复同步执行。"""
+        queue = getattr(self, '_write_behind', None)
+        if queue is not None:
+            self._write_behind = None
+            queue.close()
+
+    def _submit_write(
+        self,
+        operation_name: str,
+        write_operation: Callable[[Session], Any],
+    ) -> bool:
+        """启用写后缓冲时入队并返回 True；否则返回 False，由调用方同步写入。"""
+        queue = getattr(self, '_write_behind', None)
+        if queue is None:
+            return False
+        queue.submit(operation_name, write_operation)
+        return True
+
     def _install_sqlite_pragma_handler(self) -> None:
         """为 SQLite 连接安装竞争保护参数。"""
         if not self._is_sqlite_engine:
@@ -931,6 +1252,8 @@ class DatabaseManager:
 
         关联策略：
         - query_context 记录用户查询信息（平台、用户、会话、原始指令等）
+
+        启用写后缓冲时只入队并返回 0，实际新增条数在刷盘时记录日志。
         """
         if not response or not response.results:
             return 0
@@ -939,97 +1262,167 @@ class DatabaseManager:
         query_ctx = query_context or {}
         current_query_id = (query_ctx.get("query_id") or "").strip()
 
-        def _write(session: Session) -> int:
-            local_saved_count = 0
+        # 先在内存中整理本次响应的条目：计算去重键，同一响应内重复的键合并为一条，
+        # 后出现条目的非空字段覆盖先出现的（与逐条写入时“已存在则更新”的结果一致）
+        items: Dict[str, Dict[str, Any]] = {}
+        for item in response.results:
+            title = (item.title or '').strip()
+            url = (item.url or '').strip()
+            source = (item.source or '').strip()
+            snippet = (item.snippet or '').strip()
+            published_date = self._parse_published_date(item.published_date)
+
+            if not title and not url:
+                continue
 
-            for item in response.results:
-                title = (item.title or '').strip()
-                url = (item.url or '').strip()
-                source = (item.source or '').strip()
-                snippet = (item.snippet or '').strip()
-                published_date = self._parse_published_date(item.published_date)
+            url_key = url or self._build_fallback_url_key(
+                code=code,
+                title=title,
+                source=source,
+                published_date=published_date
+            )
 
-                if not title and not url:
-                    continue
+            merged = items.get(url_key)
+            if merged is None:
+                items[url_key] = {
+                    'title': title,
+                    'snippet': snippet,
+                    'source': source,
+                    'published_date': published_date,
+                }
+            else:
+                merged['snippet'] = snippet or merged['snippet']
+                merged['source'] = source or merged['source']
+                merged['published_date'] = published_date or merged['published_date']
+
+        _IN_CHUNK = 500
+        # NewsIntel 约 20 列，按 SQLite 单语句绑定参数上限（常见 999）分块插入
+        _SQLITE_INSERT_CHUNK = 40
+
+        def _update_existing(existing: NewsIntel, fields: Dict[str, Any]) -> None:
+            existing.name = name or existing.name
+            existing.dimension = dimension or existing.dimension
+            existing.query = query or existing.query
+            existing.provider = response.provider or existing.provider
+            existing.snippet = fields['snippet'] or existing.snippet
+            existing.source = fields['source'] or existing.source
+            existing.published_date = fields['published_date'] or existing.published_date
+            existing.fetched_at = datetime.now()
+
+            if query_context:
+                if not existing.query_id and current_query_id:
+                    existing.query_id = current_query_id
+                existing.query_source = (
+                    query_context.get("query_source") or existing.query_source
+                )
+                existing.requester_platform = (
+                    query_context.get("requester_platform") or existing.requester_platform
+                )
+                existing.requester_user_id = (
+                    query_context.get("requester_user_id") or existing.requester_user_id
+                )
+                existing.requester_user_name = (
+                    query_context.get("requester_user_name") or existing.requester_user_name
+                )
+                existing.requester_chat_id = (
+                    query_context.get("requester_chat_id") or existing.requester_chat_id
+                )
+                existing.requester_message_id = (
+                    query_context.get("requester_message_id") or existing.requester_message_id
+                )
+                existing.requester_query = (
+                    query_context.get("requester_query") or existing.requester_query
+                )
+
+        def _build_record(url_key: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                'code': code,
+                'name': name,
+                'dimension': dimension,
+                'query': query,
+                'provider': response.provider,
+                'title': fields['title'],
+                'snippet': fields['snippet'],
+                'url': url_key,
+                'source': fields['source'],
+                'published_date': fields['published_date'],
+                'fetched_at': datetime.now(),
+                'query_id': current_query_id or None,
+                'query_source': query_ctx.get("query_source"),
+                'requester_platform': query_ctx.get("requester_platform"),
+                'requester_user_id': query_ctx.get("requester_user_id"),
+                'requester_user_name': query_ctx.get("requester_user_name"),
+                'requester_chat_id': query_ctx.get("requester_chat_id"),
+                'requester_message_id': query_ctx.get("requester_message_id"),
+                'requester_query': query_ctx.get("requester_query"),
+            }
 
-                url_key = url or self._build_fallback_url_key(
-                    code=code,
-                    title=title,
-                    source=source,
-                    published_date=published_date
+        def _write(session: Session) -> int:
+            if not items:
+                return 0
+
+            url_keys = list(items.keys())
+            existing_rows: Dict[str, NewsIntel] = {}
+            for i in range(0, len(url_keys), _IN_CHUNK):
+                chunk_keys = url_keys[i : i + _IN_CHUNK]
+                existing_rows.update(
+                    (row.url, row)
+                    for row in session.execute(
+                        select(NewsIntel).where(NewsIntel.url.in_(chunk_keys))
+                    ).scalars().all()
                 )
 
-                existing = session.execute(
-                    select(NewsIntel).where(NewsIntel.url == url_key)
-                ).scalar_one_or_none()
+            new_records = []
+            for url_key, fields in items.items():
+                existing = existing_rows.get(url_key)
+                if existing is not None:
+                    _update_existing(existing, fields)
+                else:
+                    new_records.append(_build_record(url_key, fields))
 
-                if existing:
-                    existing.name = name or existing.name
-                    existing.dimension = dimension or existing.dimension
-                    existing.query = query or existing.query
-                    existing.provider = response.provider or existing.provider
-                    existing.snippet = snippet or existing.snippet
-                    existing.source = source or existing.source
-                    existing.published_date = published_date or existing.published_date
-                    existing.fetched_at = datetime.now()
-
-                    if query_context:
-                        if not existing.query_id and current_query_id:
-                            existing.query_id = current_query_id
-                        existing.query_source = (
-                            query_context.get("query_source") or existing.query_source
-                        )
-                        existing.requester_platform = (
-                            query_context.get("requester_platform") or existing.requester_platform
-                        )
-                        existing.requester_user_id = (
-                            query_context.get("requester_user_id") or existing.requester_user_id
-                        )
-                        existing.requester_user_name = (
-                            query_context.get("requester_user_name") or existing.requester_user_name
-                        )
-                        existing.requester_chat_id = (
-                            query_context.get("requester_chat_id") or existing.requester_chat_id
-                        )
-                        existing.requester_message_id = (
-                            query_context.get("requester_message_id") or existing.requester_message_id
-                        )
-                        existing.requester_query = (
-                            query_context.get("requester_query") or existing.requester_query
-                        )
-                    continue
+            if not new_records:
+                return 0
 
-                try:
-                    with session.begin_nested():
-                        record = NewsIntel(
-                            code=code,
-                            name=name,
-                            dimension=dimension,
-                            query=query,
-                            provider=response.provider,
-                            title=title,
-                            snippet=snippet,
-                            url=url_key,
-                            source=source,
-                            published_date=published_date,
-                            fetched_at=datetime.now(),
-                            query_id=current_query_id or None,
-                            query_source=query_ctx.get("query_source"),
-                            requester_platform=query_ctx.get("requester_platform"),
-                            requester_user_id=query_ctx.get("requester_user_id"),
-                            requester_user_name=query_ctx.get("requester_user_name"),
-                            requester_chat_id=query_ctx.get("requester_chat_id"),
-                            requester_message_id=query_ctx.get("requester_message_id"),
-                            requester_query=query_ctx.get("requester_query"),
-                        )
-                        session.add(record)
-                        session.flush()
-                    local_saved_count += 1
-                except IntegrityError:
-                    logger.debug("新闻情报重复（已跳过）: %s %s", code, url_key)
+            if self._is_sqlite_engine:
+                # `_run_write_transaction()` 以 BEGIN IMMEDIATE 开启事务，上面的 IN 查询与插入
+                # 处于同一写窗口；ON CONFLICT DO NOTHING 兜底并发写入的同一 URL
+                local_saved_count = 0
+                for i in range(0, len(new_records), _SQLITE_INSERT_CHUNK):
+                    chunk = new_records[i : i + _SQLITE_INSERT_CHUNK]
+                    result = session.execute(
+                        sqlite_insert(NewsIntel)
+                        .values(chunk)
+                        .on_conflict_do_nothing(index_elements=['url'])
+                    )
+                    local_saved_count += max(result.rowcount or 0, 0)
+                return local_saved_count
 
+            try:
+                with session.begin_nested():
+                    session.add_all([NewsIntel(**record) for record in new_records])
+                    session.flush()
+                return len(new_records)
+            except IntegrityError:
+                # 并发写入了相同 URL：退回逐条插入，跳过冲突条目
+                local_saved_count = 0
+                for record in new_records:
+                    try:
+                        with session.begin_nested():
+                            session.add(NewsIntel(**record))
+                            session.flush()
+                        local_saved_count += 1
+                    except IntegrityError:
+                        logger.debug("新闻情报重复（已跳过）: %s %s", code, record['url'])
+                return local_saved_count
+
+        def _write_buffered(session: Session) -> int:
+            local_saved_count = _write(session)
+            logger.info(f"保存新闻情报成功: {code}, 新增 {local_saved_count} 条")
             return local_saved_count
 
+        if self._submit_write(f"save_news_intel[{code}]", _write_buffered):
+            return 0
+
         try:
             saved_count = self._run_write_transaction(
                 f"save_news_intel[{code}]",
@@ -1057,17 +1450,26 @@ class DatabaseManager:
             return 0
 
         try:
+            # 入队时即序列化并记下时间，避免刷盘前 payload 被调用方修改、排序时间漂移
+            payload_json = self._safe_json_dumps(payload)
+            source_chain_json = self._safe_json_dumps(source_chain or [])
+            coverage_json = self._safe_json_dumps(coverage or {})
+            created_at = datetime.now()
+
             def _write(session: Session) -> int:
                 session.add(
                     FundamentalSnapshot(
                         query_id=query_id,
                         code=code,
-                        payload=self._safe_json_dumps(payload),
-                        source_chain=self._safe_json_dumps(source_chain or []),
-                        coverage=self._safe_json_dumps(coverage or {}),
+                        payload=payload_json,
+                        source_chain=source_chain_json,
+                        coverage=coverage_json,
+                        created_at=created_at,
                     )
                 )
                 return 1
+            if self._submit_write(f"save_fundamental_snapshot[{query_id}:{code}]", _write):
+                return 1
             return self._run_write_transaction(
                 f"save_fundamental_snapshot[{query_id}:{code}]",
                 _write,
@@ -1081,6 +1483,88 @@ class DatabaseManager:
             )
             return 0
 
+    def save_fundamental_dataset(
+        self,
+        dataset: str,
+        period: str,
+        payloads: Dict[str, Any],
+        replace: bool = False,
+    ) -> int:
+        """
+        写入基本面数据集缓存（同步写入，随后的读取立即可见）。
+
+        Args:
+            dataset: 数据集标识（接口名 + 非代码参数）
+            period: 报告期
+            payloads: 代码 -> 可 JSON 序列化的内容
+            replace: True 时整表替换该数据集（全市场表）；否则只替换给定代码的旧行
+
+        Returns:
+            写入行数
+        """
+        if not dataset or not period or not payloads:
+            return 0
+
+        fetched_at = datetime.now()
+        rows = [
+            {
+                "dataset": dataset,
+                "period": period,
+                "code": code,
+                "payload": self._safe_json_dumps(payload),
+                "fetched_at": fetched_at,
+            }
+            for code, payload in payloads.items()
+        ]
+
+        def _write(session: Session) -> int:
+            stale = delete(FundamentalDataset).where(FundamentalDataset.dataset == dataset)
+            if not replace:
+                stale = stale.where(FundamentalDataset.code.in_(list(payloads)))
+            session.execute(stale)
+            session.bulk_insert_mappings(FundamentalDataset, rows)
+            return len(rows)
+
+        return self._run_write_transaction(f"save_fundamental_dataset[{dataset}:{period}]", _write)
+
+    def get_fundamental_dataset(
+        self,
+        dataset: str,
+        period: str,
+        codes: List[str],
+    ) -> Dict[str, Tuple[Any, datetime]]:
+        """
+        读取基本面数据集缓存中指定代码的内容。
+
+        Returns:
+            代码 -> (内容, 写入时间)；不存在的代码不出现在结果中
+        """
+        if not dataset or not period or not codes:
+            return {}
+
+        with self.get_session() as session:
+            rows = session.execute(
+                select(
+                    FundamentalDataset.code,
+                    FundamentalDataset.payload,
+                    FundamentalDataset.fetched_at,
+                ).where(
+                    and_(
+                        FundamentalDataset.dataset == dataset,
+                        FundamentalDataset.period == period,
+                        FundamentalDataset.code.in_(list(codes)),
+                    )
+                )
+            ).all()
+
+        result: Dict[str, Tuple[Any, datetime]] = {}
+        for code, payload, fetched_at in rows:
+            try:
+                result[code] = (json.loads(payload), fetched_at)
+            except (TypeError, ValueError):
+                continue
+        return result
+
     def get_latest_fundamental_snapshot(
         self,
         query_id: str,
@@ -1091,6 +1575,7 @@ class DatabaseManager:
 
         读取失败或不存在时返回 None（fail-open）。
         """
+        self.flush_pending_writes()
         if not query_id or not code:
             return None
 
@@ -1128,6 +1613,7 @@ class DatabaseManager:
         """
         获取指定股票最近 N 天的新闻情报
         """
+        self.flush_pending_writes()
         cutoff_date = datetime.now() - timedelta(days=days)
 
         with self.get_session() as session:
@@ -1156,6 +1642,7 @@ class DatabaseManager:
         Returns:
             NewsIntel 列表（按发布时间或抓取时间倒序）
         """
+        self.flush_pending_writes()
         from sqlalchemy import func
 
         with self.get_session() as session:
@@ -1264,6 +1751,71 @@ class DatabaseManager:
             ).scalars().all()
 
             return list(results)
+
+    def get_signal_history_batch(
+        self,
+        codes: List[str],
+        days: int = 90,
+        limit: int = 5,
+        exclude_query_ids: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        一次查询多只股票最近的信号记录（仅信号列）
+
+        用 ROW_NUMBER() 按 code 分区、created_at 倒序编号，每只股票取前
+        ``limit`` 条；不加载 raw_result 等大字段。
+
+        Args:
+            codes: 股票代码列表
+            days: 只看最近 N 天
+            limit: 每只股票最多返回条数
+            exclude_query_ids: code -> query_id，排除对应股票的该次记录（如本次运行）
+
+        Returns:
+            code -> 按时间倒序的信号字典列表（created_at 为 datetime）
+        """
+        result: Dict[str, List[Dict[str, Any]]] = {code: [] for code in codes}
+        if not codes or limit <= 0:
+            return result
+
+        conditions = [
+            AnalysisHistory.code.in_(list(result)),
+            AnalysisHistory.created_at >= datetime.now() - timedelta(days=days),
+        ]
+        exclude_query_ids = {
+            code: query_id for code, query_id in (exclude_query_ids or {}).items()
+            if code in result and query_id
+        }
+        if exclude_query_ids:
+            conditions.append(or_(
+                AnalysisHistory.code.notin_(list(exclude_query_ids)),
+                AnalysisHistory.query_id != case(exclude_query_ids, value=AnalysisHistory.code),
+            ))
+
+        signal_columns = ('query_id', 'created_at', 'sentiment_score', 'operation_advice', 'trend_prediction')
+        ranked = (
+            select(
+                AnalysisHistory.code,
+                *(getattr(AnalysisHistory, name) for name in signal_columns),
+                func.row_number().over(
+                    partition_by=AnalysisHistory.code,
+                    order_by=(desc(AnalysisHistory.created_at), desc(AnalysisHistory.id)),
+                ).label('rn'),
+            )
+            .where(and_(*conditions))
+            .subquery()
+        )
+
+        with self.get_session() as session:
+            rows = session.execute(
+                select(ranked.c.code, *(ranked.c[name] for name in signal_columns))
+                .where(ranked.c.rn <= limit)
+                .order_by(ranked.c.code, ranked.c.rn)
+            ).all()
+
+        for row in rows:
+            result[row.code].append({name: getattr(row, name) for name in signal_columns})
+        return result
     
     def get_analysis_history_paginated(
         self,
@@ -1307,9 +1859,10 @@ class DatabaseManager:
             total_query = select(func.count(AnalysisHistory.id)).where(where_clause)
             total = session.execute(total_query).scalar() or 0
             
-            # 查询分页数据
+            # 查询分页数据（列表只展示摘要字段，不加载大字段）
             data_query = (
                 select(AnalysisHistory)
+                .options(*_ANALYSIS_PAYLOAD_DEFER)
                 .where(where_clause)
                 .order_by(desc(AnalysisHistory.created_at))
                 .offset(offset)
@@ -1338,6 +1891,53 @@ class DatabaseManager:
             ).scalars().first()
             return result
 
+    def compact_analysis_history(self, batch_size: int = 200) -> int:
+        """
+        将旧版明文存储的分析大字段改写为压缩格式
+
+        新写入的记录已自动压缩，本方法只处理升级前遗留的明文行；
+        SQLite 文件需随后 VACUUM 才会真正缩小。
+
+        Args:
+            batch_size: 每个事务改写的记录数
+
+        Returns:
+            改写的记录数量
+        """
+        table = AnalysisHistory.__table__
+        payload_columns = ('raw_result', 'news_content', 'context_snapshot')
+        # 以原始字符串比较，绕过 CompressedText 的读写转换
+        plain_conditions = [
+            and_(
+                func.length(table.c[name]) >= _COMPRESSED_TEXT_MIN_CHARS,
+                ~table.c[name].like(f'{_COMPRESSED_TEXT_PREFIX}%'),
+            )
+            for name in payload_columns
+        ]
+        compacted = 0
+        last_id = 0
+        while True:
+            with self.session_scope() as session:
+                rows = session.execute(
+                    select(AnalysisHistory)
+                    .where(AnalysisHistory.id > last_id, or_(*plain_conditions))
+                    .order_by(AnalysisHistory.id)
+                    .limit(batch_size)
+                ).scalars().all()
+                if not rows:
+                    break
+                for row in rows:
+                    session.execute(
+                        table.update()
+                        .where(table.c.id == row.id)
+                        .values({name: getattr(row, name) for name in payload_columns})
+                    )
+                last_id = rows[-1].id
+                compacted += len(rows)
+        if compacted:
+            logger.info(f"[数据库] 已压缩 {compacted} 条分析历史记录的大字段")
+        return compacted
+
     def delete_analysis_history_records(self, record_ids: List[int]) -> int:
         """
         删除指定的分析历史记录。
@@ -1416,6 +2016,42 @@ class DatabaseManager:
             
             return list(results)
     
+    def get_daily_panel(
+        self,
+        start_date: date,
+        end_date: Optional[date] = None,
+        codes: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        一次性读取多只股票的日线数据（长表）
+
+        用于全市场批量计算（如策略预筛选），避免逐只股票查询。
+
+        Args:
+            start_date: 开始日期（含）
+            end_date: 结束日期（含），默认不限
+            codes: 股票代码列表，None 表示库中全部股票
+
+        Returns:
+            按 code、date 排序的 DataFrame，列为 code/date/open/high/low/close/volume/amount/pct_chg
+        """
+        columns = ['code', 'date', 'open', 'high', 'low', 'close', 'volume', 'amount', 'pct_chg']
+        conditions = [StockDaily.date >= start_date]
+        if end_date is not None:
+            conditions.append(StockDaily.date <= end_date)
+        if codes is not None:
+            if not codes:
+                return pd.DataFrame(columns=columns)
+            conditions.append(StockDaily.code.in_(list(codes)))
+
+        with self.get_session() as session:
+            rows = session.execute(
+                select(*(getattr(StockDaily, name) for name in columns))
+                .where(and_(*conditions))
+                .order_by(StockDaily.code, StockDaily.date)
+            ).all()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
     def save_daily_data(
         self, 
         df: pd.DataFrame, 
@@ -1875,18 +2511,34 @@ class DatabaseManager:
         """
         保存 Agent 对话消息
         """
-        with self.session_scope() as session:
-            msg = ConversationMessage(
-                session_id=session_id,
-                role=role,
-                content=content
+        created_at = datetime.now()
+
+        def _write(session: Session) -> None:
+            session.add(
+                ConversationMessage(
+                    session_id=session_id,
+                    role=role,
+                    content=content,
+                    created_at=created_at,
+                )
             )
-            session.add(msg)
+            self._touch_chat_session(
+                session,
+                session_id,
+                title=content[:_CHAT_SESSION_TITLE_CHARS] if role == "user" else None,
+                at=created_at,
+            )
+
+        if self._submit_write(f"save_conversation_message[{session_id}]", _write):
+            return
+        with self.session_scope() as session:
+            _write(session)
 
     def get_conversation_history(self, session_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
         获取 Agent 对话历史
         """
+        self.flush_pending_writes()
         with self.session_scope() as session:
             stmt = select(ConversationMessage).filter(
                 ConversationMessage.session_id == session_id
@@ -1896,8 +2548,86 @@ class DatabaseManager:
             # 倒序返回，保证时间顺序
             return [{"role": msg.role, "content": msg.content} for msg in reversed(messages)]
 
+    def get_conversation_tail(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        获取会话最近 limit 条消息（含 id，按时间正序），用于构造对话上下文
+        """
+        self.flush_pending_writes()
+        with self.session_scope() as session:
+            rows = session.execute(
+                select(ConversationMessage.id, ConversationMessage.role, ConversationMessage.content)
+                .where(ConversationMessage.session_id == session_id)
+                .order_by(desc(ConversationMessage.id))
+                .limit(limit)
+            ).all()
+            return [
+                {"id": row.id, "role": row.role, "content": row.content}
+                for row in reversed(rows)
+            ]
+
+    def get_conversation_messages_between(
+        self,
+        session_id: str,
+        after_id: int,
+        before_id: int,
+        limit: int = 200,
+    ) -> List[Dict[str, Any]]:
+        """
+        获取 after_id < id < before_id 区间内最近 limit 条消息（按时间正序）
+        """
+        self.flush_pending_writes()
+        with self.session_scope() as session:
+            rows = session.execute(
+                select(ConversationMessage.id, ConversationMessage.role, ConversationMessage.content)
+                .where(
+                    and_(
+                        ConversationMessage.session_id == session_id,
+                        ConversationMessage.id > after_id,
+                        ConversationMessage.id < before_id,
+                    )
+                )
+                .order_by(desc(ConversationMessage.id))
+                .limit(limit)
+            ).all()
+            return [
+                {"id": row.id, "role": row.role, "content": row.content}
+                for row in reversed(rows)
+            ]
+
+    def get_conversation_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取会话滚动摘要，不存在时返回 None
+        """
+        self.flush_pending_writes()
+        with self.session_scope() as session:
+            row = session.get(ConversationSummary, session_id)
+            if row is None:
+                return None
+            return {"summary": row.summary or "", "last_message_id": row.last_message_id or 0}
+
+    def save_conversation_summary(self, session_id: str, summary: str, last_message_id: int) -> None:
+        """
+        写入会话滚动摘要（覆盖旧值）
+        """
+        def _write(session: Session) -> None:
+            row = session.get(ConversationSummary, session_id)
+            if row is None:
+                session.add(
+                    ConversationSummary(
+                        session_id=session_id,
+                        summary=summary,
+                        last_message_id=last_message_id,
+                    )
+                )
+            else:
+                row.summary = summary
+                row.last_message_id = last_message_id
+
+        self._run_write_transaction(f"save_conversation_summary[{session_id}]", _write)
+
     def conversation_session_exists(self, session_id: str) -> bool:
         """Return True when at least one message exists for the given session."""
+        self.flush_pending_writes()
         with self.session_scope() as session:
             stmt = (
                 select(ConversationMessage.id)
@@ -1913,7 +2643,7 @@ class DatabaseManager:
         extra_session_ids: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
-        获取聊天会话列表（从 conversation_messages 聚合）
+        获取聊天会话列表（从 chat_sessions 索引表读取）
 
         Args:
             limit: Maximum number of sessions to return.
@@ -1926,7 +2656,8 @@ class DatabaseManager:
         Returns:
             按最近活跃时间倒序的会话列表，每条包含 session_id, title, message_count, last_active
         """
-        from sqlalchemy import func
+        self.flush_pending_writes()
+        self._ensure_chat_sessions_index()
 
         with self.session_scope() as session:
             normalized_prefix = None
@@ -1934,60 +2665,144 @@ class DatabaseManager:
                 normalized_prefix = session_prefix if session_prefix.endswith(":") else f"{session_prefix}:"
             exact_ids = [sid for sid in (extra_session_ids or []) if sid]
 
-            # 聚合每个 session 的消息数和最后活跃时间
-            base = (
+            stmt = select(ChatSession)
+            conditions = []
+            if normalized_prefix:
+                conditions.append(ChatSession.session_id.startswith(normalized_prefix))
+            if exact_ids:
+                conditions.append(ChatSession.session_id.in_(exact_ids))
+            if conditions:
+                stmt = stmt.where(or_(*conditions))
+            rows = session.execute(
+                stmt.order_by(desc(ChatSession.last_active)).limit(limit)
+            ).scalars().all()
+
+            return [
+                {
+                    "session_id": row.session_id,
+                    "title": (row.title or "新对话")[:_CHAT_SESSION_TITLE_CHARS],
+                    "message_count": row.message_count,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "last_active": row.last_active.isoformat() if row.last_active else None,
+                }
+                for row in rows
+            ]
+
+    def _touch_chat_session(
+        self,
+        session: Session,
+        session_id: str,
+        title: Optional[str],
+        at: datetime,
+    ) -> None:
+        """Count one new message against its chat_sessions row, creating it if needed."""
+        values = {
+            'session_id': session_id,
+            'title': title,
+            'message_count': 1,
+            'created_at': at,
+            'last_active': at,
+        }
+        if self._is_sqlite_engine:
+            stmt = sqlite_insert(ChatSession).values(values)
+            table = ChatSession.__table__
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=['session_id'],
+                    set_={
+                        'title': func.coalesce(table.c.title, stmt.excluded.title),
+                        'message_count': table.c.message_count + 1,
+                        'created_at': func.min(table.c.created_at, stmt.excluded.created_at),
+                        'last_active': func.max(table.c.last_active, stmt.excluded.last_active),
+                    },
+                )
+            )
+            return
+        existing = session.get(ChatSession, session_id)
+        if existing is None:
+            session.add(ChatSession(**values))
+            session.flush()
+            return
+        existing.title = existing.title or title
+        existing.message_count = (existing.message_count or 0) + 1
+        existing.created_at = min(existing.created_at, at) if existing.created_at else at
+        existing.last_active = max(existing.last_active, at) if existing.last_active else at
+
+    def backfill_chat_sessions(self) -> int:
+        """Rebuild chat_sessions from conversation_messages.
+
+        Returns the number of sessions written.
+        """
+        self.flush_pending_writes()
+        with self.session_scope() as session:
+            session.execute(delete(ChatSession))
+            first_user_ids = (
+                select(func.min(ConversationMessage.id).label("id"))
+                .where(ConversationMessage.role == "user")
+                .group_by(ConversationMessage.session_id)
+                .subquery()
+            )
+            titles = dict(
+                session.execute(
+                    select(ConversationMessage.session_id, ConversationMessage.content)
+                    .where(ConversationMessage.id.in_(select(first_user_ids.c.id)))
+                ).all()
+            )
+            rows = session.execute(
                 select(
                     ConversationMessage.session_id,
                     func.count(ConversationMessage.id).label("message_count"),
                     func.min(ConversationMessage.created_at).label("created_at"),
                     func.max(ConversationMessage.created_at).label("last_active"),
                 )
-            )
-            conditions = []
-            if normalized_prefix:
-                conditions.append(ConversationMessage.session_id.startswith(normalized_prefix))
-            if exact_ids:
-                conditions.append(ConversationMessage.session_id.in_(exact_ids))
-            if conditions:
-                base = base.where(or_(*conditions))
-            stmt = (
-                base
                 .group_by(ConversationMessage.session_id)
-                .order_by(desc(func.max(ConversationMessage.created_at)))
-                .limit(limit)
+            ).all()
+            now = datetime.now()
+            session.add_all(
+                ChatSession(
+                    session_id=row.session_id,
+                    title=(
+                        titles[row.session_id][:_CHAT_SESSION_TITLE_CHARS]
+                        if row.session_id in titles
+                        else None
+                    ),
+                    message_count=row.message_count,
+                    created_at=row.created_at or now,
+                    last_active=row.last_active or now,
+                )
+                for row in rows
             )
-            rows = session.execute(stmt).all()
+        logger.info("[Chat] chat_sessions rebuilt for %d session(s)", len(rows))
+        return len(rows)
 
-            results = []
-            for row in rows:
-                sid = row.session_id
-                # 取该会话第一条 user 消息作为标题
-                first_user_msg = session.execute(
-                    select(ConversationMessage.content)
-                    .where(
-                        and_(
-                            ConversationMessage.session_id == sid,
-                            ConversationMessage.role == "user",
-                        )
-                    )
-                    .order_by(ConversationMessage.created_at)
-                    .limit(1)
-                ).scalar()
-                title = (first_user_msg or "新对话")[:60]
+    def _ensure_chat_sessions_index(self) -> None:
+        """Backfill chat_sessions once per process when it lags conversation_messages.
 
-                results.append({
-                    "session_id": sid,
-                    "title": title,
-                    "message_count": row.message_count,
-                    "created_at": row.created_at.isoformat() if row.created_at else None,
-                    "last_active": row.last_active.isoformat() if row.last_active else None,
-                })
-            return results
+        Covers databases created before the index table existed.
+        """
+        if getattr(self, '_chat_sessions_checked', False):
+            return
+        with self.session_scope() as session:
+            message_count = session.execute(
+                select(func.count(ConversationMessage.id))
+            ).scalar() or 0
+            indexed = session.execute(
+                select(func.coalesce(func.sum(ChatSession.message_count), 0))
+            ).scalar() or 0
+        if message_count != indexed:
+            logger.info(
+                "[Chat] chat_sessions out of date (messages=%d, indexed=%d), backfilling",
+                message_count,
+                indexed,
+            )
+            self.backfill_chat_sessions()
+        self._chat_sessions_checked = True
 
     def get_conversation_messages(self, session_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
         获取单个会话的完整消息列表（用于前端恢复历史）
         """
+        self.flush_pending_writes()
         with self.session_scope() as session:
             stmt = (
                 select(ConversationMessage)
@@ -2013,12 +2828,19 @@ class DatabaseManager:
         Returns:
             删除的消息数
         """
+        self.flush_pending_writes()
         with self.session_scope() as session:
             result = session.execute(
                 delete(ConversationMessage).where(
                     ConversationMessage.session_id == session_id
                 )
             )
+            session.execute(
+                delete(ChatSession).where(ChatSession.session_id == session_id)
+            )
+            session.execute(
+                delete(ConversationSummary).where(ConversationSummary.session_id == session_id)
+            )
             return result.rowcount
 
     # ------------------------------------------------------------------
@@ -2034,17 +2856,136 @@ class DatabaseManager:
         total_tokens: int,
         stock_code: Optional[str] = None,
     ) -> None:
-        """Append one LLM call record to llm_usage."""
-        row = LLMUsage(
-            call_type=call_type,
-            model=model or "unknown",
-            stock_code=stock_code,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=total_tokens,
-        )
-        with self.session_scope() as session:
+        """Append one LLM call record to llm_usage and bump its hourly/daily rollups."""
+        called_at = datetime.now()
+
+        def _write(session: Session) -> None:
+            row = LLMUsage(
+                call_type=call_type,
+                model=model or "unknown",
+                stock_code=stock_code,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=total_tokens,
+                called_at=called_at,
+            )
             session.add(row)
+            self._increment_llm_usage_rollups(session, [row])
+
+        if self._submit_write(f"record_llm_usage[{call_type}]", _write):
+            return
+        with self.session_scope() as session:
+            _write(session)
+
+    def _increment_llm_usage_rollups(self, session: Session, rows: List[LLMUsage]) -> None:
+        """Add raw llm_usage rows to the hourly and daily rollup buckets."""
+        for model_cls, bucket_of in _LLM_USAGE_ROLLUPS:
+            increments: Dict[Tuple[datetime, str, str, str], Dict[str, int]] = {}
+            for row in rows:
+                key = (bucket_of(row.called_at), row.call_type, row.model, row.stock_code or '')
+                acc = increments.setdefault(key, dict.fromkeys(_LLM_USAGE_SUM_COLUMNS, 0))
+                acc['calls'] += 1
+                acc['prompt_tokens'] += row.prompt_tokens or 0
+                acc['completion_tokens'] += row.completion_tokens or 0
+                acc['total_tokens'] += row.total_tokens or 0
+
+            for (bucket_start, call_type, model, stock_code), acc in increments.items():
+                values = {
+                    'bucket_start': bucket_start,
+                    'call_type': call_type,
+                    'model': model,
+                    'stock_code': stock_code,
+                    **acc,
+                }
+                if self._is_sqlite_engine:
+                    stmt = sqlite_insert(model_cls).values(values)
+                    table = model_cls.__table__
+                    session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=['bucket_start', 'call_type', 'model', 'stock_code'],
+                            set_={
+                                name: table.c[name] + stmt.excluded[name]
+                                for name in _LLM_USAGE_SUM_COLUMNS
+                            },
+                        )
+                    )
+                    continue
+                existing = session.execute(
+                    select(model_cls).where(
+                        and_(
+                            model_cls.bucket_start == bucket_start,
+                            model_cls.call_type == call_type,
+                            model_cls.model == model,
+                            model_cls.stock_code == stock_code,
+                        )
+                    )
+                ).scalar_one_or_none()
+                if existing is None:
+                    session.add(model_cls(**values))
+                    session.flush()
+                else:
+                    for name in _LLM_USAGE_SUM_COLUMNS:
+                        setattr(existing, name, (getattr(existing, name) or 0) + acc[name])
+
+    def backfill_llm_usage_rollups(self, batch_size: int = 5000) -> int:
+        """Rebuild the hourly/daily rollups from the raw llm_usage log.
+
+        Returns the number of raw rows aggregated.
+        """
+        self.flush_pending_writes()
+        processed = 0
+        with self.session_scope() as session:
+            session.execute(delete(LLMUsageHourly))
+            session.execute(delete(LLMUsageDaily))
+            last_id = 0
+            while True:
+                batch = session.execute(
+                    select(LLMUsage)
+                    .where(LLMUsage.id > last_id)
+                    .order_by(LLMUsage.id)
+                    .limit(batch_size)
+                ).scalars().all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                rows = [row for row in batch if row.called_at is not None]
+                self._increment_llm_usage_rollups(session, rows)
+                processed += len(rows)
+                # Keep the identity map bounded while walking a large log
+                session.flush()
+                session.expunge_all()
+        logger.info("[LLM usage] rollups rebuilt from %d raw row(s)", processed)
+        return processed
+
+    def _ensure_llm_usage_rollups(self) -> None:
+        """Backfill the rollups once per process when they lag the raw log.
+
+        Covers databases created before the rollup tables existed and rows
+        inserted without going through record_llm_usage().
+        """
+        if getattr(self, '_llm_usage_rollups_checked', False):
+            return
+        with self.session_scope() as session:
+            # Rows without called_at never reach a rollup bucket; leave them out
+            raw_count = session.execute(
+                select(func.count(LLMUsage.id)).where(LLMUsage.called_at.isnot(None))
+            ).scalar() or 0
+            rolled_up = session.execute(
+                select(func.coalesce(func.sum(LLMUsageHourly.calls), 0))
+            ).scalar() or 0
+        if raw_count != rolled_up:
+            logger.info(
+                "[LLM usage] rollups out of date (raw=%d, rolled up=%d), backfilling",
+                raw_count,
+                rolled_up,
+            )
+            self.backfill_llm_usage_rollups()
+        self._llm_usage_rollups_checked = True
+
+    @staticmethod
+    def _ceil_to(dt: datetime, floor_fn: Callable[[datetime], datetime], step: timedelta) -> datetime:
+        floored = floor_fn(dt)
+        return floored if floored == dt else floored + step
 
     def get_llm_usage_summary(
         self,
@@ -2053,60 +2994,80 @@ class DatabaseManager:
     ) -> Dict[str, Any]:
         """Return aggregated token usage between from_dt and to_dt.
 
+        Whole days in the range are read from llm_usage_daily, remaining whole
+        hours from llm_usage_hourly, and only the partial hours at either edge
+        from the raw llm_usage log.
+
         Returns a dict with keys:
           total_calls, total_tokens,
           by_call_type: list of {call_type, calls, total_tokens},
           by_model:     list of {model, calls, total_tokens}
         """
-        with self.session_scope() as session:
-            base_filter = and_(
-                LLMUsage.called_at >= from_dt,
-                LLMUsage.called_at <= to_dt,
-            )
+        self.flush_pending_writes()
+        self._ensure_llm_usage_rollups()
 
-            # Overall totals
-            totals = session.execute(
-                select(
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                ).where(base_filter)
-            ).one()
+        hour_floor = _LLM_USAGE_ROLLUPS[0][1]
+        day_floor = _LLM_USAGE_ROLLUPS[1][1]
+        hour_start = self._ceil_to(from_dt, hour_floor, timedelta(hours=1))
+        hour_end = hour_floor(to_dt)
 
-            # Breakdown by call_type
-            by_type_rows = session.execute(
-                select(
-                    LLMUsage.call_type,
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                )
-                .where(base_filter)
-                .group_by(LLMUsage.call_type)
-                .order_by(desc(func.sum(LLMUsage.total_tokens)))
-            ).all()
+        # (model, start, end, end_inclusive)
+        segments: List[Tuple[Any, datetime, datetime, bool]] = []
+        if hour_start >= hour_end:
+            segments.append((LLMUsage, from_dt, to_dt, True))
+        else:
+            segments.append((LLMUsage, from_dt, hour_start, False))
+            day_start = self._ceil_to(hour_start, day_floor, timedelta(days=1))
+            day_end = day_floor(hour_end)
+            if day_start < day_end:
+                segments.append((LLMUsageHourly, hour_start, day_start, False))
+                segments.append((LLMUsageDaily, day_start, day_end, False))
+                segments.append((LLMUsageHourly, day_end, hour_end, False))
+            else:
+                segments.append((LLMUsageHourly, hour_start, hour_end, False))
+            segments.append((LLMUsage, hour_end, to_dt, True))
 
-            # Breakdown by model
-            by_model_rows = session.execute(
-                select(
-                    LLMUsage.model,
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                )
-                .where(base_filter)
-                .group_by(LLMUsage.model)
-                .order_by(desc(func.sum(LLMUsage.total_tokens)))
-            ).all()
+        by_type: Dict[str, List[int]] = {}
+        by_model: Dict[str, List[int]] = {}
+        with self.session_scope() as session:
+            for model_cls, start, end, end_inclusive in segments:
+                if start > end or (start == end and not end_inclusive):
+                    continue
+                if model_cls is LLMUsage:
+                    time_col = LLMUsage.called_at
+                    calls_expr = func.count(LLMUsage.id)
+                else:
+                    time_col = model_cls.bucket_start
+                    calls_expr = func.coalesce(func.sum(model_cls.calls), 0)
+                upper = time_col <= end if end_inclusive else time_col < end
+                rows = session.execute(
+                    select(
+                        model_cls.call_type,
+                        model_cls.model,
+                        calls_expr.label("calls"),
+                        func.coalesce(func.sum(model_cls.total_tokens), 0).label("tokens"),
+                    )
+                    .where(and_(time_col >= start, upper))
+                    .group_by(model_cls.call_type, model_cls.model)
+                ).all()
+                for r in rows:
+                    for bucket, key in ((by_type, r.call_type), (by_model, r.model)):
+                        acc = bucket.setdefault(key, [0, 0])
+                        acc[0] += int(r.calls or 0)
+                        acc[1] += int(r.tokens or 0)
+
+        def _ranked(bucket: Dict[str, List[int]], label: str) -> List[Dict[str, Any]]:
+            items = sorted(bucket.items(), key=lambda item: item[1][1], reverse=True)
+            return [
+                {label: key, "calls": calls, "total_tokens": tokens}
+                for key, (calls, tokens) in items
+            ]
 
         return {
-            "total_calls": totals.calls,
-            "total_tokens": totals.tokens,
-            "by_call_type": [
-                {"call_type": r.call_type, "calls": r.calls, "total_tokens": r.tokens}
-                for r in by_type_rows
-            ],
-            "by_model": [
-                {"model": r.model, "calls": r.calls, "total_tokens": r.tokens}
-                for r in by_model_rows
-            ],
+            "total_calls": sum(calls for calls, _ in by_type.values()),
+            "total_tokens": sum(tokens for _, tokens in by_type.values()),
+            "by_call_type": _ranked(by_type, "call_type"),
+            "by_model": _ranked(by_model, "model"),
         }
 
 
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Token-count heuristics shared by prompt budgeting code.
+"""
+
+import re
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per CJK character, one per four other characters."""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
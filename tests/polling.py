@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Shared test helper for waiting on background threads."""
+
+import time
+
+
+def wait_for(predicate, timeout: float = 2.0) -> None:
+    """Poll ``predicate`` until it is truthy or ``timeout`` seconds pass."""
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
@@ -1329,6 +1329,9 @@ class TestAnalyzeWithAgentStockName(unittest.TestCase):
             pipeline.db.save_news_intel.assert_called_once()
             saved_kwargs = pipeline.db.save_news_intel.call_args.kwargs
             self.assertEqual(saved_kwargs["name"], "科创芯片ETF")
+            # The agent tool seed is not persisted with the history snapshot
+            snapshot = pipeline.db.save_analysis_history.call_args.kwargs["context_snapshot"]
+            self.assertNotIn("tool_result_seed", snapshot)
 
     def test_analyze_with_agent_keeps_dashboard_top_level_fields_after_stability(self):
         """Decision stability downgrade in agent flow should sync dashboard and top-level decision fields."""
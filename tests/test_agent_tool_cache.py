@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the per-analysis shared tool result cache.
+
+Covers:
+- ToolResultCache hit/miss accounting and error exclusion
+- Seeding from pipeline objects via build_pipeline_tool_seed
+- run_agent_loop serving repeated calls from the shared cache
+- Orchestrator sharing one cache across stage agents
+"""
+
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import litellm  # noqa: F401
+except ModuleNotFoundError:
+    sys.modules["litellm"] = MagicMock()
+
+from src.agent.llm_adapter import LLMResponse, ToolCall
+from src.agent.orchestrator import AgentOrchestrator
+from src.agent.protocols import AgentContext, StageResult, StageStatus
+from src.agent.runner import run_agent_loop
+from src.agent.tool_cache import ToolResultCache, build_pipeline_tool_seed
+from src.agent.tools.registry import ToolDefinition, ToolParameter, ToolRegistry
+
+
+def _make_quote_registry(calls):
+    def _quote(stock_code):
+        calls.append(stock_code)
+        return {"code": stock_code, "price": 10.0}
+
+    registry = ToolRegistry()
+    registry.register(
+        ToolDefinition(
+            name="get_realtime_quote",
+            description="Get realtime quote",
+            parameters=[ToolParameter(name="stock_code", type="string", description="Stock code")],
+            handler=_quote,
+        )
+    )
+    return registry
+
+
+def _tool_step(call_id, stock_code):
+    return LLMResponse(
+        content="",
+        tool_calls=[ToolCall(id=call_id, name="get_realtime_quote", arguments={"stock_code": stock_code})],
+        usage={"total_tokens": 10},
+        provider="openai",
+    )
+
+
+def _final_step(text="done"):
+    return LLMResponse(content=text, tool_calls=[], usage={"total_tokens": 10}, provider="openai")
+
+
+class TestToolResultCache(unittest.TestCase):
+
+    def test_get_counts_hits_and_misses(self):
+        cache = ToolResultCache()
+        self.assertIsNone(cache.get("get_realtime_quote", {"stock_code": "600519"}))
+        self.assertTrue(cache.put("get_realtime_quote", {"stock_code": "600519"}, {"price": 1}))
+        self.assertEqual(
+            json.loads(cache.get("get_realtime_quote", {"stock_code": "600519"})),
+            {"price": 1},
+        )
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_error_results_and_uncacheable_tools_are_skipped(self):
+        cache = ToolResultCache()
+        self.assertFalse(cache.put("get_realtime_quote", {"stock_code": "600519"}, {"error": "down"}))
+        self.assertFalse(cache.put("search_stock_news", {"stock_code": "600519"}, {"items": []}))
+        self.assertEqual(len(cache), 0)
+
+    def test_hk_variants_share_one_entry(self):
+        cache = ToolResultCache()
+        cache.put("get_realtime_quote", {"stock_code": "hk01810"}, {"price": 1})
+        self.assertIsNotNone(cache.get("get_realtime_quote", {"stock_code": "1810.HK"}))
+
+    def test_seed_does_not_count_as_lookup(self):
+        cache = ToolResultCache.from_context({
+            "tool_result_seed": [("analyze_trend", {"stock_code": "600519"}, {"trend_status": "bull"})],
+        })
+        stats = cache.stats()
+        self.assertEqual(stats["seeded"], 1)
+        self.assertEqual(stats["hits"] + stats["misses"], 0)
+
+    def test_build_pipeline_tool_seed_uses_tool_payload_shape(self):
+        quote = SimpleNamespace(
+            code="600519", name="贵州茅台", price=1800.0, change_pct=1.2, change_amount=21.0,
+            volume=100, amount=1000.0, volume_ratio=1.1, turnover_rate=0.5, amplitude=2.0,
+            open_price=1780.0, high=1810.0, low=1770.0, pre_close=1779.0, pe_ratio=30.0,
+            pb_ratio=8.0, total_mv=1.0, circ_mv=1.0, change_60d=3.0,
+            source=SimpleNamespace(value="efinance"),
+        )
+        seeds = build_pipeline_tool_seed("600519", realtime_quote=quote)
+        self.assertEqual(len(seeds), 1)
+        tool_name, arguments, payload = seeds[0]
+        self.assertEqual(tool_name, "get_realtime_quote")
+        self.assertEqual(arguments, {"stock_code": "600519"})
+        self.assertEqual(payload["open"], 1780.0)
+        self.assertEqual(payload["source"], "efinance")
+
+
+class TestRunnerSharedCache(unittest.TestCase):
+
+    def test_seeded_result_skips_tool_execution(self):
+        calls = []
+        registry = _make_quote_registry(calls)
+        cache = ToolResultCache()
+        cache.seed([("get_realtime_quote", {"stock_code": "600519"}, {"code": "600519", "price": 9.9})])
+        adapter = MagicMock()
+        adapter.call_with_tools.side_effect = [_tool_step("q1", "600519"), _final_step()]
+
+        result = run_agent_loop(
+            messages=[{"role": "user", "content": "go"}],
+            tool_registry=registry,
+            llm_adapter=adapter,
+            tool_result_cache=cache,
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(calls, [])
+        entry = result.tool_calls_log[0]
+        self.assertTrue(entry["success"])
+        self.assertTrue(entry["cached"])
+        self.assertEqual(entry["cache_source"], "shared")
+        tool_msg = [m for m in result.messages if m["role"] == "tool"][0]
+        self.assertEqual(json.loads(tool_msg["content"])["price"], 9.9)
+
+    def test_cache_is_shared_across_loops(self):
+        calls = []
+        registry = _make_quote_registry(calls)
+        cache = ToolResultCache()
+        for call_id in ("a", "b"):
+            adapter = MagicMock()
+            adapter.call_with_tools.side_effect = [_tool_step(call_id, "600519"), _final_step()]
+            run_agent_loop(
+                messages=[{"role": "user", "content": "go"}],
+                tool_registry=registry,
+                llm_adapter=adapter,
+                tool_result_cache=cache,
+            )
+
+        self.assertEqual(calls, ["600519"])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+class TestOrchestratorSharedCache(unittest.TestCase):
+
+    def test_stage_agents_receive_seeded_cache_and_stats_report_hit_rate(self):
+        seen_caches = []
+
+        def _run(ctx, progress_callback=None, timeout_seconds=None):
+            seen_caches.append(ctx.tool_cache)
+            ctx.tool_cache.get("get_realtime_quote", {"stock_code": "600519"})
+            return StageResult(stage_name="technical", status=StageStatus.COMPLETED)
+
+        orch = AgentOrchestrator(tool_registry=ToolRegistry(), llm_adapter=MagicMock(), mode="quick")
+        ctx = orch._build_context("analyze", {
+            "stock_code": "600519",
+            "tool_result_seed": [("get_realtime_quote", {"stock_code": "600519"}, {"price": 1})],
+        })
+        agents = [MagicMock(agent_name="technical"), MagicMock(agent_name="decision")]
+        for agent in agents:
+            agent.run.side_effect = _run
+
+        with patch.object(orch, "_build_agent_chain", return_value=agents):
+            result = orch._execute_pipeline(ctx, parse_dashboard=False)
+
+        self.assertEqual(len(seen_caches), 2)
+        self.assertIs(seen_caches[0], seen_caches[1])
+        self.assertEqual(result.stats.tool_cache["hits"], 2)
+        self.assertEqual(result.stats.to_dict()["tool_cache"]["hit_rate"], 1.0)
+
+    def test_context_without_cache_gets_one(self):
+        orch = AgentOrchestrator(tool_registry=ToolRegistry(), llm_adapter=MagicMock(), mode="quick")
+        ctx = AgentContext(query="test")
+        with patch.object(orch, "_build_agent_chain", return_value=[]):
+            orch._execute_pipeline(ctx, parse_dashboard=False)
+        self.assertIsInstance(ctx.tool_cache, ToolResultCache)
+
+
+if __name__ == "__main__":
+    unittest.main()
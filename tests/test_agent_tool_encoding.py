@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Tests for compact tool-result encoding used by the agent runner."""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import litellm  # noqa: F401
+except ModuleNotFoundError:
+    sys.modules["litellm"] = MagicMock()
+
+from src.agent.llm_adapter import LLMResponse, ToolCall
+from src.agent.runner import run_agent_loop, serialize_tool_result
+from src.agent.tool_encoding import encode_tool_result, tool_encoding_report
+from src.agent.tools.registry import ToolDefinition, ToolParameter, ToolRegistry
+
+
+def _daily_history(days=60):
+    return {
+        "code": "600519",
+        "source": "db_cache",
+        "cache_hit": True,
+        "requested_days": days,
+        "effective_days": days,
+        "actual_records": days,
+        "partial_cache": False,
+        "total_records": days,
+        "data": [
+            {
+                "code": "600519", "date": f"2025-01-{i % 28 + 1:02d}", "open": 1700.123456 + i,
+                "high": 1710.5 + i, "low": 1690.25 + i, "close": 1705.987654 + i,
+                "volume": 12345.0 + i, "amount": 2.1e9, "pct_chg": 0.123456,
+                "ma5": None, "ma10": 1701.0, "ma20": 1699.5, "volume_ratio": 1.05,
+                "data_source": "AkshareFetcher",
+            }
+            for i in range(days)
+        ],
+    }
+
+
+class EncodeToolResultTestCase(unittest.TestCase):
+
+    def test_daily_history_becomes_compact_table(self):
+        result = _daily_history()
+
+        encoded = encode_tool_result("get_daily_history", result)
+        payload = json.loads(encoded)
+
+        table = payload["data"]
+        self.assertEqual(table["columns"][0], "date")
+        self.assertNotIn("code", table["columns"])
+        self.assertNotIn("data_source", table["columns"])
+        self.assertNotIn("ma5", table["columns"])
+        self.assertEqual(table["const"]["amount"], 2100000000)
+        self.assertEqual(len(table["rows"]), 60)
+        self.assertEqual(table["rows"][0][table["columns"].index("close")], 1705.99)
+        self.assertNotIn("total_records", payload)
+        self.assertLess(len(encoded), len(serialize_tool_result(result)) / 2)
+
+    def test_size_cap_keeps_newest_rows_and_summarizes_the_rest(self):
+        encoded = encode_tool_result("get_daily_history", _daily_history(120), max_chars=2000)
+        payload = json.loads(encoded)
+
+        self.assertLessEqual(len(encoded), 2000)
+        table = payload["data"]
+        close_index = table["columns"].index("close")
+        self.assertEqual(table["rows"][-1][close_index], round(1705.987654 + 119, 2))
+        self.assertEqual(table["omitted"]["count"] + len(table["rows"]), 120)
+        self.assertIn("min", table["omitted"]["high"])
+
+    def test_flat_dicts_keep_their_keys(self):
+        encoded = encode_tool_result("get_realtime_quote", {"code": "600519", "price": 9.9, "pe_ratio": None})
+        self.assertEqual(json.loads(encoded), {"code": "600519", "price": 9.9})
+
+    def test_oversized_non_table_result_is_clipped_with_note(self):
+        encoded = encode_tool_result("search_stock_news", {"text": "x" * 5000}, max_chars=500)
+        payload = json.loads(encoded)
+        self.assertTrue(payload["truncated"])
+        self.assertGreater(payload["original_chars"], 5000)
+
+    def test_clipped_note_stays_within_cap_for_escape_heavy_text(self):
+        encoded = encode_tool_result("search_stock_news", {"text": '"新闻"\\' * 2000}, max_chars=1000)
+        payload = json.loads(encoded)
+        self.assertLessEqual(len(encoded), 1000)
+        self.assertTrue(payload["truncated"])
+        self.assertTrue(payload["partial"])
+
+
+class RunnerEncodingTestCase(unittest.TestCase):
+
+    def test_runner_sends_encoded_results_and_reports_sizes(self):
+        registry = ToolRegistry()
+        registry.register(ToolDefinition(
+            name="get_daily_history",
+            description="history",
+            parameters=[ToolParameter(name="stock_code", type="string", description="code")],
+            handler=lambda stock_code: _daily_history(),
+        ))
+        adapter = MagicMock()
+        adapter.call_with_tools.side_effect = [
+            LLMResponse(
+                content="",
+                tool_calls=[ToolCall(id="c1", name="get_daily_history", arguments={"stock_code": "600519"})],
+                usage={"total_tokens": 10},
+                provider="openai",
+            ),
+            LLMResponse(content="done", tool_calls=[], usage={"total_tokens": 10}, provider="openai"),
+        ]
+
+        with patch("src.agent.runner.resolve_tool_result_max_chars", return_value=8000):
+            result = run_agent_loop(
+                messages=[{"role": "user", "content": "go"}],
+                tool_registry=registry,
+                llm_adapter=adapter,
+            )
+
+        tool_msg = [m for m in result.messages if m["role"] == "tool"][0]
+        self.assertIn("columns", json.loads(tool_msg["content"])["data"])
+        entry = result.tool_calls_log[0]
+        self.assertGreater(entry["raw_length"], entry["result_length"])
+        self.assertGreater(entry["result_tokens"], 0)
+        report = tool_encoding_report(result.tool_calls_log)
+        self.assertEqual(report["tool_results"], 1)
+        self.assertGreater(report["saved_ratio"], 0.5)
+
+    def test_disabled_encoding_keeps_plain_json(self):
+        registry = ToolRegistry()
+        registry.register(ToolDefinition(
+            name="get_daily_history",
+            description="history",
+            parameters=[ToolParameter(name="stock_code", type="string", description="code")],
+            handler=lambda stock_code: _daily_history(3),
+        ))
+        adapter = MagicMock()
+        adapter.call_with_tools.side_effect = [
+            LLMResponse(
+                content="",
+                tool_calls=[ToolCall(id="c1", name="get_daily_history", arguments={"stock_code": "600519"})],
+                usage={},
+                provider="openai",
+            ),
+            LLMResponse(content="done", tool_calls=[], usage={}, provider="openai"),
+        ]
+
+        with patch("src.agent.runner.resolve_tool_result_max_chars", return_value=None):
+            result = run_agent_loop(
+                messages=[{"role": "user", "content": "go"}],
+                tool_registry=registry,
+                llm_adapter=adapter,
+            )
+
+        tool_msg = [m for m in result.messages if m["role"] == "tool"][0]
+        self.assertEqual(tool_msg["content"], serialize_tool_result(_daily_history(3)))
+        self.assertNotIn("raw_length", result.tool_calls_log[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""Tests for the shared agent tool execution pool."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.agent.runner import _execute_tools, resolve_tool_timeout_seconds
+from src.agent.tool_pool import ToolExecutionPool
+from src.agent.tools.registry import ToolDefinition, ToolRegistry
+from tests.polling import wait_for
+
+
+class _FakeToolCall:
+    def __init__(self, name: str, call_id: str):
+        self.name = name
+        self.arguments = {}
+        self.id = call_id
+
+
+class ToolExecutionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def _tracked(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.gate.wait(2)
+        with self.lock:
+            self.active -= 1
+        return threading.current_thread().name
+
+    def test_session_limit_caps_concurrency(self):
+        pool = ToolExecutionPool(max_workers=8, max_per_session=2)
+        try:
+            session = pool.session()
+            futures = [session.submit(self._tracked) for _ in range(5)]
+            wait_for(lambda: pool.stats()["running"] == 2)
+            self.assertEqual(pool.stats()["session_waiting"], 3)
+
+            self.gate.set()
+            for future in futures:
+                future.result(2)
+            self.assertEqual(self.peak, 2)
+            self.assertEqual(pool.stats()["completed"], 5)
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_sessions_share_bounded_workers_and_report_saturation(self):
+        pool = ToolExecutionPool(max_workers=2, max_per_session=2)
+        try:
+            futures = [pool.session().submit(self._tracked) for _ in range(3)]
+            wait_for(lambda: pool.stats()["running"] == 2)
+            stats = pool.stats()
+            self.assertEqual((stats["queued"], stats["saturated"], stats["utilization"]), (1, 1, 1.0))
+
+            self.gate.set()
+            names = {future.result(2) for future in futures}
+            self.assertLessEqual(len(names), 2)
+            self.assertEqual(self.peak, 2)
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_abandon_cancels_waiting_calls(self):
+        pool = ToolExecutionPool(max_workers=4, max_per_session=1)
+        ran = []
+        try:
+            session = pool.session()
+            running = session.submit(self._tracked)
+            waiting = session.submit(lambda: ran.append(1))
+            wait_for(lambda: pool.stats()["running"] == 1)
+
+            session.abandon([running, waiting])
+            self.gate.set()
+            running.result(2)
+
+            self.assertTrue(waiting.cancelled())
+            stats = pool.stats()
+            self.assertEqual((stats["cancelled"], stats["timed_out"], stats["session_waiting"]), (1, 1, 0))
+            self.assertEqual(ran, [])
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_abandoned_running_call_releases_its_session_slot(self):
+        pool = ToolExecutionPool(max_workers=4, max_per_session=1)
+        try:
+            session = pool.session()
+            hung = session.submit(self._tracked)
+            wait_for(lambda: pool.stats()["running"] == 1)
+
+            session.abandon([hung])
+            self.assertEqual(session.submit(lambda: "next").result(1), "next")
+
+            self.gate.set()
+            hung.result(2)
+            stats = pool.stats()
+            self.assertEqual((stats["completed"], stats["timed_out"]), (1, 1))
+        finally:
+            pool.shutdown(wait=True)
+
+
+class ExecuteToolsOnPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.registry = ToolRegistry()
+        self.registry.register(ToolDefinition(
+            name="fast", description="fast", parameters=[], handler=lambda: {"ok": True},
+        ))
+        self.registry.register(ToolDefinition(
+            name="slow", description="slow", parameters=[], handler=lambda: self.gate.wait(2) and {"ok": True},
+        ))
+        self.pool = ToolExecutionPool(max_workers=4, max_per_session=2)
+
+    def tearDown(self):
+        self.gate.set()
+        self.pool.shutdown(wait=True)
+
+    def test_batch_runs_on_session_and_reports_timeouts(self):
+        calls = [_FakeToolCall("fast", "c1"), _FakeToolCall("slow", "c2")]
+        log = []
+
+        results = _execute_tools(
+            calls, self.registry, 1, None, log,
+            tool_wait_timeout_seconds=0.2,
+            tool_session=self.pool.session(),
+        )
+
+        by_id = {item["tc"].id: json.loads(item["result_str"]) for item in results}
+        self.assertTrue(by_id["c1"]["ok"])
+        self.assertTrue(by_id["c2"]["timeout"])
+        self.assertEqual(self.pool.stats()["timed_out"], 1)
+        self.assertEqual([entry.get("timeout", False) for entry in log], [False, True])
+
+    def test_per_call_timeout_excludes_time_queued_behind_session_limit(self):
+        self.registry.register(ToolDefinition(
+            name="steady", description="steady", parameters=[], handler=lambda: time.sleep(0.2) or {"ok": True},
+        ))
+        pool = ToolExecutionPool(max_workers=8, max_per_session=5)
+        calls = [_FakeToolCall("steady", f"c{i}") for i in range(8)]
+        log = []
+        try:
+            results = _execute_tools(
+                calls, self.registry, 1, None, log,
+                tool_session=pool.session(),
+                per_call_timeout_seconds=0.35,
+            )
+        finally:
+            pool.shutdown(wait=True)
+
+        # Calls 6-8 start only after the first five finish, past 0.35s overall
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(json.loads(item["result_str"])["ok"] for item in results))
+        self.assertFalse(any(entry.get("timeout") for entry in log))
+
+    def test_per_call_timeout_abandons_only_the_hung_call(self):
+        pool = ToolExecutionPool(max_workers=4, max_per_session=1)
+        calls = [_FakeToolCall("slow", "c1"), _FakeToolCall("fast", "c2")]
+        try:
+            results = _execute_tools(
+                calls, self.registry, 1, None, [],
+                tool_session=pool.session(),
+                per_call_timeout_seconds=0.2,
+            )
+        finally:
+            self.gate.set()
+            pool.shutdown(wait=True)
+
+        by_id = {item["tc"].id: json.loads(item["result_str"]) for item in results}
+        self.assertTrue(by_id["c1"]["timeout"])
+        self.assertTrue(by_id["c2"]["ok"])
+
+    def test_resolves_per_tool_timeout_from_config(self):
+        with patch("src.config.get_config", return_value=SimpleNamespace(agent_tool_timeout_seconds=15)):
+            self.assertEqual(resolve_tool_timeout_seconds(), 15.0)
+        with patch("src.config.get_config", return_value=SimpleNamespace(agent_tool_timeout_seconds=0)):
+            self.assertIsNone(resolve_tool_timeout_seconds())
+
+
+if __name__ == "__main__":
+    unittest.main()
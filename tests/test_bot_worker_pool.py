@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""Tests for the bounded, per-user fair bot worker pool."""
+
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from bot.models import BotMessage, BotResponse, ChatType, WebhookResponse
+from bot.worker_pool import (
+    BUSY_TEXT,
+    QUEUED_TEXT,
+    Admission,
+    BotWorkerPool,
+    conversation_key,
+    submit_message,
+)
+from tests.polling import wait_for
+
+
+def _make_message(message_id: str, user_id: str = "u1", chat_type: ChatType = ChatType.GROUP) -> BotMessage:
+    return BotMessage(
+        platform="discord",
+        message_id=message_id,
+        user_id=user_id,
+        user_name=user_id,
+        chat_id="c1",
+        chat_type=chat_type,
+        content="/analyze 600519",
+        raw_content="/analyze 600519",
+        mentioned=True,
+        timestamp=datetime.now(),
+    )
+
+
+class BotWorkerPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.order = []
+        self.gate = threading.Event()
+
+    def _job(self, label, block=False):
+        def _run():
+            if block:
+                self.gate.wait(2)
+            self.order.append(label)
+        return _run
+
+    def test_users_take_turns_and_each_user_stays_fifo(self):
+        pool = BotWorkerPool(max_workers=1)
+        try:
+            self.assertEqual(pool.submit("a", self._job("a1", block=True)), Admission.STARTED)
+            self.assertEqual(pool.submit("a", self._job("a2")), Admission.FOLLOWS)
+            self.assertEqual(pool.submit("a", self._job("a3")), Admission.FOLLOWS)
+            self.assertEqual(pool.submit("b", self._job("b1")), Admission.QUEUED)
+
+            self.gate.set()
+            wait_for(lambda: len(self.order) == 4)
+
+            # b1 runs as soon as a1 frees the worker, ahead of a's backlog
+            self.assertEqual(self.order, ["a1", "b1", "a2", "a3"])
+            self.assertEqual(pool.stats()["completed"], 4)
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_long_command_does_not_stall_other_users(self):
+        pool = BotWorkerPool(max_workers=2)
+        try:
+            pool.submit("a", self._job("a1", block=True))
+            pool.submit("b", self._job("b1"))
+            wait_for(lambda: "b1" in self.order)
+            self.assertEqual(self.order, ["b1"])
+        finally:
+            self.gate.set()
+            pool.shutdown(wait=True)
+
+    def test_sheds_load_per_user_and_globally(self):
+        pool = BotWorkerPool(max_workers=1, max_pending=2, max_pending_per_user=2)
+        try:
+            pool.submit("a", self._job("a1", block=True))
+            self.assertEqual(pool.submit("a", self._job("a2")), Admission.FOLLOWS)
+            self.assertEqual(pool.submit("a", self._job("a3")), Admission.REJECTED)
+            self.assertEqual(pool.submit("b", self._job("b1")), Admission.QUEUED)
+            self.assertEqual(pool.submit("c", self._job("c1")), Admission.REJECTED)
+
+            self.gate.set()
+            wait_for(lambda: len(self.order) == 3)
+            self.assertEqual(sorted(self.order), ["a1", "a2", "b1"])
+            self.assertEqual(pool.stats()["rejected"], 2)
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_failed_job_does_not_block_the_conversation(self):
+        pool = BotWorkerPool(max_workers=1)
+        try:
+            pool.submit("a", MagicMock(side_effect=RuntimeError("boom")))
+            pool.submit("a", self._job("a2"))
+            wait_for(lambda: self.order == ["a2"])
+            self.assertEqual(self.order, ["a2"])
+            self.assertEqual(pool.stats()["failed"], 1)
+        finally:
+            pool.shutdown(wait=True)
+
+
+class SubmitMessageTestCase(unittest.TestCase):
+    def test_conversation_key_scopes_group_chats_per_user(self):
+        self.assertEqual(conversation_key(_make_message("m1")), "discord:c1:u1")
+        private = _make_message("m1", chat_type=ChatType.PRIVATE)
+        self.assertEqual(conversation_key(private), "discord:c1")
+
+    def test_delivers_result_and_queue_notices(self):
+        pool = BotWorkerPool(max_workers=1, max_pending=2, max_pending_per_user=2)
+        gate = threading.Event()
+        delivered = []
+
+        def handler(message):
+            gate.wait(2)
+            return BotResponse.text_response(f"done {message.message_id}")
+
+        try:
+            submit_message(_make_message("m1"), handler, delivered.append, pool=pool)
+            submit_message(_make_message("m2", user_id="u2"), handler, delivered.append, pool=pool)
+            # Behind the user's own command: no extra notice
+            submit_message(_make_message("m3"), handler, delivered.append, pool=pool)
+            submit_message(_make_message("m4", user_id="u3"), handler, delivered.append, pool=pool)
+            gate.set()
+            wait_for(lambda: len(delivered) == 5)
+
+            texts = [response.text for response in delivered]
+            self.assertEqual(texts[0], QUEUED_TEXT)
+            self.assertIn(BUSY_TEXT, texts[1])
+            self.assertEqual(texts[2:], ["done m1", "done m2", "done m3"])
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_deferred_webhook_is_acknowledged_before_the_command_runs(self):
+        from bot.handler import handle_webhook
+
+        pool = BotWorkerPool(max_workers=1)
+        gate = threading.Event()
+        platform = MagicMock()
+        message = _make_message("m1")
+        ack = WebhookResponse.success({"type": 5})
+        platform.handle_webhook.return_value = (message, ack)
+        dispatcher = MagicMock()
+        dispatcher.dispatch.side_effect = lambda _msg: gate.wait(2) and BotResponse.text_response("result")
+
+        try:
+            with patch("src.config.get_config", return_value=MagicMock(bot_enabled=True)), \
+                    patch("bot.handler.get_platform", return_value=platform), \
+                    patch("bot.handler.get_dispatcher", return_value=dispatcher), \
+                    patch("bot.worker_pool.get_bot_worker_pool", return_value=pool):
+                self.assertIs(handle_webhook("discord", {}, b"{}"), ack)
+                platform.send_followup.assert_not_called()
+                gate.set()
+                wait_for(lambda: platform.send_followup.called)
+
+            response, followup_message = platform.send_followup.call_args[0]
+            self.assertEqual((response.text, followup_message), ("result", message))
+        finally:
+            pool.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Tests for the scheduled pre-run cache warm-up."""
+
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from src.core.cache_warmup import warm_up_caches
+from src.storage import DatabaseManager
+
+
+def _bars(last_day: date) -> pd.DataFrame:
+    dates = pd.bdate_range(end=pd.Timestamp(last_day), periods=3)
+    return pd.DataFrame({
+        "date": [d.date() for d in dates],
+        "open": 10.0, "high": 10.5, "low": 9.5, "close": 10.0,
+        "volume": 1000.0, "amount": 10000.0, "pct_chg": 0.0,
+    })
+
+
+class WarmUpCachesTestCase(unittest.TestCase):
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+        # Friday 2026-07-03 after the A-share close
+        self.now = datetime(2026, 7, 3, 15, 40, tzinfo=ZoneInfo("Asia/Shanghai"))
+        self.config = SimpleNamespace(
+            enable_fundamental_pipeline=True,
+            fundamental_cache_ttl_seconds=900,
+            fundamental_stage_timeout_seconds=2.5,
+        )
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def test_fills_missing_bars_and_fundamentals(self):
+        self.db.save_daily_data(_bars(date(2026, 7, 3)), "600519", "test")
+        manager = MagicMock()
+        manager.prefetch_realtime_quotes.return_value = 2
+        manager.get_daily_data.return_value = (_bars(date(2026, 7, 3)), "efinance")
+        manager.get_fundamental_context.side_effect = [{}, RuntimeError("timeout")]
+
+        with patch("src.core.cache_warmup.get_effective_trading_date", return_value=date(2026, 7, 3)):
+            stats = warm_up_caches(self.config, ["600519", "000001"], manager, current_time=self.now)
+
+        # Only the stock without today's bar hits the data source
+        manager.get_daily_data.assert_called_once_with("000001", days=30)
+        self.assertTrue(self.db.has_today_data("000001", date(2026, 7, 3)))
+        manager.get_fundamental_context.assert_any_call("600519", budget_seconds=2.5)
+        self.assertEqual(
+            stats,
+            {"stocks": 2, "realtime": 2, "bars": 1, "fundamentals": 1, "errors": 1},
+        )
+
+    def test_skips_fundamentals_when_cache_disabled(self):
+        self.config.fundamental_cache_ttl_seconds = 0
+        manager = MagicMock()
+        manager.get_daily_data.return_value = (None, "")
+
+        with patch("src.core.cache_warmup.get_effective_trading_date", return_value=date(2026, 7, 3)):
+            stats = warm_up_caches(self.config, ["600519"], manager, current_time=self.now)
+
+        manager.get_fundamental_context.assert_not_called()
+        self.assertEqual((stats["bars"], stats["fundamentals"]), (0, 0))
+        self.assertEqual(warm_up_caches(self.config, [], manager)["stocks"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Tests for token-budgeted Agent chat history compaction."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agent.conversation import ConversationHistoryManager, estimate_tokens
+from src.storage import DatabaseManager
+
+
+class ConversationHistoryManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def _add_turns(self, session_id, count, start=0, answer="answer"):
+        for i in range(start, start + count):
+            self.db.save_conversation_message(session_id, "user", f"question {i}")
+            self.db.save_conversation_message(session_id, "assistant", f"{answer} {i}")
+
+    def test_short_session_is_returned_verbatim(self):
+        self._add_turns("s1", 2)
+        manager = ConversationHistoryManager(keep_turns=3, token_budget=1000, db=self.db)
+
+        history = manager.build("s1")
+
+        self.assertEqual(
+            [m["content"] for m in history],
+            ["question 0", "answer 0", "question 1", "answer 1"],
+        )
+        self.assertIsNone(self.db.get_conversation_summary("s1"))
+
+    def test_older_turns_are_rolled_into_persisted_summary(self):
+        self._add_turns("s1", 5)
+        manager = ConversationHistoryManager(keep_turns=2, token_budget=1000, db=self.db)
+
+        history = manager.build("s1")
+
+        self.assertIn("question 0", history[0]["content"])
+        self.assertIn("question 2", history[0]["content"])
+        self.assertEqual(history[1]["role"], "assistant")
+        self.assertEqual(
+            [m["content"] for m in history[2:]],
+            ["question 3", "answer 3", "question 4", "answer 4"],
+        )
+        stored = self.db.get_conversation_summary("s1")
+        self.assertIn("answer 2", stored["summary"])
+
+        # The next pass only folds in the turn that just left the window
+        self._add_turns("s1", 1, start=5)
+        history = manager.build("s1")
+        self.assertIn("question 3", history[0]["content"])
+        self.assertEqual(history[0]["content"].count("question 0"), 1)
+        self.assertEqual(history[-1]["content"], "answer 5")
+
+    def test_token_budget_drops_oldest_recent_messages(self):
+        self._add_turns("s1", 3, answer="长" * 300)
+        manager = ConversationHistoryManager(keep_turns=3, token_budget=800, db=self.db)
+
+        history = manager.build("s1")
+
+        total = sum(estimate_tokens(m["content"]) for m in history)
+        self.assertLessEqual(total, 800)
+        self.assertEqual(history[-1]["content"], "长" * 300 + " 2")
+        self.assertNotIn("question 0", [m["content"] for m in history])
+
+    def test_single_oversized_message_is_clipped(self):
+        self.db.save_conversation_message("s1", "assistant", "x" * 20000)
+        manager = ConversationHistoryManager(keep_turns=1, token_budget=1000, db=self.db)
+
+        history = manager.build("s1")
+
+        self.assertEqual(len(history), 1)
+        self.assertLessEqual(estimate_tokens(history[0]["content"]), 750)
+
+    def test_deleting_session_removes_summary(self):
+        self._add_turns("s1", 4)
+        ConversationHistoryManager(keep_turns=1, token_budget=1000, db=self.db).build("s1")
+        self.assertIsNotNone(self.db.get_conversation_summary("s1"))
+
+        self.db.delete_conversation_session("s1")
+
+        self.assertIsNone(self.db.get_conversation_summary("s1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
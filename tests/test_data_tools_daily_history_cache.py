@@ -90,7 +90,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
         manager = SimpleNamespace(get_daily_data=MagicMock())
 
         with patch("src.storage.get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=60)
 
         self.assertEqual(result["source"], "db_cache")
@@ -113,7 +113,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
         manager = SimpleNamespace(get_daily_data=MagicMock())
 
         with patch("src.storage.get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "1810.HK", days=60)
 
         self.assertEqual(result["code"], "1810.HK")
@@ -131,7 +131,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
         manager = SimpleNamespace(get_daily_data=MagicMock())
 
         with patch("src.storage.get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "1810.HK", days=60)
 
         self.assertEqual(result["code"], "HK01810")
@@ -150,7 +150,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
 
         with patch("src.storage.get_db", return_value=db), \
              patch("src.agent.tools.data_tools._get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=60)
 
         manager.get_daily_data.assert_called_once_with("600519", days=60)
@@ -170,7 +170,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
 
         with patch("src.storage.get_db", return_value=db), \
              patch("src.agent.tools.data_tools._get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=60)
 
         self.assertEqual(result["total_records"], 1)
@@ -188,7 +188,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
 
         with patch("src.storage.get_db", return_value=broken_db), \
              patch("src.agent.tools.data_tools._get_db", return_value=broken_db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=60)
 
         manager.get_daily_data.assert_called_once_with("600519", days=60)
@@ -201,7 +201,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
         manager = SimpleNamespace(get_daily_data=MagicMock())
 
         with patch("src.storage.get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=1)
 
         self.assertTrue(result["cache_hit"])
@@ -217,7 +217,7 @@ class DailyHistoryCacheToolTest(unittest.TestCase):
 
         with patch("src.storage.get_db", return_value=db), \
              patch("src.agent.tools.data_tools._get_db", return_value=db), \
-             patch("src.services.history_loader._get_fetcher_manager", return_value=manager):
+             patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
             result = self._run_with_frozen_date(target, "600519", days=999)
 
         manager.get_daily_data.assert_called_once_with("600519", days=365)
@@ -7,7 +7,7 @@ import os
 import sys
 import time
 import unittest
-from threading import BoundedSemaphore, Event
+from threading import Event
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -16,6 +16,7 @@ import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from data_provider.base import DataFetcherManager
+from data_provider.timeout_executor import TimeoutExecutor
 
 
 class _DummyFetcher:
@@ -292,7 +293,7 @@ class TestFundamentalContext(unittest.TestCase):
 
     def test_run_with_timeout_limits_hanging_workers(self) -> None:
         manager = DataFetcherManager(fetchers=[])
-        manager._fundamental_timeout_slots = BoundedSemaphore(1)
+        manager._timeout_executor = TimeoutExecutor(max_workers=1, max_queue=0)
 
         unblock = Event()
 
@@ -310,7 +311,7 @@ class TestFundamentalContext(unittest.TestCase):
             self.assertIn("worker pool exhausted", err2 or "")
         finally:
             unblock.set()
-            time.sleep(0.02)
+            manager._timeout_executor.shutdown(wait=True)
 
     def test_infer_block_status_treats_all_null_payload_as_non_ok(self) -> None:
         self.assertEqual(
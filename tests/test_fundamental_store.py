@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Tests for the persistent fundamental dataset store."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from data_provider.fundamental_adapter import AkshareFundamentalAdapter
+from data_provider.fundamental_store import FundamentalStore, report_period
+from src.storage import DatabaseManager
+
+
+def _forecast_table() -> pd.DataFrame:
+    return pd.DataFrame({
+        "股票代码": ["600519", "000001", "600519"],
+        "预告类型": ["预增", "预减", "略增"],
+        "公告日期": pd.to_datetime(["2026-07-10", "2026-07-11", "2026-04-01"]),
+    })
+
+
+class FundamentalStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+        self.store = FundamentalStore(ttl_seconds=3600, db=self.db)
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def test_report_period_is_latest_quarter_end(self):
+        self.assertEqual(report_period(date(2026, 10, 19)), "2026-09-30")
+        self.assertEqual(report_period(date(2026, 9, 30)), "2026-09-30")
+        self.assertEqual(report_period(date(2026, 2, 1)), "2025-12-31")
+
+    def test_market_wide_table_is_downloaded_once_and_indexed_by_code(self):
+        loader = MagicMock(return_value=_forecast_table())
+
+        first = self.store.get_or_fetch("stock_yjyg_em", {}, "600519", loader)
+        other = self.store.get_or_fetch("stock_yjyg_em", {}, "000001", loader)
+        missing = self.store.get_or_fetch("stock_yjyg_em", {}, "300750", loader)
+        # A new process: fresh store instance, same database
+        reloaded = FundamentalStore(ttl_seconds=3600, db=self.db).get_or_fetch(
+            "stock_yjyg_em", {}, "600519", None
+        )
+
+        loader.assert_called_once_with()
+        self.assertEqual(first["预告类型"].tolist(), ["预增", "略增"])
+        self.assertEqual(other["股票代码"].tolist(), ["000001"])
+        self.assertTrue(missing.empty)
+        self.assertEqual(list(missing.columns), ["股票代码", "预告类型", "公告日期"])
+        self.assertEqual(reloaded.to_dict("records"), first.to_dict("records"))
+        self.assertTrue(str(first["公告日期"].iloc[0]).startswith("2026-07-10"))
+
+    def test_stale_entries_are_downloaded_again(self):
+        loader = MagicMock(return_value=_forecast_table())
+        self.store.get_or_fetch("stock_yjyg_em", {}, "600519", loader)
+
+        later = datetime.now() + timedelta(hours=2)
+        with patch("data_provider.fundamental_store.datetime") as fake_datetime:
+            fake_datetime.now.return_value = later
+            self.store.get_or_fetch("stock_yjyg_em", {}, "600519", loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_per_stock_results_are_stored_under_their_code(self):
+        loader = MagicMock(return_value=pd.DataFrame({"报告期": ["2026-06-30"], "ROE": [18.0]}))
+
+        self.store.get_or_fetch("stock_financial_abstract", {"symbol": "600519"}, "600519", loader)
+        cached = self.store.get_or_fetch("stock_financial_abstract", {"symbol": "600519"}, "600519", None)
+        other = self.store.get_or_fetch("stock_financial_abstract", {"symbol": "000001"}, "000001", None)
+
+        loader.assert_called_once_with()
+        self.assertEqual(cached["ROE"].tolist(), [18.0])
+        self.assertIsNone(other)
+
+    def test_empty_per_stock_results_are_not_stored(self):
+        loader = MagicMock(side_effect=[
+            pd.DataFrame(columns=["报告期", "ROE"]),
+            pd.DataFrame({"报告期": ["2026-06-30"], "ROE": [18.0]}),
+        ])
+
+        empty = self.store.get_or_fetch("stock_financial_abstract", {"symbol": "600519"}, "600519", loader)
+        retried = self.store.get_or_fetch("stock_financial_abstract", {"symbol": "600519"}, "600519", loader)
+
+        self.assertTrue(empty.empty)
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(retried["ROE"].tolist(), [18.0])
+
+    def test_concurrent_callers_share_one_download(self):
+        # File database: in-memory SQLite is private to each thread
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url=f"sqlite:///{os.path.join(temp_dir.name, 'store.db')}")
+        self.addCleanup(DatabaseManager.reset_instance)
+        self.store = FundamentalStore(ttl_seconds=3600, db=self.db)
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return _forecast_table()
+
+        results = {}
+        threads = [
+            threading.Thread(
+                target=lambda code=code: results.setdefault(
+                    code, self.store.get_or_fetch("stock_yjkb_em", {}, code, slow_loader)
+                )
+            )
+            for code in ("600519", "000001")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results["000001"]), 1)
+
+    def test_disabled_store_passes_through(self):
+        loader = MagicMock(return_value=_forecast_table())
+        store = FundamentalStore(ttl_seconds=0, db=self.db)
+
+        result = store.get_or_fetch("stock_yjyg_em", {}, "600519", loader)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.db.get_fundamental_dataset("stock_yjyg_em", report_period(), ["*"]), {})
+
+    def test_adapter_reuses_market_wide_table_across_stocks(self):
+        forecast = MagicMock(return_value=_forecast_table())
+
+        def stock_yjyg_em(**kwargs):
+            if kwargs:
+                raise TypeError("market-wide only")
+            return forecast()
+
+        fake_akshare = SimpleNamespace(stock_yjyg_em=stock_yjyg_em)
+        adapter = AkshareFundamentalAdapter(store=self.store)
+        with patch.dict(sys.modules, {"akshare": fake_akshare}):
+            first = adapter.get_fundamental_bundle("600519")
+            second = adapter.get_fundamental_bundle("000001")
+
+        forecast.assert_called_once_with()
+        self.assertEqual(first["earnings"]["forecast_summary"], "预增")
+        self.assertEqual(second["earnings"]["forecast_summary"], "预减")
+        self.assertIn("earnings_forecast:stock_yjyg_em", second["source_chain"])
+
+
+if __name__ == "__main__":
+    unittest.main()
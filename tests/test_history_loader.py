@@ -59,7 +59,7 @@ class HistoryLoaderTestCase(unittest.TestCase):
     # ------------------------------------------------------------------
     # DB miss → DFM fallback
     # ------------------------------------------------------------------
-    @patch("src.services.history_loader._get_fetcher_manager")
+    @patch("src.services.history_loader.get_fetcher_manager")
     @patch("src.storage.get_db")
     def test_falls_back_to_dfm_when_db_empty(self, mock_get_db, mock_get_fm):
         from src.services.history_loader import load_history_df
@@ -136,7 +136,7 @@ class HistoryLoaderTestCase(unittest.TestCase):
     # ------------------------------------------------------------------
     # Both paths fail gracefully
     # ------------------------------------------------------------------
-    @patch("src.services.history_loader._get_fetcher_manager")
+    @patch("src.services.history_loader.get_fetcher_manager")
     @patch("src.storage.get_db")
     def test_graceful_when_both_fail(self, mock_get_db, mock_get_fm):
         from src.services.history_loader import load_history_df
@@ -155,5 +155,95 @@ class HistoryLoaderTestCase(unittest.TestCase):
         self.assertEqual(source, "none")
 
 
+def _daily_frame(start: str, periods: int, base: float = 10.0) -> pd.DataFrame:
+    dates = pd.bdate_range(start, periods=periods)
+    closes = [base + 0.1 * i for i in range(periods)]
+    return pd.DataFrame({
+        "date": [d.date() for d in dates],
+        "open": closes,
+        "high": [c + 0.2 for c in closes],
+        "low": [c - 0.2 for c in closes],
+        "close": closes,
+        "volume": 1000.0,
+        "amount": 10000.0,
+        "pct_chg": 1.0,
+    })
+
+
+class LoadHistoryBarsTestCase(unittest.TestCase):
+    """Tests for the DB-first chart loader against a real in-memory store."""
+
+    def setUp(self):
+        from src.services.history_loader import reset_tail_refresh_throttle
+        from src.storage import DatabaseManager
+
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+        reset_tail_refresh_throttle()
+        self.stored = _daily_frame("2026-03-02", 40)
+        self.db.save_daily_data(self.stored, "600519", "seed")
+        self.latest = self.stored["date"].iloc[-1]
+
+    def tearDown(self):
+        from src.storage import DatabaseManager
+
+        DatabaseManager.reset_instance()
+
+    def _load(self, expected_latest, days=30):
+        from src.services.history_loader import load_history_bars
+
+        with patch(
+            "src.services.history_loader._expected_latest_session",
+            return_value=expected_latest,
+        ):
+            return load_history_bars("600519", days=days)
+
+    @patch("src.services.history_loader.get_fetcher_manager")
+    def test_up_to_date_store_skips_upstream(self, mock_get_fm):
+        df, source, last_modified = self._load(self.latest)
+
+        self.assertEqual(source, "db_cache")
+        self.assertEqual(len(df), 30)
+        self.assertEqual(df["date"].iloc[-1], self.latest)
+        self.assertIsNotNone(last_modified)
+        mock_get_fm.assert_not_called()
+
+    @patch("src.services.history_loader.get_fetcher_manager")
+    def test_stale_store_fetches_and_persists_only_the_tail(self, mock_get_fm):
+        tail = _daily_frame(str(self.latest + pd.Timedelta(days=1)), 2, base=20.0)
+        mock_fm = MagicMock()
+        mock_fm.get_daily_data.return_value = (tail, "eastmoney")
+        mock_get_fm.return_value = mock_fm
+        expected = tail["date"].iloc[-1]
+
+        df, source, _ = self._load(expected)
+
+        _code, kwargs = mock_fm.get_daily_data.call_args
+        self.assertEqual(kwargs["start_date"], (self.latest + pd.Timedelta(days=1)).isoformat())
+        self.assertEqual(kwargs["end_date"], expected.isoformat())
+        self.assertEqual(source, "db_cache+eastmoney")
+        self.assertEqual(len(df), 30)
+        self.assertEqual(df["date"].iloc[-1], expected)
+        # Persisted: the next load is a pure DB hit
+        mock_fm.reset_mock()
+        self.assertEqual(self._load(expected).source, "db_cache")
+        mock_fm.get_daily_data.assert_not_called()
+
+    @patch("src.services.history_loader.get_fetcher_manager")
+    def test_refresh_is_throttled_and_failures_serve_stored_bars(self, mock_get_fm):
+        mock_fm = MagicMock()
+        mock_fm.get_daily_data.side_effect = Exception("API down")
+        mock_get_fm.return_value = mock_fm
+        # A session the store never receives (e.g. suspended stock)
+        expected = self.latest + pd.Timedelta(days=7)
+
+        first = self._load(expected)
+        second = self._load(expected)
+
+        self.assertEqual((first.source, second.source), ("db_cache", "db_cache"))
+        self.assertEqual(len(second.df), 30)
+        self.assertEqual(mock_fm.get_daily_data.call_count, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Tests for latency-aware LLM fallback ordering."""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import litellm  # noqa: F401
+except ModuleNotFoundError:
+    sys.modules["litellm"] = MagicMock()
+
+from src.llm_routing import LLMChannelRouter, get_llm_router, reset_llm_router
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+def _routing_config(**overrides):
+    values = dict(
+        litellm_model="openai/primary",
+        litellm_fallback_models=["anthropic/fallback"],
+        agent_litellm_model="",
+        llm_model_list=[],
+        llm_temperature=0.7,
+        gemini_api_keys=[],
+        anthropic_api_keys=[],
+        openai_api_keys=[],
+        deepseek_api_keys=[],
+        openai_base_url=None,
+        llm_adaptive_routing=True,
+        llm_breaker_failure_threshold=2,
+        llm_breaker_cooldown_seconds=60.0,
+        llm_health_probe_interval=0.0,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class LLMChannelRouterTestCase(unittest.TestCase):
+    def test_repeated_failures_park_model_last(self):
+        router = LLMChannelRouter(failure_threshold=2, cooldown_seconds=60)
+        models = ["a", "b", "c"]
+        router.record_failure("a", RuntimeError("timeout"), latency=30.0)
+        self.assertEqual(router.order(models), models)
+
+        router.record_failure("a", RuntimeError("timeout"), latency=30.0)
+
+        self.assertEqual(router.order(models), ["b", "c", "a"])
+        self.assertEqual(router.snapshot()["a"]["breaker"], "open")
+
+    def test_rate_limit_demotes_immediately_until_success(self):
+        router = LLMChannelRouter(failure_threshold=5)
+        router.record_failure("a", _RateLimitError("429 too many requests"))
+
+        self.assertEqual(router.order(["a", "b"]), ["b", "a"])
+        self.assertEqual(router.snapshot()["a"]["rate_limits"], 1)
+
+        router.record_success("a", 1.0)
+        self.assertEqual(router.order(["a", "b"]), ["a", "b"])
+
+    def test_slow_model_is_demoted_behind_faster_one(self):
+        router = LLMChannelRouter()
+        for _ in range(3):
+            router.record_success("slow", 40.0)
+            router.record_success("fast", 2.0)
+
+        self.assertEqual(router.order(["slow", "fast"]), ["fast", "slow"])
+
+    def test_cooled_down_model_is_restored_by_probe(self):
+        router = LLMChannelRouter(failure_threshold=1, cooldown_seconds=60)
+        probe = MagicMock()
+        router.set_probe(probe)
+        router.record_failure("a", RuntimeError("boom"))
+        self.assertEqual(router.probe_parked(), {})
+
+        router._breaker._states["a"]["last_failure_time"] -= 61
+        self.assertEqual(router.probe_parked(), {"a": True})
+
+        probe.assert_called_once_with("a")
+        self.assertEqual(router.order(["a", "b"]), ["a", "b"])
+
+    def test_ordering_leaves_the_half_open_slot_to_the_probe(self):
+        router = LLMChannelRouter(failure_threshold=1, cooldown_seconds=60)
+        router.record_failure("a", RuntimeError("boom"))
+        router._breaker._states["a"]["last_failure_time"] -= 61
+
+        for _ in range(3):
+            router.order(["a", "b"])
+        self.assertEqual(router.snapshot()["a"]["breaker"], "open")
+
+        probe = MagicMock()
+        router.set_probe(MagicMock())
+        router.set_probe(probe)
+        self.assertEqual(router.probe_parked(), {"a": True})
+        probe.assert_called_once_with("a")
+
+    def test_attempting_a_recovering_model_claims_its_probe_slot(self):
+        router = LLMChannelRouter(failure_threshold=1, cooldown_seconds=60)
+        router.record_failure("a", RuntimeError("boom"))
+        router._breaker._states["a"]["last_failure_time"] -= 61
+        probe = MagicMock()
+        router.set_probe(probe)
+
+        router.begin_attempt("a")
+
+        self.assertEqual(router.snapshot()["a"]["breaker"], "half_open")
+        self.assertEqual(router.probe_parked(), {})
+        probe.assert_not_called()
+
+    def test_background_probing_sorts_recovering_models_after_degraded(self):
+        router = LLMChannelRouter(failure_threshold=3, cooldown_seconds=60, probe_interval=3600)
+        for _ in range(3):
+            router.record_failure("a", RuntimeError("boom"))
+        router._breaker._states["a"]["last_failure_time"] -= 61
+        router.record_failure("b", _RateLimitError("429"))
+        router.set_probe(MagicMock())
+
+        self.assertEqual(router.order(["a", "b", "c"]), ["c", "b", "a"])
+        self.assertEqual(router.snapshot()["a"]["breaker"], "open")
+
+    def test_router_is_disabled_unless_configured(self):
+        reset_llm_router()
+        self.assertIsNone(get_llm_router(_routing_config(llm_adaptive_routing=False)))
+        self.assertIsNone(get_llm_router(MagicMock()))
+        self.assertIs(get_llm_router(_routing_config()), get_llm_router(_routing_config()))
+        reset_llm_router()
+
+
+class CallerIntegrationTestCase(unittest.TestCase):
+    def setUp(self):
+        reset_llm_router()
+
+    def tearDown(self):
+        reset_llm_router()
+
+    def test_analyzer_skips_parked_primary(self):
+        from src.analyzer import GeminiAnalyzer
+
+        analyzer = GeminiAnalyzer.__new__(GeminiAnalyzer)
+        analyzer._router = None
+        analyzer._config_override = _routing_config()
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+            usage=None,
+        )
+        calls = []
+
+        def fake_dispatch(model, call_kwargs, **kwargs):
+            calls.append(model)
+            if model == "openai/primary":
+                raise TimeoutError("primary timed out")
+            return response
+
+        with patch.object(analyzer, "_dispatch_litellm_completion", side_effect=fake_dispatch):
+            for _ in range(3):
+                text, model, _ = analyzer._call_litellm("prompt", {"max_tokens": 16})
+
+        self.assertEqual((text, model), ("ok", "anthropic/fallback"))
+        self.assertEqual(
+            calls,
+            ["openai/primary", "anthropic/fallback"] * 2 + ["anthropic/fallback"],
+        )
+
+    @patch("src.agent.llm_adapter.Router")
+    def test_agent_adapter_skips_parked_primary(self, _mock_router):
+        from src.agent.llm_adapter import LLMResponse, LLMToolAdapter
+
+        adapter = LLMToolAdapter(config=_routing_config())
+        calls = []
+
+        def fake_call(_messages, _tools, model, **_kwargs):
+            calls.append(model)
+            if model == "openai/primary":
+                raise RuntimeError("primary failed")
+            return LLMResponse(content="ok", provider="anthropic")
+
+        adapter._call_litellm_model = MagicMock(side_effect=fake_call)
+        for _ in range(3):
+            result = adapter.call_completion([{"role": "user", "content": "hi"}])
+
+        self.assertEqual(result.content, "ok")
+        self.assertEqual(calls[-1:], ["anthropic/fallback"])
+        self.assertEqual(calls.count("openai/primary"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Tests for the process-wide LLM admission scheduler."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import litellm  # noqa: F401
+except ModuleNotFoundError:
+    sys.modules["litellm"] = MagicMock()
+
+from src.llm_scheduler import (
+    LLMQueueTimeout,
+    LLMScheduler,
+    ProviderBudget,
+    get_llm_scheduler,
+    llm_priority,
+    parse_provider_limits,
+    reset_llm_scheduler,
+)
+
+
+class LLMSchedulerTestCase(unittest.TestCase):
+    def test_parse_provider_limits(self):
+        budgets = parse_provider_limits("gemini:rpm=15,tpm=1000;openai/gpt-5.5:concurrency=2,bogus=1")
+
+        self.assertEqual(budgets["gemini"], ProviderBudget(rpm=15, tpm=1000))
+        self.assertEqual(budgets["openai/gpt-5.5"], ProviderBudget(concurrency=2))
+
+    def test_concurrency_budget_bounds_in_flight_requests(self):
+        scheduler = LLMScheduler({"gemini": ProviderBudget(concurrency=2)})
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def _call():
+            with scheduler.slot("gemini/flash", 10):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=_call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(scheduler.stats()["gemini"]["admitted"], 6)
+
+    def test_rpm_budget_queues_then_times_out(self):
+        scheduler = LLMScheduler({"openai": ProviderBudget(rpm=1)})
+        scheduler.release(scheduler.acquire("openai/gpt", 10))
+
+        with self.assertRaises(LLMQueueTimeout):
+            scheduler.acquire("openai/gpt", 10, timeout=0.05)
+        # Other providers are not affected
+        self.assertIsNone(scheduler.acquire("gemini/flash", 10))
+
+    def test_tpm_window_uses_actual_usage(self):
+        scheduler = LLMScheduler({"gemini": ProviderBudget(tpm=1000)})
+        ticket = scheduler.acquire("gemini/flash", 900)
+        scheduler.release(ticket, actual_tokens=100)
+
+        scheduler.release(scheduler.acquire("gemini/flash", 800, timeout=0.05))
+        self.assertEqual(scheduler.stats()["gemini"]["tokens_last_minute"], 900)
+
+    def test_interactive_requests_are_admitted_before_batch(self):
+        scheduler = LLMScheduler({"gemini": ProviderBudget(concurrency=1)})
+        holder = scheduler.acquire("gemini/flash", 1)
+        order = []
+
+        def _call(priority, label):
+            with llm_priority(priority):
+                with scheduler.slot("gemini/flash", 1):
+                    order.append(label)
+
+        batch = threading.Thread(target=_call, args=("batch", "batch"))
+        batch.start()
+        time.sleep(0.05)
+        chat = threading.Thread(target=_call, args=("interactive", "chat"))
+        chat.start()
+        time.sleep(0.05)
+        scheduler.release(holder)
+        batch.join(2)
+        chat.join(2)
+
+        self.assertEqual(order, ["chat", "batch"])
+
+    def test_scheduler_only_exists_when_budgets_are_configured(self):
+        reset_llm_scheduler()
+        self.assertIsNone(get_llm_scheduler(SimpleNamespace(llm_provider_limits="", llm_default_concurrency=0)))
+        self.assertIsNone(get_llm_scheduler(MagicMock()))
+        config = SimpleNamespace(llm_provider_limits="", llm_default_concurrency=3, llm_scheduler_max_wait=10.0)
+        scheduler = get_llm_scheduler(config)
+        self.assertIs(get_llm_scheduler(config), scheduler)
+        self.assertEqual(scheduler._budgets["*"].concurrency, 3)
+        reset_llm_scheduler()
+
+    def test_default_concurrency_is_one_cap_shared_by_unlisted_providers(self):
+        scheduler = LLMScheduler({"*": ProviderBudget(concurrency=1)}, max_wait=0.05)
+        ticket = scheduler.acquire("gemini/flash", 10)
+        self.assertEqual(ticket.key, "*")
+        with self.assertRaises(LLMQueueTimeout):
+            scheduler.acquire("deepseek/deepseek-chat", 10)
+        scheduler.release(ticket)
+        scheduler.release(scheduler.acquire("deepseek/deepseek-chat", 10))
+
+
+class AdapterSchedulingTestCase(unittest.TestCase):
+    def tearDown(self):
+        reset_llm_scheduler()
+
+    @patch("src.agent.llm_adapter.Router")
+    def test_saturated_budget_falls_back_to_next_model(self, _mock_router):
+        from src.agent.llm_adapter import LLMResponse, LLMToolAdapter
+
+        config = SimpleNamespace(
+            agent_litellm_model="",
+            litellm_model="openai/primary",
+            litellm_fallback_models=["anthropic/fallback"],
+            llm_model_list=[],
+            llm_temperature=0.7,
+            gemini_api_keys=[],
+            anthropic_api_keys=[],
+            openai_api_keys=[],
+            deepseek_api_keys=[],
+            openai_base_url=None,
+            llm_provider_limits="openai:rpm=1",
+            llm_default_concurrency=0,
+            llm_scheduler_max_wait=0.05,
+        )
+        adapter = LLMToolAdapter(config=config)
+        calls = []
+
+        def fake_call(_messages, _tools, model, **_kwargs):
+            calls.append(model)
+            return LLMResponse(content="ok", provider=model.split("/")[0], usage={"total_tokens": 5})
+
+        adapter._call_litellm_model = MagicMock(side_effect=fake_call)
+        adapter.call_completion([{"role": "user", "content": "hi"}])
+        adapter.call_completion([{"role": "user", "content": "hi"}])
+
+        self.assertEqual(calls, ["openai/primary", "anthropic/fallback"])
+        self.assertEqual(get_llm_scheduler(config).stats()["openai"]["timeouts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,11 @@ import sys
 import os
 import unittest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.storage import DatabaseManager, LLMUsage, persist_llm_usage
+from src.storage import DatabaseManager, LLMUsage, LLMUsageDaily, LLMUsageHourly, persist_llm_usage
 
 
 def _fresh_db() -> DatabaseManager:
@@ -196,5 +197,83 @@ class TestPersistUsageHelper(unittest.TestCase):
             self.fail(f"persist_llm_usage raised unexpectedly: {exc}")
 
 
+class TestLLMUsageRollups(unittest.TestCase):
+    def setUp(self):
+        self.db = _fresh_db()
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def _add_raw(self, called_at, call_type="analysis", model="m1", total=10, stock_code=None):
+        with self.db.session_scope() as session:
+            session.add(LLMUsage(
+                call_type=call_type, model=model, stock_code=stock_code,
+                prompt_tokens=total // 2, completion_tokens=total - total // 2,
+                total_tokens=total, called_at=called_at,
+            ))
+
+    def test_record_updates_hourly_and_daily_buckets(self):
+        for _ in range(2):
+            self.db.record_llm_usage("analysis", "m1", 10, 20, 30, stock_code="600519")
+        self.db.record_llm_usage("analysis", "m1", 1, 1, 2)
+
+        with self.db.session_scope() as session:
+            hourly = {r.stock_code: (r.calls, r.total_tokens) for r in session.query(LLMUsageHourly).all()}
+            daily = {r.stock_code: (r.calls, r.total_tokens) for r in session.query(LLMUsageDaily).all()}
+        self.assertEqual(hourly, {"600519": (2, 60), "": (1, 2)})
+        self.assertEqual(daily, hourly)
+
+    def test_backfill_rebuilds_rollups_from_raw_log(self):
+        base = datetime(2026, 3, 2, 10, 15)
+        self._add_raw(base)
+        self._add_raw(base + timedelta(minutes=30))
+        self._add_raw(base + timedelta(days=1), model="m2")
+
+        self.assertEqual(self.db.backfill_llm_usage_rollups(), 3)
+        with self.db.session_scope() as session:
+            hourly = session.query(LLMUsageHourly).order_by(LLMUsageHourly.bucket_start).all()
+            self.assertEqual([(r.bucket_start.hour, r.calls) for r in hourly], [(10, 2), (10, 1)])
+            self.assertEqual(session.query(LLMUsageDaily).count(), 2)
+
+    def test_rows_without_called_at_do_not_force_a_backfill_every_process(self):
+        self._add_raw(datetime(2026, 3, 2, 10, 15))
+        self._add_raw(datetime(2026, 3, 2, 11, 0), model="legacy")
+        with self.db.session_scope() as session:
+            session.query(LLMUsage).filter(LLMUsage.model == "legacy").update({"called_at": None})
+        self.db._ensure_llm_usage_rollups()
+
+        self.db._llm_usage_rollups_checked = False
+        with patch.object(self.db, "backfill_llm_usage_rollups") as mock_backfill:
+            self.db._ensure_llm_usage_rollups()
+        mock_backfill.assert_not_called()
+
+    def test_summary_over_rollups_matches_raw_aggregation(self):
+        base = datetime(2026, 3, 1, 0, 0)
+        samples = []
+        for i in range(60):
+            called_at = base + timedelta(hours=i * 2.7, minutes=i)
+            call_type = ("analysis", "agent", "market_review")[i % 3]
+            model = ("m1", "m2")[i % 2]
+            total = 10 + i
+            self._add_raw(called_at, call_type=call_type, model=model, total=total)
+            samples.append((called_at, call_type, model, total))
+
+        from_dt = base + timedelta(hours=5, minutes=17)
+        to_dt = base + timedelta(days=5, hours=3, minutes=41)
+        result = self.db.get_llm_usage_summary(from_dt, to_dt)
+
+        in_range = [s for s in samples if from_dt <= s[0] <= to_dt]
+        self.assertEqual(result["total_calls"], len(in_range))
+        self.assertEqual(result["total_tokens"], sum(s[3] for s in in_range))
+        by_type = {r["call_type"]: r["total_tokens"] for r in result["by_call_type"]}
+        for call_type in ("analysis", "agent", "market_review"):
+            self.assertEqual(by_type[call_type], sum(s[3] for s in in_range if s[1] == call_type))
+
+        # Rows recorded after the first summary go straight into the rollups
+        self.db.record_llm_usage("agent", "m3", 1, 1, 2)
+        later = self.db.get_llm_usage_summary(from_dt, datetime.now())
+        self.assertIn("m3", {r["model"] for r in later["by_model"]})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,7 @@ import logging
 import os
 import tempfile
 import unittest
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -104,6 +104,9 @@ class MainScheduleModeTestCase(unittest.TestCase):
             run_immediately,
             background_tasks=None,
             schedule_time_provider=None,
+            market_tasks=None,
+            warmup_task=None,
+            warmup_minutes=0,
         ):
             scheduled_call["schedule_time"] = schedule_time
             scheduled_call["run_immediately"] = run_immediately
@@ -133,7 +136,7 @@ class MainScheduleModeTestCase(unittest.TestCase):
                 "resolved_schedule_time": "18:00",
             },
         )
-        run_full_analysis.assert_called_once_with(config, args, None)
+        run_full_analysis.assert_called_once_with(config, args, None, market=None, fetcher_manager=None)
         warning_log.assert_any_call(
             "定时模式下检测到 --stocks 参数；计划执行将忽略启动时股票快照，并在每次运行前重新读取最新的 STOCK_LIST。"
         )
@@ -150,6 +153,9 @@ class MainScheduleModeTestCase(unittest.TestCase):
             run_immediately,
             background_tasks=None,
             schedule_time_provider=None,
+            market_tasks=None,
+            warmup_task=None,
+            warmup_minutes=0,
         ):
             scheduled_call["schedule_time"] = schedule_time
             scheduled_call["resolved_schedule_time"] = (
@@ -171,7 +177,31 @@ class MainScheduleModeTestCase(unittest.TestCase):
             scheduled_call,
             {"schedule_time": "18:00", "resolved_schedule_time": "09:30"},
         )
-        run_full_analysis.assert_called_once_with(runtime_config, args, None)
+        run_full_analysis.assert_called_once_with(runtime_config, args, None, market=None, fetcher_manager=None)
+
+    def test_schedule_warmup_uses_the_same_codes_as_the_scheduled_run(self) -> None:
+        args = self._make_args(schedule=True)
+        config = self._make_config(schedule_enabled=True, schedule_warmup_minutes=10)
+        runtime_config = self._make_config(schedule_enabled=True, stock_list=["000001"])
+        captured = {}
+
+        def fake_run_with_schedule(task, schedule_time, run_immediately, warmup_task=None, **kwargs):
+            warmup_task(None)
+
+        with patch("main.parse_arguments", return_value=args), \
+             patch("main.get_config", return_value=config), \
+             patch("main._reload_runtime_config", return_value=runtime_config), \
+             patch("main._resolve_scheduled_stock_codes", return_value=["600519"]), \
+             patch("main._compute_trading_day_filter", side_effect=lambda cfg, a, codes: (codes, None, False)), \
+             patch("main.setup_logging"), \
+             patch("data_provider.DataFetcherManager"), \
+             patch("src.core.cache_warmup.warm_up_caches",
+                   side_effect=lambda cfg, codes, manager: captured.setdefault("codes", codes)), \
+             patch("src.scheduler.run_with_schedule", side_effect=fake_run_with_schedule):
+            exit_code = main.main()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(captured["codes"], ["600519"])
 
     def test_check_notify_returns_before_other_modes(self) -> None:
         args = self._make_args(check_notify=True, serve=True, schedule=True, market_review=True)
@@ -402,6 +432,137 @@ class MainScheduleModeTestCase(unittest.TestCase):
         pipeline.run.assert_called_once()
         run_market_review.assert_not_called()
 
+    def test_run_full_analysis_overlaps_market_review_when_concurrent(self) -> None:
+        import threading
+
+        args = self._make_args(workers=3)
+        config = self._make_config(
+            trading_day_check_enabled=False,
+            market_review_enabled=True,
+            market_review_concurrent=True,
+            single_stock_notify=False,
+            merge_email_notification=True,
+            analysis_delay=30,
+            max_workers=3,
+            report_type="simple",
+            database_path=str(Path(self.temp_dir.name) / "stock_analysis.db"),
+        )
+        review_started = threading.Event()
+        pipeline = MagicMock()
+        pipeline.notifier.generate_aggregate_report.return_value = "dashboard"
+        pipeline.notifier.is_available.return_value = True
+
+        def _run_batch(**_kwargs):
+            # The review must already be running while the stock batch is in flight.
+            self.assertTrue(review_started.wait(timeout=5))
+            return [MagicMock(sentiment_score=50)]
+
+        def _review(**kwargs):
+            review_started.set()
+            return "review"
+
+        pipeline.run.side_effect = _run_batch
+
+        with patch("src.core.pipeline.StockAnalysisPipeline", return_value=pipeline) as pipeline_cls, \
+             patch("src.core.market_review.run_market_review", side_effect=_review) as run_market_review, \
+             patch("main.time.sleep") as sleep_mock:
+            main.run_full_analysis(config, args, ["600519"])
+
+        self.assertEqual(pipeline_cls.call_args.kwargs["max_workers"], 2)
+        run_market_review.assert_called_once()
+        self.assertIs(run_market_review.call_args.kwargs["data_manager"], pipeline.fetcher_manager)
+        sleep_mock.assert_not_called()
+        merged_content = pipeline.notifier.send.call_args.args[0]
+        self.assertIn("review", merged_content)
+        self.assertIn("dashboard", merged_content)
+
+    def test_run_full_analysis_single_worker_runs_review_after_stocks(self) -> None:
+        args = self._make_args(workers=1)
+        config = self._make_config(
+            trading_day_check_enabled=False,
+            market_review_enabled=True,
+            market_review_concurrent=True,
+            single_stock_notify=False,
+            merge_email_notification=False,
+            analysis_delay=0,
+            max_workers=1,
+            report_type="simple",
+            database_path=str(Path(self.temp_dir.name) / "stock_analysis.db"),
+        )
+        order = []
+        pipeline = MagicMock()
+        pipeline.run.side_effect = lambda **_kwargs: order.append("stocks") or []
+
+        with patch("src.core.pipeline.StockAnalysisPipeline", return_value=pipeline) as pipeline_cls, \
+             patch("src.core.market_review.run_market_review",
+                   side_effect=lambda **_kwargs: order.append("review") or "review"):
+            main.run_full_analysis(config, args, ["600519"])
+
+        self.assertEqual(pipeline_cls.call_args.kwargs["max_workers"], 1)
+        self.assertEqual(order, ["stocks", "review"])
+
+    def test_run_full_analysis_per_market_narrows_stocks_and_review(self) -> None:
+        args = self._make_args()
+        config = self._make_config(
+            trading_day_check_enabled=False,
+            market_review_enabled=True,
+            market_review_region="both",
+            single_stock_notify=False,
+            merge_email_notification=False,
+            analysis_delay=0,
+        )
+        pipeline = MagicMock()
+        pipeline.run.return_value = []
+        shared_manager = MagicMock()
+
+        with patch("src.core.pipeline.StockAnalysisPipeline", return_value=pipeline) as pipeline_cls, \
+             patch("main._run_market_review_with_shared_lock") as run_review:
+            main.run_full_analysis(
+                config, args, ["600519", "00700", "AAPL"], market="hk", fetcher_manager=shared_manager
+            )
+            self.assertIs(pipeline_cls.call_args.kwargs["fetcher_manager"], shared_manager)
+            self.assertEqual(pipeline.run.call_args.kwargs["stock_codes"], ["00700"])
+            self.assertEqual(run_review.call_args.kwargs["override_region"], "hk")
+
+            # No US stocks and no US review configured: nothing to do
+            config.market_review_region = "cn"
+            pipeline_cls.reset_mock()
+            main.run_full_analysis(config, args, ["600519"], market="us")
+            pipeline_cls.assert_not_called()
+
+    def test_schedule_by_market_registers_market_tasks_with_shared_warmup_manager(self) -> None:
+        args = self._make_args(schedule=True)
+        config = self._make_config(
+            schedule_enabled=True,
+            schedule_by_market=True,
+            schedule_market_delay_minutes=20,
+            schedule_warmup_minutes=10,
+        )
+        scheduled_call = {}
+
+        def fake_run_with_schedule(task, schedule_time, run_immediately, **kwargs):
+            scheduled_call.update(kwargs)
+
+        with patch("main.parse_arguments", return_value=args), \
+             patch("main.get_config", return_value=config), \
+             patch("main._reload_runtime_config", return_value=config), \
+             patch("main._build_schedule_time_provider", return_value=lambda: "18:00"), \
+             patch("main.setup_logging"), \
+             patch("main.run_full_analysis") as run_full_analysis, \
+             patch("data_provider.DataFetcherManager") as manager_cls, \
+             patch("src.scheduler.run_with_schedule", side_effect=fake_run_with_schedule):
+            self.assertEqual(main.main(), 0)
+
+            market_tasks = scheduled_call["market_tasks"]
+            self.assertEqual([entry["market"] for entry in market_tasks], ["cn", "hk", "us"])
+            self.assertEqual({entry["delay_minutes"] for entry in market_tasks}, {20})
+            self.assertEqual(scheduled_call["warmup_minutes"], 10)
+            market_tasks[1]["task"]()
+
+        run_full_analysis.assert_called_once_with(
+            config, args, None, market="hk", fetcher_manager=manager_cls.return_value
+        )
+
     def test_market_review_mode_uses_shared_runtime_assembly(self) -> None:
         args = self._make_args(market_review=True)
         config = self._make_config(
@@ -557,5 +718,37 @@ class MainScheduleModeTestCase(unittest.TestCase):
         main._env_bootstrapped = False
 
 
+class SkillPrescreenTestCase(unittest.TestCase):
+    def _run_prescreen(self, as_of, expected, stock_codes=None, market=None):
+        from src.agent.skills.screener import ScreenResult
+
+        result = ScreenResult(as_of=as_of, universe_size=2, hits={"volume_breakout": ["600519"]})
+        skill_manager = MagicMock()
+        skill_manager.list_skills.return_value = [SimpleNamespace(name="volume_breakout")]
+        with patch("src.agent.factory.get_skill_manager", return_value=skill_manager), \
+             patch("src.agent.skills.screener.screen_skills", return_value=(result, [object()])), \
+             patch("src.core.trading_calendar.get_effective_trading_date", return_value=expected) as mock_expected, \
+             patch("main.logger") as mock_logger:
+            codes = main._apply_skill_prescreen(_DummyConfig(), "all", stock_codes, market=market)
+        return codes, mock_expected, mock_logger
+
+    def test_prescreen_warns_when_cached_bars_lag_latest_session(self) -> None:
+        codes, mock_expected, mock_logger = self._run_prescreen(
+            date(2026, 7, 2), date(2026, 7, 3), stock_codes=["600519", "000001"]
+        )
+
+        self.assertEqual(codes, ["600519"])
+        mock_expected.assert_called_once_with("cn")
+        self.assertTrue(
+            any("落后于最近交易日" in str(c.args[0]) for c in mock_logger.warning.call_args_list)
+        )
+
+    def test_prescreen_does_not_warn_on_current_bars(self) -> None:
+        _, mock_expected, mock_logger = self._run_prescreen(date(2026, 7, 3), date(2026, 7, 3), market="us")
+
+        mock_expected.assert_called_once_with("us")
+        mock_logger.warning.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Tests for parallel market overview collection and the shared spot snapshot."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tests.litellm_stub import ensure_litellm_stub
+
+ensure_litellm_stub()
+
+from src.market_analyzer import MarketAnalyzer
+
+
+def _make_analyzer(data_manager, *, part_timeout=5.0, search_service=None):
+    config = SimpleNamespace(report_language="zh", market_review_part_timeout_seconds=part_timeout)
+    with patch("src.market_analyzer.get_config", return_value=config):
+        return MarketAnalyzer(search_service=search_service, region="cn", data_manager=data_manager)
+
+
+class _BarrierManager:
+    """Data manager whose three overview calls only succeed when run together."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(3, timeout=2)
+
+    def get_main_indices(self, region="cn"):
+        self.barrier.wait()
+        return [{
+            "code": "000001", "name": "上证指数", "current": 3000.0, "change": 10.0,
+            "change_pct": 0.33, "open": 2990.0, "high": 3010.0, "low": 2985.0,
+            "prev_close": 2990.0, "volume": 1.0, "amount": 2.0, "amplitude": 0.8,
+        }]
+
+    def get_market_stats(self):
+        self.barrier.wait()
+        return {"up_count": 3000, "down_count": 2000, "flat_count": 100,
+                "limit_up_count": 50, "limit_down_count": 5, "total_amount": 9000.0}
+
+    def get_sector_rankings(self, n=5):
+        self.barrier.wait()
+        return [{"name": "半导体", "change_pct": 3.2}], [{"name": "煤炭", "change_pct": -1.5}]
+
+
+class MarketOverviewConcurrencyTestCase(unittest.TestCase):
+    def test_overview_parts_run_concurrently(self):
+        analyzer = _make_analyzer(_BarrierManager())
+
+        overview = analyzer.get_market_overview()
+
+        self.assertEqual(len(overview.indices), 1)
+        self.assertEqual(overview.up_count, 3000)
+        self.assertEqual(overview.limit_down_count, 5)
+        self.assertEqual(overview.top_sectors[0]["name"], "半导体")
+        self.assertEqual(overview.bottom_sectors[0]["name"], "煤炭")
+
+    def test_slow_part_times_out_without_blocking_others(self):
+        release = threading.Event()
+        manager = MagicMock()
+        manager.get_main_indices.return_value = []
+        manager.get_market_stats.return_value = {"up_count": 10, "down_count": 20}
+
+        def _slow_sectors(n=5):
+            release.wait(5)
+            return [{"name": "late", "change_pct": 1.0}], []
+
+        manager.get_sector_rankings.side_effect = _slow_sectors
+        analyzer = _make_analyzer(manager, part_timeout=0.2)
+
+        started = time.monotonic()
+        try:
+            overview = analyzer.get_market_overview()
+        finally:
+            release.set()
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(overview.up_count, 10)
+        self.assertEqual(overview.top_sectors, [])
+
+    def test_news_queries_keep_query_order(self):
+        search_service = MagicMock()
+
+        def _search(stock_code, stock_name, max_results, focus_keywords):
+            # Earlier queries finish last to prove ordering does not follow completion
+            delay = 0.1 if focus_keywords == analyzer.profile.news_queries[0].split() else 0.0
+            time.sleep(delay)
+            return SimpleNamespace(results=[" ".join(focus_keywords)])
+
+        search_service.search_stock_news.side_effect = _search
+        analyzer = _make_analyzer(MagicMock(), search_service=search_service)
+
+        news = analyzer.search_market_news()
+
+        self.assertEqual(news, list(analyzer.profile.news_queries))
+
+
+class AkshareMarketStatsSnapshotTestCase(unittest.TestCase):
+    def test_market_stats_reuse_realtime_spot_snapshot(self):
+        from data_provider import akshare_fetcher
+
+        spot = pd.DataFrame({
+            "代码": ["600000", "000001"],
+            "名称": ["浦发银行", "平安银行"],
+            "最新价": [11.0, 9.0],
+            "昨收": [10.0, 10.0],
+            "成交额": [1e8, 2e8],
+        })
+        fetcher = akshare_fetcher.AkshareFetcher.__new__(akshare_fetcher.AkshareFetcher)
+        fake_ak = MagicMock()
+        with patch.dict(akshare_fetcher._realtime_cache, {"data": spot, "timestamp": time.time()}), \
+                patch.dict(sys.modules, {"akshare": fake_ak}):
+            stats = fetcher.get_market_stats()
+
+        fake_ak.stock_zh_a_spot_em.assert_not_called()
+        self.assertEqual(stats["up_count"], 1)
+        self.assertEqual(stats["down_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
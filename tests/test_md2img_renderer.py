@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Tests for the bounded Markdown-to-image renderer and its PNG cache."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.md2img import MarkdownImageRenderer
+
+
+class MarkdownImageRendererTestCase(unittest.TestCase):
+    def test_repeated_content_is_served_from_cache(self):
+        renderer = MarkdownImageRenderer(max_workers=1, cache_size=4)
+        with patch("src.md2img._render_with_engine", return_value=b"png") as mock_render:
+            self.assertEqual(renderer.render("# report", engine="wkhtmltoimage"), b"png")
+            self.assertEqual(renderer.render("# report", engine="wkhtmltoimage"), b"png")
+        renderer.shutdown()
+
+        mock_render.assert_called_once_with("wkhtmltoimage", "# report")
+        self.assertEqual(renderer.stats()["hits"], 1)
+
+    def test_failed_render_is_not_cached(self):
+        renderer = MarkdownImageRenderer(max_workers=1, cache_size=4)
+        with patch("src.md2img._render_with_engine", side_effect=[None, b"png"]) as mock_render:
+            self.assertIsNone(renderer.render("# report", engine="wkhtmltoimage"))
+            self.assertEqual(renderer.render("# report", engine="wkhtmltoimage"), b"png")
+        renderer.shutdown()
+
+        self.assertEqual(mock_render.call_count, 2)
+
+    def test_cache_evicts_least_recently_used(self):
+        renderer = MarkdownImageRenderer(max_workers=1, cache_size=1)
+        with patch("src.md2img._render_with_engine", side_effect=lambda engine, text: text.encode()) as mock_render:
+            renderer.render("a", engine="wkhtmltoimage")
+            renderer.render("b", engine="wkhtmltoimage")
+            renderer.render("a", engine="wkhtmltoimage")
+        renderer.shutdown()
+
+        self.assertEqual(mock_render.call_count, 3)
+
+    def test_prerender_shares_in_flight_render(self):
+        renderer = MarkdownImageRenderer(max_workers=2, cache_size=4)
+        release = threading.Event()
+        calls = []
+
+        def _slow_render(engine, text):
+            calls.append(text)
+            release.wait(2)
+            return b"png"
+
+        with patch("src.md2img._render_with_engine", side_effect=_slow_render):
+            future = renderer.submit("# report", engine="wkhtmltoimage")
+            waiter = threading.Thread(target=lambda: renderer.render("# report", engine="wkhtmltoimage"))
+            waiter.start()
+            time.sleep(0.05)
+            release.set()
+            waiter.join(2)
+            self.assertEqual(future.result(timeout=2), b"png")
+        renderer.shutdown()
+
+        self.assertEqual(calls, ["# report"])
+
+    def test_concurrent_renders_are_bounded_by_max_workers(self):
+        renderer = MarkdownImageRenderer(max_workers=2, cache_size=0)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def _render(engine, text):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return b"png"
+
+        with patch("src.md2img._render_with_engine", side_effect=_render):
+            futures = [renderer.submit(f"# report {i}", engine="wkhtmltoimage") for i in range(6)]
+            for future in futures:
+                future.result(timeout=2)
+        renderer.shutdown()
+
+        self.assertLessEqual(peak[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ import unittest
 from datetime import datetime
 from unittest.mock import patch
 
+from sqlalchemy import event
 from sqlalchemy.exc import OperationalError
 
 from src.config import Config
@@ -138,6 +139,62 @@ class NewsIntelStorageTestCase(unittest.TestCase):
                 self.fail("未找到保存的新闻记录")
             self.assertTrue(row.url.startswith("no-url:"))
 
+    def test_save_news_intel_uses_one_lookup_and_one_insert_per_response(self) -> None:
+        """整批去重：一次 IN 查询 + 一次插入，已存在条目按原规则更新"""
+        first = self._build_response([
+            SearchResult(title="旧闻", snippet="旧摘要", url="https://news.example.com/old",
+                         source="example.com", published_date="2025-01-01"),
+        ])
+        self.db.save_news_intel(
+            code="600519", name="贵州茅台", dimension="latest_news",
+            query=first.query, response=first,
+        )
+
+        response = self._build_response([
+            SearchResult(title="旧闻", snippet="新摘要", url="https://news.example.com/old",
+                         source="", published_date=None),
+        ] + [
+            SearchResult(title=f"新闻{i}", snippet="", url=f"https://news.example.com/n{i}",
+                         source="example.com", published_date="2025-01-02")
+            for i in range(3)
+        ] + [
+            SearchResult(title="新闻0", snippet="补充摘要", url="https://news.example.com/n0",
+                         source="", published_date=None),
+            SearchResult(title="", snippet="", url="", source="", published_date=None),
+        ])
+
+        statements = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0].upper())
+
+        event.listen(self.db._engine, "before_cursor_execute", _capture)
+        try:
+            saved = self.db.save_news_intel(
+                code="600519", name="贵州茅台", dimension="risk_check",
+                query=response.query, response=response,
+                query_context={"query_id": "task_002"},
+            )
+        finally:
+            event.remove(self.db._engine, "before_cursor_execute", _capture)
+
+        self.assertEqual(saved, 3)
+        self.assertEqual(statements.count("SELECT"), 1)
+        self.assertEqual(statements.count("INSERT"), 1)
+
+        with self.db.get_session() as session:
+            rows = {row.url: row for row in session.query(NewsIntel).all()}
+        self.assertEqual(len(rows), 4)
+        old = rows["https://news.example.com/old"]
+        self.assertEqual(old.snippet, "新摘要")
+        self.assertEqual(old.source, "example.com")
+        self.assertEqual(old.dimension, "risk_check")
+        self.assertEqual(old.query_id, "task_002")
+        merged = rows["https://news.example.com/n0"]
+        self.assertEqual(merged.snippet, "补充摘要")
+        self.assertEqual(merged.source, "example.com")
+        self.assertEqual(merged.query_id, "task_002")
+
     def test_get_recent_news(self) -> None:
         """可按时间范围查询最新新闻"""
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -16,6 +16,8 @@ TODO:
 """
 import os
 import sys
+import threading
+import time
 import unittest
 from unittest import mock
 from typing import Optional
@@ -137,10 +139,120 @@ class TestNotificationServiceSendToMethods(unittest.TestCase):
 
         with mock.patch.object(service, "send_to_wechat", side_effect=RuntimeError("boom")), \
              mock.patch.object(service, "send_to_custom", return_value=True) as mock_custom:
-            ok = service.send("content")
+            ok, send_results = service.send_with_results("content")
 
         self.assertTrue(ok)
         mock_custom.assert_called_once_with("content")
+        results = {r.channel: r for r in send_results}
+        self.assertFalse(results[NotificationChannel.WECHAT].success)
+        self.assertEqual(results[NotificationChannel.WECHAT].error, "boom")
+        self.assertTrue(results[NotificationChannel.CUSTOM].success)
+
+    @mock.patch("src.notification.get_config")
+    def test_send_dispatches_channels_concurrently(self, mock_get_config: mock.MagicMock):
+        cfg = _make_config(
+            wechat_webhook_url="https://wechat.example/hook",
+            custom_webhook_urls=["https://example.com/webhook"],
+            notification_max_workers=2,
+        )
+        mock_get_config.return_value = cfg
+
+        service = NotificationService()
+        # Each channel blocks until the other one has started
+        barrier = threading.Barrier(2, timeout=2)
+
+        def _wait_for_peer(_content):
+            barrier.wait()
+            return True
+
+        with mock.patch.object(service, "send_to_wechat", side_effect=_wait_for_peer), \
+             mock.patch.object(service, "send_to_custom", side_effect=_wait_for_peer):
+            ok, results = service.send_with_results("content")
+
+        self.assertTrue(ok)
+        self.assertTrue(all(r.success for r in results))
+
+    @mock.patch("src.notification.get_config")
+    def test_send_times_out_slow_channel_without_blocking_others(self, mock_get_config: mock.MagicMock):
+        cfg = _make_config(
+            wechat_webhook_url="https://wechat.example/hook",
+            custom_webhook_urls=["https://example.com/webhook"],
+            notification_channel_timeout_seconds=1,
+        )
+        mock_get_config.return_value = cfg
+
+        service = NotificationService()
+        release = threading.Event()
+
+        def _hang(_content):
+            release.wait(5)
+            return True
+
+        started = time.monotonic()
+        try:
+            with mock.patch.object(service, "send_to_wechat", side_effect=_hang), \
+                 mock.patch.object(service, "send_to_custom", return_value=True):
+                ok, results = service.send_with_results("content")
+        finally:
+            release.set()
+
+        self.assertTrue(ok)
+        self.assertLess(time.monotonic() - started, 3)
+        wechat, custom = results
+        self.assertTrue(wechat.timed_out)
+        self.assertFalse(wechat.success)
+        self.assertTrue(custom.success)
+
+    @mock.patch("src.notification.time.sleep")
+    @mock.patch("src.notification.get_config")
+    def test_send_retries_failed_channel_within_budget(
+        self, mock_get_config: mock.MagicMock, _mock_sleep: mock.MagicMock
+    ):
+        cfg = _make_config(
+            custom_webhook_urls=["https://example.com/webhook"],
+            notification_channel_retries=2,
+        )
+        mock_get_config.return_value = cfg
+
+        service = NotificationService()
+
+        with mock.patch.object(service, "send_to_custom", side_effect=[False, True]) as mock_custom:
+            ok, results = service.send_with_results("content")
+
+        self.assertTrue(ok)
+        self.assertEqual(mock_custom.call_count, 2)
+        self.assertEqual(results[0].attempts, 2)
+
+    @mock.patch("src.notification_sender.wechat_sender.time.sleep")
+    @mock.patch("src.notification.time.sleep")
+    @mock.patch("src.notification.get_config")
+    def test_retry_resends_only_the_failed_chunk(
+        self, mock_get_config: mock.MagicMock, _mock_sleep: mock.MagicMock, _mock_chunk_sleep: mock.MagicMock
+    ):
+        cfg = _make_config(
+            wechat_webhook_url="https://wechat.example/hook",
+            notification_channel_retries=1,
+        )
+        mock_get_config.return_value = cfg
+
+        service = NotificationService()
+        sent = []
+        outcomes = iter([True, False, True])
+
+        def _send_chunk(chunk):
+            sent.append(chunk)
+            return next(outcomes)
+
+        chunks = ["chunk 1/2", "chunk 2/2"]
+        with mock.patch("src.notification_sender.wechat_sender.chunk_content_by_max_bytes", return_value=chunks), \
+             mock.patch.object(service, "_send_wechat_message", side_effect=_send_chunk), \
+             mock.patch.object(service, "send_to_wechat", side_effect=lambda content: service._send_wechat_chunked(content, 10)):
+            ok, results = service.send_with_results("content")
+
+        self.assertTrue(ok)
+        self.assertEqual(results[0].attempts, 2)
+        # The delivered first chunk is not sent again on retry
+        self.assertEqual(sent, ["chunk 1/2", "chunk 2/2", "chunk 2/2"])
 
     @mock.patch("src.notification.get_config")
     def test_send_route_empty_keeps_all_configured_channels(self, mock_get_config: mock.MagicMock):
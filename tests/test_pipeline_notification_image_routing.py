@@ -17,9 +17,12 @@ ensure_litellm_stub()
 
 from src.core.pipeline import StockAnalysisPipeline, NotificationChannel
 from src.enums import ReportType
+from src.notification import NotificationService
 
 
 class _FakeNotifier:
+    needs_markdown_image = NotificationService.needs_markdown_image
+
     def __init__(self):
         self._markdown_to_image_channels = {"email"}
         self._markdown_to_image_max_chars = 15000
@@ -104,6 +107,8 @@ class TestPipelineEmailGroupImageRouting(unittest.TestCase):
 
 
 class _FakeWechatNotifier:
+    needs_markdown_image = NotificationService.needs_markdown_image
+
     def __init__(self):
         self._markdown_to_image_channels = {"wechat"}
         self._markdown_to_image_max_chars = 15000
@@ -162,6 +167,8 @@ class TestPipelineWechatOnlyImageRouting(unittest.TestCase):
 
 
 class _FakeRoutedNotifier:
+    needs_markdown_image = NotificationService.needs_markdown_image
+
     def __init__(self, routed_channels, image_channels=None, noise_should_send=True):
         self._markdown_to_image_channels = set(image_channels or [])
         self._markdown_to_image_max_chars = 15000
@@ -202,6 +209,14 @@ class _FakeRoutedNotifier:
         self.send_to_ntfy = MagicMock(return_value=True)
         self.send_to_gotify = MagicMock(return_value=True)
 
+    @property
+    def markdown_to_image_channels(self):
+        return frozenset(self._markdown_to_image_channels)
+
+    @property
+    def markdown_to_image_max_chars(self):
+        return self._markdown_to_image_max_chars
+
     @staticmethod
     def _generate_dashboard_report(results):
         return "report:" + ",".join(r.code for r in results)
@@ -345,5 +360,30 @@ class TestPipelineReportRouteFiltering(unittest.TestCase):
         pipeline.notifier.release_noise_control.assert_called_once()
 
 
+class TestPipelineSingleStockImagePrerender(unittest.TestCase):
+    def _build_pipeline(self, image_channels):
+        pipeline = StockAnalysisPipeline.__new__(StockAnalysisPipeline)
+        pipeline.notifier = _FakeRoutedNotifier([NotificationChannel.TELEGRAM], image_channels=image_channels)
+        pipeline.notifier.generate_single_stock_report = MagicMock(return_value="single:000001")
+        pipeline.notifier.send = MagicMock(return_value=True)
+        return pipeline
+
+    def test_single_stock_needs_image_follows_report_route(self):
+        self.assertTrue(self._build_pipeline({"telegram"})._single_stock_needs_image())
+        self.assertFalse(self._build_pipeline({"email"})._single_stock_needs_image())
+
+    def test_prepared_report_is_prerendered_and_reused_for_send(self):
+        pipeline = self._build_pipeline({"telegram"})
+        result = SimpleNamespace(code="000001")
+
+        with patch("src.md2img.prerender_markdown_image") as mock_prerender:
+            content = pipeline._prepare_single_stock_report(result, ReportType.SIMPLE)
+        pipeline._send_single_stock_notification(result, ReportType.SIMPLE, report_content=content)
+
+        mock_prerender.assert_called_once_with("single:000001", max_chars=15000)
+        pipeline.notifier.generate_single_stock_report.assert_called_once_with(result)
+        self.assertEqual(pipeline.notifier.send.call_args.args[0], "single:000001")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -30,6 +30,7 @@ class _TrackingNotifier:
         self._lock = threading.Lock()
         self._inflight = 0
         self.max_inflight = 0
+        self.markdown_to_image_channels = frozenset()
         self.is_available = MagicMock(return_value=True)
         self.generate_dashboard_report = MagicMock(
             side_effect=lambda results: "dashboard:" + ",".join(r.code for r in results)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Tests for Scheduler background task support."""
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import sys
 import unittest
 from unittest.mock import MagicMock, patch
@@ -193,5 +193,107 @@ class SchedulerBackgroundTaskTestCase(unittest.TestCase):
         self.assertEqual(fake_schedule.jobs, [])
 
 
+def _run_threads_inline(target=None, **kwargs):
+    thread = MagicMock()
+    thread.is_alive.return_value = False
+    thread.start.side_effect = target
+    return thread
+
+
+class SchedulerMarketTaskTestCase(unittest.TestCase):
+    def test_market_task_warms_up_then_runs_after_close_and_moves_to_next_close(self):
+        fake_schedule = _FakeScheduleModule()
+        now = datetime.now(timezone.utc)
+        closes = [now - timedelta(minutes=5), now + timedelta(days=1)]
+        get_next_close = MagicMock(side_effect=closes)
+        calls = []
+
+        with patch.dict(sys.modules, {"schedule": fake_schedule}), \
+                patch("src.core.trading_calendar.get_next_market_close", get_next_close), \
+                patch("src.scheduler.threading.Thread", side_effect=_run_threads_inline):
+            from src.scheduler import Scheduler
+
+            scheduler = Scheduler(schedule_time="18:00")
+            scheduler.set_warmup_task(lambda market: calls.append(("warmup", market)), lead_minutes=10)
+            self.assertTrue(scheduler.add_market_task("hk", lambda: calls.append("run"), delay_minutes=10))
+            entry = scheduler._market_tasks[0]
+            # A close 5 minutes ago with a 10 minute delay is still pending
+            self.assertEqual(entry["next_run"], closes[0] + timedelta(minutes=10))
+
+            scheduler._run_market_tasks()
+            scheduler._run_market_tasks()
+            self.assertEqual(calls, [("warmup", "hk")])
+
+            entry["next_run"] = now - timedelta(seconds=1)
+            scheduler._run_market_tasks()
+
+        self.assertEqual(calls, [("warmup", "hk"), "run"])
+        self.assertEqual(entry["close"], closes[1])
+        self.assertFalse(entry["warmed"])
+        # Rescheduling asks for the first close after the one just handled
+        self.assertGreaterEqual(get_next_close.call_args.kwargs["after"], closes[0])
+        self.assertEqual(fake_schedule.jobs, [])
+
+    def test_daily_warmup_job_tracks_schedule_time(self):
+        fake_schedule = _FakeScheduleModule()
+        with patch.dict(sys.modules, {"schedule": fake_schedule}):
+            from src.scheduler import Scheduler
+
+            scheduler = Scheduler(schedule_time="00:05", schedule_time_provider=lambda: "09:30")
+            scheduler.set_warmup_task(lambda market: None, lead_minutes=10)
+            scheduler.set_daily_task(lambda: None, run_immediately=False)
+            self.assertEqual(sorted(job.at_time for job in fake_schedule.jobs), ["00:05", "23:55"])
+
+            scheduler._refresh_daily_schedule_if_needed()
+
+        self.assertEqual(sorted(job.at_time for job in fake_schedule.jobs), ["09:20", "09:30"])
+        # The warm-up job is not reported as the next analysis run
+        self.assertEqual(scheduler._get_next_run_time(), "2026-01-01 09:30:00")
+
+    def test_immediate_run_does_not_also_catch_up_a_close_inside_the_delay(self):
+        fake_schedule = _FakeScheduleModule()
+        now = datetime.now(timezone.utc)
+        get_next_close = MagicMock(return_value=now + timedelta(days=1))
+        with patch.dict(sys.modules, {"schedule": fake_schedule}), \
+                patch("src.core.trading_calendar.get_next_market_close", get_next_close):
+            from src import scheduler as scheduler_module
+
+            with patch.object(scheduler_module.Scheduler, "run"):
+                scheduler_module.run_with_schedule(
+                    task=lambda: None,
+                    run_immediately=True,
+                    market_tasks=[{"market": "cn", "task": lambda: None, "delay_minutes": 30}],
+                )
+            # Without the start-up run, a close inside the delay is still caught up
+            scheduler = scheduler_module.Scheduler(schedule_time="18:00")
+            scheduler.add_market_task("cn", lambda: None, delay_minutes=30)
+
+        immediate_after, catch_up_after = (c.kwargs["after"] for c in get_next_close.call_args_list)
+        self.assertGreaterEqual(immediate_after, now)
+        self.assertLess(catch_up_after, now - timedelta(minutes=29))
+
+    def test_run_with_schedule_replaces_daily_job_with_market_tasks(self):
+        fake_schedule = _FakeScheduleModule()
+        calls = []
+        with patch.dict(sys.modules, {"schedule": fake_schedule}), \
+                patch("src.core.trading_calendar.get_next_market_close",
+                      return_value=datetime.now(timezone.utc) + timedelta(hours=1)):
+            from src import scheduler as scheduler_module
+
+            with patch.object(scheduler_module.Scheduler, "run") as run:
+                scheduler_module.run_with_schedule(
+                    task=lambda: calls.append("all"),
+                    run_immediately=True,
+                    market_tasks=[
+                        {"market": "cn", "task": lambda: calls.append("cn"), "delay_minutes": 30},
+                        {"market": "us", "task": lambda: calls.append("us")},
+                    ],
+                )
+
+        run.assert_called_once_with()
+        self.assertEqual(calls, ["all"])
+        self.assertEqual(fake_schedule.jobs, [])
+
+
 if __name__ == "__main__":
     unittest.main()
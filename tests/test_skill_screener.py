@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Tests for the vectorized skill pre-screener."""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agent.skills.base import Skill, SkillManager
+from src.agent.skills.screener import (
+    compile_screen,
+    compile_skill_screens,
+    parse_screen_rule,
+    screen_bars,
+    screen_skills,
+)
+from src.storage import DatabaseManager
+
+
+def _bars(code, closes, volumes=None, start="2026-06-01"):
+    dates = pd.bdate_range(start, periods=len(closes))
+    volumes = volumes or [1000.0] * len(closes)
+    return pd.DataFrame({
+        "code": code,
+        "date": [d.date() for d in dates],
+        "open": [c - 0.1 for c in closes],
+        "high": [c + 0.1 for c in closes],
+        "low": [c - 0.2 for c in closes],
+        "close": closes,
+        "volume": volumes,
+        "amount": 0.0,
+        "pct_chg": 0.0,
+    })
+
+
+def _skill(name, screen):
+    return Skill(name=name, display_name=name, description="d", instructions="i", screen=screen)
+
+
+class ScreenRuleTestCase(unittest.TestCase):
+    def test_parse_rule_variants(self):
+        rule = parse_screen_rule("Volume < vol_ma5 * 0.7")
+        self.assertEqual((rule.lhs, rule.op, rule.rhs, rule.factor), ("volume", "<", "vol_ma5", 0.7))
+        self.assertTrue(rule.rhs_is_feature)
+
+        cross = parse_screen_rule("ma5 crosses_above ma10 within 3")
+        self.assertEqual(cross.within, 3)
+
+    def test_invalid_rules_are_rejected(self):
+        for text in ("pe_ratio > 3", "close >> 3", "ma5 crosses_above 10"):
+            with self.assertRaises(ValueError):
+                parse_screen_rule(text)
+
+    def test_builtin_screens_compile(self):
+        manager = SkillManager()
+        manager.load_builtin_skills()
+        names = {screen.skill for screen in compile_skill_screens(manager.list_skills())}
+        self.assertTrue({"volume_breakout", "ma_golden_cross", "bull_trend"} <= names)
+
+
+class ScreenBarsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.breakout = compile_screen("volume_breakout", {
+            "all": ["volume_ratio > 2", "close > high_20", "bias_ma5 < 5"],
+        })
+
+    def test_breakout_fires_only_on_the_breakout_stock(self):
+        flat = [10.0] * 30
+        breakout = [10.0] * 29 + [10.4]
+        panel = pd.concat([
+            _bars("000001", flat),
+            _bars("000002", breakout, volumes=[1000.0] * 29 + [3000.0]),
+            # Same price breakout without volume
+            _bars("000003", breakout),
+        ])
+
+        result = screen_bars(panel, [self.breakout])
+
+        self.assertEqual(result.hits["volume_breakout"], ["000002"])
+        self.assertEqual(result.universe_size, 3)
+        self.assertEqual(result.skills_for("000002"), ["volume_breakout"])
+
+    def test_cross_within_window_and_any_rules(self):
+        screen = compile_screen("golden", {"any": ["ma5 crosses_above ma10 within 3"]})
+        # Downtrend then a sharp rally: MA5 crosses MA10 a couple of bars before the end
+        closes = [20.0 - 0.2 * i for i in range(25)] + [16.0, 17.0, 18.0, 18.5, 18.6]
+        result = screen_bars(_bars("600519", closes), [screen])
+        self.assertEqual(result.hits["golden"], ["600519"])
+
+        later = closes + [18.6] * 5
+        self.assertEqual(screen_bars(_bars("600519", later), [screen]).hits["golden"], [])
+
+    def test_short_history_and_stale_stocks_never_match(self):
+        breakout = [10.0] * 29 + [10.4]
+        volumes = [1000.0] * 29 + [3000.0]
+        panel = pd.concat([
+            _bars("000002", breakout, volumes=volumes),
+            _bars("000004", breakout[-10:], volumes=volumes[-10:], start="2026-06-30"),
+            _bars("000005", breakout, volumes=volumes, start="2026-05-01"),
+        ])
+
+        result = screen_bars(panel, [self.breakout])
+
+        self.assertEqual(result.hits["volume_breakout"], ["000002"])
+
+
+class ScreenSkillsDatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def test_screens_whole_cached_universe(self):
+        breakout = _bars("000002", [10.0] * 29 + [10.4], volumes=[1000.0] * 29 + [3000.0])
+        flat = _bars("000001", [10.0] * 30)
+        self.db.save_daily_data(breakout.drop(columns=["code"]), "000002", "test")
+        self.db.save_daily_data(flat.drop(columns=["code"]), "000001", "test")
+        skills = [
+            _skill("breakout", {"all": ["volume_ratio > 2", "close > high_20"]}),
+            _skill("no_screen", {}),
+        ]
+        as_of = breakout["date"].iloc[-1]
+
+        result, screens = screen_skills(skills, db=self.db, as_of=as_of)
+
+        self.assertEqual([s.skill for s in screens], ["breakout"])
+        self.assertEqual(result.universe_size, 2)
+        self.assertEqual(result.codes, ["000002"])
+
+        restricted, _ = screen_skills(skills, codes=["000001"], db=self.db, as_of=as_of)
+        self.assertEqual(restricted.codes, [])
+
+    def test_no_screens_skips_database(self):
+        result, screens = screen_skills([_skill("plain", {})], db=object(), as_of=date(2026, 7, 1))
+        self.assertEqual((result.codes, screens), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Parity tests for StockTrendAnalyzer.analyze_many against the single-stock path."""
+
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.stock_analyzer import StockTrendAnalyzer
+
+
+def _stock_frame(code: str, bars: int, seed: int, drift: float = 0.001) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    closes = 10 * np.exp(np.cumsum(rng.normal(drift, 0.02, bars)))
+    return pd.DataFrame({
+        "code": code,
+        "date": pd.bdate_range("2025-01-01", periods=bars),
+        "open": closes * 0.995,
+        "high": closes * (1 + rng.uniform(0, 0.02, bars)),
+        "low": closes * (1 - rng.uniform(0, 0.02, bars)),
+        "close": closes,
+        "volume": rng.uniform(1e6, 5e6, bars),
+    })
+
+
+def _assert_same(testcase, expected, actual):
+    expected_dict, actual_dict = expected.to_dict(), actual.to_dict()
+    testcase.assertEqual(expected_dict.keys(), actual_dict.keys())
+    for key, value in expected_dict.items():
+        other = actual_dict[key]
+        if isinstance(value, float):
+            testcase.assertTrue(
+                math.isclose(value, other, rel_tol=1e-9, abs_tol=1e-9),
+                f"{expected.code}.{key}: {value} != {other}",
+            )
+        elif isinstance(value, list) and value and isinstance(value[0], float):
+            testcase.assertEqual(len(value), len(other), f"{expected.code}.{key}")
+            for a, b in zip(value, other):
+                testcase.assertTrue(math.isclose(a, b, rel_tol=1e-9), f"{expected.code}.{key}")
+        else:
+            testcase.assertEqual(value, other, f"{expected.code}.{key}")
+
+
+class AnalyzeManyParityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = StockTrendAnalyzer()
+
+    def test_matches_single_stock_analysis(self):
+        # Lengths straddle every threshold used by the single-stock path (20/24/26/60)
+        lengths = [12, 19, 20, 23, 24, 25, 26, 27, 45, 59, 60, 61, 150]
+        frames = [
+            _stock_frame(f"{i:06d}", bars, seed=i, drift=0.004 if i % 2 else -0.004)
+            for i, bars in enumerate(lengths)
+        ]
+        # Shuffled input order must not matter
+        panel = pd.concat(frames).sample(frac=1.0, random_state=7)
+
+        batch = self.analyzer.analyze_many(panel)
+
+        self.assertEqual(len(batch), len(frames))
+        for frame in frames:
+            code = frame["code"].iloc[0]
+            _assert_same(self, self.analyzer.analyze(frame.drop(columns=["code"]), code), batch[code])
+
+    def test_flat_prices_keep_exact_ma_ties(self):
+        flat = pd.DataFrame({
+            "code": "000001",
+            "date": pd.bdate_range("2025-01-01", periods=70),
+            "open": 10.0, "high": 10.1, "low": 9.9, "close": 10.0, "volume": 1e6,
+        })
+        panel = pd.concat([_stock_frame("000002", 200, seed=3), flat])
+
+        batch = self.analyzer.analyze_many(panel)
+
+        _assert_same(self, self.analyzer.analyze(flat.drop(columns=["code"]), "000001"), batch["000001"])
+
+    def test_requested_codes_without_data_are_marked_insufficient(self):
+        panel = _stock_frame("600519", 40, seed=1)
+
+        batch = self.analyzer.analyze_many(panel, codes=["600519", "000404"])
+
+        self.assertEqual(list(batch), ["600519", "000404"])
+        self.assertIn("数据不足，无法完成分析", batch["000404"].risk_factors)
+        self.assertEqual(self.analyzer.analyze_many(pd.DataFrame()), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Tests for the stock history service (resampling) and its HTTP revalidation."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import stocks
+from src.services.history_loader import HistoryBars
+from src.services.stock_service import StockService
+
+
+def _daily_frame() -> pd.DataFrame:
+    # Mon 2026-06-01 .. Fri 2026-07-03: five full weeks spanning two months
+    dates = pd.bdate_range("2026-06-01", "2026-07-03")
+    closes = [10.0 + i for i in range(len(dates))]
+    return pd.DataFrame({
+        "date": [d.date() for d in dates],
+        "open": [c - 0.5 for c in closes],
+        "high": [c + 1.0 for c in closes],
+        "low": [c - 1.0 for c in closes],
+        "close": closes,
+        "volume": 100.0,
+        "amount": 1000.0,
+        # First bar: +25% from a previous close of 8.0
+        "pct_chg": [25.0] + [round(100 / (c - 1), 2) for c in closes[1:]],
+    })
+
+
+def _history(last_modified=datetime(2026, 7, 3, 15, 30)):
+    return HistoryBars(_daily_frame(), "db_cache", last_modified)
+
+
+@patch("src.services.history_loader.get_fetcher_manager")
+@patch("src.services.history_loader.load_history_bars")
+class StockServiceHistoryTestCase(unittest.TestCase):
+    def test_daily_passes_stored_bars_through(self, mock_load, mock_get_fm):
+        mock_load.return_value = _history()
+        mock_get_fm.return_value.get_stock_name.return_value = "贵州茅台"
+
+        result = StockService().get_history_data("600519", period="daily", days=25)
+
+        mock_load.assert_called_once_with("600519", days=25)
+        mock_get_fm.return_value.get_stock_name.assert_called_once_with("600519", allow_realtime=False)
+        self.assertEqual(len(result["data"]), 25)
+        self.assertEqual(result["data"][0]["date"], "2026-06-01")
+        self.assertEqual(result["data"][0]["change_percent"], 25.0)
+        self.assertEqual(result["last_modified"], datetime(2026, 7, 3, 15, 30))
+
+    def test_weekly_resample(self, mock_load, mock_get_fm):
+        mock_load.return_value = _history()
+
+        data = StockService().get_history_data("600519", period="weekly", days=25)["data"]
+
+        self.assertEqual([bar["date"] for bar in data][:2], ["2026-06-05", "2026-06-12"])
+        self.assertEqual(len(data), 5)
+        first, second = data[0], data[1]
+        self.assertEqual((first["open"], first["high"], first["low"], first["close"]), (9.5, 15.0, 9.0, 14.0))
+        self.assertEqual((first["volume"], first["amount"]), (500.0, 5000.0))
+        # vs. the close before the first bar (8.0) and the previous week's close
+        self.assertEqual(first["change_percent"], 75.0)
+        self.assertEqual(second["change_percent"], round((19 / 14 - 1) * 100, 2))
+
+    def test_monthly_resample_and_unknown_period(self, mock_load, mock_get_fm):
+        mock_load.return_value = _history()
+
+        data = StockService().get_history_data("600519", period="monthly", days=25)["data"]
+
+        self.assertEqual([bar["date"] for bar in data], ["2026-06-30", "2026-07-03"])
+        self.assertEqual(data[1]["open"], 31.5)
+        with self.assertRaises(ValueError):
+            StockService().get_history_data("600519", period="yearly")
+
+
+class StockHistoryEndpointTestCase(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(stocks.router, prefix="/api/v1/stocks")
+        self.client = TestClient(app)
+        self.url = "/api/v1/stocks/600519/history?period=weekly&days=25"
+
+    def _get(self, headers=None, last_modified=datetime(2026, 7, 3, 15, 30)):
+        manager = MagicMock()
+        manager.get_stock_name.return_value = "贵州茅台"
+        with patch("src.services.history_loader.load_history_bars", return_value=_history(last_modified)), \
+                patch("src.services.history_loader.get_fetcher_manager", return_value=manager):
+            return self.client.get(self.url, headers=headers or {})
+
+    def test_etag_revalidation(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 5)
+        etag = response.headers["etag"]
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+        not_modified = self._get({"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["etag"], etag)
+        self.assertEqual(not_modified.content, b"")
+
+        self.assertEqual(self._get({"If-None-Match": 'W/"stale"'}).status_code, 200)
+
+    def test_last_modified_revalidation(self):
+        last_modified = self._get().headers["last-modified"]
+
+        self.assertEqual(self._get({"If-Modified-Since": last_modified}).status_code, 304)
+        newer = self._get({"If-Modified-Since": last_modified}, last_modified=datetime(2026, 7, 6, 15, 30))
+        self.assertEqual(newer.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,18 +4,27 @@ import sys
 import os
 import tempfile
 import threading
-from datetime import date
+import time
+from datetime import date, datetime, timedelta
 from unittest.mock import patch
 
 import pandas as pd
-from sqlalchemy import and_, select
+from sqlalchemy import and_, event, select, text
 from sqlalchemy.sql import func
 
 # Ensure src module can be imported
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.config import Config
-from src.storage import DatabaseManager, StockDaily
+from src.storage import (
+    AnalysisHistory,
+    ChatSession,
+    ConversationMessage,
+    DatabaseManager,
+    LLMUsage,
+    StockDaily,
+    WriteBehindQueue,
+)
 
 class TestStorage(unittest.TestCase):
     
@@ -100,6 +109,50 @@ class TestStorage(unittest.TestCase):
 
         DatabaseManager.reset_instance()
 
+    def test_chat_sessions_index_tracks_saves_and_deletes(self):
+        DatabaseManager.reset_instance()
+        db = DatabaseManager(db_url="sqlite:///:memory:")
+
+        db.save_conversation_message("web:a", "assistant", "welcome")
+        db.save_conversation_message("web:a", "user", "第一条问题" * 20)
+        db.save_conversation_message("web:a", "user", "second question")
+        db.save_conversation_message("web:b", "assistant", "no user yet")
+
+        sessions = {item["session_id"]: item for item in db.get_chat_sessions()}
+
+        self.assertEqual(sessions["web:a"]["message_count"], 3)
+        self.assertEqual(sessions["web:a"]["title"], ("第一条问题" * 20)[:60])
+        self.assertEqual(sessions["web:b"]["title"], "新对话")
+        self.assertEqual(db.get_chat_sessions()[0]["session_id"], "web:b")
+
+        self.assertEqual(db.delete_conversation_session("web:a"), 3)
+        self.assertEqual([item["session_id"] for item in db.get_chat_sessions()], ["web:b"])
+
+        DatabaseManager.reset_instance()
+
+    def test_chat_sessions_index_backfills_existing_messages(self):
+        DatabaseManager.reset_instance()
+        db = DatabaseManager(db_url="sqlite:///:memory:")
+        with db.session_scope() as session:
+            session.add_all([
+                ConversationMessage(session_id="legacy", role="user", content="old question",
+                                    created_at=datetime(2025, 1, 1, 9, 0)),
+                ConversationMessage(session_id="legacy", role="assistant", content="old answer",
+                                    created_at=datetime(2025, 1, 1, 9, 1)),
+            ])
+
+        sessions = db.get_chat_sessions()
+
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["title"], "old question")
+        self.assertEqual(sessions[0]["message_count"], 2)
+        self.assertEqual(sessions[0]["created_at"], "2025-01-01T09:00:00")
+        self.assertEqual(sessions[0]["last_active"], "2025-01-01T09:01:00")
+        with db.session_scope() as session:
+            self.assertEqual(session.execute(select(func.count()).select_from(ChatSession)).scalar(), 1)
+
+        DatabaseManager.reset_instance()
+
     def test_file_sqlite_enables_wal_and_busy_timeout(self):
         temp_dir = tempfile.TemporaryDirectory()
         db_path = os.path.join(temp_dir.name, "sqlite_pragmas.db")
@@ -212,5 +265,234 @@ class TestStorage(unittest.TestCase):
             temp_dir.cleanup()
             DatabaseManager.reset_instance()
 
+
+class TestWriteBehindQueue(unittest.TestCase):
+
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(db_url=f"sqlite:///{os.path.join(self.temp_dir.name, 'write_behind.db')}")
+        self.transactions = []
+
+        def _counting_transaction(operation_name, write_operation):
+            self.transactions.append(operation_name)
+            return self.db._run_write_transaction(operation_name, write_operation)
+
+        self.run_transaction = _counting_transaction
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+        self.temp_dir.cleanup()
+
+    def _enable(self, **kwargs):
+        kwargs.setdefault("flush_interval", 60)
+        self.db._write_behind = WriteBehindQueue(self.run_transaction, **kwargs)
+        return self.db._write_behind
+
+    def _count(self, model):
+        with self.db.session_scope() as session:
+            return session.execute(select(func.count(model.id))).scalar()
+
+    def test_buffered_writes_commit_in_one_transaction_and_flush_before_reads(self):
+        queue = self._enable(max_batch=100)
+
+        for _ in range(5):
+            self.db.record_llm_usage("analysis", "m1", 1, 2, 3)
+        self.db.save_conversation_message("s1", "user", "hello")
+        self.db.save_conversation_message("s1", "assistant", "hi")
+
+        self.assertEqual(self._count(LLMUsage), 0)
+        history = self.db.get_conversation_history("s1")
+
+        self.assertEqual([m["content"] for m in history], ["hello", "hi"])
+        self.assertEqual(self._count(LLMUsage), 5)
+        self.assertEqual(self.transactions, ["write_behind[7]"])
+        self.assertEqual(queue.stats()["commits"], 1)
+
+    def test_conversation_summary_read_flushes_queued_messages(self):
+        queue = self._enable(max_batch=100)
+
+        self.db.save_conversation_message("s1", "user", "hello")
+        self.assertIsNone(self.db.get_conversation_summary("s1"))
+
+        self.assertEqual(queue.stats()["pending"], 0)
+        self.assertEqual(self._count(ConversationMessage), 1)
+
+    def test_failed_operation_does_not_discard_the_rest_of_the_batch(self):
+        queue = self._enable(max_batch=100)
+
+        def _broken(session):
+            raise ValueError("boom")
+
+        queue.submit("broken", _broken)
+        self.db.save_conversation_message("s1", "user", "kept")
+        queue.flush()
+
+        self.assertEqual(self._count(ConversationMessage), 1)
+        self.assertEqual(queue.stats()["failed"], 1)
+
+    def test_backlog_cap_flushes_on_the_writing_thread(self):
+        queue = self._enable(max_batch=3, max_pending=3)
+
+        for i in range(3):
+            self.db.save_conversation_message("s1", "user", f"m{i}")
+
+        self.assertEqual(queue.stats()["pending"], 0)
+        self.assertEqual(self._count(ConversationMessage), 3)
+
+    def test_flush_interval_triggers_background_commit(self):
+        self._enable(max_batch=100, flush_interval=0.05)
+
+        self.db.record_llm_usage("agent", "m1", 1, 1, 2)
+        deadline = time.monotonic() + 2
+        while self._count(LLMUsage) == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        self.assertEqual(self._count(LLMUsage), 1)
+
+    def test_close_flushes_pending_and_later_writes_are_synchronous(self):
+        self._enable(max_batch=100)
+
+        self.db.save_conversation_message("s1", "user", "queued")
+        self.db.close_write_behind()
+        self.assertEqual(self._count(ConversationMessage), 1)
+
+        self.db.save_conversation_message("s1", "user", "direct")
+        self.assertEqual(self._count(ConversationMessage), 2)
+
+    def test_in_memory_sqlite_never_buffers(self):
+        DatabaseManager.reset_instance()
+        config = Config(db_write_behind_enabled=True)
+        with patch("src.storage.get_config", return_value=config):
+            db = DatabaseManager(db_url="sqlite:///:memory:")
+        self.assertIsNone(db._write_behind)
+
+
+
+class TestAnalysisHistoryPayloadStorage(unittest.TestCase):
+
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+        self.report = '{"analysis_summary": "' + "趋势向上，量能配合。" * 300 + '"}'
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def _raw_payload(self, record_id):
+        with self.db.get_session() as session:
+            return session.execute(
+                text("SELECT raw_result FROM analysis_history WHERE id = :id"), {"id": record_id}
+            ).scalar()
+
+    def _add_record(self, raw_result):
+        with self.db.session_scope() as session:
+            record = AnalysisHistory(
+                query_id="q1", code="600519", name="贵州茅台",
+                raw_result=raw_result, news_content="短新闻", context_snapshot=None,
+            )
+            session.add(record)
+            session.flush()
+            return record.id
+
+    def test_large_payload_is_compressed_and_read_back_transparently(self):
+        record_id = self._add_record(self.report)
+
+        stored = self._raw_payload(record_id)
+        self.assertTrue(stored.startswith("zlib:"))
+        self.assertLess(len(stored), len(self.report) / 4)
+        record = self.db.get_analysis_history_by_id(record_id)
+        self.assertEqual(record.raw_result, self.report)
+        self.assertEqual(record.news_content, "短新闻")
+
+    def test_paginated_list_skips_payload_columns(self):
+        self._add_record(self.report)
+
+        records, total = self.db.get_analysis_history_paginated()
+
+        self.assertEqual(total, 1)
+        self.assertEqual(records[0].code, "600519")
+        self.assertNotIn("raw_result", records[0].__dict__)
+
+    def test_compact_rewrites_legacy_plain_rows(self):
+        record_id = self._add_record("占位")
+        with self.db.session_scope() as session:
+            # Simulate a row written before compression existed
+            session.execute(
+                text("UPDATE analysis_history SET raw_result = :raw WHERE id = :id"),
+                {"raw": self.report, "id": record_id},
+            )
+        self.assertFalse(self._raw_payload(record_id).startswith("zlib:"))
+        self.assertEqual(self.db.get_analysis_history_by_id(record_id).raw_result, self.report)
+
+        self.assertEqual(self.db.compact_analysis_history(), 1)
+
+        self.assertTrue(self._raw_payload(record_id).startswith("zlib:"))
+        self.assertEqual(self.db.get_analysis_history_by_id(record_id).raw_result, self.report)
+        self.assertEqual(self.db.compact_analysis_history(), 0)
+
+
+class TestSignalHistoryBatch(unittest.TestCase):
+
+    def setUp(self):
+        DatabaseManager.reset_instance()
+        self.db = DatabaseManager(db_url="sqlite:///:memory:")
+        now = datetime.now()
+        rows = [
+            # code, query_id, minutes ago, score
+            ("600519", "q1", 30, 60),
+            ("600519", "q2", 20, 65),
+            ("600519", "q3", 10, 70),
+            ("000001", "q3", 15, 40),
+            ("000001", "q0", 60 * 24 * 120, 10),  # outside the 90-day window
+        ]
+        with self.db.session_scope() as session:
+            for code, query_id, minutes, score in rows:
+                session.add(AnalysisHistory(
+                    query_id=query_id, code=code, name=code, sentiment_score=score,
+                    operation_advice="持有", trend_prediction="震荡",
+                    raw_result="x" * 5000, created_at=now - timedelta(minutes=minutes),
+                ))
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def test_latest_rows_per_code_in_one_query(self):
+        statements = []
+
+        def _count(_conn, _cursor, statement, *_args):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(self.db._engine, "before_cursor_execute", _count)
+        try:
+            result = self.db.get_signal_history_batch(
+                ["600519", "000001", "300750"], limit=2, exclude_query_ids={"600519": "q3"},
+            )
+        finally:
+            event.remove(self.db._engine, "before_cursor_execute", _count)
+
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("raw_result", statements[0])
+        self.assertEqual([r["query_id"] for r in result["600519"]], ["q2", "q1"])
+        # Exclusions are per code: 000001 keeps its own q3
+        self.assertEqual([r["sentiment_score"] for r in result["000001"]], [40])
+        self.assertEqual(result["300750"], [])
+
+    def test_service_keeps_report_shape(self):
+        from src.services.history_comparison_service import get_signal_changes, get_signal_changes_batch
+
+        batch = get_signal_changes_batch(["600519"], limit=5)
+        self.assertEqual(
+            set(batch["600519"][0]),
+            {"created_at", "query_id", "sentiment_score", "operation_advice", "trend_prediction"},
+        )
+        self.assertIsInstance(batch["600519"][0]["created_at"], str)
+        self.assertEqual(
+            [r["query_id"] for r in get_signal_changes("600519", exclude_query_id="q2")],
+            ["q3", "q1"],
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@
 """Integration tests for system configuration API endpoints."""
 
 import asyncio
+import json
 import os
 import tempfile
 import unittest
@@ -22,6 +23,7 @@ from api.v1.endpoints import system_config
 from api.v1.schemas.system_config import (
     DiscoverLLMChannelModelsRequest,
     ImportSystemConfigRequest,
+    TestChannelsRequest,
     TestLLMChannelRequest,
     TestNotificationChannelRequest,
     UpdateSystemConfigRequest,
@@ -570,6 +572,31 @@ class SystemConfigApiTestCase(unittest.TestCase):
         mock_test.assert_called_once()
         self.assertEqual(mock_test.call_args.kwargs["capability_checks"], ["json", "stream"])
 
+    def test_test_channels_endpoint_streams_one_event_per_channel(self) -> None:
+        events = [
+            {"type": "notification", "name": "wechat", "cached": True, "result": {"success": True}},
+            {"type": "llm", "name": "primary", "cached": False, "result": {"success": False}},
+        ]
+        with patch.object(self.service, "test_channels", return_value=iter(events)) as mock_test:
+            response = system_config.test_channels(
+                request=TestChannelsRequest(
+                    llm_channels=[TestLLMChannelRequest(name="primary", models=["gpt-4o-mini"])],
+                    notification_channels=["wechat"],
+                ),
+                service=self.service,
+            )
+
+            async def _collect():
+                return [chunk async for chunk in response.body_iterator]
+
+            chunks = asyncio.run(_collect())
+
+        self.assertEqual(response.media_type, "text/event-stream")
+        payloads = [json.loads(chunk[len("data: "):]) for chunk in chunks]
+        self.assertEqual([p["type"] for p in payloads], ["notification", "llm", "done"])
+        self.assertEqual(payloads[-1]["total"], 2)
+        self.assertEqual(mock_test.call_args.kwargs["notification_channels"], ["wechat"])
+
     def test_test_notification_channel_endpoint_returns_service_payload(self) -> None:
         with patch.object(
             self.service,
@@ -3,7 +3,9 @@
 
 import os
 import tempfile
+import threading
 import unittest
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Dict, Optional
@@ -1109,6 +1111,89 @@ class SystemConfigServiceTestCase(unittest.TestCase):
         self.assertNotIn("access_token=first", str(payload))
         self.assertNotIn("token=second", str(payload))
 
+    def test_test_channels_runs_probes_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=2)
+
+        def _slow_llm_test(**kwargs):
+            # Both probes must be in flight at once to get past the barrier
+            barrier.wait()
+            return {"success": True, "message": kwargs["name"]}
+
+        with patch.object(self.service, "test_llm_channel", side_effect=_slow_llm_test):
+            events = list(self.service.test_channels(
+                llm_channels=[
+                    {"name": "a", "base_url": "https://a.example.com/v1", "models": ["m"]},
+                    {"name": "b", "base_url": "https://b.example.com/v1", "models": ["m"]},
+                ],
+            ))
+
+        self.assertEqual(sorted(event["name"] for event in events), ["a", "b"])
+        self.assertTrue(all(event["result"]["success"] for event in events))
+        self.assertFalse(any(event["cached"] for event in events))
+
+    def test_test_channels_reports_probes_finishing_at_the_deadline(self) -> None:
+        release = threading.Event()
+
+        def _llm_test(**kwargs):
+            if kwargs["name"] == "late":
+                release.wait(timeout=2)
+            return {"success": True, "message": kwargs["name"]}
+
+        def _as_completed_then_deadline(futures, timeout=None):
+            # "late" finishes between the deadline and the timeout sweep
+            yield next(f for f in futures if f.result(timeout=2)["message"] == "fast")
+            release.set()
+            for future in futures:
+                future.result(timeout=2)
+            raise FuturesTimeoutError()
+
+        with patch.object(self.service, "test_llm_channel", side_effect=_llm_test), patch(
+            "src.services.system_config_service.as_completed", side_effect=_as_completed_then_deadline
+        ):
+            events = list(self.service.test_channels(
+                llm_channels=[
+                    {"name": "fast", "base_url": "https://a.example.com/v1", "models": ["m"]},
+                    {"name": "late", "base_url": "https://b.example.com/v1", "models": ["m"]},
+                ],
+            ))
+            cached = list(self.service.test_channels(
+                llm_channels=[{"name": "late", "base_url": "https://b.example.com/v1", "models": ["m"]}],
+            ))
+
+        self.assertEqual([event["name"] for event in events], ["fast", "late"])
+        self.assertTrue(all(event["result"]["success"] for event in events))
+        self.assertTrue(cached[0]["cached"])
+
+    @patch("src.notification_sender.wechat_sender.requests.post")
+    def test_test_channels_reuses_recent_successes_only(self, mock_post) -> None:
+        mock_post.return_value = self._mock_http_response(200, {"errcode": 0})
+        llm_results = [{"success": False, "message": "down"}, {"success": True, "message": "ok"}]
+        items = [{"key": "WECHAT_WEBHOOK_URL", "value": "https://qyapi.example.com/hook?key=one"}]
+        channel = {"name": "primary", "base_url": "https://api.example.com/v1", "models": ["m"]}
+
+        with self._notification_test_env(), patch.object(
+            self.service, "test_llm_channel", side_effect=llm_results
+        ) as mock_llm:
+            first = {e["type"]: e for e in self.service.test_channels(
+                llm_channels=[channel], notification_channels=["wechat"], items=items,
+            )}
+            second = {e["type"]: e for e in self.service.test_channels(
+                llm_channels=[channel], notification_channels=["wechat"], items=items,
+            )}
+            changed = list(self.service.test_channels(
+                notification_channels=["wechat"],
+                items=[{"key": "WECHAT_WEBHOOK_URL", "value": "https://qyapi.example.com/hook?key=two"}],
+            ))
+
+        # Failed LLM probe is retried; the successful notification is served from cache
+        self.assertEqual(mock_llm.call_count, 2)
+        self.assertFalse(second["llm"]["cached"])
+        self.assertTrue(second["llm"]["result"]["success"])
+        self.assertTrue(second["notification"]["cached"])
+        self.assertFalse(changed[0]["cached"])
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertFalse(first["notification"]["cached"])
+
     @patch("src.notification_sender.ntfy_sender.requests.post")
     def test_test_notification_channel_supports_ntfy_and_masks_topic_target(self, mock_post) -> None:
         mock_post.return_value = self._mock_http_response(200)
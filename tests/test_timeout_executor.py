@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Tests for the shared timeout-guarded task executor."""
+
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from data_provider.fundamental_adapter import AkshareFundamentalAdapter
+from data_provider.timeout_executor import TimeoutExecutor, current_cancel_token
+from tests.polling import wait_for
+
+
+class TimeoutExecutorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.executor = TimeoutExecutor(max_workers=1, max_queue=1)
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.executor.shutdown(wait=True)
+
+    def test_reuses_worker_threads(self):
+        names = [
+            self.executor.run(lambda: threading.current_thread().name, 1.0, "name")[0]
+            for _ in range(3)
+        ]
+
+        self.assertEqual(len(set(names)), 1)
+        self.assertEqual(self.executor.stats()["completed"], 3)
+        self.assertIsNone(current_cancel_token())
+
+    def test_timeout_cancels_token_and_counts_abandoned_task(self):
+        seen = {}
+
+        def _slow():
+            seen["token"] = current_cancel_token()
+            self.gate.wait(2)
+            return "late"
+
+        result, err, _ = self.executor.run(_slow, 0.05, "slow")
+
+        self.assertIsNone(result)
+        self.assertEqual(err, "slow timeout")
+        self.assertTrue(seen["token"].cancelled)
+        stats = self.executor.stats()
+        self.assertEqual((stats["timed_out"], stats["abandoned"], stats["running"]), (1, 1, 1))
+
+        self.gate.set()
+        wait_for(lambda: self.executor.stats()["running"] == 0)
+        stats = self.executor.stats()
+        self.assertEqual((stats["abandoned"], stats["abandoned_total"]), (0, 1))
+
+    def test_queued_task_is_dropped_on_timeout_and_full_queue_rejects(self):
+        ran = []
+        self.executor.run(lambda: self.gate.wait(2), 0.01, "blocker")
+
+        result, err, _ = self.executor.run(lambda: ran.append(1), 0.05, "queued")
+        self.assertEqual(err, "queued timeout")
+
+        # Worker busy, queue slot taken by a waiting caller: the next one is rejected
+        waiter = threading.Thread(target=self.executor.run, args=(lambda: None, 1.0, "waiter"))
+        waiter.start()
+        wait_for(lambda: self.executor.stats()["queued"] == 1)
+        _, rejected_err, _ = self.executor.run(lambda: None, 1.0, "extra")
+        self.gate.set()
+        waiter.join(2)
+
+        self.assertIn("worker pool exhausted", rejected_err)
+        stats = self.executor.stats()
+        self.assertEqual((stats["cancelled"], stats["rejected"], stats["peak_queued"]), (1, 1, 1))
+        self.assertEqual(ran, [])
+
+    def test_task_errors_are_returned(self):
+        def _boom():
+            raise ValueError("boom")
+
+        result, err, _ = self.executor.run(_boom, 1.0, "boom")
+
+        self.assertEqual((result, err), (None, "boom"))
+        self.assertEqual(self.executor.stats()["failed"], 1)
+
+    def test_adapter_stops_probing_after_cancellation(self):
+        adapter = AkshareFundamentalAdapter()
+        fake_akshare = SimpleNamespace(stock_yjyg_em=MagicMock(), stock_yjkb_em=MagicMock())
+
+        def _probe():
+            current_cancel_token().cancel()
+            return adapter._call_df_candidates([("stock_yjyg_em", {}), ("stock_yjkb_em", {})])
+
+        with patch.dict(sys.modules, {"akshare": fake_akshare}):
+            (df, source, errors), err, _ = self.executor.run(_probe, 1.0, "probe")
+
+        self.assertIsNone(err)
+        self.assertEqual((df, source, errors), (None, None, ["cancelled"]))
+        fake_akshare.stock_yjyg_em.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@
 from datetime import date, datetime, time, timezone
 from types import SimpleNamespace
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from zoneinfo import ZoneInfo
 
 import pandas as pd
@@ -17,6 +17,12 @@ class _FakeCalendar:
         self._sessions = sorted(sessions)
         self._close_hour = close_hour
         self._tz_name = tz_name
+        self.range_calls = 0
+
+    def sessions_in_range(self, start: str, end: str) -> pd.DatetimeIndex:
+        self.range_calls += 1
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        return pd.DatetimeIndex([pd.Timestamp(d) for d in self._sessions if first <= d <= last])
 
     def is_session(self, check_date: date) -> bool:
         return check_date in self._sessions
@@ -50,6 +56,12 @@ class _FakeCalendar:
 
 
 class EffectiveTradingDateTestCase(unittest.TestCase):
+    def setUp(self):
+        trading_calendar.clear_session_cache()
+
+    def tearDown(self):
+        trading_calendar.clear_session_cache()
+
     def test_weekend_returns_previous_session(self):
         fake_calendar = _FakeCalendar(
             sessions=[date(2026, 3, 26), date(2026, 3, 27)],
@@ -168,6 +180,91 @@ class EffectiveTradingDateTestCase(unittest.TestCase):
         self.assertEqual(result, date(2026, 3, 28))
 
 
+class SessionTableTestCase(unittest.TestCase):
+    def setUp(self):
+        trading_calendar.clear_session_cache()
+
+    def tearDown(self):
+        trading_calendar.clear_session_cache()
+
+    def test_calendar_is_built_once_per_market_and_year(self):
+        fake_calendar = _FakeCalendar(
+            sessions=[date(2025, 12, 31), date(2026, 1, 2), date(2026, 1, 5)],
+            close_hour=15,
+            tz_name="Asia/Shanghai",
+        )
+        get_calendar = Mock(return_value=fake_calendar)
+
+        with patch.object(trading_calendar, "_XCALS_AVAILABLE", True), patch.object(
+            trading_calendar, "xcals", SimpleNamespace(get_calendar=get_calendar), create=True,
+        ):
+            for _ in range(50):
+                self.assertTrue(trading_calendar.is_market_open("cn", date(2026, 1, 2)))
+                self.assertFalse(trading_calendar.is_market_open("cn", date(2026, 1, 3)))
+            self.assertEqual(
+                trading_calendar.get_effective_trading_date(
+                    "cn", current_time=datetime(2026, 1, 2, 10, 0, tzinfo=ZoneInfo("Asia/Shanghai"))
+                ),
+                date(2025, 12, 31),
+            )
+            self.assertEqual(get_calendar.call_count, 1)
+            self.assertEqual(fake_calendar.range_calls, 1)
+
+            # Year rollover builds a fresh table for the new year
+            self.assertFalse(trading_calendar.is_market_open("cn", date(2027, 1, 1)))
+            self.assertEqual(fake_calendar.range_calls, 2)
+
+    def test_matches_exchange_calendars_when_installed(self):
+        if not trading_calendar._XCALS_AVAILABLE:
+            self.skipTest("exchange-calendars not installed")
+        cal = trading_calendar.xcals.get_calendar("XSHG")
+        day = date(2026, 1, 1)
+        for offset in range(60):
+            check = date.fromordinal(day.toordinal() + offset)
+            self.assertEqual(trading_calendar.is_market_open("cn", check), cal.is_session(check))
+
+
+class NextMarketCloseTestCase(unittest.TestCase):
+    def setUp(self):
+        trading_calendar.clear_session_cache()
+
+    def tearDown(self):
+        trading_calendar.clear_session_cache()
+
+    def test_next_close_skips_past_closes_and_holidays_across_year_end(self):
+        fake_calendar = _FakeCalendar(
+            sessions=[date(2026, 12, 30), date(2026, 12, 31), date(2027, 1, 4)],
+            close_hour=16,
+            tz_name="America/New_York",
+        )
+        ny = ZoneInfo("America/New_York")
+
+        with patch.object(trading_calendar, "_XCALS_AVAILABLE", True), patch.object(
+            trading_calendar, "xcals", SimpleNamespace(get_calendar=Mock(return_value=fake_calendar)), create=True,
+        ):
+            before_close = trading_calendar.get_next_market_close(
+                "us", after=datetime(2026, 12, 31, 15, 0, tzinfo=ny)
+            )
+            after_close = trading_calendar.get_next_market_close(
+                "us", after=datetime(2026, 12, 31, 21, 0, tzinfo=timezone.utc)
+            )
+
+        self.assertEqual(before_close, datetime(2026, 12, 31, 16, 0, tzinfo=ny))
+        self.assertEqual(after_close, datetime(2027, 1, 4, 16, 0, tzinfo=ny))
+        self.assertEqual(after_close.utcoffset(), before_close.utcoffset())
+
+    def test_falls_back_to_regular_weekday_close(self):
+        shanghai = ZoneInfo("Asia/Shanghai")
+        with patch.object(trading_calendar, "_XCALS_AVAILABLE", False):
+            # Friday after the close -> Monday
+            close = trading_calendar.get_next_market_close(
+                "cn", after=datetime(2026, 7, 3, 15, 30, tzinfo=shanghai)
+            )
+            self.assertIsNone(trading_calendar.get_next_market_close("jp"))
+
+        self.assertEqual(close, datetime(2026, 7, 6, 15, 0, tzinfo=shanghai))
+
+
 class ComputeEffectiveRegionTestCase(unittest.TestCase):
     """Regression tests for compute_effective_region subset logic."""
 